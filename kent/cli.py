@@ -454,6 +454,17 @@ def serve(runs_dir: str, host: str, port: int, verbose: bool) -> None:
     is_flag=True,
     help="Skip archive requests; local_filepath will be 'skipped'.",
 )
+@click.option(
+    "--archive-store",
+    "archive_store_dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help=(
+        "Directory of an archive store shared between runs. Archived "
+        "files are added to it, and files it already holds are linked "
+        "into this run instead of downloaded again."
+    ),
+)
 @click.option(
     "--proxy",
     default=None,
@@ -479,6 +490,7 @@ def run(
     headed: bool,
     browser_profile_path: str | None,
     skip_archive: bool,
+    archive_store_dir: str | None,
     proxy: str | None,
     verbose: bool,
 ) -> None:
@@ -626,6 +638,12 @@ def run(
             "playwright drivers (it requires a request database)."
         )
 
+    if skip_archive and archive_store_dir:
+        raise click.UsageError(
+            "--archive-store cannot be combined with --skip-archive."
+        )
+    archive_store = Path(archive_store_dir) if archive_store_dir else None
+
     click.echo(f"Scraper: {scraper_name}")
     click.echo(f"Driver:  {driver_name}")
 
@@ -635,6 +653,7 @@ def run(
             storage_dir,
             seed_params,
             skip_archive=skip_archive,
+            archive_store=archive_store,
             proxy=proxy,
         )
     elif driver_name == "async":
@@ -644,6 +663,7 @@ def run(
             workers,
             seed_params,
             skip_archive=skip_archive,
+            archive_store=archive_store,
             proxy=proxy,
         )
     elif driver_name == "persistent":
@@ -657,6 +677,7 @@ def run(
             seed_params,
             max_workers=max_workers,
             skip_archive=skip_archive,
+            archive_store=archive_store,
             proxy=proxy,
             add_seed_params=add_seed_params,
         )
@@ -673,6 +694,7 @@ def run(
             browser_profile_path=browser_profile_path,
             max_workers=max_workers,
             skip_archive=skip_archive,
+            archive_store=archive_store,
             proxy=proxy,
             add_seed_params=add_seed_params,
         )
@@ -689,9 +711,14 @@ def _run_sync(
     seed_params: list[dict[str, dict[str, Any]]] | None,
     *,
     skip_archive: bool = False,
+    archive_store: Path | None = None,
     proxy: str | None = None,
 ) -> None:
-    from kent.driver.archive_handler import NoDownloadsSyncArchiveHandler
+    from kent.driver.archive_handler import (
+        LocalSyncArchiveHandler,
+        NoDownloadsSyncArchiveHandler,
+    )
+    from kent.driver.archive_store import ArchiveStore
     from kent.driver.sync_driver import SyncDriver
 
     archive_handler = NoDownloadsSyncArchiveHandler() if skip_archive else None
@@ -701,6 +728,10 @@ def _run_sync(
         archive_handler=archive_handler,
         proxy=proxy,
     )
+    if archive_store is not None:
+        driver.archive_handler = LocalSyncArchiveHandler(
+            driver.storage_dir, store=ArchiveStore(archive_store)
+        )
     driver.seed_params = seed_params
     driver.run()
     click.echo("Done.")
@@ -713,6 +744,7 @@ def _run_async(
     seed_params: list[dict[str, dict[str, Any]]] | None,
     *,
     skip_archive: bool = False,
+    archive_store: Path | None = None,
     proxy: str | None = None,
 ) -> None:
     from kent.driver.archive_handler import NoDownloadsAsyncArchiveHandler
@@ -730,6 +762,8 @@ def _run_async(
             archive_handler=archive_handler,
             proxy=proxy,
         )
+        if archive_store is not None:
+            await _use_archive_store(driver, archive_store)
         driver.seed_params = seed_params
         await driver.run()
 
@@ -737,6 +771,17 @@ def _run_async(
     click.echo("Done.")
 
 
+async def _use_archive_store(driver: Any, archive_store: Path) -> None:
+    """Archive through ``archive_store`` into the driver's storage dir."""
+    from kent.driver.archive_handler import LocalAsyncArchiveHandler
+    from kent.driver.archive_store import ArchiveStore
+
+    store = await asyncio.to_thread(ArchiveStore, archive_store)
+    driver.archive_handler = LocalAsyncArchiveHandler(
+        driver.storage_dir, store=store
+    )
+
+
 async def _reject_params_on_existing_db(db_path: Path) -> None:
     """Raise if ``db_path`` is a database that already has a run.
 
@@ -770,6 +815,7 @@ def _run_persistent(
     *,
     max_workers: int | None = None,
     skip_archive: bool = False,
+    archive_store: Path | None = None,
     proxy: str | None = None,
     add_seed_params: list[dict[str, dict[str, Any]]] | None = None,
 ) -> None:
@@ -807,6 +853,8 @@ def _run_persistent(
                 )
 
                 driver.archive_handler = NoDownloadsAsyncArchiveHandler()
+            elif archive_store is not None:
+                await _use_archive_store(driver, archive_store)
             if add_seed_params is not None:
                 await driver.add_seed_params(add_seed_params)
             await driver.run()
@@ -828,6 +876,7 @@ def _run_playwright(
     browser_profile_path: str | None = None,
     max_workers: int | None = None,
     skip_archive: bool = False,
+    archive_store: Path | None = None,
     proxy: str | None = None,
     add_seed_params: list[dict[str, dict[str, Any]]] | None = None,
 ) -> None:
@@ -880,6 +929,8 @@ def _run_playwright(
                 )
 
                 driver.archive_handler = NoDownloadsAsyncArchiveHandler()
+            elif archive_store is not None:
+                await _use_archive_store(driver, archive_store)
             if add_seed_params is not None:
                 await driver.add_seed_params(add_seed_params)
             await driver.run()
@@ -4,9 +4,27 @@ This module defines exception hierarchy for scraper assumption violations.
 Step 8 introduces structural assumption errors for HTML parsing.
 """
 
+import copyreg
 from typing import Any
 
 
+def _reduce_by_state(exc: BaseException) -> tuple[Any, ...]:
+    """Pickle an exception from its formatted ``args`` and ``__dict__``.
+
+    The default ``BaseException.__reduce__`` re-calls ``__init__`` with
+    ``args``, which breaks for subclasses whose constructors take
+    structured arguments and pass a formatted message to ``super()``.
+    Rebuilding via ``__new__`` and restoring ``__dict__`` sidesteps the
+    constructor so these exceptions survive a round trip through a
+    process pool.
+    """
+    return (
+        copyreg.__newobj__,  # type: ignore[attr-defined]
+        (type(exc), *exc.args),
+        exc.__dict__,
+    )
+
+
 class PersistentException(Exception):
     """Errors the server or site state will keep producing on retry.
 
@@ -23,6 +41,9 @@ class PersistentException(Exception):
     retries and surface the error directly.
     """
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_by_state(self)
+
 
 class ScraperAssumptionException(PersistentException):
     """Base class for scraper assumption violations.
@@ -204,7 +225,8 @@ class TransientException(Exception):
     The driver is responsible for retry logic and strategy.
     """
 
-    pass
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_by_state(self)
 
 
 class HTMLResponseAssumptionException(TransientException):
@@ -271,6 +293,37 @@ class RequestTimeoutException(TransientException):
         super().__init__(self.message)
 
 
+class IncompleteDownloadException(TransientException):
+    """Raised when a ranged archive download stops short.
+
+    The connection dropped or the server sent fewer bytes than the
+    requested range. The bytes received so far are kept, so a retry
+    resumes from the last recorded offset instead of byte zero.
+
+    Attributes:
+        url: The URL being downloaded.
+        received: Bytes of the file on disk when the download stopped.
+        total: Expected size of the file in bytes.
+        message: Human-readable error message.
+    """
+
+    def __init__(self, url: str, received: int, total: int) -> None:
+        """Initialize the exception.
+
+        Args:
+            url: The URL being downloaded.
+            received: Bytes of the file on disk when the download stopped.
+            total: Expected size of the file in bytes.
+        """
+        self.url = url
+        self.received = received
+        self.total = total
+        self.message = (
+            f"Download of {url} stopped at {received} of {total} bytes"
+        )
+        super().__init__(self.message)
+
+
 class PersistentHTTPResponseException(PersistentException):
     """HTTP status classified as persistent per scraper policy.
 
@@ -26,10 +26,12 @@ from kent.common.exceptions import (
     RequestTimeoutException,
     SpeculationHTTPFailure,
 )
+from kent.common.speculative import PROBE_HEAD, PROBE_RANGE
 from kent.data_types import (
     BaseRequest,
     BaseScraper,
     DriverRequirement,
+    HttpMethod,
     Response,
     TimeoutType,
 )
@@ -171,6 +173,23 @@ def _merge_cookies_into_headers(
     headers["Cookie"] = cookie_str
 
 
+def _apply_probe(
+    request: BaseRequest, method: str, headers: dict[str, Any]
+) -> str:
+    """Rewrite an existence probe's method and headers; return the method.
+
+    ``head`` probes are sent as HEAD (the caller drops any body);
+    ``range`` probes keep their method and ask for the first byte only.
+    Requests without ``probe`` are left unchanged.
+    """
+    probe = getattr(request, "probe", None)
+    if probe == PROBE_HEAD:
+        return HttpMethod.HEAD.value
+    if probe == PROBE_RANGE:
+        headers["Range"] = "bytes=0-0"
+    return method
+
+
 class SyncRequestManager:
     """Manages HTTP requests for synchronous drivers.
 
@@ -349,17 +368,19 @@ class SyncRequestManager:
 
         headers = dict(http_params.headers) if http_params.headers else {}
         _merge_cookies_into_headers(http_params.cookies, headers)
+        method = _apply_probe(request, http_params.method.value, headers)
+        send_body = method != HttpMethod.HEAD.value
 
         try:
             http_response = client.request(
-                method=http_params.method.value,
+                method=method,
                 url=http_params.url,
                 headers=headers,
                 content=http_params.data
-                if isinstance(http_params.data, bytes)
+                if send_body and isinstance(http_params.data, bytes)
                 else None,
                 data=http_params.data  # type: ignore[arg-type]
-                if isinstance(http_params.data, dict)
+                if send_body and isinstance(http_params.data, dict)
                 else None,
                 follow_redirects=self._follow_redirects,
                 timeout=_httpx_timeout(http_params.timeout),
@@ -621,8 +642,15 @@ class AsyncRequestManager:
         else:
             client = self._client_for(http_params.verify)
 
-        # Prepare content and data parameters for httpx
-        request_data = http_params.data
+        headers = dict(http_params.headers) if http_params.headers else {}
+        _merge_cookies_into_headers(http_params.cookies, headers)
+        method = _apply_probe(request, http_params.method.value, headers)
+
+        # Prepare content and data parameters for httpx (probes sent as
+        # HEAD carry no body)
+        request_data = (
+            http_params.data if method != HttpMethod.HEAD.value else None
+        )
         content_param: bytes | None = (
             request_data if isinstance(request_data, bytes) else None
         )
@@ -632,12 +660,9 @@ class AsyncRequestManager:
             else None
         )
 
-        headers = dict(http_params.headers) if http_params.headers else {}
-        _merge_cookies_into_headers(http_params.cookies, headers)
-
         logger.info(
             "resolve_request: %s %s request_timeout=%r client_timeout=%r",
-            http_params.method.value,
+            method,
             http_params.url,
             http_params.timeout,
             client.timeout,
@@ -646,7 +671,7 @@ class AsyncRequestManager:
         # Make the HTTP request
         try:
             http_response = await client.request(
-                method=http_params.method.value,
+                method=method,
                 url=http_params.url,
                 headers=headers,
                 content=content_param,
@@ -18,6 +18,18 @@ The protocol has four members:
 - ``max_gap()``: the consecutive-failure ceiling (and initial window
   size when ``should_advance`` is True).
 
+Models may also define an optional ``search_strategy`` attribute. It is
+not part of the structural check; when absent the driver uses
+``"linear"``. ``"gallop"`` makes the driver search past a run of
+``max_gap()`` failures with exponentially spaced probes instead of
+stopping, which finds a block that starts at an unknown offset without
+requesting every ID in between.
+
+An optional ``probe`` attribute (``"head"`` or ``"range"``) turns on
+existence probes: each speculative ID is first requested with ``HEAD``
+(or with ``Range: bytes=0-0``), the outcome is tracked from that cheap
+response, and the full request is enqueued only when the probe succeeds.
+
 Example::
 
     class DocketId(BaseModel):
@@ -46,6 +58,10 @@ from typing import Protocol, TypeVar, runtime_checkable
 
 T = TypeVar("T", covariant=True)
 
+PROBE_HEAD = "head"
+PROBE_RANGE = "range"
+PROBE_MODES = frozenset({PROBE_HEAD, PROBE_RANGE})
+
 
 @runtime_checkable
 class Speculative(Protocol[T]):
@@ -74,6 +90,21 @@ class Speculative(Protocol[T]):
             before the speculation stops. Also controls the size of the
             initial advance window enqueued when ``should_advance`` is
             True. Returning 0 disables the advance window entirely.
+
+    Optional attributes (looked up with ``getattr``):
+        search_strategy: ``"linear"`` (default) stops after ``max_gap()``
+            consecutive failures. ``"gallop"`` then probes
+            ``ceiling + max_gap() * 2**i`` one at a time, bisects back to
+            the start of the first populated block it hits, fills that
+            bracket densely and resumes linear advance. The search ends
+            when every galloping probe fails.
+        probe: ``None`` (default) fetches each speculative ID in full.
+            ``"head"`` first sends ``HEAD``; ``"range"`` sends the
+            request's own method with ``Range: bytes=0-0``. A 2xx probe
+            counts as a success and enqueues the full request as an
+            ordinary (non-speculative) request; anything else is a miss.
+            ``fails_successfully()`` is not consulted for probes, since
+            they carry no body.
     """
 
     should_advance: bool
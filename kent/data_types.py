@@ -21,7 +21,7 @@ import json
 import ssl
 from collections.abc import Callable, Generator, Mapping
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import date
 from enum import Enum
 from http.cookiejar import CookieJar
@@ -613,7 +613,9 @@ class BaseScraper(Generic[ScraperReturnType]):
         """Generate JSON Schema for all entry points.
 
         Returns a dict using Pydantic's model_json_schema() for BaseModel
-        parameters and standard JSON Schema types for primitives.
+        parameters and standard JSON Schema types for primitives. Entry
+        return types that are BaseModels are added to $defs too, under
+        the name given in ``returns``.
 
         Returns:
             Dict with scraper name, entries, and $defs for referenced models.
@@ -655,6 +657,14 @@ class BaseScraper(Generic[ScraperReturnType]):
                         "format": "date",
                     }
 
+            return_type = entry_info.return_type
+            if isinstance(return_type, type) and issubclass(
+                return_type, PydanticBaseModel
+            ):
+                model_schema = return_type.model_json_schema()
+                all_defs.update(model_schema.pop("$defs", {}))
+                all_defs[return_type.__name__] = model_schema
+
             entry_schema: dict[str, Any] = {
                 "returns": entry_info.return_type.__name__,
                 "speculative": entry_info.speculative,
@@ -955,6 +965,10 @@ class BaseRequest:
              client state (session, ViewState, CSRF token). None = unspecified.
              Consumed by `pdd replay error-stubs` to choose how far up the parent chain
              to walk when re-seeding errored subtrees.
+        probe: Existence-probe mode (``"head"`` or ``"range"``) for a speculative
+             request, or None. The request manager sends HEAD (or adds
+             ``Range: bytes=0-0``) instead of fetching the body; on success the
+             driver enqueues ``probe_target()`` and skips the continuation.
     """
 
     request: HTTPRequestParams
@@ -970,6 +984,7 @@ class BaseRequest:
     via: Any = None  # ViaLink | ViaFormSubmit | None - using Any to avoid circular import
     bypass_rate_limit: bool = False
     hateoas: bool | None = None
+    probe: str | None = None
 
     def __post_init__(self) -> None:
         """Deep copy accumulated_data and permanent to prevent unintended sharing.
@@ -1208,6 +1223,7 @@ class Request(BaseRequest):
             archive_hash_header=self.archive_hash_header,
             bypass_rate_limit=self.bypass_rate_limit,
             hateoas=self.hateoas,
+            probe=self.probe,
         )
 
     def speculative(
@@ -1244,8 +1260,34 @@ class Request(BaseRequest):
             archive_hash_header=self.archive_hash_header,
             bypass_rate_limit=self.bypass_rate_limit,
             hateoas=self.hateoas,
+            probe=self.probe,
         )
 
+    def as_probe(self, mode: str) -> Request:
+        """Create an existence-probe copy of this speculative request.
+
+        The HTTP parameters are kept as-is; the request manager rewrites
+        them at send time according to ``mode``.
+
+        Args:
+            mode: ``"head"`` or ``"range"``.
+
+        Returns:
+            A new Request with ``probe`` set.
+        """
+        return replace(self, probe=mode)
+
+    def probe_target(self) -> Request:
+        """Create the full request a successful probe stands in for.
+
+        The copy is no longer speculative (the probe already recorded the
+        speculation outcome) but keeps ``speculation_id`` for provenance.
+
+        Returns:
+            A new Request with ``probe`` cleared and is_speculative=False.
+        """
+        return replace(self, probe=None, is_speculative=False)
+
 
 @dataclass
 class Response:
@@ -0,0 +1,122 @@
+"""Process pools for scraper work that runs beside other threads.
+
+:func:`pool_mp_context` picks the start method every kent process pool
+uses. :class:`OrderedPool` is the bounded, in-order pipeline behind
+response search (:func:`map_response_chunks`) and step replay
+(:func:`map_step_jobs`): the pool starts on first use, a few calls per
+worker are kept in flight, and results come back in submission order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import multiprocessing.context
+import os
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Generic, TypeVar
+
+_TagT = TypeVar("_TagT")
+
+
+def pool_mp_context() -> multiprocessing.context.BaseContext:
+    """Pick a start method that is safe alongside other threads.
+
+    ``fork`` would copy locks held by the caller's threads (the sync
+    driver's fetch pool, the event loop's executor) into the child, so
+    we use ``forkserver`` where available and ``spawn`` elsewhere.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class OrderedPool(Generic[_TagT]):
+    """Calls on a lazily started process pool, collected in order.
+
+    Each call is submitted with a tag and :meth:`popleft` hands back
+    ``(tag, future)`` pairs in submission order. Callers keep at most
+    :attr:`max_in_flight` calls pending (twice the pool size) by
+    draining while :attr:`full`. With ``processes=0`` calls run in the
+    event loop's default thread pool instead.
+
+    Always :meth:`aclose` the pool, typically in a ``finally``: it
+    cancels calls that have not started and waits for the rest off the
+    event loop.
+
+    Args:
+        processes: Pool size. ``None`` uses one per CPU.
+    """
+
+    def __init__(self, processes: int | None) -> None:
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = processes
+        self.max_in_flight = max(processes, 1) * 2
+        self._pool: ProcessPoolExecutor | None = None
+        self._in_flight: deque[tuple[_TagT, asyncio.Future[Any]]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    @property
+    def full(self) -> bool:
+        """Whether :attr:`max_in_flight` calls are pending."""
+        return len(self._in_flight) >= self.max_in_flight
+
+    @property
+    def started(self) -> bool:
+        """Whether the process pool has been started."""
+        return self._pool is not None
+
+    def submit(
+        self,
+        tag: _TagT,
+        func: Callable[..., Any],
+        *args: Any,
+        in_thread: bool = False,
+    ) -> None:
+        """Queue ``func(*args)``; it must be picklable.
+
+        Args:
+            tag: Returned with the call's future by :meth:`popleft`.
+            func: The call to run.
+            *args: Its arguments.
+            in_thread: Run this call in a thread even with a pool.
+        """
+        executor: Executor | None = None
+        if self.processes > 0 and not in_thread:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=pool_mp_context(),
+                )
+            executor = self._pool
+        loop = asyncio.get_running_loop()
+        self._in_flight.append(
+            (tag, loop.run_in_executor(executor, func, *args))
+        )
+
+    def add_result(self, tag: _TagT, result: Any) -> None:
+        """Queue an already known result, keeping its place in order."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        self._in_flight.append((tag, future))
+
+    def popleft(self) -> tuple[_TagT, asyncio.Future[Any]]:
+        """Take the oldest call's tag and future."""
+        return self._in_flight.popleft()
+
+    async def aclose(self) -> None:
+        """Cancel pending calls and shut the pool down."""
+        for _, future in self._in_flight:
+            future.cancel()
+        self._in_flight.clear()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            # Calls already running finish first; wait off the loop.
+            await asyncio.to_thread(
+                pool.shutdown, wait=True, cancel_futures=True
+            )
@@ -0,0 +1,341 @@
+"""Parallel, resumable ``Range`` downloads for archive requests.
+
+Used by :meth:`AsyncDriver.resolve_archive_request` when the archive
+handler opts in with ``range_segments``. A HEAD request checks that the
+server advertises ``Accept-Ranges: bytes`` and a ``Content-Length``. The
+file is then preallocated next to its final destination and split into
+segments that are fetched concurrently, each with its own ``Range``
+header, and written in place at their offsets.
+
+Progress is checkpointed as a :class:`PartialDownload`: the temp file is
+fsynced first and then the per-segment offsets are handed to the driver,
+which records them (in memory for :class:`AsyncDriver`, in the
+``archive_partials`` table for the persistent driver). When a retry
+finds a checkpoint whose size and validator (``ETag`` or
+``Last-Modified``) still match, each segment resumes from its recorded
+offset instead of byte zero.
+
+Once every segment is complete the SHA-256 of the assembled file is
+computed so the handler can move it to the usual content-addressed path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from kent.common.exceptions import (
+    IncompleteDownloadException,
+    RequestTimeoutException,
+)
+from kent.common.speculative import PROBE_HEAD
+from kent.driver.archive_handler import STREAM_COALESCE_BYTES
+
+if TYPE_CHECKING:
+    from kent.common.request_manager import AsyncRequestManager
+    from kent.data_types import Request
+
+logger = logging.getLogger(__name__)
+
+# Progress is fsynced and recorded after roughly this many new bytes.
+RANGE_CHECKPOINT_BYTES = 8 * 1024 * 1024
+
+# Block size used when hashing the assembled file.
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+class RangesNotSupported(Exception):
+    """The server answered a ``Range`` request with the full body."""
+
+
+@dataclass
+class PartialDownload:
+    """Durable progress of one ranged archive download.
+
+    Attributes:
+        url: URL being downloaded; the key progress is stored under.
+        temp_path: Preallocated file the segments are written into.
+        total_size: Size of the file from ``Content-Length``.
+        validator: ``ETag`` or ``Last-Modified`` seen when the download
+            started. A resume is only attempted while it still matches.
+        segments: ``[start, end, offset]`` per segment, with ``end``
+            exclusive and ``offset`` the next byte to fetch.
+    """
+
+    url: str
+    temp_path: str
+    total_size: int
+    validator: str | None
+    segments: list[list[int]] = field(default_factory=list)
+
+    @property
+    def bytes_done(self) -> int:
+        return sum(offset - start for start, _, offset in self.segments)
+
+    @property
+    def complete(self) -> bool:
+        return all(offset >= end for _, end, offset in self.segments)
+
+    def snapshot(self) -> PartialDownload:
+        """Copy with the segment offsets frozen at this instant."""
+        return replace(self, segments=[list(s) for s in self.segments])
+
+    def segments_json(self) -> str:
+        return json.dumps(self.segments)
+
+
+def plan_segments(total_size: int, count: int) -> list[list[int]]:
+    """Split ``total_size`` bytes into ``count`` contiguous segments."""
+    count = max(1, min(count, total_size))
+    step, extra = divmod(total_size, count)
+    segments = []
+    start = 0
+    for i in range(count):
+        end = start + step + (1 if i < extra else 0)
+        segments.append([start, end, start])
+        start = end
+    return segments
+
+
+@dataclass
+class RangeSupport:
+    """What a HEAD response says about ranged downloads."""
+
+    total_size: int
+    validator: str | None
+    headers: dict[str, Any]
+
+
+def range_support(headers: dict[str, Any]) -> RangeSupport | None:
+    """Return :class:`RangeSupport` if ``headers`` allow byte ranges.
+
+    Requires ``Accept-Ranges: bytes`` and a positive ``Content-Length``.
+    Encoded bodies are rejected, since ranges would then address the
+    compressed bytes rather than the file.
+    """
+    lowered = {k.lower(): v for k, v in headers.items()}
+    if "bytes" not in lowered.get("accept-ranges", "").lower():
+        return None
+    if lowered.get("content-encoding", "identity").lower() != "identity":
+        return None
+    try:
+        total_size = int(lowered.get("content-length", ""))
+    except ValueError:
+        return None
+    if total_size <= 0:
+        return None
+    validator = lowered.get("etag") or lowered.get("last-modified")
+    return RangeSupport(total_size, validator, headers)
+
+
+async def probe_range_support(
+    request_manager: AsyncRequestManager, request: Request
+) -> RangeSupport | None:
+    """Send a HEAD for ``request`` and report whether ranges are usable.
+
+    Any failure (including servers that reject HEAD) returns None so the
+    caller falls back to a single streamed download.
+    """
+    try:
+        response = await request_manager.resolve_request(
+            request.as_probe(PROBE_HEAD)
+        )
+    except Exception as e:
+        logger.info(
+            "range probe failed url=%s: %s: %s",
+            request.request.url,
+            type(e).__name__,
+            e,
+        )
+        return None
+    if response.status_code != 200:
+        return None
+    return range_support(response.headers)
+
+
+def preallocate(path: Path, size: int) -> None:
+    """Create ``path`` at ``size`` bytes, reserving the blocks if possible."""
+    with open(path, "wb") as f:
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                pass
+        f.truncate(size)
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of the file at ``path``."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_BYTES):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _write_at(f: Any, offset: int, data: bytes) -> None:
+    # Segment files are unbuffered, so a write may be short; a gap left
+    # here would read as downloaded on resume.
+    f.seek(offset)
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view) :]
+
+
+def _ranged(request: Request, start: int, end: int) -> Request:
+    """Copy ``request`` asking for bytes ``start`` to ``end`` inclusive."""
+    headers = dict(request.request.headers or {})
+    headers["Range"] = f"bytes={start}-{end}"
+    return replace(request, request=replace(request.request, headers=headers))
+
+
+class RangedDownload:
+    """Fetch the remaining segments of a :class:`PartialDownload`.
+
+    Args:
+        request_manager: Manager used for each segment request, so rate
+            limits and client settings apply per segment.
+        request: The archive request being downloaded.
+        partial: Progress to resume from; offsets are advanced in place.
+        checkpoint: Awaitable callback receiving a durable snapshot.
+        checkpoint_bytes: New bytes between checkpoints.
+    """
+
+    def __init__(
+        self,
+        request_manager: AsyncRequestManager,
+        request: Request,
+        partial: PartialDownload,
+        checkpoint: Callable[[PartialDownload], Awaitable[None]],
+        checkpoint_bytes: int = RANGE_CHECKPOINT_BYTES,
+    ) -> None:
+        self.request_manager = request_manager
+        self.request = request
+        self.partial = partial
+        self._checkpoint = checkpoint
+        self._checkpoint_bytes = checkpoint_bytes
+        self._since_checkpoint = 0
+        self._checkpoint_lock = asyncio.Lock()
+        self._fd: int | None = None
+
+    async def run(self) -> str:
+        """Download every incomplete segment and return the SHA-256.
+
+        Raises:
+            IncompleteDownloadException: A segment stopped short. Progress
+                up to that point has been checkpointed.
+            RangesNotSupported: The server ignored a ``Range`` header.
+        """
+        path = self.partial.temp_path
+        files = [
+            await asyncio.to_thread(open, path, "r+b", buffering=0)
+            for _ in self.partial.segments
+        ]
+        self._fd = files[0].fileno()
+        tasks = [
+            asyncio.ensure_future(self._fetch_segment(segment, f))
+            for segment, f in zip(self.partial.segments, files, strict=True)
+            if segment[2] < segment[1]
+        ]
+        try:
+            if tasks:
+                # Let healthy segments finish even when one drops, so the
+                # retry has as little left to fetch as possible.
+                await asyncio.wait(tasks)
+            failed = [t for t in tasks if t.exception()]
+            if failed:
+                # Surface a fallback signal first, else the first failure.
+                failed.sort(
+                    key=lambda t: (
+                        not isinstance(t.exception(), RangesNotSupported)
+                    )
+                )
+                raise failed[0].exception()  # type: ignore[misc]
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Record whatever reached the disk so a retry resumes there.
+            with contextlib.suppress(Exception):
+                await self._save_checkpoint()
+            raise
+        finally:
+            for f in files:
+                f.close()
+        return await asyncio.to_thread(hash_file, path)
+
+    async def _fetch_segment(self, segment: list[int], f: Any) -> None:
+        url = self.request.request.url
+        start, end, offset = segment
+        buffered: list[bytes] = []
+        pending = 0
+
+        async def flush() -> None:
+            nonlocal buffered, pending
+            if not buffered:
+                return
+            data = b"".join(buffered)
+            buffered, pending = [], 0
+            # Never write past the segment even if the server overshoots.
+            data = data[: end - segment[2]]
+            await asyncio.to_thread(_write_at, f, segment[2], data)
+            segment[2] += len(data)
+            await self._progress(len(data))
+
+        try:
+            async with self.request_manager.stream_request(
+                _ranged(self.request, offset, end - 1)
+            ) as stream:
+                if stream.status_code != 206:
+                    raise RangesNotSupported(url)
+                async for chunk in stream.aiter_bytes():
+                    buffered.append(chunk)
+                    pending += len(chunk)
+                    if pending >= STREAM_COALESCE_BYTES:
+                        await flush()
+                        if segment[2] >= end:
+                            break
+            await flush()
+        except (httpx.TransportError, RequestTimeoutException) as e:
+            await flush()
+            logger.warning(
+                "range segment dropped url=%s bytes=%d-%d at %d: %s",
+                url,
+                start,
+                end - 1,
+                segment[2],
+                e,
+            )
+            raise IncompleteDownloadException(
+                url, self.partial.bytes_done, self.partial.total_size
+            ) from e
+        if segment[2] < end:
+            raise IncompleteDownloadException(
+                url, self.partial.bytes_done, self.partial.total_size
+            )
+
+    async def _progress(self, nbytes: int) -> None:
+        self._since_checkpoint += nbytes
+        if self._since_checkpoint >= self._checkpoint_bytes:
+            await self._save_checkpoint()
+
+    async def _save_checkpoint(self) -> None:
+        async with self._checkpoint_lock:
+            self._since_checkpoint = 0
+            # Freeze offsets before the fsync: everything they cover was
+            # already written, so the fsync makes all of it durable.
+            snapshot = self.partial.snapshot()
+            if self._fd is not None:
+                await asyncio.to_thread(os.fsync, self._fd)
+            await self._checkpoint(snapshot)
@@ -4,17 +4,35 @@ The three drivers differ only in how a speculative request is dispatched —
 heapq push, asyncio PriorityQueue, or DB insert — so the seed/extend/track
 machinery lives here and each driver subclasses the matching mixin and
 implements the single ``_enqueue_speculative`` hook.
+
+Seeding is a top-up: each state holds lazy iterators of IDs still to be
+enqueued, and at most ``window`` speculative requests are kept pending at
+once. Every tracked outcome frees a slot and pulls the next IDs, so a large
+``seed_range()`` never materialises as one giant queue (or one DB insert per
+ID before the first worker starts). ``window=None`` keeps eager seeding.
+
+Templates whose ``search_strategy`` is ``"gallop"`` do not give up when the
+linear advance window runs dry: a :class:`FrontierSearch` probes
+exponentially spaced IDs past the ceiling, bisects back to the start of the
+next populated block, and resumes dense seeding from there.
+
+Templates with a ``probe`` mode get existence probes instead of full
+fetches: the outcome is tracked from a HEAD (or one-byte ranged) response
+and only IDs that exist are enqueued again as full, non-speculative
+requests.
 """
 
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
-from collections.abc import Generator
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Generator, Iterator
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
-from kent.common.speculative import Speculative
+from kent.common.speculative import PROBE_MODES, Speculative
 from kent.data_types import BaseRequest, BaseScraper, Request, Response
 
 if TYPE_CHECKING:
@@ -22,6 +40,77 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+SEARCH_LINEAR = "linear"
+SEARCH_GALLOP = "gallop"
+
+# Galloping probes ``floor + max_gap() * 2**i`` for i below this, so a
+# search spans up to ``max_gap() * 2**9`` IDs past the ceiling.
+GALLOP_MAX_DOUBLINGS = 10
+
+
+@dataclass
+class FrontierSearch:
+    """Sequential galloping/binary search for the next populated ID block.
+
+    Starting from ``floor`` (the highest ID already planned), probes
+    ``floor + gap * 2**i`` one at a time until one succeeds, then bisects
+    between the last failing probe (``lo``) and that success (``hi``)
+    until the bracket is no wider than ``gap``. Only one probe is
+    outstanding at a time, so the search never outruns the rate limiter.
+
+    Attributes:
+        floor: Highest ID planned before the search started.
+        gap: The template's ``max_gap()``; bisection stops at this width.
+        lo: Highest probed ID known to fail (``floor`` initially).
+        hi: Lowest probed ID known to succeed, once one has.
+        doublings: Failed galloping probes so far.
+        probe: The outstanding probe ID, if any.
+        probes: Probes issued by this search.
+        exhausted: True once every galloping probe has failed.
+    """
+
+    floor: int
+    gap: int
+    lo: int = 0
+    hi: int | None = None
+    doublings: int = 0
+    probe: int | None = None
+    probes: int = 0
+    exhausted: bool = False
+
+    def __post_init__(self) -> None:
+        self.lo = self.floor
+
+    @property
+    def found(self) -> bool:
+        """True once ``(lo, hi]`` is narrow enough to fill densely."""
+        return self.hi is not None and self.hi - self.lo <= self.gap
+
+    def next_probe(self) -> int | None:
+        """Pick the next ID to probe, or None when the search is over."""
+        if self.hi is None:
+            if self.doublings >= GALLOP_MAX_DOUBLINGS:
+                self.exhausted = True
+                return None
+            n = self.floor + self.gap * 2**self.doublings
+        elif not self.found:
+            n = (self.lo + self.hi) // 2
+        else:
+            return None
+        self.probe = n
+        self.probes += 1
+        return n
+
+    def record(self, n: int, is_success: bool) -> None:
+        """Narrow the bracket with the outcome of probe *n*."""
+        self.probe = None
+        if is_success:
+            self.hi = n
+        else:
+            self.lo = n
+            if self.hi is None:
+                self.doublings += 1
+
 
 @dataclass
 class SpeculationState:
@@ -39,6 +128,19 @@ class SpeculationState:
         consecutive_failures: Consecutive non-success responses beyond highest_successful_id.
         current_ceiling: Highest ID currently seeded to the queue.
         stopped: True when max_gap consecutive failures reached or max_gap == 0.
+        window: Maximum speculative requests pending at once; None seeds
+            every planned ID immediately.
+        target_ceiling: Highest ID the seed plan and advance window have
+            committed to. IDs between ``current_ceiling`` and this are
+            enqueued as the window frees up.
+        pending: Seeded requests whose outcome has not been tracked yet.
+        seed_sources: Lazy iterators of IDs still to be enqueued, drained
+            front to back.
+        search: The active (or exhausted) frontier search, if any.
+        probed: IDs already requested by the search; top-ups skip them.
+        search_probes: Total probes issued by frontier searches.
+        probes_saved: Requests a dense linear scan would have spent
+            reaching the blocks the searches found, minus the probes.
     """
 
     func_name: str
@@ -49,6 +151,34 @@ class SpeculationState:
     consecutive_failures: int = 0
     current_ceiling: int = 0
     stopped: bool = False
+    window: int | None = None
+    target_ceiling: int = 0
+    pending: int = 0
+    seed_sources: deque[Iterator[int]] = field(
+        default_factory=deque, repr=False, compare=False
+    )
+    search: FrontierSearch | None = field(default=None, compare=False)
+    probed: set[int] = field(default_factory=set, repr=False, compare=False)
+    search_probes: int = 0
+    probes_saved: int = 0
+
+
+def search_strategy(template: Speculative) -> str:  # type: ignore[type-arg]
+    """Return the template's ``search_strategy``, defaulting to linear."""
+    return getattr(template, "search_strategy", SEARCH_LINEAR)
+
+
+def probe_mode(template: Speculative) -> str | None:  # type: ignore[type-arg]
+    """Return the template's ``probe`` mode, or None for full fetches."""
+    from kent.common.exceptions import ScraperConfigError
+
+    mode = getattr(template, "probe", None)
+    if mode is not None and mode not in PROBE_MODES:
+        raise ScraperConfigError(
+            f"unknown speculative probe mode {mode!r}; "
+            f"expected one of {sorted(PROBE_MODES)}"
+        )
+    return mode
 
 
 def find_speculative_param(scraper: BaseScraper, base_func_name: str) -> str:
@@ -64,12 +194,14 @@ def find_speculative_param(scraper: BaseScraper, base_func_name: str) -> str:
 
 def discover_speculate_functions(
     scraper: BaseScraper,
+    window: int | None = None,
 ) -> dict[str, SpeculationState]:
     """Build initial SpeculationState for every discovered template.
 
     Looks up templates from ``scraper._speculation_templates`` (populated
     by ``initial_seed()``). Each template at index *i* becomes a
-    ``SpeculationState`` keyed by ``{func_name}:{i}``.
+    ``SpeculationState`` keyed by ``{func_name}:{i}``, with the given
+    pending ``window``.
     """
     state: dict[str, SpeculationState] = {}
     templates = getattr(scraper, "_speculation_templates", {})
@@ -83,6 +215,7 @@ def discover_speculate_functions(
                 template=template,
                 param_index=i,
                 base_func_name=entry_info.name,
+                window=window,
             )
     return state
 
@@ -153,17 +286,24 @@ def build_speculative_request(
             f"{type(request).__name__}; prep wrappers cannot be used "
             f"with @speculate (no parent response/page exists)"
         )
-    return request.speculative(state_key, spec_state.param_index, n)
+    speculative = request.speculative(state_key, spec_state.param_index, n)
+    mode = probe_mode(spec_state.template)
+    if mode is not None and not speculative.archive:
+        return speculative.as_probe(mode)
+    return speculative
 
 
 def compute_seed_plan(
     spec_state: SpeculationState,
-) -> tuple[list[int], int, bool]:
+) -> tuple[Iterator[int], int, bool]:
     """Return (ids_to_seed, new_ceiling, stopped) for one state.
 
     Uses resume-aware semantics: when ``current_ceiling`` is 0 (fresh
     state) this reduces to plain seeding; when non-zero (persistent
-    resume), skips IDs at or below the ceiling.
+    resume), skips IDs at or below the ceiling. A state that is already
+    stopped only gets the rest of its ``seed_range()``, never a new
+    advance window. ``ids_to_seed`` is lazy, so large ranges cost nothing
+    until they are pulled.
     """
     template = spec_state.template
     seed_ids = template.seed_range()
@@ -173,16 +313,18 @@ def compute_seed_plan(
         if spec_state.current_ceiling > 0
         else seed_ids.start
     )
-    seed_ids_to_run = [n for n in seed_ids if n >= resume_floor]
+    seed_ids_to_run = (n for n in seed_ids if n >= resume_floor)
 
     advance_floor = max(seed_ids.start, seed_ids.stop, resume_floor)
     window = (
         range(advance_floor, advance_floor + template.max_gap())
-        if template.should_advance and template.max_gap() > 0
+        if template.should_advance
+        and template.max_gap() > 0
+        and not spec_state.stopped
         else range(0)
     )
 
-    ids = seed_ids_to_run + list(window)
+    ids = itertools.chain(seed_ids_to_run, window)
 
     if window:
         new_ceiling = advance_floor + template.max_gap() - 1
@@ -194,15 +336,165 @@ def compute_seed_plan(
     return ids, new_ceiling, stopped
 
 
+def iter_top_up(spec_state: SpeculationState) -> Iterator[int]:
+    """Yield the next IDs to enqueue without exceeding the pending window.
+
+    Bookkeeping runs as each ID is consumed: ``current_ceiling`` tracks
+    the highest ID handed out (so ``save_speculation_state`` records a
+    resumable cursor) and ``pending`` counts it against the window. Once
+    every source is drained the ceiling catches up to ``target_ceiling``.
+    """
+    while spec_state.seed_sources:
+        if (
+            spec_state.window is not None
+            and spec_state.pending >= spec_state.window
+        ):
+            return
+        n = next(spec_state.seed_sources[0], None)
+        if n is None:
+            spec_state.seed_sources.popleft()
+            continue
+        if n in spec_state.probed:
+            spec_state.probed.discard(n)
+            continue
+        yield n
+        spec_state.current_ceiling = max(spec_state.current_ceiling, n)
+        spec_state.pending += 1
+    spec_state.current_ceiling = max(
+        spec_state.current_ceiling, spec_state.target_ceiling
+    )
+
+
+def plan_extension(spec_state: SpeculationState) -> bool:
+    """Queue another ``max_gap()`` IDs if successes approach the target.
+
+    Returns True when the plan grew. Callers top up afterwards.
+    """
+    gap = spec_state.template.max_gap()
+    if gap == 0:
+        return False
+
+    if spec_state.consecutive_failures >= gap:
+        spec_state.stopped = True
+        return False
+
+    ceiling = max(spec_state.target_ceiling, spec_state.current_ceiling)
+    if spec_state.highest_successful_id < ceiling - gap:
+        return False
+    spec_state.seed_sources.append(iter(range(ceiling + 1, ceiling + gap + 1)))
+    spec_state.target_ceiling = ceiling + gap
+    return True
+
+
+def record_outcome(
+    spec_state: SpeculationState, speculative_id: int, is_success: bool
+) -> None:
+    """Update success/failure counters for one tracked speculative ID."""
+    spec_state.pending = max(0, spec_state.pending - 1)
+    if is_success:
+        if speculative_id > spec_state.highest_successful_id:
+            spec_state.highest_successful_id = speculative_id
+        spec_state.consecutive_failures = 0
+    elif speculative_id > spec_state.highest_successful_id:
+        spec_state.consecutive_failures += 1
+        gap = spec_state.template.max_gap()
+        if spec_state.consecutive_failures >= gap:
+            spec_state.stopped = True
+
+
+def start_search(spec_state: SpeculationState) -> int | None:
+    """Open a frontier search for a stopped galloping state.
+
+    Returns the first probe ID, or None if the template is linear, frozen,
+    or a search is already under way (or exhausted) for this state.
+    """
+    template = spec_state.template
+    gap = template.max_gap()
+    if (
+        spec_state.search is not None
+        or search_strategy(template) != SEARCH_GALLOP
+        or not template.should_advance
+        or gap == 0
+    ):
+        return None
+    floor = max(spec_state.target_ceiling, spec_state.current_ceiling)
+    spec_state.search = FrontierSearch(floor=floor, gap=gap)
+    return _next_search_probe(spec_state)
+
+
+def _next_search_probe(spec_state: SpeculationState) -> int | None:
+    assert spec_state.search is not None
+    n = spec_state.search.next_probe()
+    if n is not None:
+        spec_state.probed.add(n)
+        spec_state.search_probes += 1
+    return n
+
+
+def advance_search(
+    spec_state: SpeculationState, n: int, is_success: bool
+) -> int | None:
+    """Feed a probe outcome to the search; return the next probe ID.
+
+    When the bracket is narrow enough, schedules a dense fill of
+    ``(lo, hi)``, resumes linear speculation past ``hi`` and clears the
+    search. An exhausted search stays on the state so it is not restarted
+    until the next run.
+    """
+    search = spec_state.search
+    assert search is not None
+    search.record(n, is_success)
+    if not search.found:
+        return _next_search_probe(spec_state)
+
+    assert search.hi is not None
+    spec_state.probes_saved += max(
+        0, (search.lo - search.floor) - search.probes
+    )
+    logger.info(
+        "%s: frontier search found IDs at %d after %d probes",
+        spec_state.func_name,
+        search.hi,
+        search.probes,
+    )
+    spec_state.seed_sources.append(iter(range(search.lo + 1, search.hi)))
+    spec_state.target_ceiling = max(spec_state.target_ceiling, search.hi)
+    spec_state.highest_successful_id = max(
+        spec_state.highest_successful_id, search.hi
+    )
+    spec_state.consecutive_failures = 0
+    spec_state.stopped = False
+    spec_state.search = None
+    plan_extension(spec_state)
+    return None
+
+
+def is_search_probe(spec_state: SpeculationState, n: int) -> bool:
+    """True if *n* is the outstanding probe of the state's search."""
+    return spec_state.search is not None and spec_state.search.probe == n
+
+
 class _SpeculationBase:
     """Shared attributes contract for both sync and async mixins."""
 
     scraper: BaseScraper
     seed_params: list[dict[str, dict[str, Any]]] | None
     _speculation_state: dict[str, SpeculationState]
+    speculation_window: int | None = None
 
     def _discover_speculate_functions(self) -> dict[str, SpeculationState]:
-        return discover_speculate_functions(self.scraper)
+        return discover_speculate_functions(
+            self.scraper, self.speculation_window
+        )
+
+    def _is_speculation_success(self, response: Response) -> bool:
+        is_success = 200 <= response.status_code < 300
+        if response.request.probe is not None:
+            # Probes carry no body for fails_successfully() to inspect.
+            return is_success
+        if is_success and not self.scraper.fails_successfully(response):
+            is_success = False
+        return is_success
 
     def _get_entry_requests(self) -> Generator[Request, None, None]:
         yield from get_entry_requests(self.scraper, self.seed_params)
@@ -216,41 +508,70 @@ class SyncSpeculationSupport(_SpeculationBase):
 
     def _seed_speculative_queue(self) -> None:
         for state_key, spec_state in self._speculation_state.items():
-            if spec_state.stopped:
-                continue
             ids, new_ceiling, stopped = compute_seed_plan(spec_state)
-            for n in ids:
-                request = build_speculative_request(
-                    self.scraper, spec_state, state_key, n
-                )
-                self._enqueue_speculative(request)
-            spec_state.current_ceiling = new_ceiling
+            spec_state.seed_sources.append(ids)
+            spec_state.target_ceiling = new_ceiling
             spec_state.stopped = stopped
+            self._top_up_speculation(state_key)
+            if (
+                spec_state.stopped
+                and spec_state.consecutive_failures
+                >= spec_state.template.max_gap()
+            ):
+                # A resumed galloping state re-probes past its ceiling.
+                self._issue_probe(state_key, start_search(spec_state))
+
+    def _issue_probe(self, state_key: str, n: int | None) -> None:
+        if n is None:
+            return
+        spec_state = self._speculation_state[state_key]
+        request = build_speculative_request(
+            self.scraper, spec_state, state_key, n
+        )
+        self._enqueue_speculative(request)
+
+    def _top_up_speculation(self, state_key: str) -> int:
+        """Enqueue IDs until the state's pending window is full."""
+        spec_state = self._speculation_state.get(state_key)
+        if spec_state is None:
+            return 0
+        count = 0
+        for n in iter_top_up(spec_state):
+            request = build_speculative_request(
+                self.scraper, spec_state, state_key, n
+            )
+            self._enqueue_speculative(request)
+            count += 1
+        return count
+
+    def _refill_speculation(self) -> bool:
+        """Top up every state once the queue has drained.
+
+        Outcomes that never reach tracking (a skipped transient error, a
+        cancelled request) leave their window slot taken; with nothing
+        left in flight every slot is free again. Returns True if anything
+        was enqueued.
+        """
+        enqueued = 0
+        for state_key, spec_state in self._speculation_state.items():
+            search = spec_state.search
+            if search is not None and search.probe is not None:
+                # The probe's outcome was lost; count it as a miss.
+                n = advance_search(spec_state, search.probe, False)
+                if n is not None:
+                    self._issue_probe(state_key, n)
+                    enqueued += 1
+            if spec_state.seed_sources:
+                spec_state.pending = 0
+                enqueued += self._top_up_speculation(state_key)
+        return enqueued > 0
 
     def _extend_speculation(self, state_key: str) -> None:
         spec_state = self._speculation_state.get(state_key)
         if spec_state is None or spec_state.stopped:
             return
-
-        gap = spec_state.template.max_gap()
-        if gap == 0:
-            return
-
-        if spec_state.consecutive_failures >= gap:
-            spec_state.stopped = True
-            return
-
-        if (
-            spec_state.highest_successful_id
-            >= spec_state.current_ceiling - gap
-        ):
-            new_ceiling = spec_state.current_ceiling + gap
-            for n in range(spec_state.current_ceiling + 1, new_ceiling + 1):
-                request = build_speculative_request(
-                    self.scraper, spec_state, state_key, n
-                )
-                self._enqueue_speculative(request)
-            spec_state.current_ceiling = new_ceiling
+        if plan_extension(spec_state):
+            self._top_up_speculation(state_key)
 
     def _track_speculation_outcome(
         self, request: BaseRequest, response: Response
@@ -263,21 +584,21 @@ class SyncSpeculationSupport(_SpeculationBase):
         if spec_state is None:
             return
 
-        is_success = 200 <= response.status_code < 300
-        if is_success and not self.scraper.fails_successfully(response):
-            is_success = False
-
-        if is_success:
-            if speculative_id > spec_state.highest_successful_id:
-                spec_state.highest_successful_id = speculative_id
-            spec_state.consecutive_failures = 0
-            self._extend_speculation(state_key)
+        is_success = self._is_speculation_success(response)
+        if is_success and isinstance(request, Request) and request.probe:
+            self._enqueue_speculative(request.probe_target())
+        if is_search_probe(spec_state, speculative_id):
+            self._issue_probe(
+                state_key,
+                advance_search(spec_state, speculative_id, is_success),
+            )
         else:
-            if speculative_id > spec_state.highest_successful_id:
-                spec_state.consecutive_failures += 1
-                gap = spec_state.template.max_gap()
-                if spec_state.consecutive_failures >= gap:
-                    spec_state.stopped = True
+            record_outcome(spec_state, speculative_id, is_success)
+            if is_success:
+                self._extend_speculation(state_key)
+            elif spec_state.stopped:
+                self._issue_probe(state_key, start_search(spec_state))
+        self._top_up_speculation(state_key)
 
 
 class AsyncSpeculationSupport(_SpeculationBase):
@@ -294,46 +615,78 @@ class AsyncSpeculationSupport(_SpeculationBase):
         raise NotImplementedError
 
     async def _after_outcome(self, spec_state: SpeculationState) -> None:
-        """Hook run inside the speculation lock after outcome updates."""
+        """Hook run after seeding, a top-up, or an outcome update."""
         return None
 
     async def _seed_speculative_queue(self) -> None:
         for state_key, spec_state in self._speculation_state.items():
-            if spec_state.stopped:
-                continue
             ids, new_ceiling, stopped = compute_seed_plan(spec_state)
-            for n in ids:
-                request = build_speculative_request(
-                    self.scraper, spec_state, state_key, n
-                )
-                await self._enqueue_speculative(request)
-            spec_state.current_ceiling = new_ceiling
+            spec_state.seed_sources.append(ids)
+            spec_state.target_ceiling = new_ceiling
             spec_state.stopped = stopped
+            await self._top_up_speculation(state_key)
+            if (
+                spec_state.stopped
+                and spec_state.consecutive_failures
+                >= spec_state.template.max_gap()
+            ):
+                # A resumed galloping state re-probes past its ceiling.
+                await self._issue_probe(state_key, start_search(spec_state))
+            await self._after_outcome(spec_state)
 
-    async def _extend_speculation(self, state_key: str) -> None:
-        spec_state = self._speculation_state.get(state_key)
-        if spec_state is None or spec_state.stopped:
+    async def _issue_probe(self, state_key: str, n: int | None) -> None:
+        if n is None:
             return
+        spec_state = self._speculation_state[state_key]
+        request = build_speculative_request(
+            self.scraper, spec_state, state_key, n
+        )
+        await self._enqueue_speculative(request)
 
-        gap = spec_state.template.max_gap()
-        if gap == 0:
-            return
+    async def _top_up_speculation(self, state_key: str) -> int:
+        """Enqueue IDs until the state's pending window is full."""
+        spec_state = self._speculation_state.get(state_key)
+        if spec_state is None:
+            return 0
+        count = 0
+        for n in iter_top_up(spec_state):
+            request = build_speculative_request(
+                self.scraper, spec_state, state_key, n
+            )
+            await self._enqueue_speculative(request)
+            count += 1
+        return count
 
-        if spec_state.consecutive_failures >= gap:
-            spec_state.stopped = True
-            return
+    async def _refill_speculation(self) -> bool:
+        """Top up every state once the queue has drained.
 
-        if (
-            spec_state.highest_successful_id
-            >= spec_state.current_ceiling - gap
-        ):
-            new_ceiling = spec_state.current_ceiling + gap
-            for n in range(spec_state.current_ceiling + 1, new_ceiling + 1):
-                request = build_speculative_request(
-                    self.scraper, spec_state, state_key, n
-                )
-                await self._enqueue_speculative(request)
-            spec_state.current_ceiling = new_ceiling
+        See :meth:`SyncSpeculationSupport._refill_speculation`.
+        """
+        enqueued = 0
+        async with self._speculation_lock:
+            for state_key, spec_state in self._speculation_state.items():
+                added = 0
+                search = spec_state.search
+                if search is not None and search.probe is not None:
+                    # The probe's outcome was lost; count it as a miss.
+                    n = advance_search(spec_state, search.probe, False)
+                    if n is not None:
+                        await self._issue_probe(state_key, n)
+                        added += 1
+                if spec_state.seed_sources:
+                    spec_state.pending = 0
+                    added += await self._top_up_speculation(state_key)
+                if added:
+                    enqueued += added
+                    await self._after_outcome(spec_state)
+        return enqueued > 0
+
+    async def _extend_speculation(self, state_key: str) -> None:
+        spec_state = self._speculation_state.get(state_key)
+        if spec_state is None or spec_state.stopped:
+            return
+        if plan_extension(spec_state):
+            await self._top_up_speculation(state_key)
 
     async def _track_speculation_outcome(
         self, request: BaseRequest, response: Response
@@ -346,21 +699,24 @@ class AsyncSpeculationSupport(_SpeculationBase):
         if spec_state is None:
             return
 
-        is_success = 200 <= response.status_code < 300
-        if is_success and not self.scraper.fails_successfully(response):
-            is_success = False
+        is_success = self._is_speculation_success(response)
+        if is_success and isinstance(request, Request) and request.probe:
+            await self._enqueue_speculative(request.probe_target())
 
         async with self._speculation_lock:
-            if is_success:
-                if speculative_id > spec_state.highest_successful_id:
-                    spec_state.highest_successful_id = speculative_id
-                spec_state.consecutive_failures = 0
-                await self._extend_speculation(state_key)
+            if is_search_probe(spec_state, speculative_id):
+                await self._issue_probe(
+                    state_key,
+                    advance_search(spec_state, speculative_id, is_success),
+                )
             else:
-                if speculative_id > spec_state.highest_successful_id:
-                    spec_state.consecutive_failures += 1
-                    gap = spec_state.template.max_gap()
-                    if spec_state.consecutive_failures >= gap:
-                        spec_state.stopped = True
+                record_outcome(spec_state, speculative_id, is_success)
+                if is_success:
+                    await self._extend_speculation(state_key)
+                elif spec_state.stopped:
+                    await self._issue_probe(
+                        state_key, start_search(spec_state)
+                    )
+            await self._top_up_speculation(state_key)
 
             await self._after_outcome(spec_state)
@@ -6,7 +6,12 @@ implementations for different archive strategies:
 - NoDownloads: skip all downloads (replaces skip_archive=True)
 - Local: save files to a local directory (replaces default_archive_callback)
 - LocalStreaming: like Local, but writes incoming chunks straight to disk
-  without buffering the full file in memory.
+  without buffering the full file in memory. Hashing and writing run on a
+  dedicated writer thread per download, fed through a bounded queue.
+
+The Local handlers accept an optional
+:class:`~kent.driver.archive_store.ArchiveStore`, which shares archived
+files between runs and answers ``should_download`` from memory.
 """
 
 from __future__ import annotations
@@ -15,17 +20,35 @@ import asyncio
 import hashlib
 import logging
 import os
+import queue
 import tempfile
+import threading
 import time
 from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 from urllib.parse import urlparse
 
 from kent.data_types import ArchiveDecision
 
+if TYPE_CHECKING:
+    from kent.driver.archive_store import ArchiveStore
+
 logger = logging.getLogger(__name__)
 
+# Streamed chunks are coalesced into batches of about this many bytes
+# before being handed to the writer thread.
+STREAM_COALESCE_BYTES = 1024 * 1024
+
+# Maximum number of coalesced batches waiting for the writer thread.
+# Bounds the memory held per download to roughly
+# ``STREAM_COALESCE_BYTES * (STREAM_MAX_PENDING + 1)``.
+STREAM_MAX_PENDING = 8
+
+# Ranged archive downloads use one segment per this many bytes, up to the
+# handler's ``range_segments``.
+RANGE_MIN_SEGMENT_BYTES = 16 * 1024 * 1024
+
 
 def _dedup_dir(storage_dir: Path, deduplication_key: str) -> Path:
     """Return the nested storage subdirectory for a deduplication key.
@@ -119,13 +142,17 @@ def _filename_from_url(url: str, expected_type: str | None) -> str:
 
 
 def _existing_dedup_file(dedup_dir: Path) -> Path | None:
-    """Return the first file in ``dedup_dir`` if it exists and is non-empty."""
+    """Return the first file in ``dedup_dir`` if it exists and is non-empty.
+
+    Dot-prefixed names are in-progress downloads (``.stream-*.tmp``,
+    ``.ranged-*.part``) and are ignored.
+    """
     if not dedup_dir.is_dir():
         return None
-    try:
-        return next(iter(dedup_dir.iterdir()))
-    except StopIteration:
-        return None
+    return next(
+        (p for p in dedup_dir.iterdir() if not p.name.startswith(".")),
+        None,
+    )
 
 
 def _write_local_file(
@@ -145,12 +172,184 @@ def _write_local_file(
     return file_path
 
 
+def link_from_store(
+    store: ArchiveStore,
+    target_dir: Path,
+    deduplication_key: str,
+) -> ArchiveDecision:
+    """Decide from ``store`` whether ``deduplication_key`` needs a download.
+
+    On a hit the stored file is linked into ``target_dir``. Misses never
+    touch the filesystem. Shared by the handlers here and by custom
+    handlers that take a ``store``.
+    """
+    entry = store.lookup(deduplication_key)
+    if entry is not None:
+        location = store.link_into(
+            deduplication_key, entry, target_dir / entry.name
+        )
+        if location is not None:
+            return ArchiveDecision(download=False, file_url=str(location))
+    return ArchiveDecision(download=True)
+
+
+async def alink_from_store(
+    store: ArchiveStore,
+    target_dir: Path,
+    deduplication_key: str,
+) -> ArchiveDecision:
+    """Async :func:`link_from_store`; only a hit leaves the event loop."""
+    if store.lookup(deduplication_key) is None:
+        return ArchiveDecision(download=True)
+    return await asyncio.to_thread(
+        link_from_store, store, target_dir, deduplication_key
+    )
+
+
+def _write_and_store(
+    storage_dir: Path,
+    deduplication_key: str | None,
+    filename: str,
+    content: bytes,
+    store: ArchiveStore | None,
+) -> Path:
+    """:func:`_write_local_file`, then add the file to ``store``."""
+    file_path = _write_local_file(
+        storage_dir, deduplication_key, filename, content
+    )
+    if store is not None and deduplication_key:
+        store.add(
+            deduplication_key,
+            file_path,
+            hashlib.sha256(content).hexdigest(),
+        )
+    return file_path
+
+
 def _hash_and_write(sha: Any, tmp: Any, chunk: bytes) -> None:
     """Update a running hash and write ``chunk`` in a single thread dispatch."""
     sha.update(chunk)
     tmp.write(chunk)
 
 
+class _StreamingSink:
+    """Hash and write one streamed download on a dedicated writer thread.
+
+    Chunks passed to :meth:`write` (or :meth:`awrite`) are coalesced into
+    batches of at least ``coalesce_bytes`` and handed through a queue
+    bounded at ``max_pending`` batches to a single writer thread, which
+    updates the SHA-256 and writes each batch with one ``write`` call.
+    A full queue blocks the producer, so a slow disk applies backpressure
+    to the download instead of buffering it in memory.
+
+    Errors raised by the writer thread are re-raised to the producer on
+    the next :meth:`write` or in :meth:`close`. The writer keeps draining
+    the queue after an error so a producer never blocks forever.
+    """
+
+    def __init__(
+        self, target_dir: Path, coalesce_bytes: int, max_pending: int
+    ) -> None:
+        self._tmp = tempfile.NamedTemporaryFile(  # noqa: SIM115 (rename-then-close)
+            dir=target_dir, delete=False, prefix=".stream-", suffix=".tmp"
+        )
+        self.name = self._tmp.name
+        self.writes = 0
+        self._sha = hashlib.sha256()
+        self._coalesce_bytes = coalesce_bytes
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._queue: queue.Queue[bytes | None] = queue.Queue(
+            maxsize=max_pending
+        )
+        self._error: BaseException | None = None
+        self._aborted = False
+        self._thread = threading.Thread(
+            target=self._run, name="stream-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while (batch := self._queue.get()) is not None:
+                if self._error is not None or self._aborted:
+                    continue
+                try:
+                    _hash_and_write(self._sha, self._tmp, batch)
+                    self.writes += 1
+                except BaseException as exc:
+                    self._error = exc
+        finally:
+            try:
+                self._tmp.close()
+            except BaseException as exc:
+                if self._error is None:
+                    self._error = exc
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _take(self, chunk: bytes) -> bytes | None:
+        """Buffer ``chunk`` and return a batch once enough has piled up."""
+        self._pending.append(chunk)
+        self._pending_bytes += len(chunk)
+        if self._pending_bytes < self._coalesce_bytes:
+            return None
+        return self._drain_pending()
+
+    def _drain_pending(self) -> bytes | None:
+        if not self._pending:
+            return None
+        pending = self._pending
+        self._pending = []
+        self._pending_bytes = 0
+        return pending[0] if len(pending) == 1 else b"".join(pending)
+
+    def write(self, chunk: bytes) -> None:
+        """Queue ``chunk``, blocking while the writer is ``max_pending`` behind."""
+        self._raise_if_failed()
+        batch = self._take(chunk)
+        if batch is not None:
+            self._queue.put(batch)
+
+    async def awrite(self, chunk: bytes) -> None:
+        """Async :meth:`write` that only leaves the loop when the queue is full."""
+        self._raise_if_failed()
+        batch = self._take(chunk)
+        if batch is None:
+            return
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, batch)
+
+    def close(self) -> str:
+        """Flush pending bytes, wait for the writer, and return the SHA-256."""
+        batch = self._drain_pending()
+        if batch is not None:
+            self._queue.put(batch)
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_if_failed()
+        return self._sha.hexdigest()
+
+    def abort(self) -> None:
+        """Stop the writer without writing queued batches and remove the file.
+
+        Synchronous so it stays safe under cancellation; the writer only
+        discards what is left, so the join is at most one batch write.
+        """
+        self._aborted = True
+        self._pending = []
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            os.unlink(self.name)
+        except OSError:
+            pass
+
+
 class NoDownloadsSyncArchiveHandler:
     """Always skips downloads. Replaces skip_archive=True for SyncDriver."""
 
@@ -198,10 +397,17 @@ class NoDownloadsAsyncArchiveHandler:
 
 
 class LocalSyncArchiveHandler:
-    """Saves files to a local directory. Replaces default_archive_callback."""
+    """Saves files to a local directory. Replaces default_archive_callback.
+
+    With a ``store``, keyed files are also added to it, and keys it
+    already holds are linked into ``storage_dir`` instead of downloaded.
+    """
 
-    def __init__(self, storage_dir: Path) -> None:
+    def __init__(
+        self, storage_dir: Path, *, store: ArchiveStore | None = None
+    ) -> None:
         self.storage_dir = storage_dir
+        self.store = store
 
     def should_download(
         self,
@@ -212,6 +418,10 @@ class LocalSyncArchiveHandler:
     ) -> ArchiveDecision:
         if deduplication_key:
             dedup_dir = _dedup_dir(self.storage_dir, deduplication_key)
+            if self.store is not None:
+                return link_from_store(
+                    self.store, dedup_dir, deduplication_key
+                )
             existing = _existing_dedup_file(dedup_dir)
             if existing is not None:
                 return ArchiveDecision(download=False, file_url=str(existing))
@@ -226,17 +436,24 @@ class LocalSyncArchiveHandler:
         content: bytes,
     ) -> str:
         filename = _filename_from_url(url, expected_type)
-        file_path = _write_local_file(
-            self.storage_dir, deduplication_key, filename, content
+        file_path = _write_and_store(
+            self.storage_dir, deduplication_key, filename, content, self.store
         )
         return str(file_path)
 
 
 class LocalAsyncArchiveHandler:
-    """Saves files to a local directory. Async variant for AsyncDriver."""
+    """Saves files to a local directory. Async variant for AsyncDriver.
+
+    With a ``store``, ``should_download`` is answered from the store's
+    in-memory index, so a miss costs no filesystem calls.
+    """
 
-    def __init__(self, storage_dir: Path) -> None:
+    def __init__(
+        self, storage_dir: Path, *, store: ArchiveStore | None = None
+    ) -> None:
         self.storage_dir = storage_dir
+        self.store = store
 
     async def should_download(
         self,
@@ -247,6 +464,10 @@ class LocalAsyncArchiveHandler:
     ) -> ArchiveDecision:
         if deduplication_key:
             dedup_dir = _dedup_dir(self.storage_dir, deduplication_key)
+            if self.store is not None:
+                return await alink_from_store(
+                    self.store, dedup_dir, deduplication_key
+                )
             existing = await asyncio.to_thread(_existing_dedup_file, dedup_dir)
             if existing is not None:
                 return ArchiveDecision(download=False, file_url=str(existing))
@@ -262,11 +483,12 @@ class LocalAsyncArchiveHandler:
     ) -> str:
         filename = _filename_from_url(url, expected_type)
         file_path = await asyncio.to_thread(
-            _write_local_file,
+            _write_and_store,
             self.storage_dir,
             deduplication_key,
             filename,
             content,
+            self.store,
         )
         return str(file_path)
 
@@ -327,10 +549,27 @@ class LocalSyncStreamingArchiveHandler:
     ``{storage_dir}/{xx}/{yy}/{deduplication_key}/{sha256}.{expected_type}``.
     Bytes stream into a temp file alongside the final destination so the
     rename is atomic once the full SHA-256 is known.
+
+    Hashing and writing happen on one writer thread per download. Chunks
+    are coalesced into writes of about ``coalesce_bytes`` and at most
+    ``max_pending`` batches wait for the writer before the download
+    blocks.
+
+    ``store`` works as for :class:`LocalSyncArchiveHandler`.
     """
 
-    def __init__(self, storage_dir: Path) -> None:
+    def __init__(
+        self,
+        storage_dir: Path,
+        *,
+        coalesce_bytes: int = STREAM_COALESCE_BYTES,
+        max_pending: int = STREAM_MAX_PENDING,
+        store: ArchiveStore | None = None,
+    ) -> None:
         self.storage_dir = storage_dir
+        self.coalesce_bytes = coalesce_bytes
+        self.max_pending = max_pending
+        self.store = store
 
     def should_download(
         self,
@@ -341,6 +580,10 @@ class LocalSyncStreamingArchiveHandler:
     ) -> ArchiveDecision:
         if deduplication_key:
             dedup_dir = _dedup_dir(self.storage_dir, deduplication_key)
+            if self.store is not None:
+                return link_from_store(
+                    self.store, dedup_dir, deduplication_key
+                )
             existing = _existing_dedup_file(dedup_dir)
             if existing is not None:
                 return ArchiveDecision(download=False, file_url=str(existing))
@@ -361,30 +604,27 @@ class LocalSyncStreamingArchiveHandler:
         )
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        sha = hashlib.sha256()
-        tmp = tempfile.NamedTemporaryFile(  # noqa: SIM115 (rename-then-close)
-            dir=target_dir, delete=False, prefix=".stream-", suffix=".tmp"
+        sink = _StreamingSink(
+            target_dir, self.coalesce_bytes, self.max_pending
         )
         try:
-            with tmp as f:
-                for chunk in chunks:
-                    sha.update(chunk)
-                    f.write(chunk)
+            for chunk in chunks:
+                sink.write(chunk)
+            sha_hex = sink.close()
             final_path = _streaming_target_path(
                 self.storage_dir,
                 deduplication_key,
-                sha.hexdigest(),
+                sha_hex,
                 expected_type,
             )
-            os.replace(tmp.name, final_path)
+            os.replace(sink.name, final_path)
         except BaseException:
             # Best-effort cleanup on any error so we don't leave .tmp
             # files behind.
-            try:
-                os.unlink(tmp.name)
-            except OSError:
-                pass
+            sink.abort()
             raise
+        if self.store is not None and deduplication_key:
+            self.store.add(deduplication_key, final_path, sha_hex)
         return str(final_path)
 
 
@@ -393,10 +633,38 @@ class LocalAsyncStreamingArchiveHandler:
 
     Same content-addressed filename scheme:
     ``{storage_dir}/{xx}/{yy}/{deduplication_key}/{sha256}.{expected_type}``.
+    Chunks are handed to the per-download writer thread without a
+    thread-pool dispatch; the event loop only waits on the executor when
+    ``max_pending`` batches are already queued.
+
+    Setting ``range_segments`` opts in to ranged downloads: when the
+    server advertises ``Accept-Ranges: bytes``, the driver fetches the
+    file as up to ``range_segments`` concurrent ``Range`` requests (one
+    per ``range_min_segment_bytes``) into :meth:`partial_path` and hands
+    the finished file to :meth:`save_file`. Interrupted downloads resume
+    from the last recorded offset.
+
+    ``store`` works as for :class:`LocalAsyncArchiveHandler`.
     """
 
-    def __init__(self, storage_dir: Path) -> None:
+    def __init__(
+        self,
+        storage_dir: Path,
+        *,
+        coalesce_bytes: int = STREAM_COALESCE_BYTES,
+        max_pending: int = STREAM_MAX_PENDING,
+        range_segments: int | None = None,
+        range_min_segment_bytes: int = RANGE_MIN_SEGMENT_BYTES,
+        store: ArchiveStore | None = None,
+    ) -> None:
+        if range_segments is not None and range_segments < 1:
+            raise ValueError("range_segments must be at least 1")
         self.storage_dir = storage_dir
+        self.coalesce_bytes = coalesce_bytes
+        self.max_pending = max_pending
+        self.range_segments = range_segments
+        self.range_min_segment_bytes = range_min_segment_bytes
+        self.store = store
 
     async def should_download(
         self,
@@ -407,6 +675,10 @@ class LocalAsyncStreamingArchiveHandler:
     ) -> ArchiveDecision:
         if deduplication_key:
             dedup_dir = _dedup_dir(self.storage_dir, deduplication_key)
+            if self.store is not None:
+                return await alink_from_store(
+                    self.store, dedup_dir, deduplication_key
+                )
             existing = await asyncio.to_thread(_existing_dedup_file, dedup_dir)
             if existing is not None:
                 return ArchiveDecision(download=False, file_url=str(existing))
@@ -427,13 +699,8 @@ class LocalAsyncStreamingArchiveHandler:
         )
         await asyncio.to_thread(target_dir.mkdir, parents=True, exist_ok=True)
 
-        sha = hashlib.sha256()
-        tmp = await asyncio.to_thread(
-            tempfile.NamedTemporaryFile,  # noqa: SIM115 (rename-then-close)
-            dir=target_dir,
-            delete=False,
-            prefix=".stream-",
-            suffix=".tmp",
+        sink = await asyncio.to_thread(
+            _StreamingSink, target_dir, self.coalesce_bytes, self.max_pending
         )
         logger.info(
             "save_stream: starting url=%s dedup_key=%s",
@@ -446,49 +713,91 @@ class LocalAsyncStreamingArchiveHandler:
         last_log = start
         last_chunk = start
         try:
-            try:
-                async for chunk in chunks:
-                    now = time.monotonic()
-                    gap = now - last_chunk
-                    bytes_total += len(chunk)
-                    chunk_count += 1
-                    last_chunk = now
-                    if now - last_log >= 30.0:
-                        logger.info(
-                            "save_stream: in flight url=%s elapsed=%.1fs "
-                            "chunks=%d bytes=%d last_gap=%.2fs",
-                            url,
-                            now - start,
-                            chunk_count,
-                            bytes_total,
-                            gap,
-                        )
-                        last_log = now
-                    await asyncio.to_thread(_hash_and_write, sha, tmp, chunk)
-            finally:
-                await asyncio.to_thread(tmp.close)
+            async for chunk in chunks:
+                now = time.monotonic()
+                gap = now - last_chunk
+                bytes_total += len(chunk)
+                chunk_count += 1
+                last_chunk = now
+                if now - last_log >= 30.0:
+                    logger.info(
+                        "save_stream: in flight url=%s elapsed=%.1fs "
+                        "chunks=%d bytes=%d last_gap=%.2fs",
+                        url,
+                        now - start,
+                        chunk_count,
+                        bytes_total,
+                        gap,
+                    )
+                    last_log = now
+                await sink.awrite(chunk)
+            sha_hex = await asyncio.to_thread(sink.close)
             logger.info(
                 "save_stream: chunks done url=%s elapsed=%.1fs chunks=%d "
-                "bytes=%d",
+                "bytes=%d writes=%d",
                 url,
                 time.monotonic() - start,
                 chunk_count,
                 bytes_total,
+                sink.writes,
             )
             final_path = await asyncio.to_thread(
                 _streaming_target_path,
                 self.storage_dir,
                 deduplication_key,
-                sha.hexdigest(),
+                sha_hex,
                 expected_type,
             )
-            await asyncio.to_thread(os.replace, tmp.name, final_path)
+            await asyncio.to_thread(os.replace, sink.name, final_path)
         except BaseException:
-            # Best-effort cleanup — use sync os.unlink so this stays safe
+            # Best-effort cleanup — abort synchronously so this stays safe
             # under cancellation (an await here could itself be cancelled).
-            try:
-                os.unlink(tmp.name)
-            except OSError:
-                pass
+            sink.abort()
             raise
+        await self._add_to_store(deduplication_key, final_path, sha_hex)
         return str(final_path)
+
+    def partial_path(self, url: str, deduplication_key: str | None) -> Path:
+        """Return the temp file a ranged download of ``url`` is written to.
+
+        The name only depends on the URL, so a retry finds the bytes an
+        earlier attempt left behind. The parent directory is created as a
+        side effect.
+        """
+        target_dir = (
+            _dedup_dir(self.storage_dir, deduplication_key)
+            if deduplication_key
+            else self.storage_dir
+        )
+        target_dir.mkdir(parents=True, exist_ok=True)
+        name = hashlib.sha256(url.encode()).hexdigest()[:32]
+        return target_dir / f".ranged-{name}.part"
+
+    async def save_file(
+        self,
+        url: str,
+        deduplication_key: str | None,
+        expected_type: str | None,
+        hash_header_value: str | None,
+        path: str,
+        sha_hex: str,
+    ) -> str:
+        """Move a completed ranged download to its content-addressed path."""
+        final_path = await asyncio.to_thread(
+            _streaming_target_path,
+            self.storage_dir,
+            deduplication_key,
+            sha_hex,
+            expected_type,
+        )
+        await asyncio.to_thread(os.replace, path, final_path)
+        await self._add_to_store(deduplication_key, final_path, sha_hex)
+        return str(final_path)
+
+    async def _add_to_store(
+        self, deduplication_key: str | None, path: Path, sha_hex: str
+    ) -> None:
+        if self.store is not None and deduplication_key:
+            await asyncio.to_thread(
+                self.store.add, deduplication_key, path, sha_hex
+            )
@@ -0,0 +1,311 @@
+"""Content-addressed archive store shared across runs.
+
+Each run archives into its own storage directory, so without help the same
+file is downloaded again by every run. :class:`ArchiveStore` keeps one copy
+of every archived file under a shared root, addressed by its SHA-256, and
+remembers which deduplication key produced it:
+
+    {root}/objects/{xx}/{yy}/{sha256}
+    {root}/index.tsv
+
+The index is an append-only, tab-separated log read into memory once when
+the store is opened, so the presence check made by ``should_download`` is
+a dict lookup rather than a directory listing. Two record kinds are
+written:
+
+- ``P  sha  size  name  key`` -- ``key`` now refers to blob ``sha``;
+  ``name`` is the filename the handler gave the file in its run.
+- ``H  sha  size  key`` -- a lookup for ``key`` was served from the store
+  instead of downloading ``size`` bytes.
+
+When a key is found, the blob is hardlinked into the requesting run's
+storage directory. If the two directories are on different filesystems
+(or the filesystem has no hardlinks) the blob path itself is returned as
+the file's location. Files added to the store are likewise linked, not
+copied, unless a link is impossible.
+
+Entries added by another process after this store was opened are not seen
+until :meth:`ArchiveStore.refresh`; a miss only costs a download, and the
+duplicate blob is folded into the existing one when it is added.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.tsv"
+
+
+@dataclass(frozen=True)
+class StoreEntry:
+    """What the store knows about one deduplication key.
+
+    Attributes:
+        sha256: Hex digest of the file contents; names the blob.
+        size: File size in bytes.
+        name: Filename the file was archived under in its run.
+    """
+
+    sha256: str
+    size: int
+    name: str
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    """Totals reported by ``pdd store stats``.
+
+    Attributes:
+        keys: Deduplication keys with an entry.
+        blobs: Distinct files held by the store.
+        stored_bytes: Bytes on disk for those files.
+        referenced_bytes: Sum of file sizes over every key. The difference
+            to ``stored_bytes`` is disk saved by sharing identical files.
+        hits: Downloads avoided by finding a key in the store.
+        hit_bytes: Bytes those downloads would have transferred.
+    """
+
+    keys: int
+    blobs: int
+    stored_bytes: int
+    referenced_bytes: int
+    hits: int
+    hit_bytes: int
+
+    @property
+    def dedup_saved_bytes(self) -> int:
+        return self.referenced_bytes - self.stored_bytes
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hardlink ``src`` to ``dst``, copying when linking is impossible.
+
+    Raises FileExistsError if ``dst`` already exists.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except FileExistsError:
+        raise
+    except OSError:
+        pass
+    # Copy to a temp name first so a partial copy is never visible.
+    with (
+        open(src, "rb") as f,
+        tempfile.NamedTemporaryFile(
+            dir=dst.parent, delete=False, prefix=".copy-", suffix=".tmp"
+        ) as tmp,
+    ):
+        shutil.copyfileobj(f, tmp)
+    try:
+        if dst.exists():
+            raise FileExistsError(dst)
+        os.replace(tmp.name, dst)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp.name)
+        raise
+
+
+class ArchiveStore:
+    """Shared, content-addressed store with an in-memory presence index.
+
+    Thread-safe: handlers call :meth:`add` and :meth:`link_into` through
+    ``asyncio.to_thread``, and one store may serve several drivers.
+
+    Args:
+        root: Directory holding ``objects/`` and the index. Created if
+            missing.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._entries: dict[str, StoreEntry] = {}
+        self._blobs: dict[str, int] = {}
+        self._hits = 0
+        self._hit_bytes = 0
+        self._offset = 0
+        # Start offsets of records this store appended past ``_offset``;
+        # refresh() must not count their hits a second time.
+        self._own_records: set[int] = set()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.refresh()
+
+    def blob_path(self, sha256: str) -> Path:
+        """Return where the blob for ``sha256`` lives in the store."""
+        return self.objects_dir / sha256[:2] / sha256[2:4] / sha256
+
+    def refresh(self) -> None:
+        """Read index records appended since the last load."""
+        with self._lock:
+            try:
+                with open(self.index_path, "rb") as f:
+                    f.seek(self._offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return
+            # Leave a trailing partial record (a concurrent append) for
+            # the next refresh.
+            end = data.rfind(b"\n") + 1
+            position = self._offset
+            self._offset += end
+            for line in data[:end].split(b"\n")[:-1]:
+                own = position in self._own_records
+                self._own_records.discard(position)
+                position += len(line) + 1
+                self._apply(line.decode().split("\t", 4), count_hit=not own)
+
+    def _apply(self, fields: list[str], count_hit: bool = True) -> None:
+        try:
+            if fields[0] == "P" and len(fields) == 5:
+                _, sha, size_text, name, key = fields
+                size = int(size_text)
+                self._entries[key] = StoreEntry(sha, size, name)
+                self._blobs[sha] = size
+            elif fields[0] == "H" and len(fields) >= 4:
+                hit_size = int(fields[2])
+                if count_hit:
+                    self._hits += 1
+                    self._hit_bytes += hit_size
+            else:
+                raise ValueError(fields[0])
+        except ValueError:
+            logger.warning("archive store: skipping bad index record")
+
+    def _append(self, record: str) -> None:
+        # Called with the lock held. A single small O_APPEND write keeps
+        # records from concurrent processes from interleaving.
+        data = (record + "\n").encode()
+        fd = os.open(
+            self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+        try:
+            os.write(fd, data)
+            # O_APPEND leaves the offset at the end of this record.
+            start = os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+        finally:
+            os.close(fd)
+        if start == self._offset:
+            self._offset += len(data)
+        else:
+            self._own_records.add(start)
+
+    def lookup(self, deduplication_key: str) -> StoreEntry | None:
+        """Return the entry for ``deduplication_key`` without touching disk."""
+        return self._entries.get(deduplication_key)
+
+    def link_into(
+        self,
+        deduplication_key: str,
+        entry: StoreEntry,
+        target: Path,
+    ) -> Path | None:
+        """Make the blob for ``entry`` available at ``target``.
+
+        Hardlinks the blob to ``target`` (parents are created). Falls back
+        to returning the blob path when a link is impossible. Records a
+        hit either way.
+
+        Returns:
+            Where the file can be read, or None if the blob has gone
+            missing (the entry is then dropped) or the key cannot be
+            recorded in the index; the caller downloads.
+        """
+        if "\n" in deduplication_key:
+            return None
+        blob = self.blob_path(entry.sha256)
+        location: Path | None = target
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.link(blob, target)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            location = None
+        except OSError:
+            location = blob if blob.exists() else None
+
+        with self._lock:
+            if location is None:
+                logger.warning(
+                    "archive store: blob missing for key=%s sha=%s",
+                    deduplication_key,
+                    entry.sha256,
+                )
+                if self._entries.get(deduplication_key) == entry:
+                    del self._entries[deduplication_key]
+                return None
+            self._hits += 1
+            self._hit_bytes += entry.size
+            self._append(
+                f"H\t{entry.sha256}\t{entry.size}\t{deduplication_key}"
+            )
+        return location
+
+    def add(
+        self,
+        deduplication_key: str,
+        path: Path,
+        sha256: str,
+    ) -> None:
+        """Record the freshly archived file at ``path`` under its key.
+
+        A new blob is hardlinked from ``path``. If the store already holds
+        the same content, ``path`` is replaced with a link to that blob so
+        both runs share one copy on disk.
+        """
+        if "\n" in deduplication_key or "\t" in path.name:
+            return
+        path = Path(path)
+        size = path.stat().st_size
+        entry = StoreEntry(sha256, size, path.name)
+        if self._entries.get(deduplication_key) == entry:
+            return
+
+        blob = self.blob_path(sha256)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            _link_or_copy(path, blob)
+        except FileExistsError:
+            self._share_existing(blob, path)
+
+        with self._lock:
+            self._entries[deduplication_key] = entry
+            self._blobs[sha256] = size
+            self._append(
+                f"P\t{sha256}\t{size}\t{path.name}\t{deduplication_key}"
+            )
+
+    @staticmethod
+    def _share_existing(blob: Path, path: Path) -> None:
+        """Point ``path`` at ``blob`` when both hold the same content."""
+        with contextlib.suppress(OSError):
+            if os.path.samefile(blob, path):
+                return
+            tmp = path.with_name(f".link-{path.name}")
+            os.link(blob, tmp)
+            os.replace(tmp, path)
+
+    def stats(self) -> StoreStats:
+        """Summarize the index, including bytes saved by reuse."""
+        with self._lock:
+            return StoreStats(
+                keys=len(self._entries),
+                blobs=len(self._blobs),
+                stored_bytes=sum(self._blobs.values()),
+                referenced_bytes=sum(e.size for e in self._entries.values()),
+                hits=self._hits,
+                hit_bytes=self._hit_bytes,
+            )
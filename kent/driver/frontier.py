@@ -0,0 +1,260 @@
+"""Bounded request frontier with spill-to-disk for the in-memory drivers.
+
+The sync and async drivers keep their frontier as a heap of
+``(priority, counter, request)`` entries. Broad crawls can grow that heap
+faster than workers drain it, so :class:`SpillingFrontier` caps how many
+entries live in memory. When the cap is exceeded the lowest-priority half
+of the heap (the largest ``(priority, counter)`` keys) is written out as a
+sorted, append-only segment file. Pops k-way merge the in-memory heap with
+the head of every segment, so ordering is identical to a plain heap.
+
+:class:`SpillingPriorityQueue` plugs the same storage into
+:class:`asyncio.PriorityQueue` for the async driver.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import pickle
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+# Entries are ``(priority, counter, request)``; the counter is unique, so
+# tuple comparison never reaches the request itself.
+FrontierEntry = tuple[int, int, Any]
+
+# Merge all segments into one once this many are open, bounding the file
+# handles held and the per-pop head comparison.
+DEFAULT_MAX_SEGMENTS = 16
+
+
+class _Segment:
+    """One sorted run of spilled entries, read front to back."""
+
+    def __init__(self, path: Path, count: int) -> None:
+        self.path = path
+        self.remaining = count
+        self._file: IO[bytes] = open(path, "rb")  # noqa: SIM115
+        self.head_offset = 0
+        self.head: FrontierEntry | None = None
+        self._advance()
+
+    def _advance(self) -> None:
+        if self.remaining == 0:
+            self.head = None
+            return
+        self.head_offset = self._file.tell()
+        self.head = pickle.load(self._file)
+
+    def take(self) -> FrontierEntry:
+        """Return the head entry and read the next one."""
+        assert self.head is not None
+        entry = self.head
+        self.remaining -= 1
+        self._advance()
+        return entry
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        """Yield the remaining entries without consuming them."""
+        if self.remaining == 0:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.head_offset)
+            for _ in range(self.remaining):
+                yield pickle.load(f)
+
+    def close(self) -> None:
+        self._file.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SpillingFrontier:
+    """Min-heap of frontier entries with a configurable in-memory cap.
+
+    With ``max_in_memory=None`` this is a plain ``heapq`` list. Otherwise,
+    once more than ``max_in_memory`` entries are held, the largest half is
+    spilled to a new segment under ``spill_dir``. Entries must be picklable
+    once spilling is enabled.
+
+    Example::
+
+        frontier = SpillingFrontier(max_in_memory=10_000)
+        frontier.push((request.priority, counter, request))
+        priority, counter, request = frontier.pop()
+    """
+
+    def __init__(
+        self,
+        max_in_memory: int | None = None,
+        spill_dir: Path | None = None,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+    ) -> None:
+        """Initialize the frontier.
+
+        Args:
+            max_in_memory: Maximum entries kept in the in-memory heap.
+                ``None`` disables spilling.
+            spill_dir: Directory for segment files. Defaults to the system
+                temp directory. Segment files are removed as they drain and
+                on :meth:`close`.
+            max_segments: Number of open segments that triggers a merge
+                into a single segment.
+        """
+        if max_in_memory is not None and max_in_memory < 1:
+            raise ValueError("max_in_memory must be at least 1")
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        self.max_segments = max_segments
+        self._heap: list[FrontierEntry] = []
+        self._segments: list[_Segment] = []
+        self.spilled_total = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) + sum(s.remaining for s in self._segments)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap) or bool(self._segments)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        """Iterate every queued entry in no particular order."""
+        yield from self._heap
+        for segment in self._segments:
+            yield from segment
+
+    @property
+    def in_memory(self) -> int:
+        """Number of entries currently held in memory."""
+        return len(self._heap)
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segment files currently on disk."""
+        return len(self._segments)
+
+    def push(self, entry: FrontierEntry) -> None:
+        """Add an entry, spilling the overflow if the cap is exceeded."""
+        heapq.heappush(self._heap, entry)
+        if (
+            self.max_in_memory is not None
+            and len(self._heap) > self.max_in_memory
+        ):
+            self._spill()
+
+    def pop(self) -> FrontierEntry:
+        """Remove and return the smallest ``(priority, counter)`` entry.
+
+        Raises:
+            IndexError: If the frontier is empty.
+        """
+        if not self._segments:
+            return heapq.heappop(self._heap)
+
+        segment = min(self._segments, key=_head_key)
+        if self._heap and self._heap[0][:2] < _head_key(segment):
+            return heapq.heappop(self._heap)
+
+        entry = segment.take()
+        if segment.head is None:
+            self._segments.remove(segment)
+            segment.close()
+        return entry
+
+    def clear(self) -> None:
+        """Drop every entry and delete all segment files."""
+        self._heap.clear()
+        for segment in self._segments:
+            segment.close()
+        self._segments.clear()
+
+    def close(self) -> None:
+        """Alias for :meth:`clear`; releases segment files."""
+        self.clear()
+
+    def _spill(self) -> None:
+        """Write the larger half of the heap out as a sorted segment."""
+        assert self.max_in_memory is not None
+        self._heap.sort()
+        keep = self.max_in_memory // 2
+        overflow = self._heap[keep:]
+        # A sorted list is a valid heap, so the kept prefix needs no heapify.
+        del self._heap[keep:]
+        self._segments.append(self._write_segment(overflow))
+        self.spilled_total += len(overflow)
+        logger.debug(
+            "frontier: spilled %d entries (%d segments on disk)",
+            len(overflow),
+            len(self._segments),
+        )
+        if len(self._segments) > self.max_segments:
+            self._merge_segments()
+
+    def _write_segment(self, entries: Any) -> _Segment:
+        fd, name = tempfile.mkstemp(
+            prefix="frontier-", suffix=".seg", dir=self.spill_dir
+        )
+        count = 0
+        with os.fdopen(fd, "wb") as f:
+            for entry in entries:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                count += 1
+        return _Segment(Path(name), count)
+
+    def _merge_segments(self) -> None:
+        """Collapse every open segment into one sorted segment."""
+        old = self._segments
+        merged = self._write_segment(
+            heapq.merge(*(iter(s) for s in old), key=lambda e: e[:2])
+        )
+        for segment in old:
+            segment.close()
+        self._segments = [merged]
+
+
+def _head_key(segment: _Segment) -> tuple[int, int]:
+    assert segment.head is not None
+    return segment.head[0], segment.head[1]
+
+
+class SpillingPriorityQueue(asyncio.PriorityQueue):  # type: ignore[type-arg]
+    """``asyncio.PriorityQueue`` whose storage is a :class:`SpillingFrontier`.
+
+    Only the backing container changes; ``put``/``get``/``join``/
+    ``task_done`` keep their asyncio semantics. ``maxsize`` is not
+    supported because the point is to accept work without blocking
+    producers.
+    """
+
+    def __init__(
+        self,
+        max_in_memory: int | None = None,
+        spill_dir: Path | None = None,
+    ) -> None:
+        self._max_in_memory = max_in_memory
+        self._spill_dir = spill_dir
+        super().__init__()
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = SpillingFrontier(  # type: ignore[assignment]
+            max_in_memory=self._max_in_memory, spill_dir=self._spill_dir
+        )
+
+    def _put(self, item: FrontierEntry) -> None:
+        self._queue.push(item)  # type: ignore[attr-defined]
+
+    def _get(self) -> FrontierEntry:
+        return self._queue.pop()  # type: ignore[attr-defined, no-any-return]
+
+    @property
+    def frontier(self) -> SpillingFrontier:
+        """The backing frontier, for stats and cleanup."""
+        return self._queue  # type: ignore[return-value]
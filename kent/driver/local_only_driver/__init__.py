@@ -5,7 +5,8 @@ SQLite-backed lookup over one or more source DBs. The output is a regular
 ``PersistentDriver``-shaped run DB, resumable by ``kent run`` for any
 requests that couldn't be served from the source data.
 
-Exposed via the ``pdd replay`` CLI subcommand.
+Exposed via the ``pdd replay`` CLI subcommand; :func:`run_sharded_replay`
+spreads one replay across several processes (``--shards``).
 """
 
 from kent.driver.local_only_driver.errors import (
@@ -16,14 +17,26 @@ from kent.driver.local_only_driver.local_only_driver import (
     LocalOnlyDriver,
     MatchMode,
     MissPolicy,
+    default_index_db_path,
+)
+from kent.driver.local_only_driver.sharded import (
+    ShardedReplayResult,
+    run_sharded_replay,
+)
+from kent.driver.local_only_driver.source_index import (
+    IndexBuildProgress,
+    SourceIndex,
 )
-from kent.driver.local_only_driver.source_index import SourceIndex
 
 __all__ = [
+    "IndexBuildProgress",
     "LocalOnlyDriver",
     "LocalOnlyMiss",
     "LocalOnlyScraperMismatchError",
     "MatchMode",
     "MissPolicy",
+    "ShardedReplayResult",
     "SourceIndex",
+    "default_index_db_path",
+    "run_sharded_replay",
 ]
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any, Generic, Literal
 
 from sqlalchemy import text, update
+from typing_extensions import Self
 
 from kent.common.exceptions import (
     RequestFailedHalt,
@@ -29,6 +30,7 @@ from kent.driver.local_only_driver.source_index import (
     FetchedResponse,
     IndexEntry,
     SourceIndex,
+    fallback_replay_key,
     fallback_replay_key_for_request,
 )
 from kent.driver.persistent_driver.models import Request as RequestModel
@@ -49,6 +51,11 @@ MissPolicy = Literal["raise", "skip", "stub"]
 MatchMode = Literal["prev-error-free", "curr-error-free", "desc-error-free"]
 
 
+def default_index_db_path(db_path: Path) -> Path:
+    """Where a replay into ``db_path`` keeps its source index by default."""
+    return db_path.with_name(f"{db_path.name}.source-index")
+
+
 class LocalOnlyDriver(
     PersistentDriver[ScraperReturnDatatype],
     Generic[ScraperReturnDatatype],
@@ -72,6 +79,11 @@ class LocalOnlyDriver(
             unconditionally treated as misses and stubbed for re-fetch.
     """
 
+    #: How many upcoming pending requests to read ahead of the workers.
+    #: Their responses are fetched and decompressed in batches on the
+    #: source index's reader pool; 0 disables prefetching.
+    prefetch_depth: int = 64
+
     def __init__(
         self,
         *,
@@ -93,6 +105,11 @@ class LocalOnlyDriver(
         self._retry_eligible_parents: set[int] = set()
         self._retry_eligible_lock = asyncio.Lock()
 
+        self._prefetch_task: asyncio.Task[None] | None = None
+        # Prefetched responses still ahead of the workers, as of the
+        # last refill minus dequeues since.
+        self._prefetched_ahead = 0
+
     @classmethod
     @asynccontextmanager
     async def open(  # type: ignore[override]
@@ -105,33 +122,43 @@ class LocalOnlyDriver(
         mode: MatchMode = "curr-error-free",
         trust_subtree_after_retry: bool = False,
         index_db_path: Path | None = None,
+        rebuild_index: bool = False,
         num_workers: int = 4,
+        finalize_stubs: bool = True,
         **kwargs: Any,
-    ) -> AsyncIterator[LocalOnlyDriver[ScraperReturnDatatype]]:
+    ) -> AsyncIterator[Self]:
         """Open a LocalOnlyDriver run against one or more source DBs.
 
         Steps performed before yielding the driver:
         1. Open each source DB read-only and build the SQLite routing
            index. ``mode='desc-error-free'`` additionally computes the
            HATEOAS-aware pruning plan and seeds the output DB with the
-           anchor entry requests.
+           anchor entry requests. The index is kept at ``index_db_path``
+           (default: :func:`default_index_db_path` next to ``db_path``)
+           and reused by later replays of the same sources, merging in
+           only rows added since; ``rebuild_index`` forces a fresh build.
         2. Verify every source DB's recorded ``scraper_name`` (class
            only; versions may differ).
         3. Initialise the output DB exactly the way :class:`PersistentDriver`
            does for ``kent run``, then construct the driver.
+
+        On exit, stubbed rows are finalized (see :meth:`_finalize_stubs`)
+        unless ``finalize_stubs`` is False; sharded replay defers that
+        until every shard has been merged.
         """
         from kent.driver.local_only_driver.error_pruning import (
             compute_pruning_plan,
         )
 
         # Step 1: build the index. desc-error-free needs a pre-pass to
-        # decide which rows to exclude (anchor descendants).
+        # decide which rows to exclude (anchor descendants); the pre-pass
+        # only walks source rows, so it skips building an index.
         excluded: dict[int, set[int]] | None = None
         anchors_per_db: dict[int, list[tuple[int, int]]] | None = None
         if mode == "desc-error-free":
             scratch_index = SourceIndex(
                 source_db_paths=source_db_paths,
-                index_db_path=None,
+                build_index=False,
             )
             try:
                 plan = compute_pruning_plan(scratch_index)
@@ -139,10 +166,18 @@ class LocalOnlyDriver(
                 anchors_per_db = plan.anchors
             finally:
                 scratch_index.close()
+        # prev-error-free drops retry-eligible rows so they fall through
+        # to the miss policy.
         source_index = SourceIndex(
             source_db_paths=source_db_paths,
-            index_db_path=index_db_path,
+            index_db_path=(
+                index_db_path
+                if index_db_path is not None
+                else default_index_db_path(db_path)
+            ),
             excluded_request_ids=excluded,
+            exclude_retry_eligible=mode == "prev-error-free",
+            rebuild=rebuild_index,
         )
 
         # Step 2: scraper-class enforcement.
@@ -163,16 +198,6 @@ class LocalOnlyDriver(
                 expected=expected, mismatches=mismatches
             )
 
-        # prev-error-free: rebuild the index dropping retry-eligible rows
-        # so they fall through to the miss policy.
-        if mode == "prev-error-free":
-            source_index.close()
-            source_index = SourceIndex(
-                source_db_paths=source_db_paths,
-                index_db_path=index_db_path,
-                exclude_retry_eligible=True,
-            )
-
         # Step 3: standard PersistentDriver bring-up.
         seed_params = kwargs.pop("seed_params", None)
         max_backoff_time = kwargs.pop("max_backoff_time", 3600.0)
@@ -230,8 +255,11 @@ class LocalOnlyDriver(
             yield driver
         finally:
             try:
-                await cls._finalize_stubs(sql_manager)
+                if finalize_stubs:
+                    await cls._finalize_stubs(sql_manager)
             finally:
+                if driver._prefetch_task is not None:
+                    driver._prefetch_task.cancel()
                 source_index.close()
                 await driver.close()
 
@@ -379,9 +407,7 @@ class LocalOnlyDriver(
             raise LocalOnlyMiss(
                 dedup_key=_dedup_key_of(request), url=request.request.url
             )
-        fetched: FetchedResponse = await asyncio.to_thread(
-            self.source_index.fetch_response, entry
-        )
+        fetched = await self._fetch_response(entry)
         return Response(
             status_code=fetched.status_code,
             headers=fetched.headers,
@@ -391,6 +417,64 @@ class LocalOnlyDriver(
             request=request,
         )
 
+    async def _fetch_response(self, entry: IndexEntry) -> FetchedResponse:
+        """Claim ``entry``'s prefetched response, or read it now."""
+        prefetched = self.source_index.take_prefetched(entry)
+        if prefetched is not None:
+            return await asyncio.wrap_future(prefetched)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.source_index.executor, self.source_index.fetch_response, entry
+        )
+
+    async def _get_next_request(
+        self,
+    ) -> tuple[int, BaseRequest, int | None] | None:
+        """Dequeue as usual, topping up the prefetch window as we go.
+
+        The window is refilled by one background task at a time, once
+        fewer than ``prefetch_depth // 2`` prefetched responses are left
+        ahead of the workers.
+        """
+        result = await super()._get_next_request()
+        if result is None or self.prefetch_depth <= 0:
+            return result
+        self._prefetched_ahead -= 1
+        task = self._prefetch_task
+        if (task is None or task.done()) and (
+            self._prefetched_ahead < self.prefetch_depth // 2
+        ):
+            self._prefetch_task = asyncio.create_task(
+                self._prefetch_upcoming()
+            )
+        return result
+
+    async def _prefetch_upcoming(self) -> None:
+        """Start reading responses for the next pending requests.
+
+        Keys are derived from the stored columns the same way
+        :meth:`_lookup_entry` derives them from a deserialized request.
+        Archive requests are skipped; they only resolve a file path.
+        """
+        try:
+            rows = await self.db.peek_pending_requests(self.prefetch_depth)
+        except Exception:
+            logger.debug("Prefetch peek failed", exc_info=True)
+            return
+        entries: list[IndexEntry] = []
+        for dedup_key, request_type, url, body in rows:
+            if request_type == "archive":
+                continue
+            entry = self.source_index.lookup(dedup_key)
+            if entry is None:
+                entry = self.source_index.lookup(
+                    fallback_replay_key(url, body)
+                )
+            if entry is not None:
+                entries.append(entry)
+        self.source_index.prefetch(entries)
+        self._prefetched_ahead = len(entries)
+
     async def resolve_archive_request(  # type: ignore[override]
         self,
         request: Request,
@@ -412,8 +496,9 @@ class LocalOnlyDriver(
             raise LocalOnlyMiss(
                 dedup_key=_dedup_key_of(request), url=request.request.url
             )
-        fetched: FetchedArchive | None = await asyncio.to_thread(
-            self.source_index.fetch_archive, entry
+        loop = asyncio.get_running_loop()
+        fetched: FetchedArchive | None = await loop.run_in_executor(
+            self.source_index.executor, self.source_index.fetch_archive, entry
         )
         if fetched is None:
             raise LocalOnlyMiss(
@@ -0,0 +1,556 @@
+"""Multi-process replay: shard a LocalOnlyDriver run across processes.
+
+A single :class:`LocalOnlyDriver` runs every continuation, decompression
+and SQL write on one event loop, so a large replay uses one core.
+:func:`run_sharded_replay` splits the crawl in three stages:
+
+1. **Expand.** Replay in-process into the output DB until the frontier
+   (pending, non-speculative requests) holds ``shards *
+   frontier_per_shard`` rows, or the crawl finishes.
+2. **Shard.** Copy the output DB once per shard and hand each shard a
+   round-robin slice of the frontier; the rest of the frontier is
+   ``held`` in that copy so it still deduplicates but is never
+   dequeued. Every shard replays its slice, and everything those
+   requests yield, in its own process against its own copy. Shards are
+   then merged back into the output DB one at a time: rows a shard
+   added are appended with their ids shifted past the output DB's,
+   frontier rows it owned replace the output's, and ancestors it
+   stubbed are stubbed. A request a shard added whose dedup_key an
+   earlier shard already added is dropped with its subtree — the same
+   outcome as the dedup check in a single process, where whichever
+   worker got there first wins.
+3. **Finish.** Replay once more in-process over the merged DB. This
+   runs any speculative requests (shards never speculate, so
+   speculation state stays consistent) and finalizes stubs across all
+   shards at once.
+
+Miss policies behave as in a single process: each shard applies them
+as it goes, and stubs are finalized once at the end. For
+``curr-error-free`` the set of retried parents is threaded from stage 1
+into every shard and from the shards into stage 3, so children of a
+retried continuation are still forced to miss wherever they land.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import sqlite3
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from kent.driver.local_only_driver.local_only_driver import (
+    LocalOnlyDriver,
+    MatchMode,
+    MissPolicy,
+    default_index_db_path,
+)
+from kent.driver.persistent_driver.sql_manager import SQLManager
+
+if TYPE_CHECKING:
+    from kent.data_types import BaseRequest, BaseScraper
+    from kent.driver._speculation_support import SpeculationState
+
+logger = logging.getLogger(__name__)
+
+# Tables a shard can add rows to, parents before the tables that
+# reference them. Ids in each are shifted on merge; foreign keys between
+# them are found with ``PRAGMA foreign_key_list`` and shifted to match.
+_MERGED_TABLES = (
+    "compression_dicts",
+    "incidental_request_storage",
+    "requests",
+    "results",
+    "errors",
+    "estimates",
+    "archived_files",
+    "archive_processing",
+    "incidental_requests",
+)
+
+
+@dataclass(frozen=True)
+class ShardedReplayResult:
+    """What :func:`run_sharded_replay` did.
+
+    Attributes:
+        frontier: Pending requests split across the shards; 0 when the
+            crawl finished before the frontier reached its target.
+        shards: Shard processes run.
+        duplicates_dropped: Requests dropped on merge because an earlier
+            shard had already added their dedup_key, counting their
+            subtrees.
+    """
+
+    frontier: int
+    shards: int
+    duplicates_dropped: int
+
+
+async def run_sharded_replay(
+    scraper: BaseScraper[Any],
+    db_path: Path,
+    *,
+    source_db_paths: list[Path],
+    shards: int,
+    miss_policy: MissPolicy = "stub",
+    mode: MatchMode = "curr-error-free",
+    trust_subtree_after_retry: bool = False,
+    index_db_path: Path | None = None,
+    rebuild_index: bool = False,
+    num_workers: int = 4,
+    frontier_per_shard: int = 64,
+    **kwargs: Any,
+) -> ShardedReplayResult:
+    """Replay ``scraper`` from ``source_db_paths`` using ``shards`` processes.
+
+    Produces the same output DB as :meth:`LocalOnlyDriver.open` with the
+    same arguments followed by ``run()``. Shards run in spawned
+    processes, so ``scraper`` must be picklable (scrapers importable as
+    ``module:Class`` are).
+
+    Args:
+        scraper: The scraper to replay.
+        db_path: Output DB.
+        source_db_paths: Source DBs, as for :meth:`LocalOnlyDriver.open`.
+        shards: Number of shard processes.
+        miss_policy: See :class:`LocalOnlyDriver`.
+        mode: See :class:`LocalOnlyDriver`.
+        trust_subtree_after_retry: See :class:`LocalOnlyDriver`.
+        index_db_path: Source index path; defaults to
+            :func:`default_index_db_path`. Built or updated once in
+            stage 1 and reused by every shard.
+        rebuild_index: Rebuild the source index from scratch.
+        num_workers: Worker tasks per process.
+        frontier_per_shard: Pending requests per shard to accumulate
+            before sharding. Higher values balance shards better at the
+            cost of a longer single-process stage 1.
+        **kwargs: Passed to every :meth:`LocalOnlyDriver.open`.
+    """
+    if shards < 1:
+        raise ValueError(f"shards must be at least 1, got {shards}")
+    if index_db_path is None:
+        index_db_path = default_index_db_path(db_path)
+    open_kwargs: dict[str, Any] = {
+        "source_db_paths": source_db_paths,
+        "miss_policy": miss_policy,
+        "mode": mode,
+        "trust_subtree_after_retry": trust_subtree_after_retry,
+        "index_db_path": index_db_path,
+        "num_workers": num_workers,
+        **kwargs,
+    }
+
+    # Stage 1: expand the crawl until the frontier is wide enough.
+    async with _ExpandingDriver.open(
+        scraper,
+        db_path,
+        rebuild_index=rebuild_index,
+        finalize_stubs=False,
+        **open_kwargs,
+    ) as expander:
+        expander.frontier_target = shards * frontier_per_shard
+        await expander.run(setup_signal_handlers=False)
+        expanded = expander.stop_event.is_set()
+        retried = set(expander._retry_eligible_parents)
+
+    if not expanded:
+        logger.info("Sharded replay: crawl finished before sharding")
+        async with SQLManager.open(db_path) as sql_manager:
+            await LocalOnlyDriver._finalize_stubs(sql_manager)
+        return ShardedReplayResult(frontier=0, shards=0, duplicates_dropped=0)
+
+    plan = await asyncio.to_thread(_plan_shards, db_path, shards)
+    dropped = 0
+    if plan is not None:
+        dropped = await _replay_shards(
+            scraper, db_path, plan, retried, open_kwargs
+        )
+
+    # Stage 3: speculation, leftovers, and stub finalization.
+    async with LocalOnlyDriver.open(
+        scraper, db_path, **{**open_kwargs, "enable_monitor": False}
+    ) as driver:
+        driver._retry_eligible_parents.update(retried)
+        await driver.run(setup_signal_handlers=False)
+
+    return ShardedReplayResult(
+        frontier=plan.frontier if plan is not None else 0,
+        shards=len(plan.owned) if plan is not None else 0,
+        duplicates_dropped=dropped,
+    )
+
+
+async def _replay_shards(
+    scraper: BaseScraper[Any],
+    db_path: Path,
+    plan: _ShardPlan,
+    retried: set[int],
+    open_kwargs: dict[str, Any],
+) -> int:
+    """Stage 2: replay each slice of the frontier in its own process.
+
+    Adds the shards' retried parents to ``retried``, in output DB ids.
+
+    Returns:
+        Requests dropped on merge as duplicates.
+    """
+    logger.info(
+        f"Sharded replay: {plan.frontier} frontier requests across "
+        f"{len(plan.owned)} shards"
+    )
+    shard_paths = [
+        db_path.with_name(f"{db_path.name}.shard-{i}")
+        for i in range(len(plan.owned))
+    ]
+    for shard_path, owned in zip(shard_paths, plan.owned, strict=True):
+        await asyncio.to_thread(_create_shard, db_path, shard_path, owned)
+    jobs = [
+        _ShardJob(
+            scraper=scraper,
+            db_path=shard_path,
+            retry_eligible_parents=frozenset(retried),
+            open_kwargs=open_kwargs,
+        )
+        for shard_path in shard_paths
+    ]
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=len(jobs),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        shard_retried = await asyncio.gather(
+            *(loop.run_in_executor(pool, _run_shard, job) for job in jobs)
+        )
+
+    dropped = 0
+    for shard_path, owned, shard_parents in zip(
+        shard_paths, plan.owned, shard_retried, strict=True
+    ):
+        merged = await asyncio.to_thread(
+            _merge_shard, db_path, shard_path, plan, owned
+        )
+        dropped += len(merged.dropped)
+        retried.update(merged.remap_request_ids(shard_parents))
+        _remove_db_files(shard_path)
+    return dropped
+
+
+class _ExpandingDriver(LocalOnlyDriver[Any]):
+    """Stage 1 driver: stops once ``frontier_target`` requests are pending.
+
+    The check runs before every dequeue; stage 1 is short, so the extra
+    COUNT is cheap next to the shards it sets up.
+    """
+
+    frontier_target = 0
+
+    async def _get_next_request(
+        self,
+    ) -> tuple[int, BaseRequest, int | None] | None:
+        if self.stop_event.is_set():
+            return None
+        if await self.db.count_pending_requests() >= self.frontier_target:
+            self.stop()
+            return None
+        return await super()._get_next_request()
+
+
+# --- Shard processes ---
+
+
+@dataclass(frozen=True)
+class _ShardJob:
+    """Everything a shard process needs; pickled into the child."""
+
+    scraper: BaseScraper[Any]
+    db_path: Path
+    retry_eligible_parents: frozenset[int]
+    open_kwargs: dict[str, Any]
+
+
+class _ShardDriver(LocalOnlyDriver[Any]):
+    """LocalOnlyDriver for one shard.
+
+    Speculation is left to stage 3: shards running it independently
+    would each extend the same speculative ranges.
+    """
+
+    def _discover_speculate_functions(self) -> dict[str, SpeculationState]:
+        return {}
+
+
+def _run_shard(job: _ShardJob) -> set[int]:
+    """Process entry point: replay one shard, return its retried parents."""
+    return asyncio.run(_replay_shard(job))
+
+
+async def _replay_shard(job: _ShardJob) -> set[int]:
+    async with _ShardDriver.open(
+        job.scraper, job.db_path, finalize_stubs=False, **job.open_kwargs
+    ) as driver:
+        driver._retry_eligible_parents.update(job.retry_eligible_parents)
+        await driver.run(setup_signal_handlers=False)
+        return set(driver._retry_eligible_parents)
+
+
+# --- Planning, copying and merging shard DBs ---
+
+
+@dataclass(frozen=True)
+class _ShardPlan:
+    """The frontier split, and the output DB's state when it was taken.
+
+    ``bases`` maps each of :data:`_MERGED_TABLES` to its max id at
+    snapshot time: in a shard, rows at or below it are copies, rows
+    above it are the shard's own.
+    """
+
+    owned: list[list[int]]
+    bases: dict[str, int]
+    queue_counter_base: int
+
+    @property
+    def frontier(self) -> int:
+        return sum(map(len, self.owned))
+
+
+@dataclass
+class _MergedShard:
+    """Id shifts applied to one shard's requests, and what was dropped."""
+
+    request_base: int
+    request_offset: int
+    dropped: set[int] = field(default_factory=set)
+
+    def remap_request_ids(self, ids: Iterable[int]) -> set[int]:
+        """Translate shard request ids into output DB ids."""
+        return {
+            i + self.request_offset if i > self.request_base else i
+            for i in ids
+            if i not in self.dropped
+        }
+
+
+def _plan_shards(db_path: Path, shards: int) -> _ShardPlan | None:
+    """Split the pending frontier round-robin; None if it is empty."""
+    conn = sqlite3.connect(db_path)
+    try:
+        frontier = [
+            row[0]
+            for row in conn.execute(
+                "SELECT id FROM requests WHERE status = 'pending' "
+                "AND NOT is_speculative ORDER BY priority, queue_counter"
+            )
+        ]
+        if not frontier:
+            return None
+        bases = {
+            table: conn.execute(
+                f"SELECT COALESCE(MAX(id), 0) FROM {table}"
+            ).fetchone()[0]
+            for table in _MERGED_TABLES
+        }
+        (queue_counter_base,) = conn.execute(
+            "SELECT COALESCE(MAX(queue_counter), 0) FROM requests"
+        ).fetchone()
+    finally:
+        conn.close()
+    owned = [frontier[i::shards] for i in range(min(shards, len(frontier)))]
+    return _ShardPlan(
+        owned=owned, bases=bases, queue_counter_base=queue_counter_base
+    )
+
+
+def _create_shard(db_path: Path, shard_path: Path, owned: list[int]) -> None:
+    """Copy the output DB, holding every pending row the shard doesn't own."""
+    _remove_db_files(shard_path)
+    source = sqlite3.connect(db_path)
+    shard = sqlite3.connect(shard_path)
+    try:
+        source.backup(shard)
+        shard.execute("CREATE TEMP TABLE owned (id INTEGER PRIMARY KEY)")
+        shard.executemany(
+            "INSERT INTO owned VALUES (?)", ((i,) for i in owned)
+        )
+        shard.execute(
+            "UPDATE requests SET status = 'held' WHERE status = 'pending' "
+            "AND id NOT IN (SELECT id FROM owned)"
+        )
+        shard.commit()
+    finally:
+        source.close()
+        shard.close()
+
+
+def _merge_shard(
+    db_path: Path, shard_path: Path, plan: _ShardPlan, owned: list[int]
+) -> _MergedShard:
+    """Merge one shard DB into the output DB in a single transaction."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS shard", (str(shard_path),))
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("CREATE TEMP TABLE owned (id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO owned VALUES (?)", ((i,) for i in owned))
+        request_base = plan.bases["requests"]
+        # Requests this shard added that an earlier shard already added,
+        # and everything under them.
+        conn.execute(
+            "CREATE TEMP TABLE dropped AS "
+            "WITH RECURSIVE subtree(id) AS ("
+            "  SELECT s.id FROM shard.requests s "
+            "  WHERE s.id > ? AND s.deduplication_key IS NOT NULL "
+            "  AND EXISTS (SELECT 1 FROM main.requests m "
+            "    WHERE m.deduplication_key = s.deduplication_key) "
+            "  UNION "
+            "  SELECT c.id FROM shard.requests c "
+            "  JOIN subtree ON c.parent_request_id = subtree.id"
+            ") SELECT id FROM subtree",
+            (request_base,),
+        )
+        offsets = {
+            table: max(
+                conn.execute(
+                    f"SELECT COALESCE(MAX(id), 0) FROM main.{table}"
+                ).fetchone()[0],
+                base,
+            )
+            - base
+            for table, base in plan.bases.items()
+        }
+        (max_queue_counter,) = conn.execute(
+            "SELECT COALESCE(MAX(queue_counter), 0) FROM main.requests"
+        ).fetchone()
+        queue_counter_offset = (
+            max(max_queue_counter, plan.queue_counter_base)
+            - plan.queue_counter_base
+        )
+
+        # Owned frontier rows are replaced by the shard's copies (or
+        # dropped, if the shard deleted them under ``--miss skip``).
+        # Plain DELETE then INSERT rather than INSERT OR REPLACE: REPLACE
+        # skips the delete triggers that keep the counters.
+        conn.execute(
+            "DELETE FROM main.requests WHERE id IN (SELECT id FROM temp.owned)"
+        )
+        for table in _MERGED_TABLES:
+            columns, exprs, request_fks = _shifted_columns(
+                conn, table, plan, offsets, queue_counter_offset
+            )
+            if table == "requests":
+                request_fks.append("id")
+            where = " AND ".join(
+                [
+                    f"id > {plan.bases[table]}",
+                    *(
+                        f"({fk} IS NULL OR "
+                        f"{fk} NOT IN (SELECT id FROM temp.dropped))"
+                        for fk in request_fks
+                    ),
+                ]
+            )
+            if table == "requests":
+                where = f"({where}) OR id IN (SELECT id FROM temp.owned)"
+            conn.execute(
+                f"INSERT INTO main.{table} ({', '.join(columns)}) "
+                f"SELECT {', '.join(exprs)} FROM shard.{table} "
+                f"WHERE {where}"
+            )
+
+        # The copied rows brought the shard's child_count / result_count,
+        # which the insert triggers then added the merged children and
+        # results to; recount them.
+        conn.execute(
+            "UPDATE main.requests SET "
+            "child_count = (SELECT COUNT(*) FROM main.requests c "
+            "  WHERE c.parent_request_id = requests.id), "
+            "result_count = (SELECT COUNT(*) FROM main.results r "
+            "  WHERE r.request_id = requests.id) "
+            "WHERE id IN (SELECT id FROM temp.owned) OR id > ?",
+            (request_base + offsets["requests"],),
+        )
+        # Ancestors the shard stubbed while walking to a HATEOAS anchor.
+        conn.execute(
+            "UPDATE main.requests SET status = 'stubbed', "
+            "started_at = NULL, started_at_ns = NULL "
+            "WHERE status != 'stubbed' AND id IN (SELECT id FROM "
+            "shard.requests WHERE id <= ? AND status = 'stubbed')",
+            (request_base,),
+        )
+        dropped = {
+            row[0] for row in conn.execute("SELECT id FROM temp.dropped")
+        }
+        conn.execute("COMMIT")
+        conn.execute("DETACH DATABASE shard")
+    finally:
+        conn.close()
+    return _MergedShard(
+        request_base=request_base,
+        request_offset=offsets["requests"],
+        dropped=dropped,
+    )
+
+
+def _shifted_columns(
+    conn: sqlite3.Connection,
+    table: str,
+    plan: _ShardPlan,
+    offsets: dict[str, int],
+    queue_counter_offset: int,
+) -> tuple[list[str], list[str], list[str]]:
+    """Column names and SELECT expressions that shift a shard's new ids.
+
+    Returns ``(columns, exprs, request_fks)``; ``request_fks`` lists the
+    columns that reference ``requests``.
+    """
+
+    def shifted(column: str, target: str) -> str:
+        base, offset = plan.bases[target], offsets[target]
+        return (
+            f"CASE WHEN {column} > {base} THEN {column} + {offset} "
+            f"ELSE {column} END"
+        )
+
+    references = {
+        row[3]: row[2]
+        for row in conn.execute(f"PRAGMA main.foreign_key_list({table})")
+    }
+    columns = [
+        row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")
+    ]
+    exprs = []
+    for column in columns:
+        if column == "id":
+            exprs.append(shifted("id", table))
+        elif references.get(column) in offsets:
+            exprs.append(shifted(column, references[column]))
+        elif table == "requests" and column == "queue_counter":
+            exprs.append(
+                f"CASE WHEN queue_counter > {plan.queue_counter_base} "
+                f"THEN queue_counter + {queue_counter_offset} "
+                "ELSE queue_counter END"
+            )
+        elif table == "compression_dicts" and column == "version":
+            # Versions are unique per continuation; number a shard's
+            # dictionaries after any already in the output DB.
+            exprs.append(
+                "version + (SELECT COALESCE(MAX(m.version), 0) FROM "
+                "main.compression_dicts m "
+                "WHERE m.continuation = compression_dicts.continuation)"
+            )
+        else:
+            exprs.append(column)
+    request_fks = [
+        column for column, target in references.items() if target == "requests"
+    ]
+    return columns, exprs, request_fks
+
+
+def _remove_db_files(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
@@ -13,26 +13,44 @@ The ``retry_eligible`` flag is True for source rows that have an
 unresolved structural / validation error against them — used by
 ``curr-error-free`` mode to re-execute the continuation against the
 stored response.
+
+The index is built inside SQLite: each source DB is ATTACHed read-only
+and merged with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` whose
+``WHERE`` clause applies the policy, so no source row passes through
+Python. ``scripts/bench_source_index.py`` compares it with the previous
+row-at-a-time build.
+
+Responses are read on :attr:`SourceIndex.executor`, a CPU-sized thread
+pool whose threads each hold their own read-only connection to every
+source DB, and can be prefetched in batches ahead of the workers that
+need them. ``scripts/bench_replay_fetch.py`` measures how fetch
+throughput scales with concurrency.
 """
 
 from __future__ import annotations
 
 import hashlib
 import json
+import logging
+import os
 import sqlite3
 import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, NamedTuple
 from urllib.parse import urlencode, urlparse, urlunparse
 
-from kent.driver.persistent_driver.compression import decompress
+import zstandard as zstd
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
     from kent.data_types import HTTPRequestParams
 
+logger = logging.getLogger(__name__)
 
 # Error types that signal "the parser broke on a valid response" — these are
 # fixable by editing scraper code, so curr-error-free mode retries them.
@@ -146,13 +164,37 @@ class FetchedArchive:
     url: str
 
 
+@dataclass(frozen=True)
+class IndexBuildProgress:
+    """Progress of a :class:`SourceIndex` build, reported per source DB.
+
+    Attributes:
+        source_db_idx: The source DB just merged into the index.
+        source_db_count: Number of source DBs being indexed.
+        rows: Index entries that source DB added or took over from an
+            earlier source DB's row.
+        keys: Distinct dedup_keys in the index so far.
+        elapsed_s: Seconds since the build started.
+        cached: True when the source DB was unchanged since the
+            persisted index was built, so nothing was read from it.
+    """
+
+    source_db_idx: int
+    source_db_count: int
+    rows: int
+    keys: int
+    elapsed_s: float
+    cached: bool = False
+
+
 class SourceIndex:
     """Routing index across one or more source DBs.
 
     Build with :meth:`build`. Look up a yielded request's dedup_key with
     :meth:`lookup`. Fetch the response payload with :meth:`fetch_response`
-    or :meth:`fetch_archive`. Close source-DB connections via
-    :meth:`close`.
+    or :meth:`fetch_archive`, or start reading it early with
+    :meth:`prefetch` and collect it with :meth:`take_prefetched`. Close
+    source-DB connections via :meth:`close`.
 
     The index DB is its own SQLite (``:memory:`` by default, or a file
     path). Source DBs are opened read-only via ``mode=ro`` URI; they are
@@ -166,14 +208,21 @@ class SourceIndex:
         index_db_path: Path | None = None,
         excluded_request_ids: dict[int, set[int]] | None = None,
         exclude_retry_eligible: bool = False,
+        on_progress: Callable[[IndexBuildProgress], None] | None = None,
+        rebuild: bool = False,
+        build_index: bool = True,
+        read_workers: int | None = None,
+        prefetch_limit: int = 256,
     ) -> None:
-        """Open source DBs and build the routing index.
+        """Open source DBs and build (or bring up to date) the routing index.
 
         Args:
             source_db_paths: Source DB paths in priority order (earlier
                 wins ties).
             index_db_path: Path for the index SQLite, or None for an
-                in-memory index.
+                in-memory index. An index left at this path by an earlier
+                build over the same sources is reused; only source rows
+                added since then are merged in.
             excluded_request_ids: Optional per-source-db set of request_id
                 values to *exclude* from the index. Used by mode 3 (
                 ``desc-error-free``) to drop hateoas-anchor rows so they
@@ -183,42 +232,50 @@ class SourceIndex:
                 Used by mode 1 (``prev-error-free``) so retry-eligible
                 rows fall through to the miss policy instead of being
                 served.
+            on_progress: Optional callback receiving an
+                :class:`IndexBuildProgress` as each source DB is merged.
+            rebuild: Discard any index found at ``index_db_path`` and
+                build from scratch.
+            build_index: When False, only open the source DBs. Used for
+                the ``desc-error-free`` pre-pass, which walks source rows
+                but never looks up a dedup_key.
+            read_workers: Threads in :attr:`executor`, which reads and
+                decompresses responses. Defaults to the CPU count.
+            prefetch_limit: Most responses :meth:`prefetch` holds at once;
+                the oldest are dropped to make room.
         """
         self.source_db_paths = list(source_db_paths)
         self._excluded = excluded_request_ids or {}
         self._exclude_retry_eligible = exclude_retry_eligible
+        self._on_progress = on_progress
+        # uri=True so source DBs can be ATTACHed read-only during the build.
         self._index_conn = sqlite3.connect(
-            str(index_db_path) if index_db_path is not None else ":memory:"
-        )
-        self._index_conn.execute(
-            """
-            CREATE TABLE source_index (
-                dedup_key TEXT PRIMARY KEY,
-                source_db_idx INTEGER NOT NULL,
-                request_id INTEGER NOT NULL,
-                completed_at_ns INTEGER NOT NULL,
-                created_at_ns INTEGER NOT NULL,
-                retry_eligible INTEGER NOT NULL DEFAULT 0
-            )
-            """
+            str(index_db_path) if index_db_path is not None else ":memory:",
+            uri=True,
         )
+        # Shared handles for the build and the event-loop-side helpers
+        # (scraper names, parent walks). Response reads never use them:
+        # each reader thread opens its own connections (see _reader), so
+        # concurrent fetches don't queue behind one handle per source DB.
         self._source_conns: list[sqlite3.Connection] = []
-        # One lock per source connection. sqlite3 with check_same_thread=False
-        # accepts cross-thread use, but not *concurrent* use — the worker
-        # thread pool will hammer fetch_response/fetch_archive on the same
-        # connection unless we serialize. Lock per-DB so unrelated source
-        # DBs can still be read in parallel.
-        self._source_conn_locks: list[threading.Lock] = []
         for path in self.source_db_paths:
             # Open read-only; URI mode is required to set mode=ro.
             conn = sqlite3.connect(
-                f"file:{path}?mode=ro&immutable=0",
+                _read_only_uri(path),
                 uri=True,
                 check_same_thread=False,
             )
             self._source_conns.append(conn)
-            self._source_conn_locks.append(threading.Lock())
-        self._build()
+        self.read_workers = read_workers or os.cpu_count() or 1
+        self.prefetch_limit = prefetch_limit
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread_state = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_conns_lock = threading.Lock()
+        self._prefetched: dict[tuple[int, int], Future[FetchedResponse]] = {}
+        self._prefetch_lock = threading.Lock()
+        if build_index:
+            self._build(rebuild=rebuild)
 
     @classmethod
     def build(
@@ -227,6 +284,7 @@ class SourceIndex:
         *,
         index_db_path: Path | None = None,
         excluded_request_ids: dict[int, set[int]] | None = None,
+        on_progress: Callable[[IndexBuildProgress], None] | None = None,
     ) -> SourceIndex:
         """Construct a SourceIndex (alias for the constructor).
 
@@ -237,107 +295,308 @@ class SourceIndex:
             source_db_paths=source_db_paths,
             index_db_path=index_db_path,
             excluded_request_ids=excluded_request_ids,
+            on_progress=on_progress,
         )
 
-    def _build(self) -> None:
-        """Scan every source DB and populate ``source_index``.
+    def _build(self, rebuild: bool) -> None:
+        """Bring ``source_index`` up to date with every source DB.
 
-        Resolution policy on duplicate dedup_key: higher
+        Each source DB is ATTACHed read-only to the index connection and
+        merged with a single ``INSERT ... SELECT ... ON CONFLICT DO
+        UPDATE``. Resolution policy on duplicate dedup_key: higher
         ``completed_at_ns`` wins → tiebreak on higher ``created_at_ns``
-        → tiebreak on lower ``source_db_idx``.
+        → tiebreak on lower ``source_db_idx``. Within one source DB a
+        full tie keeps the lower request id.
+
+        The merge is idempotent and the policy does not depend on merge
+        order, so an index persisted by an earlier build is updated in
+        place: a source whose size, mtime and max request id are
+        unchanged is skipped, and a changed source only contributes rows
+        above its recorded high-water id (see :func:`_high_water_id`).
+        Anything the upsert cannot express — different sources or
+        exclusions, a source that shrank, or (with
+        ``exclude_retry_eligible``) entries that have since become
+        retry-eligible — falls back to a full rebuild.
         """
-        retry_eligible_by_db: list[set[int]] = []
-        for conn in self._source_conns:
-            retry_eligible_by_db.append(_retry_eligible_request_ids(conn))
+        conn = self._index_conn
+        conn.create_function(
+            "fallback_replay_key", 2, fallback_replay_key, deterministic=True
+        )
+        current = [
+            _SourceState.read(path, source_conn)
+            for path, source_conn in zip(
+                self.source_db_paths, self._source_conns, strict=True
+            )
+        ]
+        config = self._config_fingerprint()
+        loaded = None if rebuild else self._load_stored_states(config)
+        if loaded is not None and not self._can_update(loaded, current):
+            loaded = None
+        stored: list[_SourceState | None]
+        if loaded is None:
+            self._reset_index(config)
+            stored = [None] * len(current)
+        else:
+            stored = list(loaded)
+
+        conn.execute(
+            "CREATE TEMP TABLE excluded_ids ("
+            "source_db_idx INTEGER, request_id INTEGER, "
+            "PRIMARY KEY (source_db_idx, request_id)) WITHOUT ROWID"
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO excluded_ids VALUES (?, ?)",
+            (
+                (db_idx, request_id)
+                for db_idx, ids in self._excluded.items()
+                for request_id in ids
+            ),
+        )
+        start = time.perf_counter()
+        for db_idx, (path, state, previous) in enumerate(
+            zip(self.source_db_paths, current, stored, strict=True)
+        ):
+            cached = previous is not None and previous.key == state.key
+            rows = 0
+            if not cached:
+                conn.execute(
+                    "ATTACH DATABASE ? AS src", (_read_only_uri(path),)
+                )
+                try:
+                    rows, state = self._merge_attached_source(
+                        db_idx, state, previous
+                    )
+                finally:
+                    conn.execute("DETACH DATABASE src")
+            (keys,) = conn.execute(
+                "SELECT COUNT(*) FROM source_index"
+            ).fetchone()
+            progress = IndexBuildProgress(
+                source_db_idx=db_idx,
+                source_db_count=len(self.source_db_paths),
+                rows=rows,
+                keys=keys,
+                elapsed_s=time.perf_counter() - start,
+                cached=cached,
+            )
+            if cached:
+                logger.info(
+                    f"Source index for {path} is up to date "
+                    f"({db_idx + 1}/{progress.source_db_count})"
+                )
+            else:
+                logger.info(
+                    f"Indexed {path} "
+                    f"({db_idx + 1}/{progress.source_db_count}"
+                    f"{', incremental' if previous else ''}): "
+                    f"{rows} entries won, {keys} keys total, "
+                    f"{progress.elapsed_s:.2f}s"
+                )
+            if self._on_progress is not None:
+                self._on_progress(progress)
+        conn.execute("DROP TABLE excluded_ids")
+
+    def _config_fingerprint(self) -> str:
+        """Everything besides source contents that shapes the index."""
+        excluded = hashlib.sha256()
+        for db_idx in sorted(self._excluded):
+            for request_id in sorted(self._excluded[db_idx]):
+                excluded.update(f"{db_idx}:{request_id},".encode())
+        return json.dumps(
+            {
+                "format": _INDEX_FORMAT,
+                "sources": [
+                    str(Path(p).resolve()) for p in self.source_db_paths
+                ],
+                "exclude_retry_eligible": self._exclude_retry_eligible,
+                "excluded": excluded.hexdigest(),
+            }
+        )
 
-        for db_idx, conn in enumerate(self._source_conns):
-            excluded = self._excluded.get(db_idx, set())
-            retry_ids = retry_eligible_by_db[db_idx]
+    def _load_stored_states(self, config: str) -> list[_SourceState] | None:
+        """Source states recorded by an earlier build with ``config``.
+
+        Returns None when there is no usable earlier build.
+        """
+        conn = self._index_conn
+        try:
+            row = conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'config'"
+            ).fetchone()
+            if row is None or row[0] != config:
+                return None
+            rows = conn.execute(
+                "SELECT path, size, mtime_ns, max_request_id, "
+                "high_water_id, retry_digest FROM index_sources "
+                "ORDER BY source_db_idx"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return None
+        states = [_SourceState(*r) for r in rows]
+        return states if len(states) == len(self.source_db_paths) else None
+
+    def _can_update(
+        self, stored: list[_SourceState], current: list[_SourceState]
+    ) -> bool:
+        """Whether merging new rows is enough to bring ``stored`` current."""
+        for previous, state in zip(stored, current, strict=True):
+            if previous.key == state.key:
+                continue
+            if state.max_request_id < previous.max_request_id:
+                return False
+            # Excluded rows cannot be removed again once another source's
+            # row has lost to them, so new exclusions need a full build.
+            if (
+                self._exclude_retry_eligible
+                and state.retry_digest != previous.retry_digest
+            ):
+                return False
+        return True
+
+    def _reset_index(self, config: str) -> None:
+        """Drop any earlier build and create empty index tables."""
+        conn = self._index_conn
+        conn.executescript(
+            """
+            DROP TABLE IF EXISTS source_index;
+            DROP TABLE IF EXISTS index_sources;
+            DROP TABLE IF EXISTS index_meta;
+            CREATE TABLE source_index (
+                dedup_key TEXT PRIMARY KEY,
+                source_db_idx INTEGER NOT NULL,
+                request_id INTEGER NOT NULL,
+                completed_at_ns INTEGER NOT NULL,
+                created_at_ns INTEGER NOT NULL,
+                retry_eligible INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE index_sources (
+                source_db_idx INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                max_request_id INTEGER NOT NULL,
+                high_water_id INTEGER NOT NULL,
+                retry_digest TEXT NOT NULL
+            );
+            CREATE TABLE index_meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        conn.execute("INSERT INTO index_meta VALUES ('config', ?)", (config,))
+        conn.commit()
+
+    def _merge_attached_source(
+        self,
+        db_idx: int,
+        state: _SourceState,
+        previous: _SourceState | None,
+    ) -> tuple[int, _SourceState]:
+        """Merge the source DB attached as ``src`` into ``source_index``.
+
+        Only rows above ``previous.high_water_id`` are read when an
+        earlier build is being updated. Returns the number of index
+        entries the source added or won, and the state to record.
+        """
+        conn = self._index_conn
+        types_list = ",".join("?" * len(_RETRY_ELIGIBLE_ERROR_TYPES))
+        conn.execute(
+            f"""
+            CREATE TEMP TABLE retry_ids AS
+            SELECT DISTINCT request_id AS id FROM src.errors
+            WHERE is_resolved = 0
+              AND error_type IN ({types_list})
+              AND request_id IS NOT NULL
+            """,
+            tuple(_RETRY_ELIGIBLE_ERROR_TYPES),
+        )
+        try:
             # Inclusion gate: a row is fulfillable iff it has a response
             # AND either (a) the response content is stored inline (normal
             # responses) or (b) it's an archive request — those store the
             # file on disk and the response body in the DB is NULL by
             # design (see PersistentDriver._store_response).
             #
-            # Rows are allowed to have a NULL deduplication_key: that
-            # path covers source DBs whose original yield went through a
-            # code path that didn't auto-populate the key (or whose
-            # scraper used SkipDeduplicationCheck). For those rows we
-            # derive a stable fallback key from the stored URL + body
-            # — the lookup side computes the same fallback when its
-            # probe with the yielded request's own key misses. Rows that
-            # *do* have a real dedup_key keep it (overrides are preserved).
+            # Rows are allowed to have a NULL deduplication_key: that path
+            # covers source DBs whose original yield went through a code
+            # path that didn't auto-populate the key (or whose scraper used
+            # SkipDeduplicationCheck). For those rows we derive a stable
+            # fallback key from the stored URL + body — the lookup side
+            # computes the same fallback when its probe with the yielded
+            # request's own key misses. Rows that *do* have a real
+            # dedup_key keep it (overrides are preserved).
+            #
+            # Rows are read in id order, so an exact tie within this DB
+            # keeps the first row; the row-value comparison in the
+            # ON CONFLICT clause applies the policy against earlier DBs.
             cur = conn.execute(
                 """
-                SELECT id, deduplication_key, completed_at_ns, created_at_ns,
-                       url, body
-                FROM requests
-                WHERE response_status_code IS NOT NULL
+                INSERT INTO source_index
+                SELECT
+                    CASE WHEN r.deduplication_key IS NULL
+                         THEN fallback_replay_key(r.url, r.body)
+                         ELSE r.deduplication_key END,
+                    :db_idx,
+                    r.id,
+                    COALESCE(r.completed_at_ns, 0),
+                    COALESCE(r.created_at_ns, 0),
+                    r.id IN temp.retry_ids
+                FROM src.requests r
+                WHERE r.response_status_code IS NOT NULL
                   AND (
-                      content_compressed IS NOT NULL
-                      OR request_type = 'archive'
+                      r.content_compressed IS NOT NULL
+                      OR r.request_type = 'archive'
                   )
-                """
+                  AND NOT EXISTS (
+                      SELECT 1 FROM temp.excluded_ids x
+                      WHERE x.source_db_idx = :db_idx
+                        AND x.request_id = r.id
+                  )
+                  AND NOT (:exclude_retry AND r.id IN temp.retry_ids)
+                  AND r.id > :after_id AND r.id <= :through_id
+                ORDER BY r.id
+                ON CONFLICT (dedup_key) DO UPDATE SET
+                    source_db_idx = excluded.source_db_idx,
+                    request_id = excluded.request_id,
+                    completed_at_ns = excluded.completed_at_ns,
+                    created_at_ns = excluded.created_at_ns,
+                    retry_eligible = excluded.retry_eligible
+                WHERE (
+                    excluded.completed_at_ns,
+                    excluded.created_at_ns,
+                    -excluded.source_db_idx
+                ) > (
+                    source_index.completed_at_ns,
+                    source_index.created_at_ns,
+                    -source_index.source_db_idx
+                )
+                """,
+                {
+                    "db_idx": db_idx,
+                    "exclude_retry": int(self._exclude_retry_eligible),
+                    "after_id": previous.high_water_id if previous else 0,
+                    "through_id": state.max_request_id,
+                },
             )
-            for row in cur:
-                (
-                    request_id,
-                    dedup_key,
-                    completed_ns,
-                    created_ns,
-                    row_url,
-                    row_body,
-                ) = row
-                if request_id in excluded:
-                    continue
-                if self._exclude_retry_eligible and request_id in retry_ids:
-                    continue
-                if dedup_key is None:
-                    dedup_key = fallback_replay_key(row_url, row_body)
-                retry_eligible = 1 if request_id in retry_ids else 0
-                completed_ns = completed_ns or 0
-                created_ns = created_ns or 0
-                # Insert; if a row already exists, decide using the policy.
-                existing = self._index_conn.execute(
-                    "SELECT source_db_idx, request_id, completed_at_ns, "
-                    "created_at_ns FROM source_index WHERE dedup_key = ?",
-                    (dedup_key,),
-                ).fetchone()
-                if existing is None:
-                    self._index_conn.execute(
-                        "INSERT INTO source_index "
-                        "(dedup_key, source_db_idx, request_id, "
-                        "completed_at_ns, created_at_ns, retry_eligible) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (
-                            dedup_key,
-                            db_idx,
-                            request_id,
-                            completed_ns,
-                            created_ns,
-                            retry_eligible,
-                        ),
-                    )
-                else:
-                    ex_idx, _ex_req_id, ex_completed, ex_created = existing
-                    new_key = (completed_ns, created_ns, -db_idx)
-                    ex_key = (ex_completed, ex_created, -ex_idx)
-                    if new_key > ex_key:
-                        self._index_conn.execute(
-                            "UPDATE source_index SET source_db_idx = ?, "
-                            "request_id = ?, completed_at_ns = ?, "
-                            "created_at_ns = ?, retry_eligible = ? "
-                            "WHERE dedup_key = ?",
-                            (
-                                db_idx,
-                                request_id,
-                                completed_ns,
-                                created_ns,
-                                retry_eligible,
-                                dedup_key,
-                            ),
-                        )
-        self._index_conn.commit()
+            rows = cur.rowcount
+            if previous and previous.retry_digest != state.retry_digest:
+                # Errors were added or resolved for rows merged earlier.
+                conn.execute(
+                    "UPDATE source_index "
+                    "SET retry_eligible = request_id IN temp.retry_ids "
+                    "WHERE source_db_idx = ?",
+                    (db_idx,),
+                )
+            state = state.with_high_water(
+                _high_water_id(conn, state.max_request_id)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO index_sources VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                (db_idx, *state),
+            )
+            conn.commit()
+        finally:
+            conn.execute("DROP TABLE temp.retry_ids")
+        return rows, state
 
     def lookup(self, dedup_key: str | None) -> IndexEntry | None:
         """Look up a dedup_key. Returns None on miss."""
@@ -357,60 +616,219 @@ class SourceIndex:
             retry_eligible=bool(row[2]),
         )
 
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool that reads and decompresses source responses.
+
+        Sized to the CPU count by default: zstd and SQLite both release
+        the GIL, so replay throughput scales with cores once reads stop
+        sharing a connection. Created on first use.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.read_workers,
+                thread_name_prefix="source-read",
+            )
+        return self._executor
+
     def fetch_response(self, entry: IndexEntry) -> FetchedResponse:
-        """Decompress the source row's stored response.
+        """Read and decompress the source row's stored response.
 
-        Called from the worker pool via ``asyncio.to_thread``; serializes
-        access to the source DB connection with a threading.Lock so
-        concurrent workers can't interleave statement executions on the
-        same SQLite handle.
+        Safe to call from any number of threads at once; each thread
+        reads through its own read-only connection.
         """
-        conn = self._source_conns[entry.source_db_idx]
-        lock = self._source_conn_locks[entry.source_db_idx]
-        with lock:
-            row = conn.execute(
-                "SELECT content_compressed, compression_dict_id, "
-                "response_headers_json, response_status_code, response_url, url "
-                "FROM requests WHERE id = ?",
-                (entry.request_id,),
-            ).fetchone()
+        rows = self._read_rows(entry.source_db_idx, [entry.request_id])
+        row = rows.get(entry.request_id)
+        if row is None:
+            raise _missing_row(entry.source_db_idx, entry.request_id)
+        return self._materialize(entry.source_db_idx, row)
+
+    def prefetch(self, entries: Iterable[IndexEntry]) -> int:
+        """Start reading ``entries`` ahead of their :meth:`fetch_response`.
+
+        Entries are grouped by source DB and read in batches of
+        ``_PREFETCH_BATCH`` rows with one query each; every row is then
+        decompressed as its own :attr:`executor` task. Collect results
+        with :meth:`take_prefetched`. Entries already prefetched are
+        skipped; past ``prefetch_limit`` the oldest unclaimed results
+        are dropped.
+
+        Returns:
+            Number of entries newly scheduled.
+        """
+        batches: dict[int, list[tuple[int, Future[FetchedResponse]]]] = {}
+        with self._prefetch_lock:
+            for entry in entries:
+                key = (entry.source_db_idx, entry.request_id)
+                if key in self._prefetched:
+                    continue
+                while len(self._prefetched) >= self.prefetch_limit:
+                    dropped = next(iter(self._prefetched))
+                    self._prefetched.pop(dropped).cancel()
+                future: Future[FetchedResponse] = Future()
+                self._prefetched[key] = future
+                batches.setdefault(entry.source_db_idx, []).append(
+                    (entry.request_id, future)
+                )
+        scheduled = 0
+        for db_idx, items in batches.items():
+            for start in range(0, len(items), _PREFETCH_BATCH):
+                batch = items[start : start + _PREFETCH_BATCH]
+                self.executor.submit(self._prefetch_batch, db_idx, batch)
+                scheduled += len(batch)
+        return scheduled
+
+    def take_prefetched(
+        self, entry: IndexEntry
+    ) -> Future[FetchedResponse] | None:
+        """Claim the prefetched response for ``entry``, if one was started."""
+        with self._prefetch_lock:
+            return self._prefetched.pop(
+                (entry.source_db_idx, entry.request_id), None
+            )
+
+    def prefetched_count(self) -> int:
+        """Number of prefetched responses not yet claimed."""
+        with self._prefetch_lock:
+            return len(self._prefetched)
+
+    def _prefetch_batch(
+        self,
+        db_idx: int,
+        items: list[tuple[int, Future[FetchedResponse]]],
+    ) -> None:
+        """Read one batch of rows, then fan decompression out to the pool."""
+        pending = [
+            (request_id, future)
+            for request_id, future in items
+            if future.set_running_or_notify_cancel()
+        ]
+        if not pending:
+            return
+        try:
+            rows = self._read_rows(db_idx, [rid for rid, _ in pending])
+        except Exception as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+            return
+        for request_id, future in pending:
+            row = rows.get(request_id)
             if row is None:
-                raise RuntimeError(
-                    f"Index points at source_db_idx={entry.source_db_idx} "
-                    f"request_id={entry.request_id} but the row is gone"
+                future.set_exception(_missing_row(db_idx, request_id))
+                continue
+            try:
+                self.executor.submit(
+                    self._decompress_into, future, db_idx, row
                 )
-            (
-                content_compressed,
-                dict_id,
-                headers_json,
-                status_code,
-                response_url,
-                url,
-            ) = row
-            dictionary: bytes | None = None
-            if dict_id is not None:
-                dict_row = conn.execute(
-                    "SELECT dictionary_data FROM compression_dicts WHERE id = ?",
-                    (dict_id,),
-                ).fetchone()
-                if dict_row is None:
-                    raise RuntimeError(
-                        f"compression_dict_id={dict_id} referenced by request "
-                        f"{entry.request_id} not present in source DB "
-                        f"(source_db_idx={entry.source_db_idx})"
-                    )
-                dictionary = dict_row[0]
-        # Decompression is CPU-bound; do it outside the lock so a parallel
-        # worker on a different source DB can read its own connection.
-        content = decompress(content_compressed, dictionary=dictionary)
+            except RuntimeError:
+                # The pool is shutting down; finish the work here.
+                self._decompress_into(future, db_idx, row)
+
+    def _decompress_into(
+        self,
+        future: Future[FetchedResponse],
+        db_idx: int,
+        row: tuple[Any, ...],
+    ) -> None:
+        try:
+            future.set_result(self._materialize(db_idx, row))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    def _read_rows(
+        self, db_idx: int, request_ids: list[int]
+    ) -> dict[int, tuple[Any, ...]]:
+        """Fetch the still-compressed response columns for ``request_ids``."""
+        placeholders = ",".join("?" * len(request_ids))
+        cur = self._reader(db_idx).execute(
+            "SELECT id, content_compressed, compression_dict_id, "
+            "response_headers_json, response_status_code, response_url, url "
+            f"FROM requests WHERE id IN ({placeholders})",
+            request_ids,
+        )
+        return {row[0]: row for row in cur}
+
+    def _materialize(
+        self, db_idx: int, row: tuple[Any, ...]
+    ) -> FetchedResponse:
+        (
+            request_id,
+            content_compressed,
+            dict_id,
+            headers_json,
+            status_code,
+            response_url,
+            url,
+        ) = row
+        decompressor = self._decompressor(db_idx, dict_id, request_id)
         headers = json.loads(headers_json) if headers_json else {}
         return FetchedResponse(
             status_code=status_code,
             headers=headers,
-            content=content,
+            content=decompressor.decompress(content_compressed),
             url=response_url or url,
         )
 
+    def _reader(self, db_idx: int) -> sqlite3.Connection:
+        """This thread's read-only connection to source DB ``db_idx``."""
+        conns: dict[int, sqlite3.Connection] | None = getattr(
+            self._thread_state, "conns", None
+        )
+        if conns is None:
+            conns = self._thread_state.conns = {}
+        conn = conns.get(db_idx)
+        if conn is None:
+            # check_same_thread=False only so close() can run elsewhere.
+            conn = sqlite3.connect(
+                _read_only_uri(self.source_db_paths[db_idx]),
+                uri=True,
+                check_same_thread=False,
+            )
+            conns[db_idx] = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def _decompressor(
+        self, db_idx: int, dict_id: int | None, request_id: int
+    ) -> zstd.ZstdDecompressor:
+        """This thread's decompressor for a source DB's dictionary.
+
+        Cached so the dictionary is read and loaded once per thread
+        rather than once per response.
+        """
+        cache: dict[tuple[int, int | None], zstd.ZstdDecompressor] | None = (
+            getattr(self._thread_state, "decompressors", None)
+        )
+        if cache is None:
+            cache = self._thread_state.decompressors = {}
+        decompressor = cache.get((db_idx, dict_id))
+        if decompressor is not None:
+            return decompressor
+        if dict_id is None:
+            decompressor = zstd.ZstdDecompressor()
+        else:
+            dict_row = (
+                self._reader(db_idx)
+                .execute(
+                    "SELECT dictionary_data FROM compression_dicts "
+                    "WHERE id = ?",
+                    (dict_id,),
+                )
+                .fetchone()
+            )
+            if dict_row is None:
+                raise RuntimeError(
+                    f"compression_dict_id={dict_id} referenced by request "
+                    f"{request_id} not present in source DB "
+                    f"(source_db_idx={db_idx})"
+                )
+            decompressor = zstd.ZstdDecompressor(
+                dict_data=zstd.ZstdCompressionDict(dict_row[0])
+            )
+        cache[(db_idx, dict_id)] = decompressor
+        return decompressor
+
     def fetch_archive(self, entry: IndexEntry) -> FetchedArchive | None:
         """Resolve the source row's archived-file path.
 
@@ -418,16 +836,17 @@ class SourceIndex:
         the caller should treat that as a miss (the original archive
         request was deferred via the archive_handler).
         """
-        conn = self._source_conns[entry.source_db_idx]
-        lock = self._source_conn_locks[entry.source_db_idx]
-        with lock:
-            row = conn.execute(
+        row = (
+            self._reader(entry.source_db_idx)
+            .execute(
                 "SELECT af.file_path, r.response_headers_json, "
                 "r.response_status_code, COALESCE(r.response_url, r.url) "
                 "FROM requests r LEFT JOIN archived_files af "
                 "ON af.request_id = r.id WHERE r.id = ?",
                 (entry.request_id,),
-            ).fetchone()
+            )
+            .fetchone()
+        )
         if row is None or row[0] is None:
             return None
         file_path, headers_json, status_code, url = row
@@ -554,12 +973,116 @@ class SourceIndex:
         return dict(zip(keys, row, strict=True))
 
     def close(self) -> None:
-        """Close all DB handles (source DBs and the index DB)."""
+        """Stop the reader pool and close all DB handles."""
+        with self._prefetch_lock:
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        for conn in self._reader_conns:
+            conn.close()
         for conn in self._source_conns:
             conn.close()
         self._index_conn.close()
 
 
+# Rows read per query when prefetching; well under SQLite's bound
+# parameter limit.
+_PREFETCH_BATCH = 32
+
+
+def _missing_row(db_idx: int, request_id: int) -> RuntimeError:
+    return RuntimeError(
+        f"Index points at source_db_idx={db_idx} "
+        f"request_id={request_id} but the row is gone"
+    )
+
+
+# Bump when the layout of the persisted index tables changes.
+_INDEX_FORMAT = 1
+
+# Requests that may still receive a response. Rows above the lowest such
+# id are re-read on the next incremental update.
+_UNSETTLED_STATUSES = ("pending", "in_progress", "held")
+
+
+class _SourceState(NamedTuple):
+    """What the persisted index knows about one source DB.
+
+    ``path``, ``size``, ``mtime_ns`` and ``max_request_id`` identify the
+    source's contents; ``high_water_id`` is the id below which every row
+    had settled when it was merged, and ``retry_digest`` hashes the set of
+    retry-eligible request ids.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    max_request_id: int
+    high_water_id: int
+    retry_digest: str
+
+    @property
+    def key(self) -> tuple[str, int, int, int]:
+        return (self.path, self.size, self.mtime_ns, self.max_request_id)
+
+    @classmethod
+    def read(cls, path: Path, conn: sqlite3.Connection) -> _SourceState:
+        """Stat ``path`` and read its max request id and retry ids.
+
+        The ``-wal`` file counts toward size and mtime: in WAL mode new
+        rows reach the main file only at checkpoint.
+        """
+        size = 0
+        mtime_ns = 0
+        for file in (Path(path), Path(f"{path}-wal")):
+            try:
+                st = file.stat()
+            except FileNotFoundError:
+                continue
+            size += st.st_size
+            mtime_ns = max(mtime_ns, st.st_mtime_ns)
+        (max_id,) = conn.execute("SELECT MAX(id) FROM requests").fetchone()
+        digest = hashlib.sha256()
+        for request_id in sorted(_retry_eligible_request_ids(conn)):
+            digest.update(f"{request_id},".encode())
+        return cls(
+            path=str(Path(path).resolve()),
+            size=size,
+            mtime_ns=mtime_ns,
+            max_request_id=max_id or 0,
+            high_water_id=0,
+            retry_digest=digest.hexdigest(),
+        )
+
+    def with_high_water(self, high_water_id: int) -> _SourceState:
+        return self._replace(high_water_id=high_water_id)
+
+
+def _high_water_id(conn: sqlite3.Connection, through_id: int) -> int:
+    """Highest id of the attached ``src`` at or below which all rows settled.
+
+    A pending or in-progress row can still gain a response after the
+    index is built, so the next incremental update starts just below the
+    lowest such row. Sources without a ``status`` column are treated as
+    settled.
+    """
+    columns = {
+        row[1] for row in conn.execute("PRAGMA src.table_info(requests)")
+    }
+    if "status" not in columns:
+        return through_id
+    placeholders = ",".join("?" * len(_UNSETTLED_STATUSES))
+    (lowest,) = conn.execute(
+        f"SELECT MIN(id) FROM src.requests "
+        f"WHERE response_status_code IS NULL AND id <= ? "
+        f"AND status IN ({placeholders})",
+        (through_id, *_UNSETTLED_STATUSES),
+    ).fetchone()
+    return through_id if lowest is None else lowest - 1
+
+
 def _retry_eligible_request_ids(conn: sqlite3.Connection) -> set[int]:
     """Set of request_ids in this DB whose unresolved error is parser-side."""
     types_list = ",".join("?" * len(_RETRY_ELIGIBLE_ERROR_TYPES))
@@ -575,6 +1098,15 @@ def _retry_eligible_request_ids(conn: sqlite3.Connection) -> set[int]:
     return {row[0] for row in cur}
 
 
+def _read_only_uri(path: Path) -> str:
+    """SQLite URI opening ``path`` read-only.
+
+    ``Path.as_uri`` percent-encodes characters such as ``?`` and ``#``
+    that would otherwise be parsed as URI syntax.
+    """
+    return f"{Path(path).resolve().as_uri()}?mode=ro"
+
+
 def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
     """Check whether ``column`` exists on ``table``.
 
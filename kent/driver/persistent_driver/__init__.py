@@ -68,10 +68,13 @@ from kent.driver.persistent_driver.stats import (
     QueueStats,
     ResultStats,
     ThroughputStats,
+    check_run_counters,
+    collect_queue_metrics,
     get_compression_stats,
     get_error_stats,
     get_queue_stats,
     get_result_stats,
+    get_run_metrics,
     get_stats,
     get_throughput_stats,
 )
@@ -117,10 +120,13 @@ __all__ = [
     "QueueStats",
     "ResultStats",
     "ThroughputStats",
+    "check_run_counters",
+    "collect_queue_metrics",
     "get_compression_stats",
     "get_error_stats",
     "get_queue_stats",
     "get_result_stats",
+    "get_run_metrics",
     "get_stats",
     "get_throughput_stats",
     # Dry run driver
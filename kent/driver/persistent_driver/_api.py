@@ -20,6 +20,7 @@ from kent.driver.persistent_driver.sql_manager import (
     ResponseRecord,
     ResultRecord,
     SQLManager,
+    TotalMode,
 )
 
 if TYPE_CHECKING:
@@ -363,6 +364,8 @@ class APIMixin:
         continuation: str | None = None,
         offset: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[RequestRecord]:
         """List requests with optional filters and pagination."""
         return await self.db.list_requests(
@@ -370,6 +373,8 @@ class APIMixin:
             continuation=continuation,
             offset=offset,
             limit=limit,
+            cursor=cursor,
+            total=total,
         )
 
     async def list_responses(
@@ -377,10 +382,16 @@ class APIMixin:
         continuation: str | None = None,
         offset: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[ResponseRecord]:
         """List responses with optional filters and pagination."""
         return await self.db.list_responses(
-            continuation=continuation, offset=offset, limit=limit
+            continuation=continuation,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            total=total,
         )
 
     async def list_results(
@@ -389,6 +400,8 @@ class APIMixin:
         is_valid: bool | None = None,
         offset: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[ResultRecord]:
         """List results with optional filters and pagination."""
         return await self.db.list_results(
@@ -396,6 +409,8 @@ class APIMixin:
             is_valid=is_valid,
             offset=offset,
             limit=limit,
+            cursor=cursor,
+            total=total,
         )
 
     async def get_request(self, request_id: int) -> RequestRecord | None:
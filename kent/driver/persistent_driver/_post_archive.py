@@ -0,0 +1,233 @@
+"""PostArchiveMixin - Processing of archived files off the request path.
+
+When a download worker stores an archived file it only records the row in
+``archived_files`` and queues a :class:`PostArchiveJob`; it then goes back
+to the network. A separate pool of ``post_archive_workers`` tasks takes
+jobs from a bounded queue, hashes the file, and runs every processor
+registered with :meth:`PostArchiveMixin.register_archive_processor`. Each
+processor's output and wall-clock time are recorded in
+``archive_processing``, and ``archived_files.processed_at`` is set when
+the file is finished.
+
+Files whose processing had not finished when a run stopped are queued
+again when the next run starts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from kent.driver._ranged_download import hash_file
+from kent.driver.persistent_driver.sql_manager import SQLManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PostArchiveJob:
+    """One archived file waiting for post-archive processing.
+
+    Attributes:
+        archived_file_id: Row in ``archived_files``.
+        request_id: The request that downloaded the file.
+        file_path: Where the archive handler stored the file.
+        expected_type: The archive request's ``expected_type``.
+    """
+
+    archived_file_id: int
+    request_id: int
+    file_path: str
+    expected_type: str | None
+
+
+# A processor receives the job and returns a JSON-serializable value (or
+# None). Plain functions run in the default executor; coroutine functions
+# are awaited on the event loop.
+ArchiveProcessor = Callable[[PostArchiveJob], Any]
+
+
+def _stat_and_hash(path: str) -> tuple[int, str] | None:
+    """Return ``(size, sha256)`` for ``path``, or None if it is not a file."""
+    if not os.path.isfile(path):
+        return None
+    return os.path.getsize(path), hash_file(path)
+
+
+class PostArchiveMixin:
+    """Bounded worker pool that processes archived files after download.
+
+    Tunables (override on a subclass or instance):
+
+    - ``post_archive_workers``: concurrent processing tasks.
+    - ``post_archive_max_pending``: queued jobs before download workers
+      wait for the stage to catch up.
+    """
+
+    db: SQLManager
+    stop_event: asyncio.Event
+
+    post_archive_workers: int = 2
+    post_archive_max_pending: int = 64
+
+    _archive_processors: dict[str, ArchiveProcessor]
+    _post_archive_queue: asyncio.Queue[PostArchiveJob] | None
+    _post_archive_tasks: list[asyncio.Task[None]]
+    _post_archive_feeder: asyncio.Task[None] | None
+
+    def register_archive_processor(
+        self, name: str, processor: ArchiveProcessor
+    ) -> None:
+        """Run ``processor`` on every file archived from now on.
+
+        Processors run in registration order, once per file. An exception
+        is recorded as an ``error`` row and does not stop the remaining
+        processors.
+
+        Args:
+            name: Identifies the processor in ``archive_processing``.
+            processor: Callable taking a :class:`PostArchiveJob`.
+
+        Raises:
+            ValueError: If a processor is already registered as ``name``.
+        """
+        if name in self._archive_processors:
+            raise ValueError(f"Archive processor {name!r} already registered")
+        self._archive_processors[name] = processor
+
+    async def _start_post_archive(self) -> None:
+        """Start the processing pool and queue unfinished files."""
+        self._post_archive_queue = asyncio.Queue(
+            maxsize=self.post_archive_max_pending
+        )
+        backlog = await self.db.list_unprocessed_archived_files()
+        if backlog:
+            logger.info(
+                f"Resuming post-archive processing of {len(backlog)} files"
+            )
+        self._post_archive_tasks = [
+            asyncio.create_task(self._post_archive_worker(i))
+            for i in range(self.post_archive_workers)
+        ]
+        if backlog:
+            # Fed from a task so a long backlog cannot delay the run.
+            self._post_archive_feeder = asyncio.create_task(
+                self._feed_post_archive(
+                    [
+                        PostArchiveJob(
+                            archived_file_id=row["id"],
+                            request_id=row["request_id"],
+                            file_path=row["file_path"],
+                            expected_type=row["expected_type"],
+                        )
+                        for row in backlog
+                    ]
+                )
+            )
+
+    async def _feed_post_archive(self, jobs: list[PostArchiveJob]) -> None:
+        for job in jobs:
+            await self._submit_post_archive(job)
+
+    async def _submit_post_archive(self, job: PostArchiveJob) -> None:
+        """Queue ``job``, waiting while the queue is full.
+
+        Outside :meth:`run` there is no pool; the file stays unprocessed
+        and is picked up when the next run starts.
+        """
+        if self._post_archive_queue is not None:
+            await self._post_archive_queue.put(job)
+
+    async def _stop_post_archive(self, drain: bool) -> None:
+        """Stop the pool, first finishing queued jobs if ``drain``.
+
+        Without ``drain`` queued jobs are dropped; their files keep a NULL
+        ``processed_at`` and are queued again by the next run.
+        """
+        queue = self._post_archive_queue
+        if queue is None:
+            return
+        feeder = self._post_archive_feeder
+        tasks = [*self._post_archive_tasks, *([feeder] if feeder else [])]
+        try:
+            if drain:
+                if feeder is not None:
+                    await feeder
+                await queue.join()
+        finally:
+            self._post_archive_queue = None
+            self._post_archive_feeder = None
+            self._post_archive_tasks = []
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _post_archive_worker(self, worker_id: int) -> None:
+        queue = self._post_archive_queue
+        assert queue is not None
+        while True:
+            job = await queue.get()
+            try:
+                await self._process_archived_file(job)
+            except Exception:
+                logger.exception(
+                    f"Post-archive worker {worker_id} failed on archived "
+                    f"file {job.archived_file_id}"
+                )
+            finally:
+                queue.task_done()
+
+    async def _process_archived_file(self, job: PostArchiveJob) -> None:
+        """Hash ``job``'s file, run the processors, and record the results."""
+        stat = await asyncio.to_thread(_stat_and_hash, job.file_path)
+        if stat is None:
+            # Skipped archives ("skipped") and files removed since download
+            # have nothing to process.
+            logger.debug(
+                f"Archived file {job.archived_file_id} not on disk: "
+                f"{job.file_path}"
+            )
+            await self.db.finish_archived_file(
+                job.archived_file_id, None, None
+            )
+            return
+
+        for name, processor in self._archive_processors.items():
+            start = time.perf_counter()
+            output_json: str | None = None
+            error: str | None = None
+            try:
+                if inspect.iscoroutinefunction(processor):
+                    output = await processor(job)
+                else:
+                    output = await asyncio.to_thread(processor, job)
+                if output is not None:
+                    output_json = json.dumps(output, default=str)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.warning(
+                    f"Archive processor {name!r} failed on archived file "
+                    f"{job.archived_file_id}: {error}"
+                )
+            duration_ms = (time.perf_counter() - start) * 1000
+            await self.db.record_archive_processing(
+                archived_file_id=job.archived_file_id,
+                request_id=job.request_id,
+                processor=name,
+                status="error" if error else "success",
+                output_json=output_json,
+                error=error,
+                duration_ms=duration_ms,
+            )
+
+        file_size, content_hash = stat
+        await self.db.finish_archived_file(
+            job.archived_file_id, file_size, content_hash
+        )
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import time
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlencode, urlparse, urlunparse
@@ -18,6 +19,7 @@ from kent.driver.persistent_driver.sql_manager import SQLManager
 
 if TYPE_CHECKING:
     from kent.driver.persistent_driver._staging import StagedWrites
+    from kent.driver.persistent_driver.metrics import DriverMetrics
 
 
 def _json_default(obj: Any) -> Any:
@@ -39,6 +41,7 @@ class QueueMixin:
     """
 
     db: SQLManager
+    metrics: DriverMetrics
 
     if TYPE_CHECKING:
 
@@ -120,6 +123,7 @@ class QueueMixin:
             cert_json=request_data["cert_json"],
             archive_hash_header=request_data["archive_hash_header"],
             hateoas=request_data["hateoas"],
+            probe=request_data["probe"],
         )
 
         # Emit progress event
@@ -325,6 +329,7 @@ class QueueMixin:
             "cert_json": cert_json,
             "archive_hash_header": request.archive_hash_header,
             "hateoas": request.hateoas,
+            "probe": request.probe,
         }
 
     async def _get_next_request(
@@ -345,16 +350,22 @@ class QueueMixin:
         # workers could select the same request.
         # Skip 'held' status requests
         # Skip requests in retry backoff (started_at is used to track retry-after time)
+        start = time.perf_counter()
         row = await self.db.dequeue_next_request()
+        self.metrics.dequeue_time.observe(time.perf_counter() - start)
 
         if row is None:
             return None
 
         request_id = row[0]
-        parent_request_id = row[28]  # Last column in RETURNING clause
+        parent_request_id = row[28]
+        probe = row[29]
 
-        # Deserialize using the first 28 columns (excluding parent_request_id)
+        # Deserialize using the first 28 columns (excluding parent_request_id
+        # and probe)
         request = self._deserialize_request(row[:28])
+        if probe is not None and isinstance(request, Request):
+            request = request.as_probe(probe)
         return (request_id, request, parent_request_id)
 
     def _deserialize_request(self, row: tuple[Any, ...]) -> BaseRequest:
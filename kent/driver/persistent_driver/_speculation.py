@@ -61,6 +61,7 @@ class SpeculationMixin(AsyncSpeculationSupport):
             is_speculative=request_data["is_speculative"],
             speculation_id=request_data["speculation_id"],
             verify=request_data.get("verify"),
+            probe=request_data["probe"],
         )
 
     async def _after_outcome(self, spec_state: SpeculationState) -> None:
@@ -76,6 +77,8 @@ class SpeculationMixin(AsyncSpeculationSupport):
             stopped=spec_state.stopped,
             param_index=spec_state.param_index,
             template_json=template_json,
+            search_probes=spec_state.search_probes,
+            probes_saved=spec_state.probes_saved,
         )
 
     # --- Persistent-only: resume state from DB ---
@@ -97,6 +100,8 @@ class SpeculationMixin(AsyncSpeculationSupport):
                 spec_state.consecutive_failures = saved["consecutive_failures"]
                 spec_state.current_ceiling = saved["current_ceiling"]
                 spec_state.stopped = saved["stopped"]
+                spec_state.search_probes = saved["search_probes"]
+                spec_state.probes_saved = saved["probes_saved"]
             elif "template_json" in saved and saved["template_json"]:
                 # State exists in DB but not in current discovery.
                 # Try to reconstruct from template_json if possible.
@@ -139,6 +144,8 @@ class SpeculationMixin(AsyncSpeculationSupport):
                             consecutive_failures=saved["consecutive_failures"],
                             current_ceiling=saved["current_ceiling"],
                             stopped=saved["stopped"],
+                            search_probes=saved["search_probes"],
+                            probes_saved=saved["probes_saved"],
                         )
                         self._speculation_state[func_name] = spec_state
                     except Exception:
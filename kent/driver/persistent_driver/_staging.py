@@ -138,6 +138,10 @@ class StagedWrites:
     ) -> list[dict[str, Any]]:
         """Commit all buffered writes in a single transaction.
 
+        The parent's ``child_count`` and ``result_count`` are bumped by
+        schema triggers as the rows are inserted, so they commit (or
+        roll back) together with them.
+
         Returns the list of progress-event payloads for newly-inserted
         requests, so the caller can fire them post-commit (cross-step
         dedup'd inserts are omitted).
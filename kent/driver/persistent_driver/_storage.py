@@ -4,11 +4,16 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from kent.data_types import Response
+from kent.driver._ranged_download import PartialDownload
+from kent.driver.persistent_driver._post_archive import PostArchiveJob
 from kent.driver.persistent_driver.sql_manager import SQLManager
 
+if TYPE_CHECKING:
+    from kent.driver.persistent_driver.metrics import DriverMetrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +26,11 @@ class StorageMixin:
 
     db: SQLManager
     max_backoff_time: float
+    metrics: DriverMetrics
+
+    if TYPE_CHECKING:
+
+        async def _submit_post_archive(self, job: PostArchiveJob) -> None: ...
 
     async def _mark_request_completed(self, request_id: int) -> None:
         """Mark a request as completed in the database.
@@ -99,6 +109,37 @@ class StorageMixin:
 
         return next_retry_delay
 
+    async def _load_partial_download(self, url: str) -> PartialDownload | None:
+        """Return recorded progress of a ranged download of ``url``.
+
+        Stored in ``archive_partials`` so a retry (or a later run) resumes
+        from the last durable offset.
+        """
+        row = await self.db.load_archive_partial(url)
+        if row is None:
+            return None
+        return PartialDownload(
+            url=row["url"],
+            temp_path=row["temp_path"],
+            total_size=row["total_size"],
+            validator=row["validator"],
+            segments=json.loads(row["segments_json"]),
+        )
+
+    async def _save_partial_download(self, partial: PartialDownload) -> None:
+        """Record durable progress of a ranged download."""
+        await self.db.save_archive_partial(
+            url=partial.url,
+            temp_path=partial.temp_path,
+            total_size=partial.total_size,
+            validator=partial.validator,
+            segments_json=partial.segments_json(),
+        )
+
+    async def _clear_partial_download(self, url: str) -> None:
+        """Forget progress of a finished or abandoned ranged download."""
+        await self.db.delete_archive_partial(url)
+
     async def _store_response(
         self,
         request_id: int,
@@ -110,7 +151,8 @@ class StorageMixin:
 
         For regular responses, content is compressed and stored in the responses table.
         For ArchiveResponse, content is NOT stored (it's already on disk); instead,
-        file metadata is stored in the archived_files table.
+        file metadata is stored in the archived_files table and the file is
+        queued for the post-archive stage.
 
         Args:
             request_id: The database ID of the associated request.
@@ -160,6 +202,10 @@ class StorageMixin:
                     db_lock=self.db._lock,
                 )
                 content_size_compressed = len(compressed)
+                if content_size_compressed:
+                    self.metrics.compression_ratio.labels(
+                        continuation
+                    ).observe(content_size_original / content_size_compressed)
             else:
                 compressed = b""
                 dict_id = None
@@ -188,13 +234,21 @@ class StorageMixin:
             ):
                 expected_type = response.request.expected_type
 
-            await self._store_archived_file(
+            archived_file_id = await self._store_archived_file(
                 request_id=request_id,
                 file_path=response.file_url,
                 original_url=response.url,
                 expected_type=expected_type,
                 content=response.content,
             )
+            await self._submit_post_archive(
+                PostArchiveJob(
+                    archived_file_id=archived_file_id,
+                    request_id=request_id,
+                    file_path=response.file_url,
+                    expected_type=expected_type,
+                )
+            )
 
         return request_id
 
@@ -208,29 +262,27 @@ class StorageMixin:
     ) -> int:
         """Store archived file metadata in the database.
 
+        The content hash (and, for streamed files, the size) is filled in
+        later by the post-archive stage, which reads the file from disk
+        instead of hashing ``content`` on the request path.
+
         Args:
             request_id: The database ID of the associated request.
             file_path: Local file system path where the file is stored.
             original_url: The URL the file was downloaded from.
             expected_type: Expected file type (pdf, audio, etc.).
-            content: File content for computing hash and size.
+            content: File content, used only for its size when present.
 
         Returns:
             The database ID of the archived file record.
         """
-        import hashlib
-
-        # Compute file size and content hash
-        file_size = len(content) if content else 0
-        content_hash = hashlib.sha256(content).hexdigest() if content else None
-
         return await self.db.store_archived_file(
             request_id=request_id,
             file_path=file_path,
             original_url=original_url,
             expected_type=expected_type,
-            file_size=file_size,
-            content_hash=content_hash,
+            file_size=len(content) if content else None,
+            content_hash=None,
         )
 
     @staticmethod
@@ -0,0 +1,85 @@
+"""TextIndexMixin - Keeps the response text index current during a run.
+
+With ``PersistentDriver.open(..., text_index=True)`` a background task
+updates the run's full-text side index
+(:mod:`~kent.driver.persistent_driver.text_index`) every
+``text_index_interval`` seconds while workers run, and once more when
+the run finishes. Each pass indexes only responses stored since the
+previous one. Indexing failures are logged; they never stop the run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from kent.driver.persistent_driver.sql_manager import SQLManager
+from kent.driver.persistent_driver.text_index import (
+    ResponseTextIndex,
+    update_text_index,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TextIndexMixin:
+    """Periodic text index updates while :meth:`run` is active.
+
+    Tunables (override on a subclass or instance):
+
+    - ``text_index_interval``: seconds between index passes.
+    """
+
+    db: SQLManager
+
+    text_index_interval: float = 30.0
+
+    # Set by open(text_index=True); None disables indexing.
+    text_index_path: Path | None = None
+    _text_index_task: asyncio.Task[None] | None = None
+
+    def _start_text_index(self) -> None:
+        """Start the background indexing task, if enabled."""
+        if self.text_index_path is None:
+            return
+        self._text_index_task = asyncio.create_task(self._text_index_loop())
+
+    async def _stop_text_index(self, final_pass: bool) -> None:
+        """Stop the task, then index what is left if ``final_pass``."""
+        task = self._text_index_task
+        if task is None:
+            return
+        self._text_index_task = None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if final_pass:
+            await self._update_text_index_once()
+
+    async def _text_index_loop(self) -> None:
+        while True:
+            await self._update_text_index_once()
+            await asyncio.sleep(self.text_index_interval)
+
+    async def _update_text_index_once(self) -> None:
+        assert self.text_index_path is not None
+        try:
+            index = ResponseTextIndex(self.text_index_path)
+            try:
+                update = await update_text_index(
+                    self.db._session_factory, index
+                )
+            finally:
+                index.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(
+                f"Text index update failed for {self.text_index_path}"
+            )
+            return
+        if update.indexed:
+            logger.debug(
+                f"Indexed {update.indexed} responses "
+                f"(high-water mark {update.high_water})"
+            )
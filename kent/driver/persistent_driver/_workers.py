@@ -5,7 +5,9 @@ from __future__ import annotations
 import asyncio
 import functools
 import logging
+import time
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
 
 from pyrate_limiter import Limiter
 
@@ -41,6 +43,7 @@ if TYPE_CHECKING:
         AsyncArchiveHandler,
         AsyncStreamingArchiveHandler,
     )
+    from kent.driver.persistent_driver.metrics import DriverMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +56,7 @@ class WorkerMixin:
     """
 
     db: SQLManager
+    metrics: DriverMetrics
     scraper: BaseScraper
     stop_event: asyncio.Event
     max_workers: int
@@ -138,6 +142,10 @@ class WorkerMixin:
             self, request: BaseRequest, response: Response
         ) -> None: ...
 
+        async def _refill_speculation(self) -> bool: ...
+
+        def _is_speculation_success(self, response: Response) -> bool: ...
+
         # Provided by AsyncDriver
         async def resolve_request(self, request: BaseRequest) -> Response: ...
 
@@ -475,7 +483,13 @@ class WorkerMixin:
                                 await self.db.count_pending_requests()
                             )
 
-                            if in_progress_count == 0 and pending_count == 0:
+                            if (
+                                in_progress_count == 0
+                                and pending_count == 0
+                                and await self._refill_speculation()
+                            ):
+                                consecutive_empty = 0
+                            elif in_progress_count == 0 and pending_count == 0:
                                 consecutive_empty += 1
                                 if (
                                     consecutive_empty >= 6
@@ -618,6 +632,9 @@ class WorkerMixin:
             except TransientException as e:
                 retry_delay = await self._handle_retry(request_id, e)
                 if retry_delay is not None:
+                    self.metrics.retries.labels(
+                        urlsplit(request.request.url).hostname or ""
+                    ).inc()
                     # Log at warning level without full traceback for transient errors
                     logger.warning(
                         f"Worker {worker_id} transient error on request "
@@ -698,6 +715,10 @@ class WorkerMixin:
                 )
                 if request.is_speculative and self._speculation_state:
                     await self._track_speculation_outcome(request, synthetic)
+                if request.probe is not None:
+                    await self._store_response(
+                        request_id, synthetic, "", "failure"
+                    )
                 await self._mark_request_completed(request_id)
                 await self._emit_progress(
                     "request_completed",
@@ -826,6 +847,7 @@ class WorkerMixin:
                 metadata.auto_await_timeout if metadata else None
             )
 
+        step_start = time.perf_counter()
         if page is not None and auto_await_timeout:
             await self._process_generator_with_autowait(
                 continuation,
@@ -848,7 +870,12 @@ class WorkerMixin:
                 page=page,
             )
 
+        flush_start = time.perf_counter()
+        self.metrics.step_time.labels(continuation_name).observe(
+            flush_start - step_start
+        )
         emitted_events = await staged.flush(self.db)
+        self.metrics.flush_time.observe(time.perf_counter() - flush_start)
         for event in emitted_events:
             await self._emit_progress("request_enqueued", event)
 
@@ -874,6 +901,7 @@ class WorkerMixin:
                 redundant ``should_download()`` call.
         """
         logger.info(f"Request {request_id}: starting HTTP fetch")
+        fetch_start = time.perf_counter()
         response: Response = (
             await self.resolve_archive_request(
                 request, archive_decision=archive_decision
@@ -881,6 +909,11 @@ class WorkerMixin:
             if request.archive
             else await self.resolve_request(request)
         )
+        if archive_decision is None or archive_decision.download:
+            # A skipped archive download makes no HTTP call.
+            self.metrics.http_latency.labels(
+                urlsplit(request.request.url).hostname or ""
+            ).observe(time.perf_counter() - fetch_start)
         logger.info(
             f"Request {request_id}: HTTP fetch complete, status={response.status_code}"
         )
@@ -889,9 +922,25 @@ class WorkerMixin:
         if request.is_speculative and self._speculation_state:
             await self._track_speculation_outcome(request, response)
 
-        await self._complete_request(
-            request_id, response, request, continuation_name
-        )
+        if request.probe is not None:
+            # An existence probe only records its outcome; on success the
+            # full request was enqueued by _track_speculation_outcome.
+            outcome = (
+                "success"
+                if self._is_speculation_success(response)
+                else "failure"
+            )
+            await self._complete_request(
+                request_id,
+                response,
+                request,
+                "",
+                speculation_outcome=outcome,
+            )
+        else:
+            await self._complete_request(
+                request_id, response, request, continuation_name
+            )
 
         await self._emit_progress(
             "request_completed",
@@ -5,6 +5,7 @@ LocalDevDriver run databases.
 
 Usage:
     pdd --db run.db info                        # Show run metadata and stats
+    pdd --db run.db metrics                     # Latency histograms and gauges
     pdd --db run.db requests list               # List requests (with responses)
     pdd --db run.db requests show <id>          # Show request details
     pdd --db run.db requests search <query>     # Search response content
@@ -19,6 +20,7 @@ Usage:
     pdd --db run.db scrape estimates            # Check estimate accuracy
     pdd --db run.db step re-evaluate <step>     # Re-evaluate a step
     pdd --db run.db step xpath-stats <step>     # XPath selector statistics
+    pdd store stats --store DIR                 # Archive store reuse savings
 
 The --db option can be placed at any level:
     pdd --db run.db scrape health
@@ -382,6 +384,58 @@ def info(
     asyncio.run(run())
 
 
+# =========================================================================
+# Metrics Command
+# =========================================================================
+
+
+@cli.command()
+@click.option(
+    "--exposition",
+    is_flag=True,
+    help="Print the Prometheus text exposition format instead",
+)
+@db_option
+@format_options
+@click.pass_context
+def metrics(
+    ctx: click.Context,
+    exposition: bool,
+    db_path: str | None,
+    format_type: str,
+    template_name: str | None,
+) -> None:
+    """Show a metrics snapshot rebuilt from the run database.
+
+    Request duration and retries per host, compression ratio per
+    continuation, and queue depth. Step, flush and lock-wait timings
+    are only recorded by a live driver (``kent serve`` at /metrics).
+
+    \b
+    Examples:
+        pdd metrics --db run.db
+        pdd metrics --db run.db --format json
+        pdd metrics --db run.db --exposition
+    """
+    db_path = _resolve_db_path(ctx, db_path)
+
+    async def run() -> None:
+        async with LocalDevDriverDebugger.open(db_path) as debugger:
+            registry = await debugger.get_metrics()
+
+        if exposition:
+            click.echo(registry.render(), nl=False)
+            return
+        render_output(
+            registry.snapshot(),
+            format_type=format_type,
+            template_path="metrics",
+            template_name=template_name or "default",
+        )
+
+    asyncio.run(run())
+
+
 # =========================================================================
 # Main Entry Point
 # =========================================================================
@@ -461,6 +515,9 @@ from kent.driver.persistent_driver.cli import (
 from kent.driver.persistent_driver.cli import (
     step as _step_mod,
 )
+from kent.driver.persistent_driver.cli import (
+    store as _store_mod,
+)
 
 if __name__ == "__main__":
     main()
@@ -59,6 +59,22 @@ _offset_option = click.option(
 )
 
 
+_cursor_option = click.option(
+    "--cursor",
+    default=None,
+    help="Continue from the next-page cursor a previous page printed",
+)
+
+
+_total_option = click.option(
+    "--total",
+    "total_mode",
+    type=click.Choice(("exact", "approximate", "none")),
+    default="approximate",
+    help="How to count the total (approximate: maintained counters)",
+)
+
+
 def format_options(f: F) -> F:
     """Adds ``--format`` and ``--template``."""
     return _format_option(_template_option(f))
@@ -69,6 +85,11 @@ def pagination_options(f: F) -> F:
     return _limit_option(_offset_option(f))
 
 
+def cursor_options(f: F) -> F:
+    """Adds ``--cursor`` and ``--total`` for keyset-paginated lists."""
+    return _cursor_option(_total_option(f))
+
+
 def search_options(f: F) -> F:
     """Adds ``--text``, ``--regex``, ``--xpath``."""
     f = click.option(
@@ -81,3 +102,47 @@ def search_options(f: F) -> F:
         "--text", "text_pattern", help="Plain text to search for"
     )(f)
     return f
+
+
+def search_filter_options(f: F) -> F:
+    """Adds the search prefilters, ``--limit``, ``--processes``, ``--index``."""
+    f = click.option(
+        "--index",
+        "use_index",
+        is_flag=True,
+        default=False,
+        help=(
+            "Answer --text from the text index (matches page text, not markup)"
+        ),
+    )(f)
+    f = click.option(
+        "--processes",
+        type=click.IntRange(min=0),
+        default=None,
+        help="Matching processes (default: one per CPU; 0 = no pool)",
+    )(f)
+    f = click.option(
+        "--limit",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Stop after this many matches",
+    )(f)
+    f = click.option(
+        "--max-size",
+        type=int,
+        default=None,
+        help="Only search responses at most this many bytes",
+    )(f)
+    f = click.option(
+        "--min-size",
+        type=int,
+        default=None,
+        help="Only search responses at least this many bytes",
+    )(f)
+    f = click.option(
+        "--status-code",
+        type=int,
+        default=None,
+        help="Only search responses with this HTTP status code",
+    )(f)
+    return f
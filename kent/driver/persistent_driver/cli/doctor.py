@@ -279,6 +279,50 @@ def doctor_estimates(
     asyncio.run(run())
 
 
+@doctor.command("counters")
+@click.option(
+    "--fix",
+    is_flag=True,
+    help="Rewrite drifted counters from a recount",
+)
+@db_option
+@format_options
+@click.pass_context
+def doctor_counters(
+    ctx: click.Context,
+    db_path: str | None,
+    format_type: str,
+    fix: bool,
+    template_name: str | None,
+) -> None:
+    """Reconcile the request and result counters with a recount.
+
+    The queue and result statistics read counters kept up to date by
+    triggers. This recounts the requests and results tables and reports
+    any counter that disagrees.
+
+    \b
+    Examples:
+        ldd-debug doctor counters --db run.db
+        ldd-debug doctor counters --db run.db --fix
+    """
+    db_path = _resolve_db_path(ctx, db_path)
+
+    async def run() -> None:
+        async with LocalDevDriverDebugger.open(
+            db_path, read_only=not fix
+        ) as debugger:
+            result = await debugger.check_counters(fix=fix)
+            render_output(
+                result,
+                format_type=format_type,
+                template_path="doctor/counters",
+                template_name=template_name or "default",
+            )
+
+    asyncio.run(run())
+
+
 @doctor.command("structure")
 @click.option(
     "--step", "step_name", default=None, help="Filter to a specific step name"
@@ -12,12 +12,14 @@ from kent.driver.persistent_driver.cli import (
     register_cli_group,
 )
 from kent.driver.persistent_driver.cli._options import (
+    cursor_options,
     db_option,
     format_options,
     pagination_options,
 )
 from kent.driver.persistent_driver.cli.templating import render_output
 from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.sql_manager import TotalMode
 
 # =========================================================================
 # Errors Commands
@@ -38,6 +40,7 @@ errors = register_cli_group("errors", "Inspect and manipulate errors.")
 @db_option
 @format_options
 @pagination_options
+@cursor_options
 @click.pass_context
 def errors_list(
     ctx: click.Context,
@@ -47,6 +50,8 @@ def errors_list(
     step: str | None,
     limit: int,
     offset: int,
+    cursor: str | None,
+    total_mode: TotalMode,
     format_type: str,
     template_name: str | None,
 ) -> None:
@@ -63,13 +68,18 @@ def errors_list(
 
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
-            page = await debugger.list_errors(
-                error_type=error_type,
-                is_resolved=resolved,
-                continuation=step,
-                limit=limit,
-                offset=offset,
-            )
+            try:
+                page = await debugger.list_errors(
+                    error_type=error_type,
+                    is_resolved=resolved,
+                    continuation=step,
+                    limit=limit,
+                    offset=offset,
+                    cursor=cursor,
+                    total=total_mode,
+                )
+            except ValueError as e:
+                raise click.BadParameter(str(e), param_hint="--cursor") from e
 
             output = {
                 "total": page.total,
@@ -77,6 +87,7 @@ def errors_list(
                 "limit": limit,
                 "offset": offset,
                 "has_more": page.has_more,
+                "next_cursor": page.next_cursor,
             }
             render_output(
                 output,
@@ -25,7 +25,10 @@ from typing import Any, TypeVar
 import click
 
 from kent.cli import import_scraper
-from kent.driver.local_only_driver import LocalOnlyDriver
+from kent.driver.local_only_driver import (
+    LocalOnlyDriver,
+    run_sharded_replay,
+)
 from kent.driver.persistent_driver.cli import cli
 
 F = TypeVar("F", bound=Callable[..., Any])
@@ -59,6 +62,14 @@ def _shared_options(f: F) -> F:
             "`kent run --params`. Used to seed the output DB on first run."
         ),
     )(f)
+    f = click.option(
+        "--rebuild-index",
+        is_flag=True,
+        help=(
+            "Rebuild the source-routing index from scratch instead of "
+            "reusing the one left by an earlier replay."
+        ),
+    )(f)
     f = click.option(
         "--index-db",
         "index_db_path",
@@ -66,7 +77,19 @@ def _shared_options(f: F) -> F:
         default=None,
         help=(
             "Path for the on-disk source-routing index. Default is "
-            "in-memory (:memory:); set this for very large consolidations."
+            "<output>.source-index. A later replay of the same sources "
+            "reuses it and merges in only rows added since."
+        ),
+    )(f)
+    f = click.option(
+        "--shards",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help=(
+            "Number of processes to spread the replay across. Each "
+            "replays a slice of the crawl into its own copy of the "
+            "output DB; the copies are merged at the end."
         ),
     )(f)
     f = click.option(
@@ -74,7 +97,7 @@ def _shared_options(f: F) -> F:
         type=int,
         default=4,
         show_default=True,
-        help="Number of concurrent worker tasks.",
+        help="Number of concurrent worker tasks (per shard).",
     )(f)
     f = click.option(
         "--output",
@@ -128,7 +151,9 @@ def replay_strict(
     source_dbs: tuple[Path, ...],
     output_path: Path,
     workers: int,
+    shards: int,
     index_db_path: Path | None,
+    rebuild_index: bool,
     params_json: str | None,
     verbose: bool,
     miss_policy: str,
@@ -150,7 +175,9 @@ def replay_strict(
         miss_policy=miss_policy,
         trust_subtree_after_retry=False,
         workers=workers,
+        shards=shards,
         index_db_path=index_db_path,
+        rebuild_index=rebuild_index,
         params_json=params_json,
         verbose=verbose,
     )
@@ -175,7 +202,9 @@ def replay_lenient(
     source_dbs: tuple[Path, ...],
     output_path: Path,
     workers: int,
+    shards: int,
     index_db_path: Path | None,
+    rebuild_index: bool,
     params_json: str | None,
     verbose: bool,
     miss_policy: str,
@@ -198,7 +227,9 @@ def replay_lenient(
         miss_policy=miss_policy,
         trust_subtree_after_retry=trust_subtree_after_retry,
         workers=workers,
+        shards=shards,
         index_db_path=index_db_path,
+        rebuild_index=rebuild_index,
         params_json=params_json,
         verbose=verbose,
     )
@@ -211,7 +242,9 @@ def replay_error_stubs(
     source_dbs: tuple[Path, ...],
     output_path: Path,
     workers: int,
+    shards: int,
     index_db_path: Path | None,
+    rebuild_index: bool,
     params_json: str | None,
     verbose: bool,
 ) -> None:
@@ -234,7 +267,9 @@ def replay_error_stubs(
         miss_policy="stub",
         trust_subtree_after_retry=False,
         workers=workers,
+        shards=shards,
         index_db_path=index_db_path,
+        rebuild_index=rebuild_index,
         params_json=params_json,
         verbose=verbose,
     )
@@ -249,7 +284,9 @@ def _run_replay(
     miss_policy: str,
     trust_subtree_after_retry: bool,
     workers: int,
+    shards: int,
     index_db_path: Path | None,
+    rebuild_index: bool,
     params_json: str | None,
     verbose: bool,
 ) -> None:
@@ -279,8 +316,30 @@ def _run_replay(
     click.echo(f"Sources:   {[str(p) for p in source_dbs]}")
     click.echo(f"Output:    {output_path}")
     click.echo(f"Workers:   {workers}")
+    if shards > 1:
+        click.echo(f"Shards:    {shards}")
 
     async def _go() -> None:
+        if shards > 1:
+            result = await run_sharded_replay(
+                scraper_instance,
+                output_path,
+                source_db_paths=source_dbs,
+                shards=shards,
+                miss_policy=miss_policy,  # type: ignore[arg-type]
+                mode=mode,  # type: ignore[arg-type]
+                trust_subtree_after_retry=trust_subtree_after_retry,
+                index_db_path=index_db_path,
+                rebuild_index=rebuild_index,
+                num_workers=workers,
+                seed_params=seed_params,
+            )
+            click.echo(
+                f"Sharded:   {result.frontier} frontier requests across "
+                f"{result.shards} shards, {result.duplicates_dropped} "
+                "duplicates dropped"
+            )
+            return
         async with LocalOnlyDriver.open(
             scraper=scraper_instance,
             db_path=output_path,
@@ -289,6 +348,7 @@ def _run_replay(
             mode=mode,  # type: ignore[arg-type]
             trust_subtree_after_retry=trust_subtree_after_retry,
             index_db_path=index_db_path,
+            rebuild_index=rebuild_index,
             num_workers=workers,
             seed_params=seed_params,
         ) as driver:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 
@@ -13,13 +14,16 @@ from kent.driver.persistent_driver.cli import (
     register_cli_group,
 )
 from kent.driver.persistent_driver.cli._options import (
+    cursor_options,
     db_option,
     format_options,
     pagination_options,
+    search_filter_options,
     search_options,
 )
 from kent.driver.persistent_driver.cli.templating import render_output
 from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.sql_manager import TotalMode
 
 # =========================================================================
 # Requests Commands
@@ -36,6 +40,7 @@ requests = register_cli_group("requests", "Inspect and manipulate requests.")
 @db_option
 @format_options
 @pagination_options
+@cursor_options
 @click.pass_context
 def requests_list(
     ctx: click.Context,
@@ -44,6 +49,8 @@ def requests_list(
     step: str | None,
     limit: int,
     offset: int,
+    cursor: str | None,
+    total_mode: TotalMode,
     format_type: str,
     template_name: str | None,
 ) -> None:
@@ -54,18 +61,24 @@ def requests_list(
         pdd requests list --db run.db
         pdd requests list --db run.db --status failed
         pdd requests list --db run.db --step step1 --limit 50
+        pdd requests list --db run.db --cursor <next page cursor>
     """
 
     db_path = _resolve_db_path(ctx, db_path)
 
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
-            page = await debugger.list_requests(
-                status=status,  # type: ignore
-                continuation=step,
-                limit=limit,
-                offset=offset,
-            )
+            try:
+                page = await debugger.list_requests(
+                    status=status,  # type: ignore
+                    continuation=step,
+                    limit=limit,
+                    offset=offset,
+                    cursor=cursor,
+                    total=total_mode,
+                )
+            except ValueError as e:
+                raise click.BadParameter(str(e), param_hint="--cursor") from e
 
             output = {
                 "total": page.total,
@@ -84,6 +97,7 @@ def requests_list(
                 "limit": limit,
                 "offset": offset,
                 "has_more": page.has_more,
+                "next_cursor": page.next_cursor,
             }
             render_output(
                 output,
@@ -278,6 +292,7 @@ def requests_content(
 @db_option
 @format_options
 @search_options
+@search_filter_options
 @click.pass_context
 def requests_search(
     ctx: click.Context,
@@ -286,6 +301,12 @@ def requests_search(
     regex_pattern: str | None,
     xpath_expr: str | None,
     step: str | None,
+    status_code: int | None,
+    min_size: int | None,
+    max_size: int | None,
+    limit: int | None,
+    processes: int | None,
+    use_index: bool,
     format_type: str,
     template_name: str | None,
 ) -> None:
@@ -293,12 +314,18 @@ def requests_search(
 
     Searches through all response content (decompressed) for matches.
     Exactly one of --text, --regex, or --xpath must be provided.
+    --step, --status-code and the size bounds narrow the search
+    in SQL before anything is decompressed. Responses are matched in
+    parallel; with --format jsonl, matches print as they are found.
+    With --index, --text is answered from the run's text index (pdd
+    responses index) and matches page text rather than markup.
 
     \b
     Examples:
         pdd requests search --db run.db --text "error"
         pdd requests search --db run.db --regex "case.*\\\\d{4}"
         pdd requests search --db run.db --xpath "//div[@class='opinion']"
+        pdd requests search --db run.db --text "docket" --limit 10 --format jsonl
     """
     # Validate exactly one search type is provided
     search_types = [text_pattern, regex_pattern, xpath_expr]
@@ -315,16 +342,25 @@ def requests_search(
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
             try:
-                matches = await debugger.search_responses(
+                search = debugger.iter_search_responses(
                     text=text_pattern,
                     regex=regex_pattern,
                     xpath=xpath_expr,
                     continuation=step,
+                    status_code=status_code,
+                    min_size=min_size,
+                    max_size=max_size,
+                    limit=limit,
+                    processes=processes,
+                    use_index=use_index,
                 )
+                if format_type == "jsonl":
+                    async for match in search:
+                        click.echo(json.dumps(match))
+                    return
 
-                output = {
-                    "items": matches,
-                }
+                matches = [match async for match in search]
+                output = {"items": matches}
                 render_output(
                     output,
                     format_type=format_type,
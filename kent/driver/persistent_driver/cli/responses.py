@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 
@@ -13,13 +14,16 @@ from kent.driver.persistent_driver.cli import (
     register_cli_group,
 )
 from kent.driver.persistent_driver.cli._options import (
+    cursor_options,
     db_option,
     format_options,
     pagination_options,
+    search_filter_options,
     search_options,
 )
 from kent.driver.persistent_driver.cli.templating import render_output
 from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.sql_manager import TotalMode
 
 # =========================================================================
 # Responses Commands
@@ -34,6 +38,7 @@ responses = register_cli_group("responses", "Inspect responses.")
 @db_option
 @format_options
 @pagination_options
+@cursor_options
 @click.pass_context
 def responses_list(
     ctx: click.Context,
@@ -41,6 +46,8 @@ def responses_list(
     continuation: str | None,
     limit: int,
     offset: int,
+    cursor: str | None,
+    total_mode: TotalMode,
     format_type: str,
     template_name: str | None,
 ) -> None:
@@ -56,9 +63,16 @@ def responses_list(
 
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
-            page = await debugger.list_responses(
-                continuation=continuation, limit=limit, offset=offset
-            )
+            try:
+                page = await debugger.list_responses(
+                    continuation=continuation,
+                    limit=limit,
+                    offset=offset,
+                    cursor=cursor,
+                    total=total_mode,
+                )
+            except ValueError as e:
+                raise click.BadParameter(str(e), param_hint="--cursor") from e
 
             output = {
                 "total": page.total,
@@ -77,6 +91,7 @@ def responses_list(
                 "limit": limit,
                 "offset": offset,
                 "has_more": page.has_more,
+                "next_cursor": page.next_cursor,
             }
             render_output(
                 output,
@@ -188,6 +203,7 @@ def responses_content(
 @db_option
 @format_options
 @search_options
+@search_filter_options
 @click.pass_context
 def responses_search(
     ctx: click.Context,
@@ -196,6 +212,12 @@ def responses_search(
     regex_pattern: str | None,
     xpath_expr: str | None,
     continuation: str | None,
+    status_code: int | None,
+    min_size: int | None,
+    max_size: int | None,
+    limit: int | None,
+    processes: int | None,
+    use_index: bool,
     format_type: str,
     template_name: str | None,
 ) -> None:
@@ -203,6 +225,11 @@ def responses_search(
 
     Searches through all response content (decompressed) for matches.
     Exactly one of --text, --regex, or --xpath must be provided.
+    --continuation, --status-code and the size bounds narrow the search
+    in SQL before anything is decompressed. Responses are matched in
+    parallel; with --format jsonl, matches print as they are found.
+    With --index, --text is answered from the run's text index (pdd
+    responses index) and matches page text rather than markup.
 
     \b
     Examples:
@@ -211,6 +238,7 @@ def responses_search(
         ldd-debug responses search run.db --xpath "//div[@class='opinion']"
         ldd-debug responses search run.db --text "verdict" --format json
         ldd-debug responses search run.db --text "verdict" --format jsonl
+        ldd-debug responses search run.db --text "verdict" --status-code 200 --limit 10
     """
     # Validate exactly one search type is provided
     search_types = [text_pattern, regex_pattern, xpath_expr]
@@ -227,13 +255,24 @@ def responses_search(
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
             try:
-                matches = await debugger.search_responses(
+                search = debugger.iter_search_responses(
                     text=text_pattern,
                     regex=regex_pattern,
                     xpath=xpath_expr,
                     continuation=continuation,
+                    status_code=status_code,
+                    min_size=min_size,
+                    max_size=max_size,
+                    limit=limit,
+                    processes=processes,
+                    use_index=use_index,
                 )
+                if format_type == "jsonl":
+                    async for match in search:
+                        click.echo(json.dumps(match))
+                    return
 
+                matches = [match async for match in search]
                 output = {"items": matches}
                 render_output(
                     output,
@@ -250,3 +289,56 @@ def responses_search(
                 sys.exit(1)
 
     asyncio.run(run())
+
+
+@responses.command("index")
+@click.option(
+    "--rebuild", is_flag=True, help="Discard the index and build it again"
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Extraction processes (default: one per CPU; 0 = no pool)",
+)
+@db_option
+@format_options
+@click.pass_context
+def responses_index(
+    ctx: click.Context,
+    db_path: str | None,
+    rebuild: bool,
+    processes: int | None,
+    format_type: str,
+    template_name: str | None,
+) -> None:
+    """Build or update the full-text index of response page text.
+
+    The index is a side file next to the run DB (<run>.db.text-index).
+    Each run indexes only responses stored since the last one; text
+    searches use the index once it exists.
+
+    \b
+    Examples:
+        pdd responses index --db run.db
+        pdd responses index --db run.db --rebuild
+    """
+    db_path = _resolve_db_path(ctx, db_path)
+
+    async def run() -> None:
+        async with LocalDevDriverDebugger.open(db_path) as debugger:
+            update = await debugger.update_text_index(
+                rebuild=rebuild, processes=processes
+            )
+            render_output(
+                {
+                    "path": str(debugger.text_index_path),
+                    "indexed": update.indexed,
+                    "high_water": update.high_water,
+                },
+                format_type=format_type,
+                template_path="responses/index",
+                template_name=template_name or "default",
+            )
+
+    asyncio.run(run())
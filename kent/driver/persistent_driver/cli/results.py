@@ -7,17 +7,21 @@ import sys
 
 import click
 
+from kent.cli import import_scraper
 from kent.driver.persistent_driver.cli import (
     _resolve_db_path,
     register_cli_group,
 )
 from kent.driver.persistent_driver.cli._options import (
+    cursor_options,
     db_option,
     format_options,
     pagination_options,
 )
 from kent.driver.persistent_driver.cli.templating import render_output
 from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.results_export import EXPORT_COMPRESSIONS
+from kent.driver.persistent_driver.sql_manager import TotalMode
 
 # =========================================================================
 # Results Commands
@@ -35,6 +39,7 @@ results = register_cli_group("results", "Inspect and export results.")
 @db_option
 @format_options
 @pagination_options
+@cursor_options
 @click.pass_context
 def results_list(
     ctx: click.Context,
@@ -43,6 +48,8 @@ def results_list(
     valid: bool | None,
     limit: int,
     offset: int,
+    cursor: str | None,
+    total_mode: TotalMode,
     format_type: str,
     template_name: str | None,
 ) -> None:
@@ -58,12 +65,17 @@ def results_list(
 
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
-            page = await debugger.list_results(
-                result_type=result_type,
-                is_valid=valid,
-                limit=limit,
-                offset=offset,
-            )
+            try:
+                page = await debugger.list_results(
+                    result_type=result_type,
+                    is_valid=valid,
+                    limit=limit,
+                    offset=offset,
+                    cursor=cursor,
+                    total=total_mode,
+                )
+            except ValueError as e:
+                raise click.BadParameter(str(e), param_hint="--cursor") from e
 
             output = {
                 "total": page.total,
@@ -81,6 +93,7 @@ def results_list(
                 "limit": limit,
                 "offset": offset,
                 "has_more": page.has_more,
+                "next_cursor": page.next_cursor,
             }
             render_output(
                 output,
@@ -179,6 +192,33 @@ def results_summary(
 @click.option(
     "--valid/--invalid", default=None, help="Filter by validation status"
 )
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["jsonl", "parquet"]),
+    default="jsonl",
+    show_default=True,
+    help="jsonl: one file; parquet: one file per result type",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(EXPORT_COMPRESSIONS),
+    default=None,
+    help="Compress JSONL output (default: from a .gz or .zst suffix)",
+)
+@click.option(
+    "--scraper",
+    "scraper_path",
+    default=None,
+    help="Scraper (module:Class) whose models define Parquet columns "
+    "(default: from run metadata)",
+)
+@click.option(
+    "--row-group-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Rows per Parquet row group",
+)
 @db_option
 @click.pass_context
 def results_export(
@@ -187,23 +227,61 @@ def results_export(
     output_path: str,
     result_type: str | None,
     valid: bool | None,
+    export_format: str,
+    compression: str | None,
+    scraper_path: str | None,
+    row_group_size: int | None,
 ) -> None:
-    """Export results to JSONL (newline-delimited JSON) file.
+    """Export results to JSONL, or to Parquet files by result type.
+
+    Results stream from the database, so exports of any size run in
+    constant memory. JSONL output ending in .gz or .zst is compressed.
+    With --format parquet, OUTPUT_PATH is a directory that receives one
+    <ResultType>.parquet file per result type, typed from the scraper's
+    result models.
 
     \b
     Examples:
         pdd --db run.db results export results.jsonl
         pdd --db run.db results export opinions.jsonl --type CourtOpinion --valid
+        pdd --db run.db results export results.jsonl.zst
+        pdd --db run.db results export out/ --format parquet
     """
 
     db_path = _resolve_db_path(ctx, db_path)
+    if export_format == "parquet" and compression is not None:
+        raise click.UsageError("--compression applies to JSONL only")
+    scraper_class = import_scraper(scraper_path) if scraper_path else None
 
     async def run() -> None:
         async with LocalDevDriverDebugger.open(db_path) as debugger:
-            count = await debugger.export_results_jsonl(
-                output_path, result_type=result_type, is_valid=valid
+            if export_format == "jsonl":
+                count = await debugger.export_results_jsonl(
+                    output_path,
+                    result_type=result_type,
+                    is_valid=valid,
+                    compression=compression,
+                )
+                click.echo(f"Exported {count} results to {output_path}")
+                return
+            try:
+                counts = await debugger.export_results_parquet(
+                    output_path,
+                    result_type=result_type,
+                    is_valid=valid,
+                    scraper_class=scraper_class,
+                    row_group_size=row_group_size,
+                )
+            except ImportError as e:
+                raise click.ClickException(
+                    f"Missing dependency: {e}. "
+                    "Install the 'parquet' extra: pip install kent[parquet]"
+                ) from e
+            for rtype, count in counts.items():
+                click.echo(f"Exported {count} {rtype} results")
+            click.echo(
+                f"Exported {sum(counts.values())} results to {output_path}"
             )
-            click.echo(f"Exported {count} results to {output_path}")
 
     asyncio.run(run())
 
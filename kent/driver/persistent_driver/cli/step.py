@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import sys
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, TypeVar
 
 import click
 
@@ -20,6 +21,10 @@ from kent.driver.persistent_driver.cli._options import (
 )
 from kent.driver.persistent_driver.cli.templating import render_output
 from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.result_pairing import PAIRING_MODES
+from kent.driver.persistent_driver.step_eval import StepEvalProgress
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 step = register_cli_group(
     "step", "Step-level development and debugging tools."
@@ -128,6 +133,32 @@ async def _resolve_scraper_and_requests(
     return scraper_cls, request_ids
 
 
+def replay_options(func: F) -> F:
+    """Adds ``--processes`` and ``--no-cache`` to step replay commands."""
+    func = click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Replay every request, ignoring and not updating the step cache",
+    )(func)
+    return click.option(
+        "--processes",
+        type=click.IntRange(min=0),
+        default=None,
+        help="Replay processes (default: one per CPU; 0 = no pool)",
+    )(func)
+
+
+def _echo_progress(progress: StepEvalProgress) -> None:
+    """Report replay progress on stderr about every 10%."""
+    total = progress.total or 0
+    if total > 10 and progress.done % max(1, total // 10) == 0:
+        click.echo(
+            f"  Progress: {progress.done}/{total} requests processed "
+            f"({progress.cached} cached)...",
+            err=True,
+        )
+
+
 # =========================================================================
 # Re-evaluate Command
 # =========================================================================
@@ -162,6 +193,15 @@ async def _resolve_scraper_and_requests(
     "--scraper-class",
     help="Scraper class path (e.g., juriscraper.opinions.united_states.federal_appellate.ca1.Site)",
 )
+@click.option(
+    "--pairing",
+    type=click.Choice(PAIRING_MODES),
+    default="greedy",
+    show_default=True,
+    help="How stored and new results are paired: closest first, or "
+    "minimizing the total distance",
+)
+@replay_options
 @db_option
 @format_options
 @click.pass_context
@@ -178,12 +218,20 @@ def re_evaluate(
     show_data: bool,
     limit: int | None,
     scraper_class: str | None,
+    processes: int | None,
+    no_cache: bool,
+    pairing: str,
 ) -> None:
     """Compare step output between stored and dry-run execution.
 
     Replays stored responses through current step code and compares
     the output (child requests, ParsedData, errors) against stored results.
 
+    Replays run on a process pool. Their output is cached next to the run
+    DB, keyed by the response and the step's code, so re-running after an
+    edit only replays the requests whose step changed. Use --no-cache
+    after changes the step fingerprint cannot see (e.g. in other modules).
+
     \b
     Examples:
         # Compare all requests for a step
@@ -206,6 +254,12 @@ def re_evaluate(
 
         # Limit to 50 comparisons
         pdd step re-evaluate --db run.db parse_opinions --limit 50
+
+        # Replay in 4 processes, ignoring cached output
+        pdd step re-evaluate --db run.db parse_opinions --processes 4 --no-cache
+
+        # Pair results to minimize the total edit distance
+        pdd step re-evaluate --db run.db parse_opinions --pairing optimal
     """
 
     db_path = _resolve_db_path(ctx, db_path)
@@ -230,21 +284,26 @@ def re_evaluate(
             results: list[ComparisonResult] = []
             summary = ComparisonSummary()
 
-            for req_id in request_ids:
-                try:
-                    # Compare entire tree starting from this request
-                    tree_results = await debugger.compare_request_tree(
-                        req_id, scraper_cls
-                    )
-                    for result in tree_results:
-                        results.append(result)
-                        summary.add_comparison(result)
-                except Exception as e:
+            # Follow the entire request tree of each selected request
+            tree_ids = await debugger.collect_request_trees(request_ids)
+            comparisons = debugger.compare_requests(
+                tree_ids,
+                scraper_cls,
+                processes=processes,
+                use_cache=not no_cache,
+                on_progress=_echo_progress,
+                pairing=pairing,
+            )
+            async for req_id, result, failure in comparisons:
+                if result is None:
                     click.echo(
-                        f"Warning: Failed to compare request {req_id}: {e}",
+                        f"Warning: Failed to compare request {req_id}: "
+                        f"{failure}",
                         err=True,
                     )
                     continue
+                results.append(result)
+                summary.add_comparison(result)
 
             # Build unified data dict
             def _result_to_dict(r: ComparisonResult) -> dict:
@@ -486,6 +545,7 @@ def _collect_queries_flat(
     is_flag=True,
     help="Include request IDs where the selector matched zero elements",
 )
+@replay_options
 @db_option
 @format_options
 @click.pass_context
@@ -501,12 +561,15 @@ def xpath_stats(
     template_name: str | None,
     xpath_name: str | None,
     list_non_matching: bool,
+    processes: int | None,
+    no_cache: bool,
 ) -> None:
     """Gather XPath/selector statistics across requests for a step.
 
     Replays stored responses through current step code with XPath
     observation active, then aggregates selector match statistics
-    across all processed requests.
+    across all processed requests. Replays run on a process pool and are
+    cached as for ``step re-evaluate``.
 
     \b
     Examples:
@@ -544,30 +607,25 @@ def xpath_stats(
             # Run each request with selector observer
             all_observations: list[tuple[int, list[dict[str, Any]]]] = []
             error_count = 0
-            total = len(request_ids)
-
-            for i, req_id in enumerate(request_ids, 1):
-                try:
-                    result = await debugger.run_with_selector_observer(
-                        req_id, scraper_cls
-                    )
-                    all_observations.append((req_id, result["queries"]))
-                    if result["error"]:
-                        error_count += 1
-                except (ValueError, Exception) as e:
+            observations = debugger.observe_selectors(
+                request_ids,
+                scraper_cls,
+                processes=processes,
+                use_cache=not no_cache,
+                on_progress=_echo_progress,
+            )
+            async for req_id, result, failure in observations:
+                if result is None:
                     click.echo(
-                        f"Warning: Failed to process request {req_id}: {e}",
+                        f"Warning: Failed to process request {req_id}: "
+                        f"{failure}",
                         err=True,
                     )
                     error_count += 1
                     continue
-
-                # Progress indicator for large runs
-                if total > 10 and i % max(1, total // 10) == 0:
-                    click.echo(
-                        f"  Progress: {i}/{total} requests processed...",
-                        err=True,
-                    )
+                all_observations.append((req_id, result["queries"]))
+                if result["error"]:
+                    error_count += 1
 
             # Aggregate statistics
             selector_stats, requests_with_failures = _aggregate_queries(
@@ -0,0 +1,67 @@
+"""CLI commands for inspecting a cross-run archive store."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import click
+
+from kent.driver.archive_store import INDEX_FILENAME, ArchiveStore
+from kent.driver.persistent_driver.cli import register_cli_group
+from kent.driver.persistent_driver.cli._options import format_options
+from kent.driver.persistent_driver.cli.templating import render_output
+
+# =========================================================================
+# Archive Store Commands
+# =========================================================================
+
+store = register_cli_group("store", "Inspect the shared archive store.")
+
+
+@store.command("stats")
+@click.option(
+    "--store",
+    "store_dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+    required=True,
+    help="Archive store directory (as passed to kent run --archive-store)",
+)
+@format_options
+def store_stats(
+    store_dir: str,
+    format_type: str,
+    template_name: str | None,
+) -> None:
+    """Report how much downloading and disk the store has saved.
+
+    Downloads avoided are keys served from the store instead of being
+    fetched again. Disk saved adds the files linked into runs and the
+    identical files shared between different keys.
+
+    \b
+    Examples:
+        pdd store stats --store runs/.archive_store
+        pdd store stats --store archive --format json
+    """
+    if not (Path(store_dir) / INDEX_FILENAME).exists():
+        raise click.ClickException(
+            f"{store_dir} is not an archive store (no {INDEX_FILENAME})"
+        )
+    stats = ArchiveStore(Path(store_dir)).stats()
+    output = {
+        "root": store_dir,
+        "keys": stats.keys,
+        "blobs": stats.blobs,
+        "stored_bytes": stats.stored_bytes,
+        "referenced_bytes": stats.referenced_bytes,
+        "hits": stats.hits,
+        "hit_bytes": stats.hit_bytes,
+        "dedup_saved_bytes": stats.dedup_saved_bytes,
+        "disk_saved_bytes": stats.hit_bytes + stats.dedup_saved_bytes,
+    }
+    render_output(
+        output,
+        format_type=format_type,
+        template_path="store/stats",
+        template_name=template_name or "default",
+    )
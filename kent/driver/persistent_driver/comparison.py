@@ -6,7 +6,7 @@ enables developers to understand how code changes affect scraper behavior.
 
 The comparison system supports:
 - Transitive child request tree comparison via parent_request_id
-- Levenshtein-based pairing of ParsedData results
+- Levenshtein-based pairing of ParsedData results (greedy or optimal)
 - Exact dict comparison with field-level diffs
 - Detection of added/removed requests and data
 - Error comparison (introduced/resolved/changed)
@@ -33,13 +33,15 @@ from kent.driver.persistent_driver.dry_run_driver import (
     CapturedRequest,
     DryRunResult,
 )
+from kent.driver.persistent_driver.result_pairing import (
+    levenshtein,
+    pair_indices,
+)
 
 
 def _levenshtein_distance(s1: str, s2: str) -> int:
     """Calculate Levenshtein distance between two strings.
 
-    Uses dynamic programming with O(min(m,n)) space complexity.
-
     Args:
         s1: First string.
         s2: Second string.
@@ -48,25 +50,7 @@ def _levenshtein_distance(s1: str, s2: str) -> int:
         Minimum number of single-character edits (insertions, deletions,
         or substitutions) needed to transform s1 into s2.
     """
-    if len(s1) < len(s2):
-        return _levenshtein_distance(s2, s1)
-
-    if len(s2) == 0:
-        return len(s1)
-
-    previous_row: list[int] = list(range(len(s2) + 1))
-
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            # Cost of insertions, deletions, or substitutions
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-
-    return previous_row[-1]
+    return levenshtein(s1, s2)
 
 
 def _serialize_for_comparison(data: dict[str, Any]) -> str:
@@ -82,24 +66,25 @@ def _serialize_for_comparison(data: dict[str, Any]) -> str:
 
 
 def _pair_results_by_levenshtein(
-    original: list[CapturedData], new: list[CapturedData]
+    original: list[CapturedData],
+    new: list[CapturedData],
+    pairing: str = "greedy",
 ) -> tuple[
     list[tuple[CapturedData, CapturedData]],
     list[CapturedData],
     list[CapturedData],
 ]:
-    """Pair original and new results using greedy Levenshtein distance matching.
-
-    Uses greedy assignment: finds the pair with minimum distance, removes both
-    from consideration, and repeats. This provides a simple and predictable
-    pairing strategy.
+    """Pair original and new results by Levenshtein distance.
 
-    Optimization: Pre-computes all JSON serializations and identifies exact
-    matches first to avoid expensive Levenshtein calculations when possible.
+    Exact matches pair first. With ``pairing="greedy"`` the rest pair
+    smallest distance first; with ``"optimal"`` they pair to minimize
+    the total distance. Large inputs are blocked to candidate pairs;
+    see :mod:`kent.driver.persistent_driver.result_pairing`.
 
     Args:
         original: List of original CapturedData results.
         new: List of new CapturedData results.
+        pairing: ``"greedy"`` or ``"optimal"``.
 
     Returns:
         Tuple of (paired_results, unpaired_original, unpaired_new):
@@ -116,60 +101,21 @@ def _pair_results_by_levenshtein(
     if not new:
         return [], original.copy(), []
 
-    # Pre-compute all JSON serializations once (major optimization)
-    original_strs = [_serialize_for_comparison(o.data) for o in original]
-    new_strs = [_serialize_for_comparison(n.data) for n in new]
-
-    # Track which indices are still available
-    available_orig: set[int] = set(range(len(original)))
-    available_new: set[int] = set(range(len(new)))
-    paired: list[tuple[CapturedData, CapturedData]] = []
-
-    # Phase 1: Find exact matches first (O(n*m) string comparisons, no Levenshtein)
-    # Build a map of new_str -> indices for fast lookup
-    new_str_to_indices: dict[str, list[int]] = {}
-    for j, ns in enumerate(new_strs):
-        new_str_to_indices.setdefault(ns, []).append(j)
-
-    for i in list(available_orig):
-        orig_str = original_strs[i]
-        if orig_str in new_str_to_indices:
-            # Find first available new index with exact match
-            for j in new_str_to_indices[orig_str]:
-                if j in available_new:
-                    paired.append((original[i], new[j]))
-                    available_orig.discard(i)
-                    available_new.discard(j)
-                    break
-
-    # Phase 2: Greedy Levenshtein pairing for remaining items
-    # Pre-compute distance matrix for remaining items (computed once)
-    if available_orig and available_new:
-        orig_indices = sorted(available_orig)
-        new_indices = sorted(available_new)
-
-        # Compute distance matrix once
-        distances: list[
-            tuple[int, int, int]
-        ] = []  # (distance, orig_idx, new_idx)
-        for i in orig_indices:
-            for j in new_indices:
-                dist = _levenshtein_distance(original_strs[i], new_strs[j])
-                distances.append((dist, i, j))
-
-        # Sort by distance for greedy selection
-        distances.sort(key=lambda x: x[0])
-
-        # Greedily pair by smallest distance
-        for _dist, i, j in distances:
-            if i in available_orig and j in available_new:
-                paired.append((original[i], new[j]))
-                available_orig.discard(i)
-                available_new.discard(j)
-
-    # Collect unpaired items
-    unpaired_original = [original[i] for i in sorted(available_orig)]
-    unpaired_new = [new[j] for j in sorted(available_new)]
+    pairs = pair_indices(
+        [_serialize_for_comparison(o.data) for o in original],
+        [_serialize_for_comparison(n.data) for n in new],
+        [o.data for o in original],
+        [n.data for n in new],
+        mode=pairing,
+    )
+    paired_orig = {i for i, _ in pairs}
+    paired_new = {j for _, j in pairs}
+
+    paired = [(original[i], new[j]) for i, j in pairs]
+    unpaired_original = [
+        o for i, o in enumerate(original) if i not in paired_orig
+    ]
+    unpaired_new = [n for j, n in enumerate(new) if j not in paired_new]
 
     return paired, unpaired_original, unpaired_new
 
@@ -423,6 +369,7 @@ def compare_continuation_output(
     continuation: str,
     original: DryRunResult,
     new: DryRunResult,
+    pairing: str = "greedy",
 ) -> ComparisonResult:
     """Compare continuation outputs between original and new code.
 
@@ -437,6 +384,8 @@ def compare_continuation_output(
         continuation: Continuation method name.
         original: DryRunResult from original code (loaded from database).
         new: DryRunResult from new code (dry-run replay).
+        pairing: How ParsedData results are paired, ``"greedy"`` or
+            ``"optimal"``.
 
     Returns:
         ComparisonResult with detailed diffs across all dimensions.
@@ -445,7 +394,7 @@ def compare_continuation_output(
     request_diff = _compare_requests(original.requests, new.requests)
 
     # Compare data using Levenshtein pairing
-    data_diff = _compare_data(original.data, new.data)
+    data_diff = _compare_data(original.data, new.data, pairing)
 
     # Compare errors
     error_diff = _compare_errors(original.error, new.error)
@@ -550,13 +499,16 @@ def _requests_equal(req1: CapturedRequest, req2: CapturedRequest) -> bool:
 
 
 def _compare_data(
-    original: list[CapturedData], new: list[CapturedData]
+    original: list[CapturedData],
+    new: list[CapturedData],
+    pairing: str = "greedy",
 ) -> DataDiff:
     """Compare ParsedData outputs using Levenshtein-based pairing.
 
     Args:
         original: Data from original code.
         new: Data from new code.
+        pairing: ``"greedy"`` or ``"optimal"``.
 
     Returns:
         DataDiff with paired comparisons and unpaired results.
@@ -565,7 +517,7 @@ def _compare_data(
 
     # Pair results by Levenshtein distance
     paired, unpaired_original, unpaired_new = _pair_results_by_levenshtein(
-        original, new
+        original, new, pairing
     )
 
     # Compare paired results
@@ -31,6 +31,8 @@ class DebuggerBase:
     Attributes:
         sql: The underlying SQLManager instance for database operations.
         read_only: Whether this instance is in read-only mode.
+        db_path: Path of the run database, when known. Locates side
+            files such as the text index.
     """
 
     def __init__(
@@ -38,6 +40,7 @@ class DebuggerBase:
         sql: SQLManager,
         session_factory: ScopedSessionFactory,
         read_only: bool = True,
+        db_path: Path | None = None,
     ) -> None:
         """Initialize the debugger.
 
@@ -45,10 +48,12 @@ class DebuggerBase:
             sql: SQLManager instance wrapping the database connection.
             session_factory: Async session factory for direct DB queries.
             read_only: If True, write operations will raise errors.
+            db_path: Path of the run database, if known.
         """
         self.sql = sql
         self._session_factory = session_factory
         self.read_only = read_only
+        self.db_path = db_path
 
     @classmethod
     @asynccontextmanager
@@ -97,7 +102,9 @@ class DebuggerBase:
         session_factory = ScopedSessionFactory(get_session_factory(engine))
         sql = SQLManager(engine, session_factory)
         try:
-            yield cls(sql, session_factory, read_only=read_only)
+            yield cls(
+                sql, session_factory, read_only=read_only, db_path=db_path
+            )
         finally:
             await session_factory.remove_all()
             await engine.dispose()
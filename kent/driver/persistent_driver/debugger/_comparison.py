@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-import json
-from typing import TYPE_CHECKING, Any
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any
 
 import sqlalchemy as sa
 from sqlmodel import select
@@ -11,13 +14,27 @@ from sqlmodel import select
 from kent.driver.persistent_driver.models import (
     Request,
 )
+from kent.driver.persistent_driver.request_subtree import (
+    RequestTrees,
+    StepInputs,
+    iter_step_inputs,
+    load_request_nodes,
+)
 from kent.driver.persistent_driver.scoped_session import ScopedSessionFactory
 from kent.driver.persistent_driver.sql_manager import (
-    Page,
     RequestRecord,
     ResultRecord,
     SQLManager,
 )
+from kent.driver.persistent_driver.step_eval import (
+    StepCache,
+    StepEvalProgress,
+    StepJob,
+    default_step_cache_path,
+    dry_run_job,
+    map_step_jobs,
+    selector_job,
+)
 
 
 class ComparisonMixin:
@@ -25,20 +42,7 @@ class ComparisonMixin:
 
     sql: SQLManager
     _session_factory: ScopedSessionFactory
-
-    if TYPE_CHECKING:
-        # Provided by InspectionMixin at runtime via multiple inheritance.
-        async def get_response_content(
-            self, request_id: int
-        ) -> bytes | None: ...
-        async def list_errors(
-            self,
-            error_type: str | None = None,
-            is_resolved: bool | None = None,
-            continuation: str | None = None,
-            limit: int = 100,
-            offset: int = 0,
-        ) -> Page[dict[str, Any]]: ...
+    db_path: Path | None
 
     async def get_child_requests_transitive(
         self, parent_request_id: int
@@ -104,21 +108,13 @@ class ComparisonMixin:
         Returns:
             List of request IDs for sampled terminal requests.
         """
-        child_alias = Request.__table__.alias("child")
-        child_exists = (
-            select(sa.literal(1))
-            .select_from(child_alias)
-            .where(child_alias.c.parent_request_id == Request.id)
-            .correlate(Request)
-        )
-
         async with self._session_factory() as session:
             result = await session.execute(
                 select(Request.id)
                 .where(
                     Request.continuation == continuation,
                     Request.status == "completed",
-                    ~sa.exists(child_exists),
+                    Request.child_count == 0,
                 )
                 .order_by(sa.func.random())
                 .limit(sample_count)
@@ -153,16 +149,58 @@ class ComparisonMixin:
 
         return [row[0] for row in rows]
 
+    async def _step_inputs(
+        self,
+        request_ids: list[int],
+        *,
+        originals: bool,
+        trees: RequestTrees | None = None,
+    ) -> AsyncGenerator[StepInputs, None]:
+        """Bulk-load replay inputs for ``request_ids``, in order.
+
+        With ``originals``, each request's subtree is loaded too (one
+        recursive query per batch of roots) so its stored output can be
+        rebuilt in memory; see
+        :mod:`~kent.driver.persistent_driver.request_subtree`.
+        """
+        if trees is None:
+            trees = await load_request_nodes(
+                self._session_factory, request_ids, descendants=originals
+            )
+        async for inputs in iter_step_inputs(
+            self._session_factory, trees, request_ids, originals=originals
+        ):
+            yield inputs
+
+    async def _one_step_input(
+        self, request_id: int, *, originals: bool
+    ) -> StepInputs:
+        """Load one request's replay inputs.
+
+        Raises:
+            ValueError: If request not found or no response available.
+        """
+        async with aclosing(
+            self._step_inputs([request_id], originals=originals)
+        ) as loaded:
+            async for inputs in loaded:
+                if inputs.failure is not None:
+                    raise ValueError(inputs.failure)
+                return inputs
+        raise ValueError(f"Request {request_id} not found")
+
     async def compare_continuation(
         self,
         request_id: int,
         scraper_class: type,
+        pairing: str = "greedy",
     ) -> Any:
         """Compare continuation output between stored and dry-run execution.
 
         Args:
             request_id: The request ID to compare.
             scraper_class: The scraper class to instantiate for dry-run.
+            pairing: How results are paired, ``"greedy"`` or ``"optimal"``.
 
         Returns:
             ComparisonResult with detailed diffs.
@@ -170,210 +208,37 @@ class ComparisonMixin:
         Raises:
             ValueError: If request not found or no response available.
         """
+        inputs = await self._one_step_input(request_id, originals=True)
+        return self._compare_inputs(inputs, scraper_class, pairing)
+
+    @staticmethod
+    def _compare_inputs(
+        inputs: StepInputs, scraper_class: type, pairing: str
+    ) -> Any:
+        """Replay loaded inputs through new code and compare."""
         from kent.driver.persistent_driver.comparison import (
             ComparisonResult,
             compare_continuation_output,
         )
-        from kent.driver.persistent_driver.dry_run_driver import (
-            DryRunDriver,
-            DryRunResult,
-        )
-
-        # Get the full request data
-        async with self._session_factory() as session:
-            result = await session.execute(
-                select(
-                    Request.id,
-                    Request.url,
-                    Request.method,
-                    Request.continuation,
-                    Request.current_location,
-                    Request.accumulated_data_json,
-                    Request.permanent_json,
-                ).where(Request.id == request_id)
-            )
-            request_row = result.first()
-            if not request_row:
-                raise ValueError(f"Request {request_id} not found")
-
-        request_data = {
-            "url": request_row[1],
-            "method": request_row[2],
-            "continuation": request_row[3],
-            "current_location": request_row[4],
-            "accumulated_data_json": request_row[5],
-            "permanent_json": request_row[6],
-        }
-
-        # Get the response data from the request row (merged table)
-        async with self._session_factory() as session:
-            result = await session.execute(
-                select(
-                    Request.id,
-                    Request.response_status_code,
-                    Request.response_headers_json,
-                    Request.response_url,
-                    Request.content_compressed,
-                    Request.content_size_original,
-                    Request.content_size_compressed,
-                    Request.compression_dict_id,
-                    Request.continuation,
-                    Request.response_created_at,
-                    Request.speculation_outcome,
-                ).where(
-                    Request.id == request_id,
-                    Request.response_status_code.isnot(None),  # type: ignore[union-attr]
-                )
-            )
-            response_row = result.first()
-            if not response_row:
-                raise ValueError(f"No response found for request {request_id}")
-
-        response_data = {
-            "id": response_row[0],
-            "request_id": response_row[0],
-            "status_code": response_row[1],
-            "headers_json": response_row[2],
-            "url": response_row[3],
-            "content_compressed": response_row[4],
-            "content_size_original": response_row[5],
-            "content_size_compressed": response_row[6],
-            "compression_dict_id": response_row[7],
-            "continuation": response_row[8],
-            "created_at": response_row[9],
-            "speculation_outcome": response_row[10],
-        }
-
-        # Get decompressed content
-        response_content = await self.get_response_content(request_id)
-        if response_content is None:
-            raise ValueError(
-                f"No content available for response {response_data['id']}"
-            )
 
-        response_data["content"] = response_content
-        try:
-            response_data["text"] = response_content.decode("utf-8")
-        except UnicodeDecodeError:
-            response_data["text"] = ""
-
-        # Load original stored results using recursive CTE
-        base_children = (
-            select(
-                Request.id,
-                Request.request_type,
-                Request.url,
-                Request.method,
-                Request.continuation,
-                Request.current_location,
-                Request.accumulated_data_json,
-                Request.permanent_json,
-                Request.priority,
-                Request.deduplication_key,
-                Request.expected_type,
-            )
-            .where(Request.parent_request_id == request_id)
-            .cte(name="children", recursive=True)
-        )
-
-        req_alias = Request.__table__.alias("r")
-        recursive_children = select(
-            req_alias.c.id,
-            req_alias.c.request_type,
-            req_alias.c.url,
-            req_alias.c.method,
-            req_alias.c.continuation,
-            req_alias.c.current_location,
-            req_alias.c.accumulated_data_json,
-            req_alias.c.permanent_json,
-            req_alias.c.priority,
-            req_alias.c.deduplication_key,
-            req_alias.c.expected_type,
-        ).where(req_alias.c.parent_request_id == base_children.c.id)
-
-        children_cte = base_children.union_all(recursive_children)
-
-        async with self._session_factory() as session:
-            child_result = await session.execute(
-                select(children_cte).order_by(children_cte.c.id)
-            )
-            child_rows = child_result.all()
-
-        original_results = await self.get_results_for_request(request_id)
-
-        from kent.driver.persistent_driver.dry_run_driver import (
-            CapturedData,
-            CapturedRequest,
+        assert inputs.request_data is not None
+        assert inputs.response_data is not None
+        assert inputs.original is not None
+        continuation = inputs.request_data["continuation"]
+        new = dry_run_job(
+            scraper_class,
+            continuation,
+            inputs.request_data,
+            inputs.response_data,
         )
-
-        original_requests = []
-        for row in child_rows:
-            original_requests.append(
-                CapturedRequest(
-                    request_type=row[1] or "navigating",
-                    url=row[2],
-                    method=row[3],
-                    continuation=row[4],
-                    accumulated_data=(json.loads(row[6]) if row[6] else {}),
-                    permanent=(json.loads(row[7]) if row[7] else {}),
-                    current_location=row[5] or "",
-                    priority=row[8],
-                    deduplication_key=row[9],
-                    is_speculative=False,
-                    speculation_id=None,
-                    expected_type=row[10],
-                )
-            )
-
-        original_data = [
-            CapturedData(
-                data=(json.loads(result.data_json) if result.data_json else {})
-            )
-            for result in original_results
-        ]
-
-        original: DryRunResult = DryRunResult(
-            requests=original_requests, data=original_data, error=None
-        )
-
-        # Check if there was an error for this request
-        errors_page = await self.list_errors(
-            continuation=request_data["continuation"],
-            is_resolved=None,
-            limit=1000,
-            offset=0,
-        )
-        original_error = None
-        for error in errors_page.items:
-            if error["request_id"] == request_id and not error["is_resolved"]:
-                from kent.driver.persistent_driver.dry_run_driver import (
-                    CapturedError,
-                )
-
-                original_error = CapturedError(
-                    error_type=error["error_type"],
-                    error_message=error["message"],
-                )
-                break
-
-        original.error = original_error
-
-        # Run dry-run with new code
-        scraper_instance = scraper_class()
-        driver = DryRunDriver(scraper_instance)
-        new = driver.run_continuation(
-            request_data["continuation"], response_data, request_data
-        )
-
-        # Compare
         comparison_result: ComparisonResult = compare_continuation_output(
-            request_id=request_id,
-            request_url=request_data["url"],
-            continuation=request_data["continuation"],
-            original=original,
+            request_id=inputs.request_id,
+            request_url=inputs.request_data["url"],
+            continuation=continuation,
+            original=inputs.original,
             new=new,
+            pairing=pairing,
         )
-
         return comparison_result
 
     async def run_with_selector_observer(
@@ -395,116 +260,16 @@ class ComparisonMixin:
         Raises:
             ValueError: If request not found or no response available.
         """
-        from kent.common.selector_observer import SelectorObserver
-        from kent.data_types import (
-            HttpMethod,
-            HTTPRequestParams,
-            Response,
-        )
-        from kent.data_types import (
-            Request as DataRequest,
+        inputs = await self._one_step_input(request_id, originals=False)
+        assert inputs.request_data is not None
+        assert inputs.response_data is not None
+        return selector_job(
+            scraper_class,
+            inputs.request_data["continuation"],
+            inputs.request_data,
+            inputs.response_data,
         )
 
-        # Get request data
-        async with self._session_factory() as session:
-            result = await session.execute(
-                select(
-                    Request.url,
-                    Request.method,
-                    Request.continuation,
-                    Request.current_location,
-                    Request.accumulated_data_json,
-                    Request.permanent_json,
-                ).where(Request.id == request_id)
-            )
-            request_row = result.first()
-            if not request_row:
-                raise ValueError(f"Request {request_id} not found")
-
-        (
-            url,
-            method,
-            continuation_name,
-            current_location,
-            accumulated_data_json,
-            permanent_json,
-        ) = request_row
-
-        # Get response data
-        async with self._session_factory() as session:
-            result = await session.execute(
-                select(
-                    Request.response_status_code,
-                    Request.response_headers_json,
-                    Request.response_url,
-                ).where(
-                    Request.id == request_id,
-                    Request.response_status_code.isnot(None),  # type: ignore[union-attr]
-                )
-            )
-            response_row = result.first()
-            if not response_row:
-                raise ValueError(f"No response found for request {request_id}")
-
-        status_code, headers_json, response_url = response_row
-
-        # Get decompressed content
-        content = await self.get_response_content(request_id)
-        if content is None:
-            raise ValueError(f"No content available for request {request_id}")
-
-        # Reconstruct Response object
-        headers = json.loads(headers_json) if headers_json else {}
-        accumulated_data = (
-            json.loads(accumulated_data_json) if accumulated_data_json else {}
-        )
-        permanent = json.loads(permanent_json) if permanent_json else {}
-
-        reconstructed_request = DataRequest(
-            request=HTTPRequestParams(
-                method=HttpMethod(method),
-                url=url,
-            ),
-            continuation=continuation_name,
-            current_location=current_location or url,
-            accumulated_data=accumulated_data,
-            permanent=permanent,
-        )
-
-        try:
-            text = content.decode("utf-8")
-        except UnicodeDecodeError:
-            text = content.decode("utf-8", errors="replace")
-
-        response = Response(
-            status_code=status_code,
-            url=response_url,
-            content=content,
-            text=text,
-            headers=headers,
-            request=reconstructed_request,
-        )
-
-        # Run continuation with SelectorObserver
-        scraper_instance = scraper_class()
-        error: str | None = None
-
-        with SelectorObserver() as observer:
-            try:
-                continuation_method = scraper_instance.get_continuation(
-                    continuation_name
-                )
-                gen = continuation_method(response)
-                for _item in gen:
-                    pass
-            except Exception as e:
-                error = f"{type(e).__name__}: {e}"
-
-        return {
-            "queries": observer.json(),
-            "error": error,
-        }
-
     async def compare_request_tree(
         self,
         request_id: int,
@@ -519,39 +284,209 @@ class ComparisonMixin:
         Returns:
             List of ComparisonResult for each request in the tree.
         """
-        from collections import deque
-
+        trees = await load_request_nodes(self._session_factory, [request_id])
+        order = trees.walk([request_id], through_missing=False)
         results = []
-        queue: deque[int] = deque([request_id])
-        visited: set[int] = set()
+        async with aclosing(
+            self._step_inputs(order, originals=True, trees=trees)
+        ) as loaded:
+            async for inputs in loaded:
+                if inputs.failure is None:
+                    results.append(
+                        self._compare_inputs(inputs, scraper_class, "greedy")
+                    )
+        return results
 
-        while queue:
-            current_id = queue.popleft()
-            if current_id in visited:
-                continue
-            visited.add(current_id)
+    async def collect_request_trees(self, request_ids: list[int]) -> list[int]:
+        """List the requests in the trees rooted at ``request_ids``.
+
+        Each root is followed, breadth-first, by its completed
+        descendants, as :meth:`compare_request_tree` walks them. A
+        request in several trees is listed once.
+
+        Args:
+            request_ids: Root request IDs.
 
-            try:
-                result = await self.compare_continuation(
-                    current_id, scraper_class
+        Returns:
+            Request IDs in walk order.
+        """
+        trees = await load_request_nodes(self._session_factory, request_ids)
+        return trees.walk(request_ids)
+
+    @property
+    def step_cache_path(self) -> Path | None:
+        """Where this run's step cache lives, if the DB path is known."""
+        if self.db_path is None:
+            return None
+        return default_step_cache_path(self.db_path)
+
+    async def _step_jobs(
+        self,
+        request_ids: list[int],
+        failures: dict[int, str],
+        originals: dict[int, Any] | None,
+    ) -> AsyncIterator[StepJob]:
+        """Load jobs for ``request_ids``, recording load failures.
+
+        With ``originals``, each request's stored output is put there
+        for the caller to compare against.
+        """
+        async with aclosing(
+            self._step_inputs(request_ids, originals=originals is not None)
+        ) as loaded:
+            async for inputs in loaded:
+                if inputs.failure is not None:
+                    failures[inputs.request_id] = inputs.failure
+                    continue
+                assert inputs.request_data is not None
+                assert inputs.response_data is not None
+                if originals is not None:
+                    originals[inputs.request_id] = inputs.original
+                yield StepJob(
+                    inputs.request_id,
+                    inputs.request_data["continuation"],
+                    inputs.request_data,
+                    inputs.response_data,
                 )
-                results.append(result)
-
-                async with self._session_factory() as session:
-                    child_result = await session.execute(
-                        select(Request.id).where(
-                            Request.parent_request_id == current_id,
-                            Request.status == "completed",
-                        )
-                    )
-                    child_rows = child_result.all()
 
-                for row in child_rows:
-                    child_id = row[0]
-                    if child_id not in visited:
-                        queue.append(child_id)
+    async def _map_steps(
+        self,
+        func: Any,
+        kind: str,
+        request_ids: list[int],
+        scraper_class: type,
+        processes: int | None,
+        use_cache: bool,
+        on_progress: Callable[[StepEvalProgress], None] | None,
+        originals: dict[int, Any] | None = None,
+    ) -> AsyncIterator[tuple[int, StepJob | None, Any, str | None]]:
+        """Replay ``request_ids`` through ``func`` in request order.
+
+        Yields ``(request_id, job, output, None)``, or ``(request_id,
+        job, None, message)`` for a request that could not be loaded
+        (``job`` is None) or replayed. With ``originals``, stored
+        outputs are loaded alongside the jobs (see :meth:`_step_jobs`).
+        """
+        path = self.step_cache_path if use_cache else None
+        cache = StepCache(path) if path is not None else None
+        failures: dict[int, str] = {}
+        pending = deque(request_ids)
+        outputs = map_step_jobs(
+            func,
+            scraper_class,
+            self._step_jobs(request_ids, failures, originals),
+            kind=kind,
+            cache=cache,
+            processes=processes,
+            total=len(request_ids),
+            on_progress=on_progress,
+        )
+        try:
+            async with aclosing(outputs):
+                async for job, output, failure in outputs:
+                    while pending[0] != job.request_id:
+                        request_id = pending.popleft()
+                        yield request_id, None, None, failures.pop(request_id)
+                    pending.popleft()
+                    yield job.request_id, job, output, failure
+            for request_id in pending:
+                yield request_id, None, None, failures.pop(request_id)
+        finally:
+            if cache is not None:
+                cache.close()
+
+    async def compare_requests(
+        self,
+        request_ids: list[int],
+        scraper_class: type,
+        *,
+        processes: int | None = None,
+        use_cache: bool = True,
+        on_progress: Callable[[StepEvalProgress], None] | None = None,
+        pairing: str = "greedy",
+    ) -> AsyncIterator[tuple[int, Any, str | None]]:
+        """Compare many requests, replaying them on a process pool.
+
+        Like :meth:`compare_continuation` for each request, but the
+        dry runs run in parallel and are cached next to the run DB
+        (see :mod:`~kent.driver.persistent_driver.step_eval`), so a
+        request whose response and step code are unchanged is not
+        replayed again. ``scraper_class`` must be importable by
+        worker processes.
 
-            except ValueError:
-                pass
+        Args:
+            request_ids: Requests to compare, e.g. from
+                :meth:`collect_request_trees`.
+            scraper_class: The scraper class to instantiate for dry-run.
+            processes: Pool size (``None`` = one per CPU, ``0`` = no
+                process pool).
+            use_cache: Read and write the step cache.
+            on_progress: Called after each replay.
+            pairing: How results are paired, ``"greedy"`` or ``"optimal"``.
+
+        Yields:
+            ``(request_id, ComparisonResult, None)`` in request order,
+            or ``(request_id, None, message)`` for a request with no
+            stored response or whose replay failed.
+        """
+        from kent.driver.persistent_driver.comparison import (
+            compare_continuation_output,
+        )
 
-        return results
+        originals: dict[int, Any] = {}
+        async for request_id, job, output, failure in self._map_steps(
+            dry_run_job,
+            "dry_run",
+            request_ids,
+            scraper_class,
+            processes,
+            use_cache,
+            on_progress,
+            originals,
+        ):
+            original = originals.pop(request_id, None)
+            if job is None or failure is not None:
+                yield request_id, None, failure
+                continue
+            yield (
+                request_id,
+                compare_continuation_output(
+                    request_id=request_id,
+                    request_url=job.request_data["url"],
+                    continuation=job.continuation,
+                    original=original,
+                    new=output,
+                    pairing=pairing,
+                ),
+                None,
+            )
+
+    async def observe_selectors(
+        self,
+        request_ids: list[int],
+        scraper_class: type,
+        *,
+        processes: int | None = None,
+        use_cache: bool = True,
+        on_progress: Callable[[StepEvalProgress], None] | None = None,
+    ) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+        """Run many requests with a SelectorObserver on a process pool.
+
+        The parallel, cached form of :meth:`run_with_selector_observer`;
+        see :meth:`compare_requests`.
+
+        Yields:
+            ``(request_id, {"queries": ..., "error": ...}, None)`` in
+            request order, or ``(request_id, None, message)`` for a
+            request with no stored response or whose replay failed.
+        """
+        async for request_id, _job, output, failure in self._map_steps(
+            selector_job,
+            "selectors",
+            request_ids,
+            scraper_class,
+            processes,
+            use_cache,
+            on_progress,
+        ):
+            yield request_id, output, failure
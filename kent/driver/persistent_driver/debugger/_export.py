@@ -2,21 +2,37 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from sqlmodel import select
-
-from kent.driver.persistent_driver.models import (
-    Request,
-    Result,
+from kent.driver.persistent_driver.response_search import (
+    SearchPattern,
+    iter_response_matches,
+)
+from kent.driver.persistent_driver.results_export import (
+    EXPORT_COMPRESSIONS,
+    compress_stream,
+    compression_for_path,
+    iter_result_lines,
+    iter_results_jsonl,
 )
 from kent.driver.persistent_driver.scoped_session import ScopedSessionFactory
 from kent.driver.persistent_driver.sql_manager import (
     ResponseRecord,
     SQLManager,
 )
+from kent.driver.persistent_driver.text_index import (
+    MIN_QUERY_LENGTH,
+    ResponseTextIndex,
+    TextIndexUpdate,
+    default_text_index_path,
+    iter_indexed_matches,
+)
+from kent.driver.persistent_driver.text_index import (
+    update_text_index as update_index,
+)
 
 
 class ExportSearchMixin:
@@ -24,9 +40,10 @@ class ExportSearchMixin:
 
     sql: SQLManager
     _session_factory: ScopedSessionFactory
+    db_path: Path | None
 
     if TYPE_CHECKING:
-        # Provided by InspectionMixin / DebuggerBase at runtime.
+        # Provided by InspectionMixin / ValidationMixin / DebuggerBase.
         async def get_error(self, error_id: int) -> dict[str, Any] | None: ...
         async def get_response(
             self, request_id: int
@@ -37,6 +54,7 @@ class ExportSearchMixin:
         async def get_run_metadata(
             self,
         ) -> dict[str, Any] | None: ...
+        def _load_scraper_class(self, metadata: dict[str, Any]) -> type: ...
 
     # =========================================================================
     # Debugging Methods
@@ -144,85 +162,125 @@ class ExportSearchMixin:
         output_path: Path | str,
         result_type: str | None = None,
         is_valid: bool | None = None,
+        compression: str | None = None,
     ) -> int:
         """Export results to JSONL (newline-delimited JSON) file.
 
+        Results stream from the database in chunks, so memory use does
+        not grow with the number of results.
+
         Args:
             output_path: Path for the output JSONL file.
             result_type: Optional filter by result type.
             is_valid: Optional filter by validation status.
+            compression: ``"gzip"`` or ``"zstd"``; defaults to the one
+                implied by a ``.gz`` or ``.zst`` suffix, else none.
 
         Returns:
             Number of results exported.
+
+        Raises:
+            ValueError: If ``compression`` is not supported.
         """
         if isinstance(output_path, str):
             output_path = Path(output_path)
+        if compression is None:
+            compression = compression_for_path(output_path)
+        elif compression not in EXPORT_COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression {compression!r}; "
+                f"expected one of {', '.join(EXPORT_COMPRESSIONS)}"
+            )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        conditions = []
-        if result_type:
-            conditions.append(Result.result_type == result_type)
-        if is_valid is not None:
-            conditions.append(Result.is_valid == is_valid)
-
         count = 0
-        async with self._session_factory() as session:
-            query = select(
-                Result.id,
-                Result.request_id,
-                Result.result_type,
-                Result.data_json,
-                Result.is_valid,
-                Result.validation_errors_json,
-                Result.created_at,
-            ).order_by(Result.created_at.asc())  # type: ignore[union-attr]
-
-            for cond in conditions:
-                query = query.where(cond)
-
-            result = await session.execute(query)
-            rows = result.all()
-
-        with output_path.open("w") as f:
-            for row in rows:
-                (
-                    result_id,
-                    request_id,
-                    rtype,
-                    data_json,
-                    valid,
-                    errors_json,
-                    created_at,
-                ) = row
-
-                try:
-                    data = json.loads(data_json) if data_json else {}
-                except json.JSONDecodeError:
-                    data = {}
-
-                validation_errors = None
-                if errors_json:
-                    try:
-                        validation_errors = json.loads(errors_json)
-                    except json.JSONDecodeError:
-                        pass
-
-                record = {
-                    "id": result_id,
-                    "request_id": request_id,
-                    "result_type": rtype,
-                    "data": data,
-                    "is_valid": bool(valid),
-                    "validation_errors": validation_errors,
-                    "created_at": created_at,
-                }
-
-                f.write(json.dumps(record) + "\n")
-                count += 1
+
+        async def blocks() -> AsyncIterator[bytes]:
+            nonlocal count
+            async for lines in iter_result_lines(
+                self._session_factory,
+                result_type=result_type,
+                is_valid=is_valid,
+            ):
+                count += len(lines)
+                yield b"".join(lines)
+
+        with output_path.open("wb") as f:
+            async with aclosing(compress_stream(blocks(), compression)) as out:
+                async for chunk in out:
+                    f.write(chunk)
 
         return count
 
+    def iter_results_jsonl(
+        self,
+        result_type: str | None = None,
+        is_valid: bool | None = None,
+        compression: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream the results export as (optionally compressed) JSONL bytes.
+
+        Args:
+            result_type: Optional filter by result type.
+            is_valid: Optional filter by validation status.
+            compression: ``"gzip"``, ``"zstd"`` or None for plain JSONL.
+        """
+        return iter_results_jsonl(
+            self._session_factory,
+            result_type=result_type,
+            is_valid=is_valid,
+            compression=compression,
+        )
+
+    async def export_results_parquet(
+        self,
+        output_dir: Path | str,
+        result_type: str | None = None,
+        is_valid: bool | None = None,
+        scraper_class: type | None = None,
+        row_group_size: int | None = None,
+    ) -> dict[str, int]:
+        """Export results to one Parquet file per result type.
+
+        Column types come from the scraper's result models via
+        ``scraper_class.schema()``; see
+        :mod:`~kent.driver.persistent_driver.results_parquet`. Requires
+        ``pyarrow``.
+
+        Args:
+            output_dir: Directory for the ``<result_type>.parquet`` files.
+            result_type: Optional filter by result type.
+            is_valid: Optional filter by validation status.
+            scraper_class: Scraper whose models define the columns. If not
+                provided, discovered from run metadata; when that fails,
+                each result's data is written as a JSON text column.
+            row_group_size: Rows per Parquet row group.
+
+        Returns:
+            Rows written per result type.
+        """
+        from kent.driver.persistent_driver.results_parquet import (
+            DEFAULT_ROW_GROUP_SIZE,
+            export_results_parquet,
+        )
+
+        if scraper_class is None:
+            metadata = await self.get_run_metadata()
+            try:
+                scraper_class = self._load_scraper_class(metadata or {})
+            except (ValueError, ImportError, AttributeError):
+                scraper_class = None
+        schema_fn = getattr(scraper_class, "schema", None)
+        return await export_results_parquet(
+            self._session_factory,
+            Path(output_dir),
+            schema_fn() if schema_fn is not None else None,
+            result_type=result_type,
+            is_valid=is_valid,
+            row_group_size=row_group_size or DEFAULT_ROW_GROUP_SIZE,
+        )
+
     # =========================================================================
     # Response Search Methods
     # =========================================================================
@@ -233,92 +291,174 @@ class ExportSearchMixin:
         regex: str | None = None,
         xpath: str | None = None,
         continuation: str | None = None,
+        *,
+        status_code: int | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        limit: int | None = None,
+        processes: int | None = None,
+        use_index: bool = False,
     ) -> list[dict[str, int]]:
         """Search response content for matching patterns.
 
-        Exactly one of text, regex, or xpath must be provided.
+        Exactly one of text, regex, or xpath must be provided. See
+        :meth:`iter_search_responses` for the streaming form and for how
+        the text index is used.
 
         Args:
             text: Plain text to search for (case-insensitive).
             regex: Regular expression pattern to search for.
             xpath: XPath expression to evaluate.
             continuation: Optional filter by continuation (step name).
+            status_code: Optional filter by HTTP status code.
+            min_size: Optional minimum uncompressed response size.
+            max_size: Optional maximum uncompressed response size.
+            limit: Stop after this many matches.
+            processes: Matching pool size (``None`` = one per CPU,
+                ``0`` = no process pool).
+            use_index: Answer a text search from the text index, which
+                matches page text rather than the raw body.
 
         Returns:
-            List of dictionaries with request_id.
+            List of dictionaries with request_id, in request id order.
 
         Raises:
-            ValueError: If zero or more than one search pattern is provided.
+            ValueError: If zero or more than one search pattern is
+                provided, or ``use_index`` is set and the index can't
+                answer the query.
         """
-        import re
-
-        search_types = [text, regex, xpath]
-        provided = sum(1 for s in search_types if s is not None)
-        if provided != 1:
-            raise ValueError(
-                "Exactly one of text, regex, or xpath must be provided"
+        return [
+            match
+            async for match in self.iter_search_responses(
+                text=text,
+                regex=regex,
+                xpath=xpath,
+                continuation=continuation,
+                status_code=status_code,
+                min_size=min_size,
+                max_size=max_size,
+                limit=limit,
+                processes=processes,
+                use_index=use_index,
             )
+        ]
 
-        regex_pattern = None
-        if regex is not None:
-            regex_pattern = re.compile(regex)
-
-        xpath_expr = None
-        if xpath is not None:
-            from lxml import etree
-
-            xpath_expr = etree.XPath(xpath)
+    async def iter_search_responses(
+        self,
+        text: str | None = None,
+        regex: str | None = None,
+        xpath: str | None = None,
+        continuation: str | None = None,
+        *,
+        status_code: int | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        limit: int | None = None,
+        processes: int | None = None,
+        use_index: bool = False,
+    ) -> AsyncIterator[dict[str, int]]:
+        """Yield matches of :meth:`search_responses` as they are found.
+
+        Continuation, status and size filters are applied in SQL; the
+        remaining responses are decompressed and matched in chunks on a
+        process pool. Stopping early (or ``limit``) shuts the pool down.
+
+        With ``use_index``, a ``text`` search of at least three
+        characters is answered from the run's text index (see
+        :meth:`update_text_index`) instead. An indexed search matches the
+        page's visible text, without markup, rather than the raw body, so
+        it is never used unless asked for.
 
-        query = (
-            select(Request.id)
-            .where(
-                Request.response_status_code.isnot(None),  # type: ignore[union-attr]
+        Raises:
+            ValueError: If zero or more than one search pattern is
+                provided, or ``use_index`` is set and the index can't
+                answer the query.
+        """
+        pattern = SearchPattern(text=text, regex=regex, xpath=xpath)
+        index = None
+        if use_index and text is not None:
+            index = self._open_text_index(text)
+        if use_index and index is None:
+            raise ValueError(
+                "No text index can answer this search (it needs a text "
+                f"query of {MIN_QUERY_LENGTH}+ characters and an index "
+                "built with `pdd responses index`)"
             )
-            .order_by(Request.id)
-        )
-        if continuation:
-            query = query.where(Request.continuation == continuation)
-
-        matches: list[dict[str, int]] = []
-
-        async with self._session_factory() as session:
-            result = await session.execute(query)
-            rows = result.all()
-
-        for row in rows:
-            request_id = row[0]
-
-            content = await self.get_response_content(request_id)
-            if content is None:
-                continue
-
-            try:
-                content_str = content.decode("utf-8")
-            except UnicodeDecodeError:
-                try:
-                    content_str = content.decode("latin-1")
-                except UnicodeDecodeError:
-                    continue
-
-            matched = False
+        try:
+            if index is not None:
+                assert text is not None
+                matches = iter_indexed_matches(
+                    self._session_factory,
+                    index,
+                    text,
+                    continuation=continuation or None,
+                    status_code=status_code,
+                    min_size=min_size,
+                    max_size=max_size,
+                    limit=limit,
+                    processes=processes,
+                )
+            else:
+                matches = iter_response_matches(
+                    self._session_factory,
+                    pattern,
+                    continuation=continuation or None,
+                    status_code=status_code,
+                    min_size=min_size,
+                    max_size=max_size,
+                    limit=limit,
+                    processes=processes,
+                )
+            async with aclosing(matches):
+                async for request_id in matches:
+                    yield {"request_id": request_id}
+        finally:
+            if index is not None:
+                index.close()
+
+    @property
+    def text_index_path(self) -> Path | None:
+        """Where this run's text index lives, if the DB path is known."""
+        if self.db_path is None:
+            return None
+        return default_text_index_path(self.db_path)
+
+    def _open_text_index(self, text: str) -> ResponseTextIndex | None:
+        """The text index, read-only, if it exists and can answer ``text``."""
+        path = self.text_index_path
+        if path is None or not ResponseTextIndex.can_answer(text):
+            return None
+        return ResponseTextIndex.open_existing(path)
+
+    async def update_text_index(
+        self, *, rebuild: bool = False, processes: int | None = None
+    ) -> TextIndexUpdate:
+        """Create or bring up to date the run's text index.
+
+        The index is a side file next to the run DB, so this works on a
+        read-only debugger.
 
-            if text is not None:
-                matched = text.lower() in content_str.lower()
-
-            elif regex_pattern is not None:
-                matched = regex_pattern.search(content_str) is not None
-
-            elif xpath_expr is not None:
-                try:
-                    from lxml import html
-
-                    tree = html.fromstring(content_str)
-                    xpath_result = xpath_expr(tree)
-                    matched = bool(xpath_result)
-                except Exception:
-                    continue
+        Args:
+            rebuild: Discard the index and rebuild it from scratch.
+            processes: Extraction pool size (``None`` = one per CPU,
+                ``0`` = no process pool).
 
-            if matched:
-                matches.append({"request_id": request_id})
+        Returns:
+            How many responses were indexed and the new high-water mark.
 
-        return matches
+        Raises:
+            ValueError: If the debugger was opened without a DB path.
+        """
+        path = self.text_index_path
+        if path is None:
+            raise ValueError("The run database path is unknown")
+        index = ResponseTextIndex(path)
+        try:
+            return await update_index(
+                self._session_factory,
+                index,
+                rebuild=rebuild,
+                processes=processes,
+            )
+        finally:
+            index.close()
@@ -7,13 +7,14 @@ from typing import TYPE_CHECKING, Any, Literal
 import sqlalchemy as sa
 from sqlmodel import select
 
+from kent.driver.persistent_driver.metrics import MetricsRegistry
 from kent.driver.persistent_driver.models import (
     CompressionDict,
     Error,
     IncidentalRequest,
     IncidentalRequestStorage,
     Request,
-    Result,
+    ResultCount,
 )
 from kent.driver.persistent_driver.scoped_session import ScopedSessionFactory
 from kent.driver.persistent_driver.sql_manager import (
@@ -23,15 +24,25 @@ from kent.driver.persistent_driver.sql_manager import (
     ResponseRecord,
     ResultRecord,
     SQLManager,
+    TotalMode,
 )
 from kent.driver.persistent_driver.sql_manager._incidental_requests import (
     incidental_record_select,
     row_to_incidental_record,
 )
+from kent.driver.persistent_driver.sql_manager._pagination import (
+    KeysetOrder,
+    fetch_keyset_page,
+)
+from kent.driver.persistent_driver.stats import get_run_metrics
 
 if TYPE_CHECKING:
     pass
 
+_NEWEST_ERRORS = KeysetOrder(
+    "errors", (Error.created_at, Error.id), descending=True
+)
+
 
 class InspectionMixin:
     """Read-only inspection methods for requests, responses, errors, results, and more."""
@@ -54,6 +65,8 @@ class InspectionMixin:
         limit: int = 100,
         offset: int = 0,
         sort: str = "queue",
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[RequestRecord]:
         """List requests with optional filtering.
 
@@ -63,6 +76,8 @@ class InspectionMixin:
             limit: Maximum number of requests to return.
             offset: Number of requests to skip (for pagination).
             sort: Sort order - "queue" (default), "id_asc", or "id_desc".
+            cursor: ``next_cursor`` of the previous page.
+            total: How to compute the page total.
 
         Returns:
             Page object containing RequestRecord items.
@@ -73,6 +88,8 @@ class InspectionMixin:
             limit=limit,
             offset=offset,
             sort=sort,
+            cursor=cursor,
+            total=total,
         )
 
     async def get_request(self, request_id: int) -> RequestRecord | None:
@@ -178,6 +195,8 @@ class InspectionMixin:
         continuation: str | None = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[ResponseRecord]:
         """List responses with optional filtering.
 
@@ -185,12 +204,18 @@ class InspectionMixin:
             continuation: Filter by continuation (step name).
             limit: Maximum number of responses to return.
             offset: Number of responses to skip (for pagination).
+            cursor: ``next_cursor`` of the previous page.
+            total: How to compute the page total.
 
         Returns:
             Page object containing ResponseRecord items.
         """
         return await self.sql.list_responses(
-            continuation=continuation, limit=limit, offset=offset
+            continuation=continuation,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            total=total,
         )
 
     async def get_response(self, request_id: int) -> ResponseRecord | None:
@@ -347,6 +372,8 @@ class InspectionMixin:
         continuation: str | None = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[dict[str, Any]]:
         """List errors with optional filtering.
 
@@ -356,9 +383,16 @@ class InspectionMixin:
             continuation: Filter by continuation (step name).
             limit: Maximum number of errors to return.
             offset: Number of errors to skip (for pagination).
+            cursor: ``next_cursor`` of the previous page.
+            total: How to compute the page total. Errors have no
+                counter, so "approximate" counts them like "exact";
+                only "none" skips the count.
 
         Returns:
-            Page object containing error dictionaries.
+            Page object containing error dictionaries, newest first.
+
+        Raises:
+            ValueError: If ``cursor`` is invalid.
         """
         # Build WHERE conditions
         conditions = []
@@ -420,56 +454,33 @@ class InspectionMixin:
         ]
 
         async with self._session_factory() as session:
+            query = select(*error_columns)
+            count_stmt = select(sa.func.count()).select_from(Error)
             if continuation is not None:
                 # Need to join with requests for continuation filter
                 conditions.append(Request.continuation == continuation)
-
-                # Count query with join
-                count_stmt = (
-                    select(sa.func.count())
-                    .select_from(Error)
-                    .join(
-                        Request, Error.request_id == Request.id, isouter=True
-                    )
+                query = query.join(
+                    Request, Error.request_id == Request.id, isouter=True
                 )
-                for cond in conditions:
-                    count_stmt = count_stmt.where(cond)
-
-                count_result = await session.execute(count_stmt)
-                total = count_result.scalar() or 0
-
-                # Data query with join
-                query = (
-                    select(*error_columns)
-                    .join(
-                        Request, Error.request_id == Request.id, isouter=True
-                    )
-                    .order_by(Error.created_at.desc())  # type: ignore[union-attr]
+                count_stmt = count_stmt.join(
+                    Request, Error.request_id == Request.id, isouter=True
                 )
-                for cond in conditions:
-                    query = query.where(cond)
-
-                query = query.limit(limit).offset(offset)
-                result = await session.execute(query)
-                rows = result.all()
-            else:
-                # Simple query without join
-                count_stmt = select(sa.func.count()).select_from(Error)
-                for cond in conditions:
-                    count_stmt = count_stmt.where(cond)
 
-                count_result = await session.execute(count_stmt)
-                total = count_result.scalar() or 0
-
-                query = select(*error_columns).order_by(
-                    Error.created_at.desc()  # type: ignore[union-attr]
+            count = None
+            if total != "none":
+                count_result = await session.execute(
+                    count_stmt.where(*conditions)
                 )
-                for cond in conditions:
-                    query = query.where(cond)
-
-                query = query.limit(limit).offset(offset)
-                result = await session.execute(query)
-                rows = result.all()
+                count = count_result.scalar() or 0
+
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                query.where(*conditions),
+                _NEWEST_ERRORS,
+                cursor=cursor,
+                offset=offset,
+                limit=limit,
+            )
 
         # Convert rows to dictionaries
         items = []
@@ -479,7 +490,14 @@ class InspectionMixin:
             error_dict["is_resolved"] = bool(error_dict["is_resolved"])
             items.append(error_dict)
 
-        return Page(items=items, total=total, limit=limit, offset=offset)
+        return Page(
+            items=items,
+            total=count,
+            limit=limit,
+            offset=offset,
+            next_cursor=next_cursor,
+            more=next_cursor is not None,
+        )
 
     async def get_error(self, error_id: int) -> dict[str, Any] | None:
         """Get a single error by ID with full details.
@@ -620,6 +638,8 @@ class InspectionMixin:
         is_valid: bool | None = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[ResultRecord]:
         """List results with optional filtering.
 
@@ -628,6 +648,8 @@ class InspectionMixin:
             is_valid: Filter by validation status.
             limit: Maximum number of results to return.
             offset: Number of results to skip (for pagination).
+            cursor: ``next_cursor`` of the previous page.
+            total: How to compute the page total.
 
         Returns:
             Page object containing ResultRecord items.
@@ -637,6 +659,8 @@ class InspectionMixin:
             is_valid=is_valid,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            total=total,
         )
 
     async def get_result(self, result_id: int) -> ResultRecord | None:
@@ -658,34 +682,25 @@ class InspectionMixin:
         """
         summary: dict[str, dict[str, int]] = {}
         async with self._session_factory() as session:
+            # Maintained per (result_type, is_valid); see ResultCount.
             result = await session.execute(
                 select(
-                    Result.result_type,
-                    sa.func.sum(
-                        sa.case((Result.is_valid == sa.true(), 1), else_=0)
-                    ).label("valid_count"),
-                    sa.func.sum(
-                        sa.case((Result.is_valid == sa.false(), 1), else_=0)
-                    ).label("invalid_count"),
-                    sa.func.count().label("total_count"),
-                )
-                .group_by(Result.result_type)
-                .order_by(sa.func.count().desc())
+                    ResultCount.result_type,
+                    ResultCount.is_valid,
+                    ResultCount.count,
+                ).where(ResultCount.count != 0)
             )
             rows = result.all()
-            for row in rows:
-                result_type = row[0]
-                valid_count = row[1]
-                invalid_count = row[2]
-                total_count = row[3]
-
-                summary[result_type] = {
-                    "valid": valid_count,
-                    "invalid": invalid_count,
-                    "total": total_count,
-                }
+        for result_type, is_valid, count in rows:
+            counts = summary.setdefault(
+                result_type, {"valid": 0, "invalid": 0, "total": 0}
+            )
+            counts["valid" if is_valid else "invalid"] += count
+            counts["total"] += count
 
-        return summary
+        return dict(
+            sorted(summary.items(), key=lambda item: -item[1]["total"])
+        )
 
     # =========================================================================
     # Speculation Inspection
@@ -695,7 +710,9 @@ class InspectionMixin:
         """Get summary of speculation progress and tracking state.
 
         Returns:
-            Dictionary with progress and tracking state.
+            Dictionary with progress, tracking state, and frontier-search
+            totals (``probes`` issued and ``probes_saved`` versus a dense
+            linear scan).
         """
         progress = await self.sql.get_all_speculation_progress()
         tracking = await self.sql.load_all_speculation_states()
@@ -703,6 +720,12 @@ class InspectionMixin:
         return {
             "progress": progress,
             "tracking": tracking,
+            "search": {
+                "probes": sum(t["search_probes"] for t in tracking.values()),
+                "probes_saved": sum(
+                    t["probes_saved"] for t in tracking.values()
+                ),
+            },
         }
 
     async def get_speculative_progress(self) -> dict[str, int]:
@@ -755,6 +778,15 @@ class InspectionMixin:
         stats = await self.sql.get_stats()
         return stats.throughput.to_dict()
 
+    async def get_metrics(self) -> MetricsRegistry:
+        """Rebuild the driver metrics the run database can answer.
+
+        Returns:
+            Registry with queue depth, request duration and retries per
+            host, and compression ratio per continuation.
+        """
+        return await get_run_metrics(self._session_factory)
+
     # =========================================================================
     # Compression Inspection
     # =========================================================================
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import sqlalchemy as sa
 from sqlmodel import select
@@ -14,12 +14,30 @@ from kent.driver.persistent_driver.models import (
     Result,
 )
 from kent.driver.persistent_driver.scoped_session import ScopedSessionFactory
+from kent.driver.persistent_driver.stats import check_run_counters
+
+# The counter and NULL tests are written out literally (not as bound
+# parameters) so SQLite can match them to the WHERE clauses of the
+# partial indexes idx_requests_ghosts and idx_requests_orphaned.
+_GHOST = sa.and_(
+    Request.status == "completed",  # type: ignore[arg-type]
+    sa.text("requests.child_count = 0 AND requests.result_count = 0"),
+)
+_ORPHANED = sa.and_(
+    Request.status == "completed",  # type: ignore[arg-type]
+    sa.text("requests.response_status_code IS NULL"),
+)
 
 
 class IntegrityMixin:
     """Integrity checks: orphaned requests/responses, ghost requests, estimates."""
 
     _session_factory: ScopedSessionFactory
+    read_only: bool
+
+    if TYPE_CHECKING:
+        # Provided by DebuggerBase at runtime via multiple inheritance.
+        def _require_write_mode(self) -> None: ...
 
     async def check_integrity(self) -> dict[str, Any]:
         """Check database integrity for orphaned requests and responses.
@@ -37,20 +55,10 @@ class IntegrityMixin:
         async with self._session_factory() as session:
             # Orphaned requests: completed requests with no response
             orphaned_req_stmt = (
-                select(Request.id)
-                .where(
-                    Request.status == "completed",
-                    Request.response_status_code.is_(None),  # type: ignore[union-attr]
-                )
-                .order_by(Request.id)
+                select(Request.id).where(_ORPHANED).order_by(Request.id)
             )
             orphaned_req_count_stmt = (
-                select(sa.func.count())
-                .select_from(Request)
-                .where(
-                    Request.status == "completed",
-                    Request.response_status_code.is_(None),  # type: ignore[union-attr]
-                )
+                select(sa.func.count()).select_from(Request).where(_ORPHANED)
             )
 
             count_result = await session.execute(orphaned_req_count_stmt)
@@ -98,10 +106,7 @@ class IntegrityMixin:
                     Request.continuation,
                     Request.completed_at,
                 )
-                .where(
-                    Request.status == "completed",
-                    Request.response_status_code.is_(None),  # type: ignore[union-attr]
-                )
+                .where(_ORPHANED)
                 .order_by(Request.id)
             )
             orphaned_requests = [
@@ -127,7 +132,8 @@ class IntegrityMixin:
         """Get ghost requests (completed requests with no children and no results).
 
         Ghost requests are completed requests that produced no observable output:
-        no child requests and no ParsedData results.
+        no child requests and no ParsedData results, as recorded by the
+        ``child_count`` / ``result_count`` counters.
 
         Returns:
             Dictionary with ghost request information:
@@ -135,27 +141,9 @@ class IntegrityMixin:
                 - by_continuation: Dict mapping continuation -> count
                 - ghosts: List of dicts with {id, url, continuation, completed_at}
         """
-        # Subqueries for NOT EXISTS
-        child = Request.__table__.alias("child")
-        child_exists = (
-            select(sa.literal(1))
-            .select_from(child)
-            .where(child.c.parent_request_id == Request.id)
-            .correlate(Request)
-        )
-        result_exists = (
-            select(sa.literal(1))
-            .select_from(Result)
-            .where(Result.request_id == Request.id)
-            .correlate(Request)
-        )
-
-        # Base ghost condition
-        ghost_conditions = [
-            Request.status == "completed",
-            ~sa.exists(child_exists),
-            ~sa.exists(result_exists),
-        ]
+        # Maintained counters make this a scan of the small partial
+        # index of ghosts rather than an anti-join per request.
+        ghost_conditions = [_GHOST]
 
         async with self._session_factory() as session:
             # Get total count
@@ -211,8 +199,9 @@ class IntegrityMixin:
         """Check EstimateData predictions against actual result counts.
 
         For each stored estimate, walks the request tree (via recursive CTE
-        on parent_request_id) to count actual results of the expected types
-        produced by descendant requests.
+        on parent_request_id, pruned by the child_count / result_count
+        counters) to count actual results of the expected types produced
+        by the request and its descendants.
 
         Returns:
             Dictionary with estimate check results:
@@ -235,36 +224,42 @@ class IntegrityMixin:
             estimates = estimate_rows.all()
 
         results: list[dict[str, Any]] = []
+        req_table = Request.__table__
+        child = req_table.alias("child")
         for est_id, request_id, types_json, min_count, max_count in estimates:
             expected_types: list[str] = json.loads(types_json)
 
-            # Recursive CTE: find all descendant request IDs
-            # Start with direct children of the estimate's request
-            req_table = Request.__table__
-            descendants = (
-                select(req_table.c.id)
-                .where(req_table.c.parent_request_id == request_id)
-                .cte(name="descendants", recursive=True)
+            # Recursive CTE over the estimate's request and its
+            # descendants, only descending from requests whose
+            # child_count says they have children.
+            tree = (
+                select(
+                    req_table.c.id,
+                    req_table.c.child_count,
+                    req_table.c.result_count,
+                )
+                .where(req_table.c.id == request_id)
+                .cte(name="tree", recursive=True)
             )
-            descendants = descendants.union_all(
-                select(req_table.c.id).where(
-                    req_table.c.parent_request_id == descendants.c.id
+            tree = tree.union_all(
+                select(
+                    child.c.id, child.c.child_count, child.c.result_count
+                ).where(
+                    child.c.parent_request_id == tree.c.id,
+                    tree.c.child_count > 0,
                 )
             )
 
-            # Count results of expected types in the descendant tree
-            # Include results from the estimate's own request too
+            # Count results of expected types, looking only at requests
+            # whose result_count says they have results.
             async with self._session_factory() as session:
                 count_result = await session.execute(
                     select(sa.func.count())
                     .select_from(Result)
                     .where(
                         Result.result_type.in_(expected_types),  # type: ignore[attr-defined]
-                        sa.or_(
-                            Result.request_id == request_id,
-                            Result.request_id.in_(  # type: ignore[union-attr]
-                                select(descendants.c.id)
-                            ),
+                        Result.request_id.in_(  # type: ignore[union-attr]
+                            select(tree.c.id).where(tree.c.result_count > 0)
                         ),
                     )
                 )
@@ -303,3 +298,20 @@ class IntegrityMixin:
                 "failed": failed,
             },
         }
+
+    async def check_counters(self, *, fix: bool = False) -> dict[str, Any]:
+        """Reconcile the request and result counters with a recount.
+
+        Args:
+            fix: Rewrite the counters from the recount.
+
+        Returns:
+            Dictionary with mismatched ``requests`` and ``results``
+            counter rows, ``has_drift`` and ``fixed``.
+
+        Raises:
+            PermissionError: If ``fix`` is set in read-only mode.
+        """
+        if fix:
+            self._require_write_mode()
+        return await check_run_counters(self._session_factory, fix=fix)
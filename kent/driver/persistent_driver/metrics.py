@@ -0,0 +1,500 @@
+"""In-process metrics for the persistent driver.
+
+A :class:`MetricsRegistry` holds counters, gauges and fixed-bucket
+histograms, each optionally split by label values. Recording is a dict
+lookup and an integer add, cheap enough for the worker hot path, and
+nothing is written to the database.
+
+:class:`DriverMetrics` registers the driver's instruments:
+
+- ``kent_http_request_duration_seconds{host}``: HTTP fetch latency.
+- ``kent_step_duration_seconds{continuation}``: time spent running a
+  step's generator, excluding the flush of what it yielded.
+- ``kent_flush_duration_seconds``: staged-write flush time.
+- ``kent_db_lock_wait_seconds``: wait to acquire the SQLite write lock.
+- ``kent_dequeue_duration_seconds``: time to claim the next request.
+- ``kent_retries_total{host}``: transient errors that were retried.
+- ``kent_compression_ratio{continuation}``: original / compressed size.
+- ``kent_queue_depth{status}`` and ``kent_active_workers``: gauges.
+
+Registries render in the Prometheus text exposition format
+(:meth:`MetricsRegistry.render`, :func:`render_runs`) and as a JSON
+snapshot with estimated percentiles (:meth:`MetricsRegistry.snapshot`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, ClassVar, Generic, Literal, TypeVar
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+"""Bucket bounds, in seconds, for request and step latencies."""
+
+LOCK_WAIT_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+"""Bucket bounds, in seconds, for lock waits and other short waits."""
+
+RATIO_BUCKETS: tuple[float, ...] = (
+    1.0,
+    1.5,
+    2.0,
+    3.0,
+    4.0,
+    6.0,
+    8.0,
+    12.0,
+    16.0,
+    32.0,
+)
+"""Bucket bounds for compression ratios."""
+
+
+class CounterValue:
+    """A monotonically increasing count for one set of label values."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` (which must not be negative)."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.value += amount
+
+
+class GaugeValue:
+    """A value that can go up and down, for one set of label values."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge to ``value``."""
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` to the gauge."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Subtract ``amount`` from the gauge."""
+        self.value -= amount
+
+
+class HistogramValue:
+    """Observation counts per fixed bucket, for one set of label values.
+
+    ``counts[i]`` holds observations ``<= bounds[i]`` and above the
+    previous bound; the last slot holds those above every bound.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile by interpolating within buckets.
+
+        Observations above the last bound are reported as the last
+        bound. Returns None before the first observation.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+
+ValueT = TypeVar("ValueT", CounterValue, GaugeValue, HistogramValue)
+
+
+class Metric(Generic[ValueT]):
+    """A named metric with one value per combination of label values.
+
+    Attributes:
+        name: Metric name, e.g. ``kent_retries_total``.
+        help: One-line description for the ``# HELP`` line.
+        labelnames: Names of the labels, in the order ``labels()``
+            takes their values.
+    """
+
+    kind: ClassVar[str]
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], ValueT] = {}
+
+    def labels(self, *values: str) -> ValueT:
+        """Return the value for these label values, creating it if new."""
+        value = self._values.get(values)
+        if value is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} takes labels {self.labelnames}, "
+                    f"got {len(values)} values"
+                )
+            value = self._values[values] = self._new_value()
+        return value
+
+    def items(self) -> list[tuple[dict[str, str], ValueT]]:
+        """Label dicts and values, in label order."""
+        return [
+            (dict(zip(self.labelnames, key)), value)
+            for key, value in sorted(self._values.items())
+        ]
+
+    def _new_value(self) -> ValueT:
+        raise NotImplementedError
+
+
+class Counter(Metric[CounterValue]):
+    """A counter; use ``labels(...).inc()``, or ``inc()`` if unlabeled."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabeled counter."""
+        self.labels().inc(amount)
+
+    def _new_value(self) -> CounterValue:
+        return CounterValue()
+
+
+class Gauge(Metric[GaugeValue]):
+    """A gauge; use ``labels(...).set()``, or ``set()`` if unlabeled."""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        """Set the unlabeled gauge."""
+        self.labels().set(value)
+
+    def _new_value(self) -> GaugeValue:
+        return GaugeValue()
+
+
+class Histogram(Metric[HistogramValue]):
+    """A fixed-bucket histogram; ``labels(...).observe()`` records."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float) -> None:
+        """Record one observation on the unlabeled histogram."""
+        self.labels().observe(value)
+
+    def _new_value(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+
+MetricT = TypeVar("MetricT", Counter, Gauge, Histogram)
+
+
+class MetricsRegistry:
+    """A set of metrics, rendered together.
+
+    ``counter``, ``gauge`` and ``histogram`` return the existing metric
+    when one of that name is already registered, so callers can look
+    metrics up by name instead of holding on to them.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def counter(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Register (or return) a counter."""
+        return self._register(Counter, Counter(name, help, labelnames))
+
+    def gauge(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Register (or return) a gauge."""
+        return self._register(Gauge, Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        """Register (or return) a histogram."""
+        return self._register(
+            Histogram, Histogram(name, help, buckets, labelnames)
+        )
+
+    def metrics(self) -> list[Counter | Gauge | Histogram]:
+        """Registered metrics, sorted by name."""
+        return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render(self) -> str:
+        """Render in the Prometheus text exposition format (0.0.4)."""
+        return render_runs({"": self}, label=None)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable view of every metric.
+
+        Histograms carry cumulative bucket counts keyed by upper bound
+        (as in the exposition format) plus estimated p50, p95 and p99.
+        """
+        snapshot: dict[str, Any] = {}
+        for metric in self.metrics():
+            samples: list[dict[str, Any]] = []
+            for labels, value in metric.items():
+                if isinstance(value, HistogramValue):
+                    samples.append(
+                        {
+                            "labels": labels,
+                            "count": value.count,
+                            "sum": value.sum,
+                            "buckets": dict(_cumulative(value)),
+                            "p50": value.quantile(0.5),
+                            "p95": value.quantile(0.95),
+                            "p99": value.quantile(0.99),
+                        }
+                    )
+                else:
+                    samples.append({"labels": labels, "value": value.value})
+            snapshot[metric.name] = {
+                "type": metric.kind,
+                "help": metric.help,
+                "samples": samples,
+            }
+        return snapshot
+
+    def _register(self, kind: type[MetricT], metric: MetricT) -> MetricT:
+        existing = self._metrics.get(metric.name)
+        if existing is None:
+            self._metrics[metric.name] = metric
+            return metric
+        if not isinstance(existing, kind):
+            raise ValueError(
+                f"Metric {metric.name!r} is already a {existing.kind}"
+            )
+        return existing
+
+
+def render_runs(
+    registries: Mapping[str, MetricsRegistry], label: str | None = "run"
+) -> str:
+    """Render several registries as one exposition.
+
+    Each metric gets one ``# HELP``/``# TYPE`` header, and each sample a
+    ``label`` label naming the registry it came from (omitted when
+    ``label`` is None).
+
+    Args:
+        registries: Registries keyed by the value for ``label``.
+        label: Name of the label that tells the registries apart.
+    """
+    families: dict[str, list[tuple[str, Counter | Gauge | Histogram]]] = {}
+    for source, registry in registries.items():
+        for metric in registry.metrics():
+            families.setdefault(metric.name, []).append((source, metric))
+
+    lines: list[str] = []
+    for name in sorted(families):
+        first = families[name][0][1]
+        lines.append(f"# HELP {name} {_escape_help(first.help)}")
+        lines.append(f"# TYPE {name} {first.kind}")
+        for source, metric in families[name]:
+            extra = {label: source} if label is not None else {}
+            for labels, value in metric.items():
+                labels = {**extra, **labels}
+                if isinstance(value, HistogramValue):
+                    for bound, count in _cumulative(value):
+                        lines.append(
+                            f"{name}_bucket"
+                            f"{_format_labels({**labels, 'le': bound})}"
+                            f" {count}"
+                        )
+                    lines.append(
+                        f"{name}_sum{_format_labels(labels)}"
+                        f" {_format_number(value.sum)}"
+                    )
+                    lines.append(
+                        f"{name}_count{_format_labels(labels)} {value.count}"
+                    )
+                else:
+                    lines.append(
+                        f"{name}{_format_labels(labels)}"
+                        f" {_format_number(value.value)}"
+                    )
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _cumulative(value: HistogramValue) -> list[tuple[str, int]]:
+    """Cumulative counts per ``le`` bound, ending with ``+Inf``."""
+    buckets: list[tuple[str, int]] = []
+    total = 0
+    for bound, count in zip(value.bounds, value.counts):
+        total += count
+        buckets.append((_format_number(bound), total))
+    buckets.append(("+Inf", value.count))
+    return buckets
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+class TimedLock(asyncio.Lock):
+    """An ``asyncio.Lock`` that records how long acquiring it waited.
+
+    Waits are observed on ``wait_histogram`` once one is attached;
+    until then the lock behaves exactly like ``asyncio.Lock``.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.wait_histogram: Histogram | None = None
+
+    async def acquire(self) -> Literal[True]:
+        """Acquire the lock, recording the wait."""
+        if self.wait_histogram is None:
+            return await super().acquire()
+        start = time.perf_counter()
+        acquired = await super().acquire()
+        self.wait_histogram.observe(time.perf_counter() - start)
+        return acquired
+
+
+class DriverMetrics:
+    """The persistent driver's instruments on one registry.
+
+    Args:
+        registry: Registry to register on; a new one by default.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.http_latency = self.registry.histogram(
+            "kent_http_request_duration_seconds",
+            "HTTP fetch latency per host.",
+            labelnames=("host",),
+        )
+        self.step_time = self.registry.histogram(
+            "kent_step_duration_seconds",
+            "Time running a step's generator, per continuation.",
+            labelnames=("continuation",),
+        )
+        self.flush_time = self.registry.histogram(
+            "kent_flush_duration_seconds",
+            "Time flushing a step's staged writes.",
+        )
+        self.lock_wait = self.registry.histogram(
+            "kent_db_lock_wait_seconds",
+            "Wait to acquire the database write lock.",
+            buckets=LOCK_WAIT_BUCKETS,
+        )
+        self.dequeue_time = self.registry.histogram(
+            "kent_dequeue_duration_seconds",
+            "Time to claim the next request from the queue.",
+            buckets=LOCK_WAIT_BUCKETS,
+        )
+        self.retries = self.registry.counter(
+            "kent_retries_total",
+            "Transient errors scheduled for retry, per host.",
+            labelnames=("host",),
+        )
+        self.compression_ratio = self.registry.histogram(
+            "kent_compression_ratio",
+            "Original over compressed response size, per continuation.",
+            buckets=RATIO_BUCKETS,
+            labelnames=("continuation",),
+        )
+        self.queue_depth = self.registry.gauge(
+            "kent_queue_depth",
+            "Requests in the queue, per status.",
+            labelnames=("status",),
+        )
+        self.active_workers = self.registry.gauge(
+            "kent_active_workers",
+            "Workers currently running.",
+        )
@@ -0,0 +1,8 @@
+-- v21 → v22: Frontier-search statistics on speculation_tracking.
+--
+-- Templates with `search_strategy = "gallop"` probe exponentially spaced
+-- IDs past the ceiling instead of stopping. `search_probes` counts those
+-- probes; `probes_saved` counts the requests a dense linear scan would
+-- have spent reaching the same blocks, net of the probes.
+ALTER TABLE speculation_tracking ADD COLUMN search_probes INTEGER DEFAULT 0;
+ALTER TABLE speculation_tracking ADD COLUMN probes_saved INTEGER DEFAULT 0;
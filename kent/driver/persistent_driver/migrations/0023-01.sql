@@ -0,0 +1,7 @@
+-- v22 → v23: Existence-probe mode on requests.
+--
+-- Speculative templates with a `probe` attribute first request each ID
+-- with HEAD ("head") or with `Range: bytes=0-0` ("range"). The probe row
+-- stores the full request's method and headers; the mode tells the
+-- request manager how to rewrite them. NULL for ordinary requests.
+ALTER TABLE requests ADD COLUMN probe TEXT;
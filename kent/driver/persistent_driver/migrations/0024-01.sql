@@ -0,0 +1,16 @@
+-- v23 → v24: Durable progress of ranged archive downloads.
+--
+-- When the archive handler opts in to ranged downloads, large files are
+-- fetched as concurrent `Range` segments into a preallocated temp file.
+-- After each fsync the per-segment offsets are recorded here, keyed by
+-- URL, so a retry resumes from the last durable offset instead of byte
+-- zero. The row is deleted once the file reaches its final path.
+CREATE TABLE IF NOT EXISTS archive_partials (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    temp_path TEXT NOT NULL,
+    total_size INTEGER NOT NULL,
+    validator TEXT,
+    segments_json TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,23 @@
+-- v24 → v25: Post-archive processing stage.
+--
+-- Archived files are hashed and handed to registered processors by a
+-- worker pool of their own, after the download worker has moved on.
+-- Each processor's output and timing is recorded in archive_processing.
+-- archived_files.processed_at marks files the stage has finished, so
+-- files left over from an interrupted run are processed on resume.
+-- Existing files count as processed.
+ALTER TABLE archived_files ADD COLUMN processed_at TEXT;
+UPDATE archived_files SET processed_at = COALESCE(created_at, CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS archive_processing (
+    id INTEGER PRIMARY KEY,
+    archived_file_id INTEGER NOT NULL REFERENCES archived_files(id),
+    request_id INTEGER NOT NULL REFERENCES requests(id),
+    processor TEXT NOT NULL,
+    status TEXT NOT NULL,
+    output_json TEXT,
+    error TEXT,
+    duration_ms FLOAT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_archive_processing_file ON archive_processing(archived_file_id);
+CREATE INDEX IF NOT EXISTS idx_archive_processing_processor ON archive_processing(processor, status);
@@ -0,0 +1,10 @@
+-- v25 → v26: Per-request output counters.
+--
+-- child_count and result_count hold the number of requests and results
+-- whose parent is this request. Triggers (0026-02.py) keep them current
+-- in the transaction that writes the child rows, so a step's flush adds
+-- its children, its results and the counts atomically. Ghost and orphan
+-- checks become scans of small partial indexes instead of anti-joins
+-- over requests × requests × results.
+ALTER TABLE requests ADD COLUMN child_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE requests ADD COLUMN result_count INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,20 @@
+-- v26 → v27: Run-level counters.
+--
+-- request_counts holds the number of requests per (continuation,
+-- status) and result_counts the number of results per (result_type,
+-- is_valid). Triggers (0027-02.py) keep them current in the transaction
+-- that inserts a row or changes its status, so queue and result
+-- statistics read a few rows instead of grouping the big tables.
+-- `pdd doctor counters` recounts them and repairs any drift.
+CREATE TABLE IF NOT EXISTS request_counts (
+    continuation VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (continuation, status)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS result_counts (
+    result_type VARCHAR NOT NULL,
+    is_valid BOOLEAN NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (result_type, is_valid)
+) WITHOUT ROWID;
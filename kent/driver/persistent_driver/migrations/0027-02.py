@@ -0,0 +1,109 @@
+"""v26 → v27: backfill the run counters and install their triggers.
+
+``request_counts`` and ``result_counts`` are filled from a single
+``GROUP BY`` over ``requests`` and ``results``, then triggers follow
+every insert, delete, status / continuation change and result
+re-typing. As with the v26 output counters, triggers cover every writer
+of these tables, in the writer's own transaction.
+
+Trigger bodies contain ``;``, so this step cannot be a ``.sql`` file.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_ADD_REQUEST = """
+        INSERT INTO request_counts (continuation, status, count)
+        VALUES (NEW.continuation, NEW.status, 1)
+        ON CONFLICT (continuation, status) DO UPDATE SET count = count + 1;
+"""
+_REMOVE_REQUEST = """
+        UPDATE request_counts SET count = count - 1
+        WHERE continuation = OLD.continuation AND status = OLD.status;
+"""
+_ADD_RESULT = """
+        INSERT INTO result_counts (result_type, is_valid, count)
+        VALUES (NEW.result_type, NEW.is_valid, 1)
+        ON CONFLICT (result_type, is_valid) DO UPDATE SET count = count + 1;
+"""
+_REMOVE_RESULT = """
+        UPDATE result_counts SET count = count - 1
+        WHERE result_type = OLD.result_type AND is_valid = OLD.is_valid;
+"""
+
+BACKFILL = [
+    "DELETE FROM request_counts",
+    "INSERT INTO request_counts (continuation, status, count)"
+    " SELECT continuation, status, COUNT(*) FROM requests"
+    " GROUP BY continuation, status",
+    "DELETE FROM result_counts",
+    "INSERT INTO result_counts (result_type, is_valid, count)"
+    " SELECT result_type, is_valid, COUNT(*) FROM results"
+    " GROUP BY result_type, is_valid",
+]
+
+TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_request_counts_insert
+    AFTER INSERT ON requests
+    BEGIN {_ADD_REQUEST}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_request_counts_delete
+    AFTER DELETE ON requests
+    BEGIN {_REMOVE_REQUEST}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_request_counts_update
+    AFTER UPDATE OF status, continuation ON requests
+    WHEN OLD.status IS NOT NEW.status
+        OR OLD.continuation IS NOT NEW.continuation
+    BEGIN {_REMOVE_REQUEST} {_ADD_REQUEST}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_result_counts_insert
+    AFTER INSERT ON results
+    BEGIN {_ADD_RESULT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_result_counts_delete
+    AFTER DELETE ON results
+    BEGIN {_REMOVE_RESULT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_result_counts_update
+    AFTER UPDATE OF result_type, is_valid ON results
+    WHEN OLD.result_type IS NOT NEW.result_type
+        OR OLD.is_valid IS NOT NEW.is_valid
+    BEGIN {_REMOVE_RESULT} {_ADD_RESULT}
+    END
+    """,
+]
+
+
+async def migrate(engine: AsyncEngine) -> bool:
+    """Backfill the counters and create their triggers in one transaction."""
+    async with engine.begin() as conn:
+        for statement in BACKFILL + TRIGGERS:
+            try:
+                await conn.execute(sa.text(statement))
+            except Exception:
+                # As for .sql steps: a table or column this relies on
+                # may be missing from a partial (test) schema.
+                logger.warning("Skipped: %s", " ".join(statement.split()))
+    logger.info("Run counters backfilled.")
+    return True
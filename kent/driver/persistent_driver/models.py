@@ -10,6 +10,8 @@ Tables:
 - compression_dicts: Versioned zstd dictionaries per-continuation
 - results: Validated scraped data
 - archived_files: Downloaded file metadata
+- archive_processing: Outputs and timings of post-archive processors
+- archive_partials: Durable progress of ranged archive downloads
 - run_metadata: Single-row configuration and state
 - errors: Detailed error tracking with type-specific fields
 - rate_items: Rate limiting items
@@ -61,6 +63,19 @@ class Request(SQLModel, table=True):  # type: ignore[call-arg]
         sa.Index("idx_requests_parent", "parent_request_id"),
         sa.Index("idx_requests_response_status_code", "response_status_code"),
         sa.Index("idx_requests_compression_dict", "compression_dict_id"),
+        sa.Index(
+            "idx_requests_ghosts",
+            "status",
+            "continuation",
+            "id",
+            sqlite_where=sa.text("child_count = 0 AND result_count = 0"),
+        ),
+        sa.Index(
+            "idx_requests_orphaned",
+            "status",
+            "id",
+            sqlite_where=sa.text("response_status_code IS NULL"),
+        ),
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -139,6 +154,19 @@ class Request(SQLModel, table=True):  # type: ignore[call-arg]
         default=None, foreign_key="requests.id"
     )
 
+    # Output counters (added in v26): rows in requests / results pointing
+    # at this request. Kept current by triggers in the same transaction as
+    # the insert (see migrations/0026-02.py), so ghost and estimate checks
+    # read them instead of probing the child tables.
+    child_count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": sa.text("0")},
+    )
+    result_count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": sa.text("0")},
+    )
+
     # Speculation tracking
     is_speculative: bool = Field(
         default=False,
@@ -207,6 +235,12 @@ class Request(SQLModel, table=True):  # type: ignore[call-arg]
     # subtrees.
     hateoas: bool | None = None
 
+    # Existence-probe mode (added in v23): "head" or "range" for a
+    # speculative request that only checks whether its ID exists. NULL for
+    # ordinary requests. The stored method/headers are those of the full
+    # request; the request manager rewrites them when sending the probe.
+    probe: str | None = None
+
 
 class CompressionDict(SQLModel, table=True):  # type: ignore[call-arg]
     """Versioned zstd compression dictionaries per-continuation."""
@@ -260,6 +294,41 @@ class Result(SQLModel, table=True):  # type: ignore[call-arg]
     )
 
 
+class RequestCount(SQLModel, table=True):  # type: ignore[call-arg]
+    """Number of requests per (continuation, status), kept by triggers.
+
+    Added in v27 so queue statistics read a handful of rows instead of
+    grouping ``requests``. ``pdd doctor counters`` recounts and repairs.
+    """
+
+    __tablename__ = "request_counts"
+    __table_args__ = ({"sqlite_with_rowid": False},)
+
+    continuation: str = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": sa.text("0")},
+    )
+
+
+class ResultCount(SQLModel, table=True):  # type: ignore[call-arg]
+    """Number of results per (result_type, is_valid), kept by triggers.
+
+    Added in v27 alongside :class:`RequestCount`.
+    """
+
+    __tablename__ = "result_counts"
+    __table_args__ = ({"sqlite_with_rowid": False},)
+
+    result_type: str = Field(primary_key=True)
+    is_valid: bool = Field(primary_key=True)
+    count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": sa.text("0")},
+    )
+
+
 class ArchivedFile(SQLModel, table=True):  # type: ignore[call-arg]
     """Downloaded file metadata."""
 
@@ -284,6 +353,56 @@ class ArchivedFile(SQLModel, table=True):  # type: ignore[call-arg]
         default=None,
         sa_column_kwargs={"server_default": sa.text("CURRENT_TIMESTAMP")},
     )
+    # Set once the post-archive stage has hashed the file and run the
+    # registered processors; NULL rows are picked up on the next run.
+    processed_at: str | None = None
+
+
+class ArchiveProcessing(SQLModel, table=True):  # type: ignore[call-arg]
+    """Output of one post-archive processor for one archived file."""
+
+    __tablename__ = "archive_processing"
+    __table_args__ = (
+        sa.Index("idx_archive_processing_file", "archived_file_id"),
+        sa.Index("idx_archive_processing_processor", "processor", "status"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    archived_file_id: int = Field(foreign_key="archived_files.id")
+    request_id: int = Field(foreign_key="requests.id")
+
+    processor: str
+    status: str  # 'success' or 'error'
+    output_json: str | None = None
+    error: str | None = None
+    duration_ms: float
+
+    created_at: str | None = Field(
+        default=None,
+        sa_column_kwargs={"server_default": sa.text("CURRENT_TIMESTAMP")},
+    )
+
+
+class ArchivePartial(SQLModel, table=True):  # type: ignore[call-arg]
+    """Durable progress of an interrupted ranged archive download."""
+
+    __tablename__ = "archive_partials"
+
+    id: int | None = Field(default=None, primary_key=True)
+    url: str = Field(unique=True)
+
+    # Preallocated temp file and what the server reported for it
+    temp_path: str
+    total_size: int
+    validator: str | None = None  # ETag or Last-Modified
+
+    # JSON list of [start, end, offset] per segment
+    segments_json: str
+
+    updated_at: str | None = Field(
+        default=None,
+        sa_column_kwargs={"server_default": sa.text("CURRENT_TIMESTAMP")},
+    )
 
 
 class RunMetadata(SQLModel, table=True):  # type: ignore[call-arg]
@@ -436,6 +555,14 @@ class SpeculationTracking(SQLModel, table=True):  # type: ignore[call-arg]
         sa_column_kwargs={"server_default": sa.text("0")},
     )
     template_json: str | None = None
+    search_probes: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": sa.text("0")},
+    )
+    probes_saved: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": sa.text("0")},
+    )
     updated_at: str | None = Field(
         default=None,
         sa_column_kwargs={"server_default": sa.text("CURRENT_TIMESTAMP")},
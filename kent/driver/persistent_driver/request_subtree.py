@@ -0,0 +1,447 @@
+"""Bulk loading of request subtrees for step replay and comparison.
+
+Replaying a request through new step code needs its request row, its
+decompressed response and, to compare against, the requests it led to
+(transitively), its results and its unresolved error. Loading that one
+request at a time costs several round trips per request, and comparing
+a whole tree repeats the descendant query for every node in it.
+
+:func:`load_request_nodes` instead reads the request rows of whole
+subtrees with one recursive CTE (per batch of roots), and
+:func:`iter_step_inputs` loads response bodies, compression
+dictionaries, results and errors for a batch of requests with one
+``IN`` query each, decompressing in a worker thread. Descendants come
+from the in-memory tree.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+from sqlmodel import select
+
+from kent.driver.persistent_driver.dry_run_driver import (
+    CapturedData,
+    CapturedError,
+    CapturedRequest,
+    DryRunResult,
+)
+from kent.driver.persistent_driver.models import (
+    CompressionDict,
+    Error,
+    Request,
+    Result,
+)
+from kent.driver.persistent_driver.response_search import decompress_rows
+
+if TYPE_CHECKING:
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+# Requests per recursive CTE seed list and per IN-list.
+_ROOT_BATCH = 500
+_INPUT_BATCH = 100
+
+_NODE_COLUMNS = (
+    "id",
+    "parent_request_id",
+    "status",
+    "request_type",
+    "url",
+    "method",
+    "continuation",
+    "current_location",
+    "accumulated_data_json",
+    "permanent_json",
+    "priority",
+    "deduplication_key",
+    "expected_type",
+    "response_status_code",
+    "response_headers_json",
+    "response_url",
+    "content_size_original",
+    "content_size_compressed",
+    "compression_dict_id",
+    "response_created_at",
+    "speculation_outcome",
+)
+
+
+@dataclass
+class RequestNode:
+    """A request row without its response body."""
+
+    id: int
+    parent_request_id: int | None
+    status: str
+    request_type: str | None
+    url: str
+    method: str
+    continuation: str
+    current_location: str | None
+    accumulated_data_json: str | None
+    permanent_json: str | None
+    priority: int
+    deduplication_key: str | None
+    expected_type: str | None
+    response_status_code: int | None
+    response_headers_json: str | None
+    response_url: str | None
+    content_size_original: int | None
+    content_size_compressed: int | None
+    compression_dict_id: int | None
+    response_created_at: str | None
+    speculation_outcome: str | None
+
+    @property
+    def has_response(self) -> bool:
+        return self.response_status_code is not None
+
+    def request_data(self) -> dict[str, Any]:
+        """The request fields :meth:`DryRunDriver.run_continuation` takes."""
+        return {
+            "url": self.url,
+            "method": self.method,
+            "continuation": self.continuation,
+            "current_location": self.current_location,
+            "accumulated_data_json": self.accumulated_data_json,
+            "permanent_json": self.permanent_json,
+        }
+
+    def response_data(self, content: bytes) -> dict[str, Any]:
+        """The response fields, with the decompressed body."""
+        return {
+            "id": self.id,
+            "request_id": self.id,
+            "status_code": self.response_status_code,
+            "headers_json": self.response_headers_json,
+            "url": self.response_url,
+            "content_size_original": self.content_size_original,
+            "content_size_compressed": self.content_size_compressed,
+            "compression_dict_id": self.compression_dict_id,
+            "continuation": self.continuation,
+            "created_at": self.response_created_at,
+            "speculation_outcome": self.speculation_outcome,
+            "content": content,
+        }
+
+    def captured(self) -> CapturedRequest:
+        """This request as its parent's stored output."""
+        return CapturedRequest(
+            request_type=self.request_type or "navigating",
+            url=self.url,
+            method=self.method,
+            continuation=self.continuation,
+            accumulated_data=(
+                json.loads(self.accumulated_data_json)
+                if self.accumulated_data_json
+                else {}
+            ),
+            permanent=(
+                json.loads(self.permanent_json) if self.permanent_json else {}
+            ),
+            current_location=self.current_location or "",
+            priority=self.priority,
+            deduplication_key=self.deduplication_key,
+            is_speculative=False,
+            speculation_id=None,
+            expected_type=self.expected_type,
+        )
+
+
+@dataclass
+class RequestTrees:
+    """Request rows of one or more subtrees, linked parent to children.
+
+    Attributes:
+        nodes: Loaded requests by ID.
+        children: Child IDs of each loaded request, ascending.
+    """
+
+    nodes: dict[int, RequestNode] = field(default_factory=dict)
+    children: dict[int, list[int]] = field(default_factory=dict)
+
+    def descendants(self, request_id: int) -> list[RequestNode]:
+        """All transitive children of a request, by ID."""
+        found: list[RequestNode] = []
+        stack = list(self.children.get(request_id, ()))
+        while stack:
+            child_id = stack.pop()
+            found.append(self.nodes[child_id])
+            stack.extend(self.children.get(child_id, ()))
+        found.sort(key=lambda node: node.id)
+        return found
+
+    def walk(
+        self, root_ids: list[int], *, through_missing: bool = True
+    ) -> list[int]:
+        """Roots followed breadth-first by their completed descendants.
+
+        A root that was not loaded is still listed, without descendants.
+
+        Args:
+            root_ids: Where to start; each request is listed once.
+            through_missing: Also descend from requests with no stored
+                response.
+        """
+        ordered: list[int] = []
+        visited: set[int] = set()
+        for root in root_ids:
+            if root in visited:
+                continue
+            visited.add(root)
+            queue = deque([root])
+            while queue:
+                current = queue.popleft()
+                ordered.append(current)
+                node = self.nodes.get(current)
+                if node is None or (
+                    not through_missing and not node.has_response
+                ):
+                    continue
+                for child_id in self.children.get(current, ()):
+                    if (
+                        child_id not in visited
+                        and self.nodes[child_id].status == "completed"
+                    ):
+                        visited.add(child_id)
+                        queue.append(child_id)
+        return ordered
+
+
+async def load_request_nodes(
+    session_factory: ScopedSessionFactory,
+    request_ids: list[int],
+    *,
+    descendants: bool = True,
+) -> RequestTrees:
+    """Load request rows, with their subtrees if ``descendants``.
+
+    Each batch of roots is one recursive CTE, so a subtree of any depth
+    is read in a single query. Roots already loaded as a descendant of
+    an earlier batch are skipped, so each row is read once when
+    ``request_ids`` lists whole trees.
+
+    Args:
+        session_factory: Session factory for the run database.
+        request_ids: Requests (subtree roots) to load.
+        descendants: Also load every transitive child.
+    """
+    columns = [getattr(Request, name) for name in _NODE_COLUMNS]
+    trees = RequestTrees()
+    pending = deque(dict.fromkeys(request_ids))
+    async with session_factory() as session:
+        while pending:
+            batch: list[int] = []
+            while pending and len(batch) < _ROOT_BATCH:
+                request_id = pending.popleft()
+                if request_id not in trees.nodes:
+                    batch.append(request_id)
+            if not batch:
+                break
+            seed = select(*columns).where(
+                Request.id.in_(batch)  # type: ignore[union-attr]
+            )
+            if descendants:
+                tree = seed.cte(name="subtree", recursive=True)
+                child = Request.__table__.alias("child")  # type: ignore[attr-defined]
+                tree = tree.union(
+                    select(*(child.c[name] for name in _NODE_COLUMNS)).where(
+                        child.c.parent_request_id == tree.c.id
+                    )
+                )
+                query = select(tree).order_by(tree.c.id)
+            else:
+                query = seed.order_by(Request.id)  # type: ignore[arg-type]
+            result = await session.execute(query)
+            for row in result.all():
+                trees.nodes[row[0]] = RequestNode(*row)
+    for node in sorted(trees.nodes.values(), key=lambda n: n.id):
+        if node.parent_request_id in trees.nodes:
+            trees.children.setdefault(node.parent_request_id, []).append(
+                node.id
+            )
+    return trees
+
+
+@dataclass
+class StepInputs:
+    """What replaying and comparing one request needs.
+
+    Attributes:
+        request_id: The request.
+        request_data: Request fields for the dry run.
+        response_data: Response fields with the body, or None if the
+            request has no stored response.
+        original: The stored output as a DryRunResult, if asked for.
+        failure: Why the request cannot be replayed, if it cannot.
+    """
+
+    request_id: int
+    request_data: dict[str, Any] | None = None
+    response_data: dict[str, Any] | None = None
+    original: DryRunResult[Any] | None = None
+    failure: str | None = None
+
+
+async def _load_batch(
+    session_factory: ScopedSessionFactory,
+    trees: RequestTrees,
+    batch: list[int],
+    originals: bool,
+    dictionaries: dict[int, bytes],
+) -> list[StepInputs]:
+    responding = [
+        request_id
+        for request_id in batch
+        if request_id in trees.nodes and trees.nodes[request_id].has_response
+    ]
+    results: dict[int, list[CapturedData]] = {}
+    errors: dict[int, CapturedError] = {}
+    async with session_factory() as session:
+        rows: list[tuple[int, bytes | None, int | None]] = []
+        if responding:
+            result = await session.execute(
+                select(
+                    Request.id,
+                    Request.content_compressed,
+                    Request.compression_dict_id,
+                ).where(Request.id.in_(responding))  # type: ignore[union-attr]
+            )
+            rows = [tuple(row) for row in result.all()]  # type: ignore[misc]
+        missing = {
+            dict_id
+            for _, _, dict_id in rows
+            if dict_id is not None and dict_id not in dictionaries
+        }
+        if missing:
+            result = await session.execute(
+                select(
+                    CompressionDict.id, CompressionDict.dictionary_data
+                ).where(CompressionDict.id.in_(missing))  # type: ignore[union-attr]
+            )
+            dictionaries.update(result.all())  # type: ignore[arg-type]
+        lost = {
+            request_id: dict_id
+            for request_id, _, dict_id in rows
+            if dict_id is not None and dict_id not in dictionaries
+        }
+        if lost:
+            rows = [row for row in rows if row[0] not in lost]
+        if originals and responding:
+            result = await session.execute(
+                select(Result.request_id, Result.data_json)
+                .where(Result.request_id.in_(responding))  # type: ignore[union-attr]
+                .order_by(Result.id.desc())  # type: ignore[union-attr]
+            )
+            for request_id, data_json in result.all():
+                results.setdefault(request_id, []).append(
+                    CapturedData(
+                        data=json.loads(data_json) if data_json else {}
+                    )
+                )
+            result = await session.execute(
+                select(Error.request_id, Error.error_type, Error.message)
+                .where(
+                    Error.request_id.in_(responding),  # type: ignore[union-attr]
+                    Error.is_resolved == sa.false(),
+                )
+                .order_by(
+                    Error.created_at.desc(),  # type: ignore[union-attr]
+                    Error.id.desc(),  # type: ignore[union-attr]
+                )
+            )
+            for request_id, error_type, message in result.all():
+                errors.setdefault(
+                    request_id,
+                    CapturedError(
+                        error_type=error_type, error_message=message
+                    ),
+                )
+
+    contents = await asyncio.to_thread(
+        lambda: dict(decompress_rows(rows, dictionaries))
+    )
+    loaded = []
+    for request_id in batch:
+        node = trees.nodes.get(request_id)
+        if node is None:
+            loaded.append(
+                StepInputs(
+                    request_id, failure=f"Request {request_id} not found"
+                )
+            )
+            continue
+        if request_id in lost:
+            loaded.append(
+                StepInputs(
+                    request_id,
+                    request_data=node.request_data(),
+                    failure=(
+                        f"Dictionary {lost[request_id]} not found in database"
+                    ),
+                )
+            )
+            continue
+        if request_id not in contents:
+            loaded.append(
+                StepInputs(
+                    request_id,
+                    request_data=node.request_data(),
+                    failure=f"No response found for request {request_id}",
+                )
+            )
+            continue
+        original: DryRunResult[Any] | None = None
+        if originals:
+            original = DryRunResult(
+                requests=[d.captured() for d in trees.descendants(request_id)],
+                data=results.get(request_id, []),
+                error=errors.get(request_id),
+            )
+        loaded.append(
+            StepInputs(
+                request_id,
+                request_data=node.request_data(),
+                response_data=node.response_data(contents[request_id]),
+                original=original,
+            )
+        )
+    return loaded
+
+
+async def iter_step_inputs(
+    session_factory: ScopedSessionFactory,
+    trees: RequestTrees,
+    request_ids: list[int],
+    *,
+    originals: bool = True,
+    batch_size: int = _INPUT_BATCH,
+) -> AsyncGenerator[StepInputs, None]:
+    """Yield replay inputs for ``request_ids``, in order.
+
+    Bodies, dictionaries, results and errors are read with one query
+    each per batch; bodies are decompressed in a worker thread.
+
+    Args:
+        session_factory: Session factory for the run database.
+        trees: Request rows from :func:`load_request_nodes`; with
+            ``originals``, including each request's descendants.
+        request_ids: Requests to load.
+        originals: Also rebuild each request's stored output.
+        batch_size: Requests per batch.
+    """
+    dictionaries: dict[int, bytes] = {}
+    for start in range(0, len(request_ids), batch_size):
+        batch = request_ids[start : start + batch_size]
+        for inputs in await _load_batch(
+            session_factory, trees, batch, originals, dictionaries
+        ):
+            yield inputs
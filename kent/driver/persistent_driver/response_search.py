@@ -0,0 +1,389 @@
+"""Streaming search over stored response bodies.
+
+Responses are read from ``requests`` in id order, a chunk at a time,
+after a SQL prefilter on continuation, status code and content size.
+Each chunk is decompressed and matched in a process pool, several chunks
+in flight at once, and matching request ids are yielded in id order as
+their chunks complete so a caller can stop after the first few.
+
+The pool is only started once a search outgrows its first chunk; small
+searches match in a thread of the event loop's default executor.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import (
+    AsyncGenerator,
+    Callable,
+    Iterator,
+    Sequence,
+)
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import zstandard as zstd
+from sqlmodel import select
+
+from kent.driver._process_pool import OrderedPool
+from kent.driver.persistent_driver.models import CompressionDict, Request
+
+if TYPE_CHECKING:
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+# Responses read, decompressed and matched per pool task.
+DEFAULT_CHUNK_SIZE = 256
+
+# (request_id, content_compressed, compression_dict_id)
+_Row = tuple[int, bytes | None, int | None]
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class SearchPattern:
+    """What to look for in a response body.
+
+    Exactly one of ``text`` (case-insensitive substring), ``regex`` or
+    ``xpath`` must be set. Regex and XPath are compiled up front so a bad
+    pattern fails before any row is read.
+
+    With ``page_text``, ``text`` is matched against
+    :func:`response_page_text` instead of the raw body, with runs of
+    whitespace in ``text`` collapsed the same way. This is what the text
+    index (:mod:`~kent.driver.persistent_driver.text_index`) answers.
+
+    Raises:
+        ValueError: If zero or more than one pattern is provided.
+    """
+
+    text: str | None = None
+    regex: str | None = None
+    xpath: str | None = None
+    page_text: bool = False
+    _compiled: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        provided = sum(
+            1 for s in (self.text, self.regex, self.xpath) if s is not None
+        )
+        if provided != 1:
+            raise ValueError(
+                "Exactly one of text, regex, or xpath must be provided"
+            )
+        self._compile()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Compiled XPath objects don't pickle; pool workers recompile.
+        return {
+            "text": self.text,
+            "regex": self.regex,
+            "xpath": self.xpath,
+            "page_text": self.page_text,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_compiled", None)
+        self._compile()
+
+    def _compile(self) -> None:
+        compiled: Any = None
+        if self.text is not None and self.page_text:
+            compiled = " ".join(self.text.split()).lower()
+        elif self.text is not None:
+            compiled = (self.text.lower(), self.text.lower().encode())
+        elif self.regex is not None:
+            compiled = re.compile(self.regex)
+        elif self.xpath is not None:
+            from lxml import etree
+
+            compiled = etree.XPath(self.xpath)
+        object.__setattr__(self, "_compiled", compiled)
+
+    def matches(self, content: bytes) -> bool:
+        """Whether decompressed ``content`` matches this pattern.
+
+        Bodies are decoded as UTF-8, falling back to latin-1. For ASCII
+        text searches, ASCII-lowercased bytes are checked first; only a
+        miss on a body with non-ASCII bytes pays for decoding and
+        lowercasing the whole document.
+        """
+        if self.text is not None and self.page_text:
+            return self._compiled in response_page_text(content).lower()
+        if self.text is not None:
+            needle, needle_bytes = self._compiled
+            if needle.isascii():
+                if needle_bytes in content.lower():
+                    return True
+                if content.isascii():
+                    return False
+            return needle in _decode(content).lower()
+
+        content_str = _decode(content)
+        if self.regex is not None:
+            return self._compiled.search(content_str) is not None
+
+        from lxml import html
+
+        try:
+            return bool(self._compiled(html.fromstring(content_str)))
+        except Exception:
+            return False
+
+
+def response_page_text(content: bytes) -> str:
+    """The text a reader sees in a response, whitespace collapsed.
+
+    Markup, ``<script>`` and ``<style>`` are dropped and text nodes are
+    joined with a space, so adjacent cells don't run together. Bodies
+    lxml can't parse as HTML are used as decoded text.
+    """
+    from lxml import etree, html
+
+    try:
+        tree = html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return " ".join(_decode(content).split())
+    etree.strip_elements(tree, "script", "style", with_tail=False)
+    return " ".join(" ".join(tree.itertext()).split())
+
+
+def _decode(content: bytes) -> str:
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode("latin-1")
+
+
+def decompress_rows(
+    rows: list[_Row], dictionaries: dict[int, bytes]
+) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(request_id, content)`` for each row of a chunk."""
+    plain = zstd.ZstdDecompressor()
+    with_dict: dict[int, zstd.ZstdDecompressor] = {}
+    for request_id, compressed, dict_id in rows:
+        if not compressed:
+            yield request_id, b""
+        elif dict_id is None:
+            yield request_id, plain.decompress(compressed)
+        else:
+            decompressor = with_dict.get(dict_id)
+            if decompressor is None:
+                decompressor = zstd.ZstdDecompressor(
+                    dict_data=zstd.ZstdCompressionDict(dictionaries[dict_id])
+                )
+                with_dict[dict_id] = decompressor
+            yield request_id, decompressor.decompress(compressed)
+
+
+def _match_chunk(
+    pattern: SearchPattern,
+    rows: list[_Row],
+    dictionaries: dict[int, bytes],
+) -> list[int]:
+    """Decompress and match one chunk; runs in a pool worker.
+
+    Args:
+        pattern: The search pattern.
+        rows: ``(request_id, content_compressed, compression_dict_id)``.
+        dictionaries: Every compression dictionary the rows reference.
+
+    Returns:
+        Ids of matching requests, in row order.
+    """
+    return [
+        request_id
+        for request_id, content in decompress_rows(rows, dictionaries)
+        if pattern.matches(content)
+    ]
+
+
+async def map_response_chunks(
+    session_factory: ScopedSessionFactory,
+    func: Callable[[list[_Row], dict[int, bytes]], _T],
+    *,
+    where: Sequence[Any] = (),
+    request_ids: Sequence[int] | None = None,
+    processes: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncGenerator[_T, None]:
+    """Apply ``func`` to stored responses a chunk at a time, in id order.
+
+    ``func`` receives ``(rows, dictionaries)`` as :func:`_match_chunk`
+    does and must be picklable. Several chunks are in flight on the pool
+    at once; results are yielded in chunk order. Close the iterator
+    (``contextlib.aclosing``) when stopping early so the pool shuts down
+    promptly.
+
+    Args:
+        session_factory: Session factory for the run database.
+        func: Per-chunk work, run in a pool worker.
+        where: Extra SQLAlchemy conditions on ``Request``.
+        request_ids: Only these requests (still subject to ``where``).
+        processes: Pool size. ``None`` uses one per CPU; ``0`` runs
+            chunks in a thread instead of a process pool.
+        chunk_size: Rows per pool task.
+    """
+    query = select(
+        Request.id,
+        Request.content_compressed,
+        Request.compression_dict_id,
+    ).where(
+        Request.response_status_code.isnot(None),  # type: ignore[union-attr]
+        *where,
+    )
+    ids = sorted(request_ids) if request_ids is not None else None
+
+    dictionaries: dict[int, bytes] = {}
+    pool: OrderedPool[None] = OrderedPool(processes)
+    last_id = 0
+    position = 0
+    exhausted = False
+
+    async def read_chunk() -> list[_Row]:
+        nonlocal position, exhausted
+        if ids is None:
+            chunk_query = (
+                query.where(Request.id > last_id)  # type: ignore[arg-type,operator]
+                .order_by(Request.id)  # type: ignore[arg-type]
+                .limit(chunk_size)
+            )
+        else:
+            batch = ids[position : position + chunk_size]
+            position += chunk_size
+            chunk_query = query.where(
+                Request.id.in_(batch)  # type: ignore[union-attr]
+            ).order_by(Request.id)  # type: ignore[arg-type]
+        async with session_factory() as session:
+            result = await session.execute(chunk_query)
+            rows: list[_Row] = [tuple(row) for row in result.all()]  # type: ignore[misc]
+            missing = {
+                dict_id
+                for _, _, dict_id in rows
+                if dict_id is not None and dict_id not in dictionaries
+            }
+            if missing:
+                result = await session.execute(
+                    select(
+                        CompressionDict.id, CompressionDict.dictionary_data
+                    ).where(CompressionDict.id.in_(missing))  # type: ignore[union-attr]
+                )
+                dictionaries.update(result.all())  # type: ignore[arg-type]
+        if ids is None:
+            exhausted = len(rows) < chunk_size
+        else:
+            exhausted = position >= len(ids)
+        return rows
+
+    try:
+        while pool or not exhausted:
+            while not exhausted and not pool.full:
+                rows = await read_chunk()
+                if not rows:
+                    continue
+                last_id = rows[-1][0]
+                used = {
+                    dict_id: dictionaries[dict_id]
+                    for _, _, dict_id in rows
+                    if dict_id is not None
+                }
+                # A lone chunk is not worth starting the pool for.
+                pool.submit(
+                    None,
+                    func,
+                    rows,
+                    used,
+                    in_thread=exhausted and not pool.started,
+                )
+            if not pool:
+                break
+            _, future = pool.popleft()
+            yield await future
+    finally:
+        await pool.aclose()
+
+
+def response_filters(
+    *,
+    continuation: str | None = None,
+    status_code: int | None = None,
+    min_size: int | None = None,
+    max_size: int | None = None,
+) -> list[Any]:
+    """SQL conditions on ``Request`` for the search prefilters."""
+    where: list[Any] = []
+    if continuation is not None:
+        where.append(Request.continuation == continuation)
+    if status_code is not None:
+        where.append(Request.response_status_code == status_code)
+    if min_size is not None:
+        where.append(Request.content_size_original >= min_size)  # type: ignore[operator]
+    if max_size is not None:
+        where.append(Request.content_size_original <= max_size)  # type: ignore[operator]
+    return where
+
+
+async def iter_response_matches(
+    session_factory: ScopedSessionFactory,
+    pattern: SearchPattern,
+    *,
+    continuation: str | None = None,
+    status_code: int | None = None,
+    min_size: int | None = None,
+    max_size: int | None = None,
+    limit: int | None = None,
+    request_ids: Sequence[int] | None = None,
+    processes: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncGenerator[int, None]:
+    """Yield ids of requests whose response body matches ``pattern``.
+
+    Only requests with a stored response are searched. Ids are yielded
+    in ascending order. Close the iterator (``contextlib.aclosing``) when
+    stopping early so the pool shuts down promptly.
+
+    Args:
+        session_factory: Session factory for the run database.
+        pattern: What to match.
+        continuation: Only search responses of this continuation.
+        status_code: Only search responses with this HTTP status.
+        min_size: Only search responses at least this many bytes
+            (uncompressed).
+        max_size: Only search responses at most this many bytes.
+        limit: Stop after this many matches.
+        request_ids: Only search these requests.
+        processes: Pool size. ``None`` uses one per CPU; ``0`` matches
+            in a thread instead of a process pool.
+        chunk_size: Rows per pool task.
+    """
+    if limit is not None and limit <= 0:
+        return
+    where = response_filters(
+        continuation=continuation,
+        status_code=status_code,
+        min_size=min_size,
+        max_size=max_size,
+    )
+    found = 0
+    async with aclosing(
+        map_response_chunks(
+            session_factory,
+            partial(_match_chunk, pattern),
+            where=where,
+            request_ids=request_ids,
+            processes=processes,
+            chunk_size=chunk_size,
+        )
+    ) as chunks:
+        async for matched in chunks:
+            for request_id in matched:
+                yield request_id
+                found += 1
+                if limit is not None and found >= limit:
+                    return
@@ -0,0 +1,523 @@
+"""Pairing of original and re-evaluated results for comparison.
+
+:func:`pair_indices` matches two lists of serialized results so that
+each original result is diffed against its closest new counterpart.
+Exact matches pair first. The rest pair by Levenshtein distance, either
+greedily (smallest distance first, the default) or by an optimal
+assignment that minimizes the total distance.
+
+Distances are computed lazily: candidate pairs are checked against a
+rising distance bound, with a banded edit-distance computation that
+strips the common prefix and suffix first and gives up once the bound
+is exceeded. Greedy pairing therefore only pays for distances up to the
+ones it actually uses, and gives the same pairs as computing the full
+distance matrix.
+
+For large inputs (more than :data:`EXACT_PAIRING_LIMIT` candidate
+pairs) only pairs that share a field value or a rare character n-gram
+are considered (blocking), up to :data:`BLOCK_CANDIDATES` per result. Results left
+without a candidate within half their length are paired in order.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from collections.abc import Iterator
+from typing import Any
+
+# Pairing strategies accepted by :func:`pair_indices`.
+PAIRING_MODES = ("greedy", "optimal")
+
+# Up to this many unmatched original x new pairs, every pair is a
+# candidate and greedy pairing is exact.
+EXACT_PAIRING_LIMIT = 2500
+
+# Candidates kept per result when blocking.
+BLOCK_CANDIDATES = 8
+
+# First distance bound tried; it doubles until pairs are found.
+_FIRST_BOUND = 8
+
+# Blocking compares results by their rarest character n-grams.
+_GRAM = 5
+_RARE_GRAMS = 16
+
+
+def _common_prefix(s1: str, s2: str, limit: int) -> int:
+    """Length of the common prefix, found by bisecting slice compares."""
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if s1[:mid] == s2[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _strip_affixes(s1: str, s2: str) -> tuple[str, str]:
+    """Drop the common prefix and suffix, which never affect the distance."""
+    start = _common_prefix(s1, s2, min(len(s1), len(s2)))
+    s1, s2 = s1[start:], s2[start:]
+    end = _common_prefix(s1[::-1], s2[::-1], min(len(s1), len(s2)))
+    return s1[: len(s1) - end], s2[: len(s2) - end]
+
+
+def bounded_levenshtein(s1: str, s2: str, bound: int) -> int | None:
+    """Levenshtein distance between two strings if it is at most ``bound``.
+
+    Only the diagonal band of width ``2 * bound + 1`` is computed, and
+    the computation stops as soon as a whole row exceeds ``bound``.
+
+    Args:
+        s1: First string.
+        s2: Second string.
+        bound: Largest distance of interest.
+
+    Returns:
+        The distance, or None if it is greater than ``bound``.
+    """
+    s1, s2 = _strip_affixes(s1, s2)
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    n, m = len(s1), len(s2)
+    if n - m > bound:
+        return None
+    if m == 0:
+        return n
+
+    over = bound + 1
+    previous = [j if j <= bound else over for j in range(m + 1)]
+    for i in range(1, n + 1):
+        low = max(1, i - bound)
+        high = min(m, i + bound)
+        current = [over] * (m + 1)
+        row_min = current[0] = i if i <= bound else over
+        c1 = s1[i - 1]
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (c1 != s2[j - 1])
+            other = previous[j] + 1
+            if other < value:
+                value = other
+            other = current[j - 1] + 1
+            if other < value:
+                value = other
+            if value > over:
+                value = over
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > bound:
+            return None
+        previous = current
+    distance = previous[m]
+    return distance if distance <= bound else None
+
+
+def levenshtein(s1: str, s2: str) -> int:
+    """Levenshtein distance between two strings."""
+    distance = bounded_levenshtein(s1, s2, max(len(s1), len(s2)))
+    assert distance is not None
+    return distance
+
+
+def _bag_distance(c1: Counter[str], c2: Counter[str]) -> int:
+    """A lower bound on the edit distance from character counts."""
+    return max(sum((c1 - c2).values()), sum((c2 - c1).values()))
+
+
+class _Distances:
+    """Lazily computed distances between the unmatched strings."""
+
+    def __init__(self, originals: list[str], news: list[str]) -> None:
+        self.originals = originals
+        self.news = news
+        self._counts: dict[tuple[int, int], Counter[str]] = {}
+        # Lower bounds for pairs not yet known exactly.
+        self._bounds: dict[tuple[int, int], int] = {}
+        self._exact: dict[tuple[int, int], int] = {}
+
+    def _count(self, side: int, index: int) -> Counter[str]:
+        key = (side, index)
+        if key not in self._counts:
+            strings = self.originals if side == 0 else self.news
+            self._counts[key] = Counter(strings[index])
+        return self._counts[key]
+
+    def lower_bound(self, i: int, j: int) -> int:
+        """A lower bound on the distance of pair ``(i, j)``."""
+        if (i, j) in self._exact:
+            return self._exact[(i, j)]
+        if (i, j) not in self._bounds:
+            self._bounds[(i, j)] = max(
+                abs(len(self.originals[i]) - len(self.news[j])),
+                _bag_distance(self._count(0, i), self._count(1, j)),
+            )
+        return self._bounds[(i, j)]
+
+    def within(self, i: int, j: int, bound: int) -> int | None:
+        """The distance of ``(i, j)`` if it is at most ``bound``."""
+        if (i, j) in self._exact:
+            exact = self._exact[(i, j)]
+            return exact if exact <= bound else None
+        if self.lower_bound(i, j) > bound:
+            return None
+        distance = bounded_levenshtein(self.originals[i], self.news[j], bound)
+        if distance is None:
+            self._bounds[(i, j)] = bound + 1
+        else:
+            self._exact[(i, j)] = distance
+        return distance
+
+    def known(self, i: int, j: int) -> int | None:
+        """The distance of ``(i, j)`` if it has been computed."""
+        return self._exact.get((i, j))
+
+    def upper_bound(self, i: int, j: int) -> int:
+        """Distance of ``(i, j)`` no pairing can exceed."""
+        return max(len(self.originals[i]), len(self.news[j]))
+
+
+def _leaf_tokens(value: Any, out: set[str]) -> set[str]:
+    """The leaf values of a result, as blocking tokens."""
+    if isinstance(value, dict):
+        for child in value.values():
+            _leaf_tokens(child, out)
+    elif isinstance(value, (list, tuple)):
+        for child in value:
+            _leaf_tokens(child, out)
+    else:
+        out.add(f"={value}")
+    return out
+
+
+def _grams(text: str) -> set[str]:
+    return {text[k : k + _GRAM] for k in range(len(text) - _GRAM + 1)}
+
+
+def _block(
+    original_strs: list[str],
+    new_strs: list[str],
+    original_values: list[Any],
+    new_values: list[Any],
+    orig_indices: list[int],
+    new_indices: list[int],
+) -> set[tuple[int, int]]:
+    """Candidate pairs that share rare tokens, top-scored per result.
+
+    A result's tokens are its leaf values plus its :data:`_RARE_GRAMS`
+    rarest character n-grams that occur in some other result. Tokens
+    in more than a tenth of the results (at least eight) carry no
+    signal and are skipped; the rest are weighted by rarity.
+    """
+    grams = {
+        **{(0, i): _grams(original_strs[i]) for i in orig_indices},
+        **{(1, j): _grams(new_strs[j]) for j in new_indices},
+    }
+    gram_frequency: Counter[str] = Counter()
+    for record_grams in grams.values():
+        gram_frequency.update(record_grams)
+
+    def tokens(side: int, index: int, value: Any) -> set[str]:
+        shared = [g for g in grams[(side, index)] if gram_frequency[g] > 1]
+        rare = heapq.nsmallest(
+            _RARE_GRAMS, shared, key=lambda g: (gram_frequency[g], g)
+        )
+        return _leaf_tokens(value, {f"#{g}" for g in rare})
+
+    orig_tokens = {i: tokens(0, i, original_values[i]) for i in orig_indices}
+    new_tokens = {j: tokens(1, j, new_values[j]) for j in new_indices}
+    frequency: Counter[str] = Counter()
+    for record_tokens in (*orig_tokens.values(), *new_tokens.values()):
+        frequency.update(record_tokens)
+    total = len(orig_indices) + len(new_indices)
+    common = max(8, total // 10)
+
+    postings: dict[str, list[int]] = {}
+    for j in new_indices:
+        for token in new_tokens[j]:
+            if frequency[token] <= common:
+                postings.setdefault(token, []).append(j)
+
+    scores: dict[tuple[int, int], float] = {}
+    for i in orig_indices:
+        for token in orig_tokens[i]:
+            matches = postings.get(token)
+            if matches is None:
+                continue
+            weight = math.log(total / frequency[token])
+            for j in matches:
+                scores[(i, j)] = scores.get((i, j), 0.0) + weight
+
+    by_orig: dict[int, list[tuple[float, int]]] = {}
+    by_new: dict[int, list[tuple[float, int]]] = {}
+    for (i, j), score in scores.items():
+        by_orig.setdefault(i, []).append((-score, j))
+        by_new.setdefault(j, []).append((-score, i))
+    candidates: set[tuple[int, int]] = set()
+    for i, ranked in by_orig.items():
+        candidates.update((i, j) for _, j in sorted(ranked)[:BLOCK_CANDIDATES])
+    for j, ranked in by_new.items():
+        candidates.update((i, j) for _, i in sorted(ranked)[:BLOCK_CANDIDATES])
+    return candidates
+
+
+def _greedy(
+    distances: _Distances,
+    candidates: list[tuple[int, int]],
+    available_orig: set[int],
+    available_new: set[int],
+    limit: int | None,
+) -> Iterator[tuple[int, int]]:
+    """Pair by smallest distance first, ties by (original, new) index.
+
+    Candidates are checked against a doubling distance bound; a pair
+    found under the bound is final, as no unchecked pair can be closer.
+
+    Args:
+        distances: The distance cache.
+        candidates: Pairs that may be matched, in (original, new) order.
+        available_orig: Unpaired original indices; updated in place.
+        available_new: Unpaired new indices; updated in place.
+        limit: Skip pairs whose distance exceeds this fraction of the
+            longer string, given as a divisor, or None to allow any.
+    """
+    bound = _FIRST_BOUND
+    largest = max(
+        (distances.upper_bound(i, j) for i, j in candidates), default=0
+    )
+    while candidates and available_orig and available_new:
+        if len(available_orig) == 1 and len(available_new) == 1:
+            pair = (next(iter(available_orig)), next(iter(available_new)))
+            if pair in candidates and limit is None:
+                available_orig.clear()
+                available_new.clear()
+                yield pair
+                return
+        found = []
+        remaining = []
+        for i, j in candidates:
+            if i not in available_orig or j not in available_new:
+                continue
+            pair_bound = bound
+            if limit is not None:
+                pair_bound = min(bound, distances.upper_bound(i, j) // limit)
+            distance = distances.within(i, j, pair_bound)
+            if distance is not None:
+                found.append((distance, i, j))
+            elif pair_bound == bound:
+                remaining.append((i, j))
+        found.sort()
+        for _distance, i, j in found:
+            if i in available_orig and j in available_new:
+                available_orig.discard(i)
+                available_new.discard(j)
+                yield i, j
+        if bound >= largest:
+            return
+        candidates = remaining
+        bound *= 2
+
+
+def _assign(cost: list[list[int]]) -> list[int]:
+    """Minimum-cost assignment of each row to a distinct column.
+
+    The shortest augmenting path form of the Hungarian algorithm, for a
+    matrix with no more rows than columns.
+
+    Returns:
+        The column assigned to each row.
+    """
+    rows, cols = len(cost), len(cost[0])
+    inf = math.inf
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    owner = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        col0 = 0
+        min_v = [inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[col0] = True
+            row0 = owner[col0]
+            delta = inf
+            col1 = 0
+            costs = cost[row0 - 1]
+            u0 = u[row0]
+            for col in range(1, cols + 1):
+                if used[col]:
+                    continue
+                reduced = costs[col - 1] - u0 - v[col]
+                if reduced < min_v[col]:
+                    min_v[col] = reduced
+                    way[col] = col0
+                if min_v[col] < delta:
+                    delta = min_v[col]
+                    col1 = col
+            for col in range(cols + 1):
+                if used[col]:
+                    u[owner[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_v[col] -= delta
+            col0 = col1
+            if owner[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            owner[col0] = owner[col1]
+            col0 = col1
+    assignment = [0] * rows
+    for col in range(1, cols + 1):
+        if owner[col]:
+            assignment[owner[col] - 1] = col - 1
+    return assignment
+
+
+def _optimal(
+    distances: _Distances,
+    candidates: set[tuple[int, int]],
+    orig_indices: list[int],
+    new_indices: list[int],
+    cap: int | None,
+) -> list[tuple[int, int]]:
+    """Pair to minimize the summed distance.
+
+    Non-candidate pairs, and candidates further apart than ``cap``,
+    cost the length of the longer string (the most any edit distance
+    can be).
+    """
+    transpose = len(orig_indices) > len(new_indices)
+    row_indices, col_indices = (
+        (new_indices, orig_indices)
+        if transpose
+        else (orig_indices, new_indices)
+    )
+    cost = []
+    for r in row_indices:
+        costs = []
+        for c in col_indices:
+            i, j = (c, r) if transpose else (r, c)
+            upper = distances.upper_bound(i, j)
+            distance = None
+            if (i, j) in candidates:
+                bound = upper if cap is None else min(upper, cap)
+                distance = distances.within(i, j, bound)
+            costs.append(upper if distance is None else distance)
+        cost.append(costs)
+    pairs = []
+    for row, col in enumerate(_assign(cost)):
+        r, c = row_indices[row], col_indices[col]
+        pairs.append((cost[row][col], *((c, r) if transpose else (r, c))))
+    pairs.sort()
+    return [(i, j) for _cost, i, j in pairs]
+
+
+def pair_indices(
+    original_strs: list[str],
+    new_strs: list[str],
+    original_values: list[Any] | None = None,
+    new_values: list[Any] | None = None,
+    mode: str = "greedy",
+) -> list[tuple[int, int]]:
+    """Pair serialized original and new results.
+
+    Args:
+        original_strs: Serialized original results.
+        new_strs: Serialized new results.
+        original_values: The original results, for blocking tokens
+            (defaults to the strings).
+        new_values: The new results, likewise.
+        mode: ``"greedy"`` or ``"optimal"``.
+
+    Returns:
+        ``(original_index, new_index)`` pairs: exact matches first, then
+        the rest in order of increasing distance. ``min(len(original),
+        len(new))`` pairs are returned.
+
+    Raises:
+        ValueError: If ``mode`` is not one of :data:`PAIRING_MODES`.
+    """
+    if mode not in PAIRING_MODES:
+        raise ValueError(
+            f"Unknown pairing mode {mode!r}; "
+            f"expected one of {', '.join(PAIRING_MODES)}"
+        )
+    available_orig: set[int] = set(range(len(original_strs)))
+    available_new: set[int] = set(range(len(new_strs)))
+    paired: list[tuple[int, int]] = []
+
+    # Exact matches first, without computing any distance
+    new_str_to_indices: dict[str, list[int]] = {}
+    for j, ns in enumerate(new_strs):
+        new_str_to_indices.setdefault(ns, []).append(j)
+    for i in list(available_orig):
+        for j in new_str_to_indices.get(original_strs[i], ()):
+            if j in available_new:
+                paired.append((i, j))
+                available_orig.discard(i)
+                available_new.discard(j)
+                break
+
+    if not available_orig or not available_new:
+        return paired
+
+    orig_indices = sorted(available_orig)
+    new_indices = sorted(available_new)
+    distances = _Distances(original_strs, new_strs)
+    limit: int | None
+    if len(orig_indices) * len(new_indices) <= EXACT_PAIRING_LIMIT:
+        candidates = {(i, j) for i in orig_indices for j in new_indices}
+        limit = None
+    else:
+        candidates = _block(
+            original_strs,
+            new_strs,
+            original_values if original_values is not None else original_strs,
+            new_values if new_values is not None else new_strs,
+            orig_indices,
+            new_indices,
+        )
+        # Blocked candidates further apart than half the longer string
+        # are not worth a full distance computation.
+        limit = 2
+
+    if mode == "optimal":
+        cap = None
+        if limit is not None:
+            # Computing every candidate distance in full is what blocking
+            # avoids. A greedy pass shows how far apart matching results
+            # are; candidates much further apart than that are priced as
+            # non-candidates.
+            greedy = _greedy(
+                distances,
+                sorted(candidates),
+                set(available_orig),
+                set(available_new),
+                limit,
+            )
+            cap = _FIRST_BOUND + 2 * max(
+                (distances.known(i, j) or 0 for i, j in greedy),
+                default=0,
+            )
+        paired.extend(
+            _optimal(distances, candidates, orig_indices, new_indices, cap)
+        )
+        return paired
+
+    paired.extend(
+        _greedy(
+            distances,
+            sorted(candidates),
+            available_orig,
+            available_new,
+            limit,
+        )
+    )
+    # Results with no close candidate pair up in order.
+    paired.extend(zip(sorted(available_orig), sorted(available_new)))
+    return paired
@@ -0,0 +1,229 @@
+"""Streaming JSONL export of scraped results.
+
+Shared by :meth:`ExportSearchMixin.export_results_jsonl`, ``pdd results
+export`` and the web ``/results/export.jsonl`` route. Rows are read
+through a server-side cursor in chunks, so memory stays flat however
+many results a run has. ``data_json`` and ``validation_errors_json``
+are written by :func:`json.dumps` when results are stored, so they are
+spliced into each output line as-is rather than decoded and re-encoded.
+Each chunk's stored JSON is checked with a single parse first; a chunk
+holding malformed JSON falls back to decoding its rows one at a time.
+
+Output can be gzip- or zstd-compressed on the fly.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import zstandard as zstd
+from sqlmodel import select
+
+from kent.driver.persistent_driver.models import Result
+
+if TYPE_CHECKING:
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+# Supported values for ``compression``.
+EXPORT_COMPRESSIONS = ("gzip", "zstd")
+
+# File suffix for each compression.
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# Rows fetched from the cursor per round trip.
+_CHUNK_SIZE = 1000
+
+
+def compression_for_path(path: Path | str) -> str | None:
+    """The compression implied by ``path``'s suffix, if any."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gz":
+        return "gzip"
+    if suffix in (".zst", ".zstd"):
+        return "zstd"
+    return None
+
+
+def result_jsonl_line(
+    row: tuple[Any, Any, Any, str | None, Any, str | None, Any],
+) -> str:
+    """Format one results row as a JSONL line.
+
+    Args:
+        row: ``(id, request_id, result_type, data_json, is_valid,
+            validation_errors_json, created_at)``.
+
+    Returns:
+        The line, newline included, in the same shape
+        ``json.dumps(record)`` produced for the decoded record. The JSON
+        columns are trusted; :func:`result_jsonl_lines` checks them.
+    """
+    result_id, request_id, rtype, data_json, valid, errors_json, created = row
+    return (
+        f'{{"id": {json.dumps(result_id)}, '
+        f'"request_id": {json.dumps(request_id)}, '
+        f'"result_type": {json.dumps(rtype)}, '
+        f'"data": {data_json or "{}"}, '
+        f'"is_valid": {"true" if valid else "false"}, '
+        f'"validation_errors": {errors_json or "null"}, '
+        f'"created_at": {json.dumps(created)}}}\n'
+    )
+
+
+def result_jsonl_lines(
+    rows: Sequence[tuple[Any, Any, Any, str | None, Any, str | None, Any]],
+) -> list[str]:
+    """Format a chunk of results rows as JSONL lines.
+
+    The chunk's ``data_json`` and ``validation_errors_json`` values are
+    parsed together as one JSON array. If that fails, or yields a
+    different number of values (text that is not a single JSON value),
+    each row is decoded instead, with malformed data written as ``{}``
+    and malformed validation errors as ``null``.
+
+    Args:
+        rows: Rows as for :func:`result_jsonl_line`.
+
+    Returns:
+        One line per row, newlines included.
+    """
+    values = [
+        text for row in rows for text in (row[3] or "{}", row[5] or "null")
+    ]
+    try:
+        spliceable = len(json.loads(f"[{','.join(values)}]")) == len(values)
+    except ValueError:
+        spliceable = False
+    if spliceable:
+        return [result_jsonl_line(row) for row in rows]
+    return [_decoded_jsonl_line(row) for row in rows]
+
+
+def _decoded_jsonl_line(
+    row: tuple[Any, Any, Any, str | None, Any, str | None, Any],
+) -> str:
+    """Format a results row by decoding its JSON columns."""
+    result_id, request_id, rtype, data_json, valid, errors_json, created = row
+    try:
+        data = json.loads(data_json) if data_json else {}
+    except json.JSONDecodeError:
+        data = {}
+    validation_errors = None
+    if errors_json:
+        try:
+            validation_errors = json.loads(errors_json)
+        except json.JSONDecodeError:
+            pass
+    record = {
+        "id": result_id,
+        "request_id": request_id,
+        "result_type": rtype,
+        "data": data,
+        "is_valid": bool(valid),
+        "validation_errors": validation_errors,
+        "created_at": created,
+    }
+    return json.dumps(record) + "\n"
+
+
+async def iter_result_lines(
+    session_factory: ScopedSessionFactory,
+    *,
+    result_type: str | None = None,
+    is_valid: bool | None = None,
+    chunk_size: int = _CHUNK_SIZE,
+) -> AsyncIterator[list[bytes]]:
+    """Yield encoded JSONL lines for matching results, one chunk at a time.
+
+    Results are ordered by ``created_at`` (then ``id``).
+
+    Args:
+        session_factory: Session factory for the run database.
+        result_type: Only results of this type.
+        is_valid: Only valid (True) or invalid (False) results.
+        chunk_size: Rows fetched per round trip.
+    """
+    query = select(
+        Result.id,
+        Result.request_id,
+        Result.result_type,
+        Result.data_json,
+        Result.is_valid,
+        Result.validation_errors_json,
+        Result.created_at,
+    ).order_by(
+        Result.created_at.asc(),  # type: ignore[union-attr]
+        Result.id.asc(),  # type: ignore[union-attr]
+    )
+    if result_type:
+        query = query.where(Result.result_type == result_type)
+    if is_valid is not None:
+        query = query.where(Result.is_valid == is_valid)
+
+    async with session_factory() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield [line.encode() for line in result_jsonl_lines(rows)]
+
+
+async def compress_stream(
+    chunks: AsyncIterator[bytes], compression: str | None
+) -> AsyncGenerator[bytes, None]:
+    """Compress a byte stream with ``compression`` (None passes through).
+
+    Raises:
+        ValueError: If ``compression`` is not one of
+            :data:`EXPORT_COMPRESSIONS`.
+    """
+    if compression is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+    if compression == "gzip":
+        compressor: Any = zlib.compressobj(wbits=31)
+    elif compression == "zstd":
+        compressor = zstd.ZstdCompressor().compressobj()
+    else:
+        raise ValueError(
+            f"Unknown compression {compression!r}; "
+            f"expected one of {', '.join(EXPORT_COMPRESSIONS)}"
+        )
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def iter_results_jsonl(
+    session_factory: ScopedSessionFactory,
+    *,
+    result_type: str | None = None,
+    is_valid: bool | None = None,
+    compression: str | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield the JSONL export of matching results as (compressed) bytes.
+
+    Args:
+        session_factory: Session factory for the run database.
+        result_type: Only results of this type.
+        is_valid: Only valid (True) or invalid (False) results.
+        compression: ``"gzip"``, ``"zstd"`` or None for plain JSONL.
+    """
+
+    async def blocks() -> AsyncIterator[bytes]:
+        async for lines in iter_result_lines(
+            session_factory, result_type=result_type, is_valid=is_valid
+        ):
+            yield b"".join(lines)
+
+    async for chunk in compress_stream(blocks(), compression):
+        yield chunk
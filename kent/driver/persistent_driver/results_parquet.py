@@ -0,0 +1,309 @@
+"""Columnar (Parquet) export of scraped results, one file per result type.
+
+Each ``result_type`` is written to ``<output_dir>/<result_type>.parquet``
+with one column per top-level field of its Pydantic model. The column
+types come from the model's JSON Schema as published by
+:meth:`BaseScraper.schema`:
+
+- integers, numbers, booleans and strings map to ``int64``, ``float64``,
+  ``bool`` and ``string``;
+- ``format: date`` strings map to ``date32`` and ``format: date-time``
+  strings to UTC ``timestamp[us]`` (naive values are taken as UTC);
+- nested models map to structs and arrays to lists;
+- anything else (unions, free-form dicts) is stored as JSON text.
+
+Every file also has ``_id``, ``_request_id``, ``_is_valid``,
+``_validation_errors`` (JSON text) and ``_created_at`` columns. A result
+type with no model in the schema gets a single JSON-text ``data``
+column. Values that do not fit their column, as invalid results may
+not, are written as nulls; the JSONL export keeps them verbatim.
+
+Rows stream from the database and are written one row group at a time,
+so memory is bounded by the row group size.
+
+Requires ``pyarrow`` (``pip install kent[parquet]``).
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlmodel import select
+
+from kent.driver.persistent_driver.models import Result
+
+if TYPE_CHECKING:
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+# Rows per Parquet row group, and per database round trip.
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+_Convert = Callable[[Any], Any] | None
+
+
+@dataclass
+class _Column:
+    """An Arrow field plus how to turn a decoded JSON value into it."""
+
+    field: pa.Field
+    convert: _Convert = None
+
+
+def _to_json(value: Any) -> str | None:
+    return None if value is None else json.dumps(value)
+
+
+def _to_date(value: Any) -> date | None:
+    return None if value is None else date.fromisoformat(value)
+
+
+def _to_timestamp(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _compile(
+    name: str, node: dict[str, Any], defs: dict[str, Any], depth: int = 0
+) -> _Column:
+    """Map one JSON Schema node to an Arrow field and value converter."""
+    if "$ref" in node and depth < 32:
+        target = defs.get(node["$ref"].rsplit("/", 1)[-1])
+        if target is not None:
+            return _compile(name, target, defs, depth + 1)
+    options = node.get("anyOf") or node.get("oneOf") or node.get("allOf")
+    if options is None and isinstance(node.get("type"), list):
+        options = [{**node, "type": t} for t in node["type"]]
+    if options is not None:
+        non_null = [o for o in options if o.get("type") != "null"]
+        if len(non_null) == 1:
+            return _compile(name, non_null[0], defs, depth + 1)
+        return _Column(pa.field(name, pa.string()), _to_json)
+
+    kind = node.get("type")
+    if kind == "string":
+        if node.get("format") == "date":
+            return _Column(pa.field(name, pa.date32()), _to_date)
+        if node.get("format") == "date-time":
+            return _Column(
+                pa.field(name, pa.timestamp("us", tz="UTC")), _to_timestamp
+            )
+        return _Column(pa.field(name, pa.string()))
+    if kind == "integer":
+        return _Column(pa.field(name, pa.int64()))
+    if kind == "number":
+        return _Column(pa.field(name, pa.float64()))
+    if kind == "boolean":
+        return _Column(pa.field(name, pa.bool_()))
+    if kind == "array" and isinstance(node.get("items"), dict):
+        item = _compile("item", node["items"], defs, depth + 1)
+        item_convert = item.convert
+        convert: _Convert = None
+        if item_convert is not None:
+
+            def convert(value: Any) -> Any:
+                if value is None:
+                    return None
+                return [item_convert(v) for v in value]
+
+        return _Column(pa.field(name, pa.list_(item.field)), convert)
+    if kind == "object" and node.get("properties"):
+        children = [
+            _compile(key, child, defs, depth + 1)
+            for key, child in node["properties"].items()
+        ]
+        converters = {
+            c.field.name: c.convert for c in children if c.convert is not None
+        }
+        convert = None
+        if converters:
+
+            def convert(value: Any) -> Any:
+                if value is None:
+                    return None
+                return {
+                    key: converters[key](v) if key in converters else v
+                    for key, v in value.items()
+                }
+
+        return _Column(
+            pa.field(name, pa.struct([c.field for c in children])), convert
+        )
+    return _Column(pa.field(name, pa.string()), _to_json)
+
+
+_META_COLUMNS = [
+    _Column(pa.field("_id", pa.int64(), nullable=False)),
+    _Column(pa.field("_request_id", pa.int64())),
+    _Column(pa.field("_is_valid", pa.bool_(), nullable=False)),
+    _Column(pa.field("_validation_errors", pa.string())),
+    _Column(pa.field("_created_at", pa.string())),
+]
+
+# The only data column for a result type without a model.
+_RAW_DATA = _Column(pa.field("data", pa.string()))
+
+
+def result_columns(model_schema: dict[str, Any] | None) -> list[_Column]:
+    """Columns for results whose model has JSON Schema ``model_schema``.
+
+    Args:
+        model_schema: The model's entry in ``BaseScraper.schema()["$defs"]``
+            with ``$defs`` holding the models it references, or None for
+            a result type without a model.
+    """
+    if model_schema is None or not model_schema.get("properties"):
+        return [*_META_COLUMNS, _RAW_DATA]
+    defs = model_schema.get("$defs", {})
+    return [
+        *_META_COLUMNS,
+        *(
+            _compile(name, node, defs)
+            for name, node in model_schema["properties"].items()
+        ),
+    ]
+
+
+def _array(column: _Column, values: list[Any]) -> pa.Array:
+    """Build a column, nulling the values that do not fit its type."""
+    convert = column.convert
+    try:
+        if convert is None:
+            return pa.array(values, type=column.field.type)
+        return pa.array([convert(v) for v in values], type=column.field.type)
+    except (pa.ArrowException, TypeError, ValueError, AttributeError):
+        pass
+    fitted = []
+    for value in values:
+        try:
+            if convert is not None:
+                value = convert(value)
+            pa.array([value], type=column.field.type)
+        except (pa.ArrowException, TypeError, ValueError, AttributeError):
+            value = None
+        fitted.append(value)
+    return pa.array(fitted, type=column.field.type)
+
+
+def _row_group(
+    columns: list[_Column], schema: pa.Schema, rows: Sequence[Any]
+) -> pa.Table:
+    """Decode a chunk of results rows into a table."""
+    values: dict[str, list[Any]] = {c.field.name: [] for c in columns}
+    fields = [c.field.name for c in columns[len(_META_COLUMNS) :]]
+    raw = columns[-1] is _RAW_DATA
+    for result_id, request_id, valid, errors_json, created, data_json in rows:
+        values["_id"].append(result_id)
+        values["_request_id"].append(request_id)
+        values["_is_valid"].append(bool(valid))
+        values["_validation_errors"].append(errors_json)
+        values["_created_at"].append(created)
+        if raw:
+            values["data"].append(data_json)
+            continue
+        try:
+            data = json.loads(data_json) if data_json else {}
+        except json.JSONDecodeError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        for name in fields:
+            values[name].append(data.get(name))
+    return pa.Table.from_arrays(
+        [_array(c, values[c.field.name]) for c in columns], schema=schema
+    )
+
+
+async def export_results_parquet(
+    session_factory: ScopedSessionFactory,
+    output_dir: Path,
+    scraper_schema: dict[str, Any] | None,
+    *,
+    result_type: str | None = None,
+    is_valid: bool | None = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> dict[str, int]:
+    """Write one Parquet file per result type into ``output_dir``.
+
+    Args:
+        session_factory: Session factory for the run database.
+        output_dir: Directory for the ``<result_type>.parquet`` files.
+        scraper_schema: ``BaseScraper.schema()`` of the run's scraper, or
+            None to store every result type as JSON text.
+        result_type: Only export this result type.
+        is_valid: Only valid (True) or invalid (False) results.
+        row_group_size: Rows per row group.
+
+    Returns:
+        Rows written per result type, for each file written.
+    """
+    defs = (scraper_schema or {}).get("$defs", {})
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    conditions = []
+    if is_valid is not None:
+        conditions.append(Result.is_valid == is_valid)
+    async with session_factory() as session:
+        if result_type:
+            result_types = [result_type]
+        else:
+            result = await session.execute(
+                select(Result.result_type)
+                .distinct()
+                .order_by(Result.result_type)
+            )
+            result_types = list(result.scalars())
+
+    counts: dict[str, int] = {}
+    for rtype in result_types:
+        model_schema = defs.get(rtype)
+        if model_schema is not None:
+            model_schema = {**model_schema, "$defs": defs}
+        columns = result_columns(model_schema)
+        schema = pa.schema([c.field for c in columns])
+        query = (
+            select(
+                Result.id,
+                Result.request_id,
+                Result.is_valid,
+                Result.validation_errors_json,
+                Result.created_at,
+                Result.data_json,
+            )
+            .where(Result.result_type == rtype, *conditions)
+            .order_by(Result.id)  # type: ignore[arg-type]
+            .execution_options(yield_per=row_group_size)
+        )
+        path = output_dir / f"{rtype}.parquet"
+        writer: pq.ParquetWriter | None = None
+        count = 0
+        try:
+            async with session_factory() as session:
+                stream = await session.stream(query)
+                async for rows in stream.partitions():
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            path, schema, compression="zstd"
+                        )
+                    writer.write_table(_row_group(columns, schema, rows))
+                    count += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+        if count:
+            counts[rtype] = count
+    return counts
@@ -11,9 +11,17 @@ The SQLManager handles:
 - Error tracking
 - Run metadata management
 - Speculative progress tracking
+- Ranged archive download progress
+- Post-archive processing outputs and timings
 - Statistics and listing operations
 """
 
+from kent.driver.persistent_driver.sql_manager._archive_partials import (
+    ArchivePartialMixin,
+)
+from kent.driver.persistent_driver.sql_manager._archive_processing import (
+    ArchiveProcessingMixin,
+)
 from kent.driver.persistent_driver.sql_manager._base import SQLManagerBase
 from kent.driver.persistent_driver.sql_manager._estimates import (
     EstimateStorageMixin,
@@ -22,6 +30,7 @@ from kent.driver.persistent_driver.sql_manager._incidental_requests import (
     IncidentalRequestStorageMixin,
 )
 from kent.driver.persistent_driver.sql_manager._listing import ListingMixin
+from kent.driver.persistent_driver.sql_manager._pagination import TotalMode
 from kent.driver.persistent_driver.sql_manager._requests import (
     RequestQueueMixin,
 )
@@ -58,6 +67,8 @@ class SQLManager(
     ResultStorageMixin,
     EstimateStorageMixin,
     SpeculationMixin,
+    ArchivePartialMixin,
+    ArchiveProcessingMixin,
     ValidationMixin,
     ListingMixin,
     SQLManagerBase,
@@ -90,5 +101,6 @@ __all__ = [
     "ResponseRecord",
     "ResultRecord",
     "SQLManager",
+    "TotalMode",
     "compute_cache_key",
 ]
@@ -0,0 +1,110 @@
+"""Ranged archive download progress for SQLManager."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from kent.driver.persistent_driver.models import ArchivePartial
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+
+class ArchivePartialDict(TypedDict):
+    """Typed dict for a recorded ranged download."""
+
+    url: str
+    temp_path: str
+    total_size: int
+    validator: str | None
+    segments_json: str
+
+
+class ArchivePartialMixin:
+    """Durable offsets for resuming ranged archive downloads."""
+
+    _lock: asyncio.Lock
+    _session_factory: ScopedSessionFactory
+
+    async def save_archive_partial(
+        self,
+        url: str,
+        temp_path: str,
+        total_size: int,
+        validator: str | None,
+        segments_json: str,
+    ) -> None:
+        """Insert or update the progress of a ranged download.
+
+        Args:
+            url: URL being downloaded.
+            temp_path: Preallocated temp file holding the bytes so far.
+            total_size: Expected size of the file.
+            validator: ETag or Last-Modified seen when the download started.
+            segments_json: JSON list of ``[start, end, offset]`` segments.
+        """
+        async with self._lock, self._session_factory() as session:
+            stmt = sqlite_insert(ArchivePartial).values(
+                url=url,
+                temp_path=temp_path,
+                total_size=total_size,
+                validator=validator,
+                segments_json=segments_json,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["url"],
+                set_={
+                    "temp_path": stmt.excluded.temp_path,
+                    "total_size": stmt.excluded.total_size,
+                    "validator": stmt.excluded.validator,
+                    "segments_json": stmt.excluded.segments_json,
+                    "updated_at": func.current_timestamp(),
+                },
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def load_archive_partial(
+        self, url: str
+    ) -> ArchivePartialDict | None:
+        """Load the recorded progress of a ranged download.
+
+        Args:
+            url: URL being downloaded.
+
+        Returns:
+            Dict with the recorded fields, or None if nothing is recorded.
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(ArchivePartial).where(ArchivePartial.url == url)
+            )
+            row = result.scalar_one_or_none()
+            if row is None:
+                return None
+            return {
+                "url": row.url,
+                "temp_path": row.temp_path,
+                "total_size": row.total_size,
+                "validator": row.validator,
+                "segments_json": row.segments_json,
+            }
+
+    async def delete_archive_partial(self, url: str) -> None:
+        """Forget the progress of a finished or abandoned ranged download.
+
+        Args:
+            url: URL being downloaded.
+        """
+        async with self._lock, self._session_factory() as session:
+            await session.execute(
+                delete(ArchivePartial).where(ArchivePartial.url == url)
+            )
+            await session.commit()
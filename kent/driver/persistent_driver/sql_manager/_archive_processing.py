@@ -0,0 +1,177 @@
+"""Post-archive processing records for SQLManager."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
+
+from sqlalchemy import func, select, update
+
+from kent.driver.persistent_driver.models import (
+    ArchivedFile,
+    ArchiveProcessing,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+
+class UnprocessedArchivedFileDict(TypedDict):
+    """Typed dict for an archived file still waiting for processing."""
+
+    id: int
+    request_id: int
+    file_path: str
+    expected_type: str | None
+
+
+class ArchiveProcessingDict(TypedDict):
+    """Typed dict for one recorded processor run."""
+
+    id: int
+    archived_file_id: int
+    request_id: int
+    processor: str
+    status: str
+    output_json: str | None
+    error: str | None
+    duration_ms: float
+
+
+class ArchiveProcessingMixin:
+    """Outputs and timings of the post-archive processing stage."""
+
+    _lock: asyncio.Lock
+    _session_factory: ScopedSessionFactory
+
+    async def record_archive_processing(
+        self,
+        archived_file_id: int,
+        request_id: int,
+        processor: str,
+        status: str,
+        output_json: str | None,
+        error: str | None,
+        duration_ms: float,
+    ) -> int:
+        """Record the outcome of one processor for one archived file.
+
+        Args:
+            archived_file_id: The archived file that was processed.
+            request_id: The request that downloaded the file.
+            processor: Name the processor was registered under.
+            status: 'success' or 'error'.
+            output_json: JSON-encoded return value, if any.
+            error: Exception type and message when status is 'error'.
+            duration_ms: Wall-clock time the processor took.
+
+        Returns:
+            The database ID of the new archive_processing row.
+        """
+        async with self._lock, self._session_factory() as session:
+            row = ArchiveProcessing(
+                archived_file_id=archived_file_id,
+                request_id=request_id,
+                processor=processor,
+                status=status,
+                output_json=output_json,
+                error=error,
+                duration_ms=duration_ms,
+            )
+            session.add(row)
+            await session.commit()
+            return row.id  # type: ignore[return-value]
+
+    async def finish_archived_file(
+        self,
+        archived_file_id: int,
+        file_size: int | None,
+        content_hash: str | None,
+    ) -> None:
+        """Fill in size and hash and mark an archived file as processed.
+
+        Args:
+            archived_file_id: The archived file that was processed.
+            file_size: Size of the file on disk, or None if unreadable.
+            content_hash: SHA-256 of the file, or None if unreadable.
+        """
+        async with self._lock, self._session_factory() as session:
+            await session.execute(
+                update(ArchivedFile)
+                .where(ArchivedFile.id == archived_file_id)  # type: ignore[arg-type]
+                .values(
+                    file_size=file_size,
+                    content_hash=content_hash,
+                    processed_at=func.current_timestamp(),
+                )
+            )
+            await session.commit()
+
+    async def list_unprocessed_archived_files(
+        self,
+    ) -> list[UnprocessedArchivedFileDict]:
+        """List archived files the post-archive stage has not finished.
+
+        Returns:
+            One dict per file, oldest first.
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(
+                    ArchivedFile.id,
+                    ArchivedFile.request_id,
+                    ArchivedFile.file_path,
+                    ArchivedFile.expected_type,
+                )
+                .where(ArchivedFile.processed_at.is_(None))  # type: ignore[union-attr]
+                .order_by(ArchivedFile.id)
+            )
+            return [
+                {
+                    "id": row[0],
+                    "request_id": row[1],
+                    "file_path": row[2],
+                    "expected_type": row[3],
+                }
+                for row in result.all()
+            ]
+
+    async def list_archive_processing(
+        self,
+        archived_file_id: int | None = None,
+        processor: str | None = None,
+    ) -> list[ArchiveProcessingDict]:
+        """List recorded processor runs.
+
+        Args:
+            archived_file_id: Only runs for this archived file.
+            processor: Only runs of this processor.
+
+        Returns:
+            One dict per processor run, in the order they were recorded.
+        """
+        query = select(ArchiveProcessing).order_by(ArchiveProcessing.id)
+        if archived_file_id is not None:
+            query = query.where(
+                ArchiveProcessing.archived_file_id == archived_file_id
+            )
+        if processor is not None:
+            query = query.where(ArchiveProcessing.processor == processor)
+        async with self._session_factory() as session:
+            rows = (await session.execute(query)).scalars().all()
+            return [
+                {
+                    "id": row.id,  # type: ignore[typeddict-item]
+                    "archived_file_id": row.archived_file_id,
+                    "request_id": row.request_id,
+                    "processor": row.processor,
+                    "status": row.status,
+                    "output_json": row.output_json,
+                    "error": row.error,
+                    "duration_ms": row.duration_ms,
+                }
+                for row in rows
+            ]
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from typing_extensions import Self
 
 from kent.driver.persistent_driver.database import init_database
+from kent.driver.persistent_driver.metrics import TimedLock
 from kent.driver.persistent_driver.models import Request
 from kent.driver.persistent_driver.scoped_session import ScopedSessionFactory
 
@@ -50,7 +51,8 @@ class SQLManagerBase:
         """
         self._engine = engine
         self._session_factory = session_factory
-        self._lock = asyncio.Lock()
+        # Times its waits once a driver attaches a histogram to it.
+        self._lock: asyncio.Lock = TimedLock()
 
     @classmethod
     @asynccontextmanager
@@ -7,7 +7,17 @@ from typing import TYPE_CHECKING, Any, Literal
 
 from sqlalchemy import func, select
 
-from kent.driver.persistent_driver.models import Request, Result
+from kent.driver.persistent_driver.models import (
+    Request,
+    RequestCount,
+    Result,
+    ResultCount,
+)
+from kent.driver.persistent_driver.sql_manager._pagination import (
+    KeysetOrder,
+    TotalMode,
+    fetch_keyset_page,
+)
 from kent.driver.persistent_driver.sql_manager._types import (
     Page,
     RequestRecord,
@@ -18,10 +28,33 @@ from kent.driver.persistent_driver.sql_manager._types import (
 if TYPE_CHECKING:
     import asyncio
 
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from kent.driver.persistent_driver.scoped_session import (
         ScopedSessionFactory,
     )
 
+# Every order ends in the primary key, so each row has a unique key.
+_REQUEST_ORDERS = {
+    "queue": KeysetOrder(
+        "queue", (Request.priority, Request.queue_counter, Request.id)
+    ),
+    "id_asc": KeysetOrder("id_asc", (Request.id,)),
+    "id_desc": KeysetOrder("id_desc", (Request.id,), descending=True),
+}
+_NEWEST_RESPONSES = KeysetOrder("responses", (Request.id,), descending=True)
+_NEWEST_RESULTS = KeysetOrder("results", (Result.id,), descending=True)
+
+
+async def _count(
+    session: AsyncSession, model: Any, conditions: list[Any]
+) -> int:
+    """COUNT(*) of ``model`` rows matching ``conditions``."""
+    result = await session.execute(
+        select(func.count()).select_from(model).where(*conditions)
+    )
+    return result.scalar() or 0
+
 
 class ListingMixin:
     """Cross-model read-only listing and retrieval operations."""
@@ -60,61 +93,73 @@ class ListingMixin:
         offset: int = 0,
         limit: int = 50,
         sort: str = "queue",
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[RequestRecord]:
         """List requests with optional filters and pagination.
 
         Args:
             status: Filter by status.
             continuation: Filter by continuation method name.
-            offset: Number of records to skip.
+            offset: Number of records to skip (after ``cursor``, if any).
             limit: Maximum number of records to return.
             sort: Sort order - "queue" (default: priority, queue_counter),
                   "id_asc" (by id ascending), or "id_desc" (by id descending).
+            cursor: ``next_cursor`` of the previous page, for the same
+                filters and sort.
+            total: How to compute ``Page.total``; "approximate" reads the
+                request counters.
 
         Returns:
             Page of RequestRecord instances.
+
+        Raises:
+            ValueError: If ``cursor`` is invalid for ``sort``.
         """
+        order = _REQUEST_ORDERS.get(sort, _REQUEST_ORDERS["queue"])
         async with self._session_factory() as session:
-            # Build WHERE conditions
             conditions = []
             if status:
                 conditions.append(Request.status == status)
             if continuation:
                 conditions.append(Request.continuation == continuation)
 
-            # Count query
-            count_stmt = select(func.count()).select_from(Request)
-            for cond in conditions:
-                count_stmt = count_stmt.where(cond)
-            result = await session.execute(count_stmt)
-            total = result.scalar() or 0
-
-            # Data query
-            data_stmt = select(*RequestRecord.select_columns(Request))
-            for cond in conditions:
-                data_stmt = data_stmt.where(cond)
-
-            if sort == "id_asc":
-                data_stmt = data_stmt.order_by(Request.id.asc())  # type: ignore[union-attr]
-            elif sort == "id_desc":
-                data_stmt = data_stmt.order_by(Request.id.desc())  # type: ignore[union-attr]
-            else:
-                data_stmt = data_stmt.order_by(
-                    Request.priority.asc(),  # type: ignore[attr-defined]
-                    Request.queue_counter.asc(),  # type: ignore[attr-defined]
+            if total == "exact":
+                count = await _count(session, Request, conditions)
+            elif total == "approximate":
+                counted = select(
+                    func.coalesce(func.sum(RequestCount.count), 0)
                 )
+                if status:
+                    counted = counted.where(
+                        RequestCount.status == status  # type: ignore[arg-type]
+                    )
+                if continuation:
+                    counted = counted.where(
+                        RequestCount.continuation == continuation  # type: ignore[arg-type]
+                    )
+                count = (await session.execute(counted)).scalar_one()
+            else:
+                count = None
 
-            data_stmt = data_stmt.limit(limit).offset(offset)
-            result = await session.execute(data_stmt)
-            rows = result.all()
-
-            items = [RequestRecord.from_row(row) for row in rows]
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                select(*RequestRecord.select_columns(Request)).where(
+                    *conditions
+                ),
+                order,
+                cursor=cursor,
+                offset=offset,
+                limit=limit,
+            )
 
             return Page(
-                items=items,
-                total=total,
+                items=[RequestRecord.from_row(row) for row in rows],
+                total=count,
                 offset=offset,
                 limit=limit,
+                next_cursor=next_cursor,
+                more=next_cursor is not None,
             )
 
     async def list_responses(
@@ -124,20 +169,31 @@ class ListingMixin:
         speculation_outcome: str | None = None,
         offset: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[ResponseRecord]:
         """List responses with optional filters and pagination.
 
-        Queries requests that have a response (response_status_code IS NOT NULL).
+        Queries requests that have a response (response_status_code IS NOT NULL),
+        newest first.
 
         Args:
             continuation: Filter by continuation method name.
             request_id: Filter by request ID.
             speculation_outcome: Filter by speculation outcome.
-            offset: Number of records to skip.
+            offset: Number of records to skip (after ``cursor``, if any).
             limit: Maximum number of records to return.
+            cursor: ``next_cursor`` of the previous page, for the same
+                filters.
+            total: How to compute ``Page.total``. There is no response
+                counter, so "approximate" only counts a ``request_id``
+                lookup.
 
         Returns:
             Page of ResponseRecord instances.
+
+        Raises:
+            ValueError: If ``cursor`` is invalid.
         """
         async with self._session_factory() as session:
             conditions = [Request.response_status_code.isnot(None)]  # type: ignore[union-attr]
@@ -150,33 +206,28 @@ class ListingMixin:
                     Request.speculation_outcome == speculation_outcome
                 )
 
-            count_stmt = select(func.count()).select_from(Request)
-            for cond in conditions:
-                count_stmt = count_stmt.where(cond)
-            result = await session.execute(count_stmt)
-            total = result.scalar() or 0
-
-            data_stmt = select(
-                Request.id,
-                Request.response_status_code,
-                Request.response_url,
-                Request.content_size_original,
-                Request.content_size_compressed,
-                Request.continuation,
-                Request.response_created_at,
-                Request.compression_dict_id,
-                Request.speculation_outcome,
-            )
-            for cond in conditions:
-                data_stmt = data_stmt.where(cond)
-            data_stmt = (
-                data_stmt.order_by(Request.id.desc())  # type: ignore[union-attr]
-                .limit(limit)
-                .offset(offset)
-            )
+            count = None
+            if total == "exact" or (total == "approximate" and request_id):
+                count = await _count(session, Request, conditions)
 
-            result = await session.execute(data_stmt)
-            rows = result.all()
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                select(
+                    Request.id,
+                    Request.response_status_code,
+                    Request.response_url,
+                    Request.content_size_original,
+                    Request.content_size_compressed,
+                    Request.continuation,
+                    Request.response_created_at,
+                    Request.compression_dict_id,
+                    Request.speculation_outcome,
+                ).where(*conditions),
+                _NEWEST_RESPONSES,
+                cursor=cursor,
+                offset=offset,
+                limit=limit,
+            )
 
             items = [
                 ResponseRecord(
@@ -195,9 +246,11 @@ class ListingMixin:
 
             return Page(
                 items=items,
-                total=total,
+                total=count,
                 offset=offset,
                 limit=limit,
+                next_cursor=next_cursor,
+                more=next_cursor is not None,
             )
 
     async def list_results(
@@ -207,18 +260,27 @@ class ListingMixin:
         request_id: int | None = None,
         offset: int = 0,
         limit: int = 50,
+        cursor: str | None = None,
+        total: TotalMode = "exact",
     ) -> Page[ResultRecord]:
-        """List results with optional filters and pagination.
+        """List results with optional filters and pagination, newest first.
 
         Args:
             result_type: Filter by result type.
             is_valid: Filter by validation status.
             request_id: Filter by request ID.
-            offset: Number of records to skip.
+            offset: Number of records to skip (after ``cursor``, if any).
             limit: Maximum number of records to return.
+            cursor: ``next_cursor`` of the previous page, for the same
+                filters.
+            total: How to compute ``Page.total``; "approximate" reads the
+                result counters (or counts a ``request_id`` lookup).
 
         Returns:
             Page of ResultRecord instances.
+
+        Raises:
+            ValueError: If ``cursor`` is invalid.
         """
         async with self._session_factory() as session:
             conditions = []
@@ -229,31 +291,36 @@ class ListingMixin:
             if request_id:
                 conditions.append(Result.request_id == request_id)
 
-            count_stmt = select(func.count()).select_from(Result)
-            for cond in conditions:
-                count_stmt = count_stmt.where(cond)
-            result = await session.execute(count_stmt)
-            total = result.scalar() or 0
-
-            data_stmt = select(
-                Result.id,
-                Result.request_id,
-                Result.result_type,
-                Result.data_json,
-                Result.is_valid,
-                Result.validation_errors_json,
-                Result.created_at,
-            )
-            for cond in conditions:
-                data_stmt = data_stmt.where(cond)
-            data_stmt = (
-                data_stmt.order_by(Result.id.desc())  # type: ignore[union-attr]
-                .limit(limit)
-                .offset(offset)
-            )
+            if total == "exact" or (total == "approximate" and request_id):
+                count = await _count(session, Result, conditions)
+            elif total == "approximate":
+                counted = select(func.coalesce(func.sum(ResultCount.count), 0))
+                if result_type:
+                    counted = counted.where(
+                        ResultCount.result_type == result_type
+                    )
+                if is_valid is not None:
+                    counted = counted.where(ResultCount.is_valid == is_valid)
+                count = (await session.execute(counted)).scalar_one()
+            else:
+                count = None
 
-            result = await session.execute(data_stmt)
-            rows = result.all()
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                select(
+                    Result.id,
+                    Result.request_id,
+                    Result.result_type,
+                    Result.data_json,
+                    Result.is_valid,
+                    Result.validation_errors_json,
+                    Result.created_at,
+                ).where(*conditions),
+                _NEWEST_RESULTS,
+                cursor=cursor,
+                offset=offset,
+                limit=limit,
+            )
 
             items = [
                 ResultRecord(
@@ -270,9 +337,11 @@ class ListingMixin:
 
             return Page(
                 items=items,
-                total=total,
+                total=count,
                 offset=offset,
                 limit=limit,
+                next_cursor=next_cursor,
+                more=next_cursor is not None,
             )
 
     async def get_request(self, request_id: int) -> RequestRecord | None:
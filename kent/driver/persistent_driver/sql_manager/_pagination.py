@@ -0,0 +1,134 @@
+"""Keyset (cursor) pagination for the listing operations.
+
+Pages are read with ``WHERE (sort key) > (last key seen)`` instead of
+``OFFSET``, so the cost of a page does not grow with its depth. The key
+of the last row is handed back as an opaque cursor; clients pass it to
+fetch the next page and never look inside it.
+
+Totals are optional. ``TotalMode`` lets callers ask for an exact count,
+a cheap figure from the maintained counters, or no count at all.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+import sqlalchemy as sa
+
+if TYPE_CHECKING:
+    from sqlalchemy import Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+TotalMode = Literal["exact", "approximate", "none"]
+"""How a listing computes ``Page.total``.
+
+``exact`` runs ``COUNT(*)`` over the filtered rows. ``approximate`` reads
+the ``request_counts`` / ``result_counts`` counters where the filters
+allow it and otherwise leaves the total out. ``none`` never counts.
+"""
+
+
+def encode_cursor(order: str, key: Sequence[Any]) -> str:
+    """Encode a sort order name and key values as an opaque cursor."""
+    raw = json.dumps([order, *key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str, width: int) -> list[Any]:
+    """Decode a cursor made by :func:`encode_cursor` for ``order``.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for a
+            different sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if (
+        not isinstance(decoded, list)
+        or len(decoded) != width + 1
+        or decoded[0] != order
+    ):
+        raise ValueError(f"Invalid cursor for sort order {order!r}")
+    return decoded[1:]
+
+
+@dataclass(frozen=True)
+class KeysetOrder:
+    """A sort order that is unique per row, usable as a keyset.
+
+    Attributes:
+        name: Name embedded in cursors, so a cursor from one order is
+            rejected by another.
+        columns: Sort columns, ending in a unique column (the id).
+        descending: Whether all columns sort descending.
+    """
+
+    name: str
+    columns: tuple[Any, ...]
+    descending: bool = False
+
+    def order_by(self) -> list[Any]:
+        """ORDER BY clauses for this order."""
+        if self.descending:
+            return [column.desc() for column in self.columns]
+        return [column.asc() for column in self.columns]
+
+    def after(self, key: Sequence[Any]) -> Any:
+        """Condition selecting the rows that sort after ``key``."""
+        left: Any
+        right: Any
+        if len(self.columns) == 1:
+            left, right = self.columns[0], sa.literal(key[0])
+        else:
+            left = sa.tuple_(*self.columns)
+            right = sa.tuple_(*(sa.literal(value) for value in key))
+        return left < right if self.descending else left > right
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    stmt: Select[Any],
+    order: KeysetOrder,
+    *,
+    cursor: str | None,
+    offset: int,
+    limit: int,
+) -> tuple[list[tuple[Any, ...]], str | None]:
+    """Run ``stmt`` for one page after ``cursor``.
+
+    The key columns are appended to the selected columns and stripped
+    from the returned rows. One row beyond ``limit`` is read to learn
+    whether another page follows. ``offset`` is still applied, after
+    the cursor, for callers that page by offset.
+
+    Returns:
+        The rows of this page and the cursor for the next one (None on
+        the last page).
+
+    Raises:
+        ValueError: If ``cursor`` is invalid for ``order``.
+    """
+    width = len(order.columns)
+    stmt = stmt.add_columns(
+        *(column.label(f"_key{i}") for i, column in enumerate(order.columns))
+    )
+    if cursor is not None:
+        stmt = stmt.where(
+            order.after(decode_cursor(cursor, order.name, width))
+        )
+    stmt = stmt.order_by(*order.order_by()).limit(limit + 1).offset(offset)
+
+    rows = (await session.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(order.name, list(rows[-1][-width:]))
+    return [tuple(row[:-width]) for row in rows], next_cursor
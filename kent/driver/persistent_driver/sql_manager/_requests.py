@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING, Any
 import sqlalchemy as sa
 from sqlalchemy import func, or_, select, update
 
-from kent.driver.persistent_driver.models import Request
+from kent.driver.persistent_driver.models import Request, RequestCount
 from kent.driver.persistent_driver.sql_manager._types import compute_cache_key
 
 if TYPE_CHECKING:
@@ -125,6 +125,7 @@ class RequestQueueMixin:
         cert_json: str | None = None,
         archive_hash_header: str | None = None,
         hateoas: bool | None = None,
+        probe: str | None = None,
     ) -> int:
         """Insert a new request into the queue.
 
@@ -146,6 +147,7 @@ class RequestQueueMixin:
             is_speculative: Whether this is a speculative request.
             speculation_id: JSON tuple ["func_name", spec_id] for speculative requests.
             bypass_rate_limit: If True, skip rate limiting for this request.
+            probe: Existence-probe mode ("head" or "range"), or None.
 
         Returns:
             The ID of the newly inserted request, or the existing ID if
@@ -183,6 +185,7 @@ class RequestQueueMixin:
                 cert_json=cert_json,
                 archive_hash_header=archive_hash_header,
                 hateoas=hateoas,
+                probe=probe,
             )
             await session.commit()
             return req_id
@@ -220,6 +223,7 @@ class RequestQueueMixin:
         cert_json: str | None = None,
         archive_hash_header: str | None = None,
         hateoas: bool | None = None,
+        probe: str | None = None,
     ) -> int:
         """Insert a request inside an existing session (no commit).
 
@@ -271,6 +275,7 @@ class RequestQueueMixin:
             cert_json=cert_json,
             archive_hash_header=archive_hash_header,
             hateoas=hateoas,
+            probe=probe,
         )
         session.add(req)
         await session.flush()
@@ -422,8 +427,9 @@ class RequestQueueMixin:
         same request.
 
         Returns:
-            Row tuple (same columns as get_next_pending_request) or None
-            if the queue is empty.
+            Row tuple (the columns of get_next_pending_request, then
+            ``parent_request_id`` and ``probe``) or None if the queue is
+            empty.
         """
         async with self._lock, self._session_factory() as session:
             started_at_ns = time.monotonic_ns()
@@ -483,6 +489,7 @@ class RequestQueueMixin:
                     Request.cert_json,
                     Request.archive_hash_header,
                     Request.parent_request_id,
+                    Request.probe,
                 )
             )
             result = await session.execute(stmt)
@@ -490,6 +497,45 @@ class RequestQueueMixin:
             await session.commit()
             return tuple(row) if row else None
 
+    async def peek_pending_requests(
+        self, limit: int
+    ) -> list[tuple[str | None, str, str, bytes | None]]:
+        """Return the requests :meth:`dequeue_next_request` would hand out next.
+
+        Read-only; nothing is claimed. Used to prefetch work ahead of the
+        workers, so a row dequeued by someone else in the meantime is
+        harmless.
+
+        Args:
+            limit: Maximum number of rows to return.
+
+        Returns:
+            ``(deduplication_key, request_type, url, body)`` tuples in
+            dequeue order.
+        """
+        async with self._lock, self._session_factory() as session:
+            result = await session.execute(
+                select(
+                    Request.deduplication_key,
+                    Request.request_type,
+                    Request.url,
+                    Request.body,
+                )
+                .where(
+                    Request.status == "pending",
+                    or_(
+                        Request.started_at.is_(None),  # type: ignore[union-attr]
+                        Request.started_at <= func.datetime("now"),
+                    ),
+                )
+                .order_by(
+                    Request.priority.asc(),  # type: ignore[attr-defined]
+                    Request.queue_counter.asc(),  # type: ignore[attr-defined]
+                )
+                .limit(limit)
+            )
+            return [tuple(row) for row in result.all()]  # type: ignore[misc]
+
     async def mark_request_in_progress(self, request_id: int) -> None:
         """Mark a request as in progress.
 
@@ -625,43 +671,37 @@ class RequestQueueMixin:
             )
             await session.commit()
 
+    async def _count_by_status(self, *statuses: str) -> int:
+        """Sum the maintained request counts for ``statuses``.
+
+        Reads ``request_counts`` (one row per continuation and status),
+        so the cost does not grow with the size of the run.
+        """
+        query = select(func.coalesce(func.sum(RequestCount.count), 0))
+        if statuses:
+            query = query.where(RequestCount.status.in_(statuses))  # type: ignore[attr-defined]
+        async with self._session_factory() as session:
+            result = await session.execute(query)
+            return result.scalar() or 0
+
     async def count_pending_requests(self) -> int:
         """Count pending requests in the queue."""
-        async with self._lock, self._session_factory() as session:
-            result = await session.execute(
-                select(func.count())
-                .select_from(Request)
-                .where(Request.status == "pending")
-            )
-            return result.scalar() or 0
+        async with self._lock:
+            return await self._count_by_status("pending")
 
     async def count_active_requests(self) -> int:
         """Count pending and in_progress requests."""
-        async with self._lock, self._session_factory() as session:
-            result = await session.execute(
-                select(func.count())
-                .select_from(Request)
-                .where(Request.status.in_(["pending", "in_progress"]))  # type: ignore[attr-defined]
-            )
-            return result.scalar() or 0
+        async with self._lock:
+            return await self._count_by_status("pending", "in_progress")
 
     async def count_in_progress(self) -> int:
         """Count in_progress requests (being processed by workers)."""
-        async with self._lock, self._session_factory() as session:
-            result = await session.execute(
-                select(func.count())
-                .select_from(Request)
-                .where(Request.status == "in_progress")
-            )
-            return result.scalar() or 0
+        async with self._lock:
+            return await self._count_by_status("in_progress")
 
     async def count_all_requests(self) -> int:
         """Count all requests in the database."""
-        async with self._session_factory() as session:
-            result = await session.execute(
-                select(func.count()).select_from(Request)
-            )
-            return result.scalar() or 0
+        return await self._count_by_status()
 
     async def avg_completed_request_duration_s(
         self, sample_size: int = 20
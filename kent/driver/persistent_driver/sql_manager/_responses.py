@@ -85,7 +85,7 @@ class ResponseStorageMixin:
         file_path: str,
         original_url: str,
         expected_type: str | None,
-        file_size: int,
+        file_size: int | None,
         content_hash: str | None,
     ) -> int:
         """Store archived file metadata.
@@ -95,7 +95,8 @@ class ResponseStorageMixin:
             file_path: Local file system path.
             original_url: URL the file was downloaded from.
             expected_type: Expected file type.
-            file_size: File size in bytes.
+            file_size: File size in bytes, or None when the content was not
+                held in memory (streamed or linked from an archive store).
             content_hash: SHA256 hash of content.
 
         Returns:
@@ -29,6 +29,8 @@ class SpeculationStateDict(TypedDict):
     stopped: bool
     param_index: int
     template_json: str | None
+    search_probes: int
+    probes_saved: int
 
 
 class SpeculationMixin:
@@ -48,6 +50,8 @@ class SpeculationMixin:
         stopped: bool,
         param_index: int = 0,
         template_json: str | None = None,
+        search_probes: int = 0,
+        probes_saved: int = 0,
     ) -> None:
         """Save or update speculation tracking state.
 
@@ -59,6 +63,9 @@ class SpeculationMixin:
             stopped: Whether speculation has stopped for this entry.
             param_index: Index of this template in the params list.
             template_json: JSON serialization of the Speculative template.
+            search_probes: Probes issued by frontier searches.
+            probes_saved: Requests frontier searches saved over a dense
+                linear scan.
         """
         async with self._lock, self._session_factory() as session:
             stmt = sqlite_insert(SpeculationTracking).values(
@@ -69,6 +76,8 @@ class SpeculationMixin:
                 stopped=stopped,
                 param_index=param_index,
                 template_json=template_json,
+                search_probes=search_probes,
+                probes_saved=probes_saved,
             )
             stmt = stmt.on_conflict_do_update(
                 index_elements=["func_name"],
@@ -79,6 +88,8 @@ class SpeculationMixin:
                     "stopped": stmt.excluded.stopped,
                     "param_index": stmt.excluded.param_index,
                     "template_json": stmt.excluded.template_json,
+                    "search_probes": stmt.excluded.search_probes,
+                    "probes_saved": stmt.excluded.probes_saved,
                     "updated_at": func.current_timestamp(),
                 },
             )
@@ -113,6 +124,8 @@ class SpeculationMixin:
                 "stopped": bool(row.stopped),
                 "param_index": row.param_index,
                 "template_json": row.template_json,
+                "search_probes": row.search_probes,
+                "probes_saved": row.probes_saved,
             }
 
     async def load_all_speculation_states(
@@ -135,6 +148,8 @@ class SpeculationMixin:
                     stopped=bool(row.stopped),
                     param_index=row.param_index,
                     template_json=row.template_json,
+                    search_probes=row.search_probes,
+                    probes_saved=row.probes_saved,
                 )
                 for row in rows
             }
@@ -54,19 +54,30 @@ class Page(Generic[T]):
 
     Attributes:
         items: List of items for this page.
-        total: Total number of items matching the query.
+        total: Total number of items matching the query, or None when it
+            was not counted (see ``TotalMode``).
         offset: Number of items skipped.
         limit: Maximum items per page.
+        next_cursor: Opaque cursor for the page after this one, or None
+            on the last page (keyset-paginated listings only).
+        more: Whether items follow this page, when the query checked
+            directly. None falls back to comparing against ``total``.
     """
 
     items: list[T]
-    total: int
+    total: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+    more: bool | None = None
 
     @property
     def has_more(self) -> bool:
         """Check if there are more items after this page."""
+        if self.more is not None:
+            return self.more
+        if self.total is None:
+            return False
         return self.offset + len(self.items) < self.total
 
     def to_dict(self) -> dict[str, Any]:
@@ -80,6 +91,7 @@ class Page(Generic[T]):
             "offset": self.offset,
             "limit": self.limit,
             "has_more": self.has_more,
+            "next_cursor": self.next_cursor,
         }
 
     def to_json(self) -> str:
@@ -9,14 +9,21 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
 
 import sqlalchemy as sa
 from sqlmodel import select
 
+from kent.driver.persistent_driver.metrics import (
+    DriverMetrics,
+    MetricsRegistry,
+)
 from kent.driver.persistent_driver.models import (
     Error,
     Request,
+    RequestCount,
     Result,
+    ResultCount,
     RunMetadata,
 )
 
@@ -225,51 +232,149 @@ async def get_queue_stats(
         QueueStats instance with current queue state.
     """
     async with session_factory() as session:
-        # Get counts by status
-        result = await session.execute(
-            select(Request.status, sa.func.count()).group_by(Request.status)
-        )
-        rows = result.all()
-
-        stats = QueueStats()
-        for status, count in rows:
-            if status == "pending":
-                stats.pending = count
-            elif status == "in_progress":
-                stats.in_progress = count
-            elif status == "completed":
-                stats.completed = count
-            elif status == "failed":
-                stats.failed = count
-            elif status == "held":
-                stats.held = count
-
-        stats.total = (
-            stats.pending
-            + stats.in_progress
-            + stats.completed
-            + stats.failed
-            + stats.held
-        )
-
-        # Get counts by continuation
+        # Maintained per (continuation, status); see RequestCount.
         result = await session.execute(
             select(
-                Request.continuation,
-                Request.status,
-                sa.func.count(),
-            ).group_by(Request.continuation, Request.status)
+                RequestCount.continuation,
+                RequestCount.status,
+                RequestCount.count,
+            ).where(RequestCount.count != 0)
         )
         rows = result.all()
 
-        for continuation, status, count in rows:
-            if continuation not in stats.by_continuation:
-                stats.by_continuation[continuation] = {}
-            stats.by_continuation[continuation][status] = count
+    stats = QueueStats()
+    for continuation, status, count in rows:
+        if status in ("pending", "in_progress", "completed", "failed", "held"):
+            setattr(stats, status, getattr(stats, status) + count)
+        stats.by_continuation.setdefault(continuation, {})[status] = count
+
+    stats.total = (
+        stats.pending
+        + stats.in_progress
+        + stats.completed
+        + stats.failed
+        + stats.held
+    )
 
     return stats
 
 
+async def check_run_counters(
+    session_factory: ScopedSessionFactory,
+    *,
+    fix: bool = False,
+) -> dict[str, Any]:
+    """Compare the maintained run counters with a recount.
+
+    ``request_counts`` and ``result_counts`` are kept by triggers, so
+    they only drift if rows were changed with the triggers dropped (or
+    by a bug). This is the one full scan of ``requests`` and ``results``
+    the statistics above no longer do.
+
+    Args:
+        session_factory: Async session factory.
+        fix: Replace the counters with the recount, atomically.
+
+    Returns:
+        Dictionary with:
+            - requests: Mismatched {continuation, status, stored, actual}
+            - results: Mismatched {result_type, is_valid, stored, actual}
+            - has_drift: bool
+            - fixed: bool (True if ``fix`` rewrote the counters)
+    """
+    recount_requests = select(
+        Request.continuation, Request.status, sa.func.count()
+    ).group_by(Request.continuation, Request.status)
+    recount_results = select(
+        Result.result_type, Result.is_valid, sa.func.count()
+    ).group_by(Result.result_type, Result.is_valid)
+
+    async with session_factory() as session:
+        stored_requests = {
+            (row[0], row[1]): row[2]
+            for row in await session.execute(
+                select(
+                    RequestCount.continuation,
+                    RequestCount.status,
+                    RequestCount.count,
+                )
+            )
+        }
+        actual_requests = {
+            (row[0], row[1]): row[2]
+            for row in await session.execute(recount_requests)
+        }
+        stored_results = {
+            (row[0], bool(row[1])): row[2]
+            for row in await session.execute(
+                select(
+                    ResultCount.result_type,
+                    ResultCount.is_valid,
+                    ResultCount.count,
+                )
+            )
+        }
+        actual_results = {
+            (row[0], bool(row[1])): row[2]
+            for row in await session.execute(recount_results)
+        }
+
+        request_drift = [
+            {
+                "continuation": continuation,
+                "status": status,
+                "stored": stored_requests.get((continuation, status), 0),
+                "actual": actual_requests.get((continuation, status), 0),
+            }
+            for continuation, status in sorted(
+                stored_requests.keys() | actual_requests.keys()
+            )
+            if stored_requests.get((continuation, status), 0)
+            != actual_requests.get((continuation, status), 0)
+        ]
+        result_drift = [
+            {
+                "result_type": result_type,
+                "is_valid": is_valid,
+                "stored": stored_results.get((result_type, is_valid), 0),
+                "actual": actual_results.get((result_type, is_valid), 0),
+            }
+            for result_type, is_valid in sorted(
+                stored_results.keys() | actual_results.keys()
+            )
+            if stored_results.get((result_type, is_valid), 0)
+            != actual_results.get((result_type, is_valid), 0)
+        ]
+    has_drift = bool(request_drift or result_drift)
+
+    fixed = False
+    if fix and has_drift:
+        # A fresh transaction that deletes first: the write lock is then
+        # held while recounting, so no concurrent trigger update is lost.
+        async with session_factory() as session:
+            await session.execute(sa.delete(RequestCount))
+            await session.execute(sa.delete(ResultCount))
+            await session.execute(
+                sa.insert(RequestCount).from_select(
+                    ["continuation", "status", "count"], recount_requests
+                )
+            )
+            await session.execute(
+                sa.insert(ResultCount).from_select(
+                    ["result_type", "is_valid", "count"], recount_results
+                )
+            )
+            await session.commit()
+            fixed = True
+
+    return {
+        "requests": request_drift,
+        "results": result_drift,
+        "has_drift": has_drift,
+        "fixed": fixed,
+    }
+
+
 async def get_throughput_stats(
     session_factory: ScopedSessionFactory,
 ) -> ThroughputStats:
@@ -402,34 +507,24 @@ async def get_result_stats(
         ResultStats instance with result metrics.
     """
     async with session_factory() as session:
+        # Maintained per (result_type, is_valid); see ResultCount.
         result = await session.execute(
             select(
-                sa.func.count(),
-                sa.func.sum(
-                    sa.case((Result.is_valid == sa.true(), 1), else_=0)
-                ),
-                sa.func.sum(
-                    sa.case((Result.is_valid == sa.false(), 1), else_=0)
-                ),
-            )
-        )
-        row = result.first()
-
-        stats = ResultStats()
-        if row:
-            stats.total = row[0]
-            stats.valid = row[1] or 0
-            stats.invalid = row[2] or 0
-
-        # Get counts by type
-        result = await session.execute(
-            select(Result.result_type, sa.func.count()).group_by(
-                Result.result_type
-            )
+                ResultCount.result_type,
+                ResultCount.is_valid,
+                ResultCount.count,
+            ).where(ResultCount.count != 0)
         )
         rows = result.all()
-        for result_type, count in rows:
-            stats.by_type[result_type] = count
+
+    stats = ResultStats()
+    for result_type, is_valid, count in rows:
+        stats.total += count
+        if is_valid:
+            stats.valid += count
+        else:
+            stats.invalid += count
+        stats.by_type[result_type] = stats.by_type.get(result_type, 0) + count
 
     return stats
 
@@ -519,3 +614,92 @@ async def get_stats(
         run_status=run_status,
         scraper_name=scraper_name,
     )
+
+
+async def collect_queue_metrics(
+    session_factory: ScopedSessionFactory, metrics: DriverMetrics
+) -> None:
+    """Set the ``kent_queue_depth`` gauges from the run counters.
+
+    Args:
+        session_factory: Async session factory.
+        metrics: The instruments to update.
+    """
+    stats = await get_queue_stats(session_factory)
+    for status in ("pending", "in_progress", "completed", "failed", "held"):
+        metrics.queue_depth.labels(status).set(getattr(stats, status))
+
+
+async def get_run_metrics(
+    session_factory: ScopedSessionFactory,
+    chunk_size: int = 10_000,
+) -> MetricsRegistry:
+    """Rebuild the driver metrics that the run database can answer.
+
+    Queue depth, retries per host and compression ratio per
+    continuation come from the stored requests. Only whole-request
+    durations are stored, so HTTP latency is replaced by
+    ``kent_request_duration_seconds{host}`` (fetch, step and flush
+    together). Step, flush, lock-wait and dequeue timings only exist
+    in a live driver's registry.
+
+    Args:
+        session_factory: Async session factory.
+        chunk_size: Rows read per round trip while scanning requests.
+
+    Returns:
+        A registry holding the rebuilt metrics.
+    """
+    metrics = DriverMetrics()
+    registry = metrics.registry
+    request_time = registry.histogram(
+        "kent_request_duration_seconds",
+        "Time from dequeue to completion per host (fetch, step, flush).",
+        labelnames=("host",),
+    )
+    await collect_queue_metrics(session_factory, metrics)
+
+    query = sa.select(
+        Request.url,
+        Request.continuation,
+        Request.started_at_ns,
+        Request.completed_at_ns,
+        Request.retry_count,
+        Request.content_size_original,
+        Request.content_size_compressed,
+    ).where(
+        Request.status.in_(("completed", "failed"))  # type: ignore[attr-defined]
+    )
+    async with session_factory() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            for (
+                url,
+                continuation,
+                started_ns,
+                completed_ns,
+                retries,
+                original,
+                compressed,
+            ) in rows:
+                host = urlsplit(url).hostname or ""
+                # Stamps are monotonic, so they only compare within the
+                # process that made both.
+                if (
+                    started_ns is not None
+                    and completed_ns is not None
+                    and completed_ns >= started_ns
+                ):
+                    request_time.labels(host).observe(
+                        (completed_ns - started_ns) / 1e9
+                    )
+                if retries:
+                    metrics.retries.labels(host).inc(retries)
+                if original and compressed:
+                    metrics.compression_ratio.labels(continuation).observe(
+                        original / compressed
+                    )
+
+    return registry
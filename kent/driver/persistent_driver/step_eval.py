@@ -0,0 +1,436 @@
+"""Parallel, cached step evaluation for ``pdd step`` tools.
+
+``pdd step re-evaluate`` and ``pdd step xpath-stats`` replay stored
+responses through the current step code. The replays are independent
+and CPU-bound, so :func:`map_step_jobs` runs them on a process pool,
+yielding outcomes in submission order.
+
+Each replay's output is cached in a side file next to the run DB
+(``<run>.db.step-cache``). The key combines:
+
+- a fingerprint of the step's code (:func:`step_fingerprint`): the
+  bytecode and constants of the step method and of the scraper methods
+  and same-module functions it references, transitively;
+- a hash of the response content, status, headers and URL;
+- the request context the step sees (URL, method, location,
+  accumulated and permanent data).
+
+Re-running after an edit elsewhere in the scraper therefore replays
+only the requests whose step changed. Changes outside that reach (kent
+itself, other modules, class attributes) are not seen; pass
+``--no-cache`` after such changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+import threading
+import types
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from kent.driver._process_pool import OrderedPool
+from kent.driver.persistent_driver.dry_run_driver import (
+    DryRunDriver,
+    DryRunResult,
+)
+
+# Request fields the step sees, in key order.
+_REQUEST_KEYS = (
+    "url",
+    "method",
+    "continuation",
+    "current_location",
+    "accumulated_data_json",
+    "permanent_json",
+)
+_RESPONSE_KEYS = ("status_code", "headers_json", "url")
+
+
+def default_step_cache_path(db_path: Path) -> Path:
+    """Where the step cache for the run DB at ``db_path`` lives."""
+    return db_path.with_name(f"{db_path.name}.step-cache")
+
+
+def _hash_code(code: types.CodeType, digest: Any) -> None:
+    digest.update(code.co_code)
+    digest.update(" ".join(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, digest)
+        elif isinstance(const, frozenset):
+            # Set order depends on the hash seed; sort for stability.
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+def _referenced_names(code: types.CodeType) -> set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def step_fingerprint(scraper_class: type, continuation: str) -> str:
+    """Hash the code a step runs, for keying cached step output.
+
+    Covers the step method and, transitively, the methods of
+    ``scraper_class`` and the functions defined in the scraper's or the
+    step's module that it references by name.
+
+    Args:
+        scraper_class: The scraper class.
+        continuation: The step method name.
+
+    Returns:
+        A hex digest.
+    """
+    root = inspect.unwrap(getattr(scraper_class, continuation))
+    modules = {scraper_class.__module__, getattr(root, "__module__", None)}
+    digest = hashlib.sha256(
+        f"{scraper_class.__module__}.{scraper_class.__qualname__}"
+        f".{continuation}".encode()
+    )
+    seen: set[int] = set()
+    stack = [root]
+    while stack:
+        func = stack.pop()
+        code = getattr(func, "__code__", None)
+        if code is None or id(code) in seen:
+            continue
+        seen.add(id(code))
+        digest.update(func.__qualname__.encode())
+        _hash_code(code, digest)
+        module_globals = getattr(func, "__globals__", {})
+        for name in sorted(_referenced_names(code)):
+            for candidate in (
+                getattr(scraper_class, name, None),
+                module_globals.get(name),
+            ):
+                if isinstance(candidate, (staticmethod, classmethod)):
+                    candidate = candidate.__func__
+                if isinstance(candidate, types.MethodType):
+                    candidate = candidate.__func__
+                if not callable(candidate):
+                    continue
+                candidate = inspect.unwrap(candidate)
+                if (
+                    isinstance(candidate, types.FunctionType)
+                    and candidate.__module__ in modules
+                ):
+                    stack.append(candidate)
+    return digest.hexdigest()
+
+
+def step_cache_key(
+    kind: str,
+    fingerprint: str,
+    request_data: dict[str, Any],
+    response_data: dict[str, Any],
+) -> str:
+    """Cache key for one step replay.
+
+    Args:
+        kind: What the replay produced (``"dry_run"``, ``"selectors"``).
+        fingerprint: :func:`step_fingerprint` of the step.
+        request_data: The request fields the step sees.
+        response_data: The response fields, with ``content`` bytes.
+    """
+    digest = hashlib.sha256(f"{kind}\0{fingerprint}\0".encode())
+    digest.update(response_data.get("content") or b"")
+    digest.update(
+        json.dumps(
+            [
+                [request_data.get(k) for k in _REQUEST_KEYS],
+                [response_data.get(k) for k in _RESPONSE_KEYS],
+            ]
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+class StepCache:
+    """Pickled step outputs in a SQLite side file, keyed by
+    :func:`step_cache_key`.
+
+    Methods are synchronous and thread-safe.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (creating if needed) the cache at ``path``."""
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS step_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """The cached value for ``key``, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM step_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])  # noqa: S301 - our own cache file
+        except Exception:
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+        data = pickle.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO step_cache (key, value) VALUES (?, ?)",
+                (key, data),
+            )
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM step_cache")
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def dry_run_job(
+    scraper_class: type,
+    continuation: str,
+    request_data: dict[str, Any],
+    response_data: dict[str, Any],
+) -> DryRunResult[Any]:
+    """Replay one response through the step, capturing its yields."""
+    if "text" not in response_data:
+        try:
+            text = response_data["content"].decode("utf-8")
+        except UnicodeDecodeError:
+            text = ""
+        response_data = {**response_data, "text": text}
+    driver = DryRunDriver(scraper_class())
+    return driver.run_continuation(continuation, response_data, request_data)
+
+
+def selector_job(
+    scraper_class: type,
+    continuation: str,
+    request_data: dict[str, Any],
+    response_data: dict[str, Any],
+) -> dict[str, Any]:
+    """Replay one response through the step with a SelectorObserver.
+
+    Returns:
+        ``{"queries": [...], "error": str | None}``, as
+        ``run_with_selector_observer`` documents.
+    """
+    from kent.common.selector_observer import SelectorObserver
+    from kent.data_types import (
+        HttpMethod,
+        HTTPRequestParams,
+        Response,
+    )
+    from kent.data_types import (
+        Request as DataRequest,
+    )
+
+    url = request_data["url"]
+    headers_json = response_data.get("headers_json")
+    accumulated_data_json = request_data.get("accumulated_data_json")
+    permanent_json = request_data.get("permanent_json")
+    reconstructed_request = DataRequest(
+        request=HTTPRequestParams(
+            method=HttpMethod(request_data["method"]),
+            url=url,
+        ),
+        continuation=continuation,
+        current_location=request_data.get("current_location") or url,
+        accumulated_data=(
+            json.loads(accumulated_data_json) if accumulated_data_json else {}
+        ),
+        permanent=json.loads(permanent_json) if permanent_json else {},
+    )
+
+    content = response_data["content"]
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        text = content.decode("utf-8", errors="replace")
+
+    response = Response(
+        status_code=response_data["status_code"],
+        url=response_data["url"],
+        content=content,
+        text=text,
+        headers=json.loads(headers_json) if headers_json else {},
+        request=reconstructed_request,
+    )
+
+    scraper_instance = scraper_class()
+    error: str | None = None
+
+    with SelectorObserver() as observer:
+        try:
+            continuation_method = scraper_instance.get_continuation(
+                continuation
+            )
+            for _item in continuation_method(response):
+                pass
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    return {"queries": observer.json(), "error": error}
+
+
+@dataclass
+class StepJob:
+    """One request to replay.
+
+    Attributes:
+        request_id: The request.
+        continuation: The step to run.
+        request_data: Request fields, as :func:`dry_run_job` takes them.
+        response_data: Response fields including ``content`` bytes.
+    """
+
+    request_id: int
+    continuation: str
+    request_data: dict[str, Any]
+    response_data: dict[str, Any]
+
+
+@dataclass
+class StepEvalProgress:
+    """Progress of :func:`map_step_jobs`.
+
+    Attributes:
+        done: Jobs finished so far, cached or not.
+        total: Jobs expected, if known.
+        cached: Jobs answered from the cache so far.
+    """
+
+    done: int
+    total: int | None
+    cached: int
+
+
+async def map_step_jobs(
+    func: Callable[[type, str, dict[str, Any], dict[str, Any]], Any],
+    scraper_class: type,
+    jobs: AsyncIterable[StepJob],
+    *,
+    kind: str,
+    cache: StepCache | None = None,
+    processes: int | None = None,
+    total: int | None = None,
+    on_progress: Callable[[StepEvalProgress], None] | None = None,
+) -> AsyncGenerator[tuple[StepJob, Any, str | None], None]:
+    """Run ``func`` for each job on a process pool, using the cache.
+
+    ``func`` is :func:`dry_run_job` or :func:`selector_job` (or another
+    picklable function with their signature). A ``scraper_class`` that
+    workers cannot import (one defined in a function, say) is replayed
+    in a thread instead. Results are yielded in job order as ``(job,
+    output, None)``, or ``(job, None, message)`` if the replay raised;
+    failed replays are not cached. Close the iterator
+    (``contextlib.aclosing``) when stopping early.
+
+    Args:
+        func: The replay to run.
+        scraper_class: The scraper class.
+        jobs: Requests to replay.
+        kind: Cache namespace for ``func``'s output.
+        cache: Step cache, or None to always replay.
+        processes: Pool size. ``None`` uses one per CPU; ``0`` replays
+            in a thread instead of a process pool.
+        total: Number of jobs, for progress reports.
+        on_progress: Called after each job finishes.
+    """
+    if processes != 0 and not _picklable(scraper_class):
+        processes = 0
+    fingerprints: dict[str, str] = {}
+    pool: OrderedPool[tuple[StepJob, str | None]] = OrderedPool(processes)
+    done = cached = 0
+
+    def report() -> None:
+        if on_progress is not None:
+            on_progress(StepEvalProgress(done, total, cached))
+
+    try:
+        async for job in jobs:
+            key: str | None = None
+            hit: Any = None
+            if cache is not None:
+                if job.continuation not in fingerprints:
+                    fingerprints[job.continuation] = step_fingerprint(
+                        scraper_class, job.continuation
+                    )
+                key = step_cache_key(
+                    kind,
+                    fingerprints[job.continuation],
+                    job.request_data,
+                    job.response_data,
+                )
+                hit = await asyncio.to_thread(cache.get, key)
+            if hit is not None:
+                pool.add_result((job, None), hit)
+                cached += 1
+            else:
+                pool.submit(
+                    (job, key),
+                    func,
+                    scraper_class,
+                    job.continuation,
+                    job.request_data,
+                    job.response_data,
+                )
+            while pool.full:
+                yield await _finish(pool.popleft(), cache)
+                done += 1
+                report()
+        while pool:
+            yield await _finish(pool.popleft(), cache)
+            done += 1
+            report()
+    finally:
+        await pool.aclose()
+
+
+async def _finish(
+    entry: tuple[tuple[StepJob, str | None], asyncio.Future[Any]],
+    cache: StepCache | None,
+) -> tuple[StepJob, Any, str | None]:
+    (job, key), future = entry
+    try:
+        output = await future
+    except Exception as e:
+        return job, None, f"{type(e).__name__}: {e}"
+    if cache is not None and key is not None:
+        await asyncio.to_thread(cache.put, key, output)
+    return job, output, None
+
+
+def _picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
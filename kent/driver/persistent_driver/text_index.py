@@ -0,0 +1,412 @@
+"""Full-text side index over response page text.
+
+The index is a SQLite FTS5 table in its own file next to the run DB
+(``<run>.db.text-index`` by default), so a run DB without one is
+unchanged and a large index never bloats the run. Each row holds the
+:func:`~kent.driver.persistent_driver.response_search.response_page_text`
+of one response under its request id, tokenized into case-folded
+trigrams so any substring of three or more characters is a phrase
+query.
+
+The index is brought up to date incrementally by
+:func:`update_text_index`, either from ``pdd responses index`` or from
+the persistent driver's background task (``PersistentDriver.open(...,
+text_index=True)``). It persists a high-water mark: every request at or
+below it had finished, and was indexed, when the mark was set. Above the
+mark, each indexed row remembers the completion stamp it was indexed at
+so rows are neither missed nor decompressed twice.
+
+:func:`iter_indexed_matches` answers a page-text search from the index
+up to the mark and scans the few responses above it that are not yet
+indexed. Requests re-run after the mark passed them keep their old text
+until the index is rebuilt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from sqlmodel import select
+
+from kent.driver.persistent_driver.models import Request
+from kent.driver.persistent_driver.response_search import (
+    SearchPattern,
+    decompress_rows,
+    iter_response_matches,
+    map_response_chunks,
+    response_filters,
+    response_page_text,
+)
+
+if TYPE_CHECKING:
+    from kent.driver.persistent_driver.scoped_session import (
+        ScopedSessionFactory,
+    )
+
+# Shortest query the trigram tokenizer can answer.
+MIN_QUERY_LENGTH = 3
+
+# Statuses whose response may still change; the high-water mark stops
+# below the first of them.
+_UNFINISHED = ("pending", "in_progress", "held")
+
+# Ids checked per query when filtering index hits in the run DB.
+_ID_BATCH = 500
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS response_text USING fts5(
+    body, tokenize = 'trigram'
+);
+CREATE TABLE IF NOT EXISTS indexed (
+    request_id INTEGER PRIMARY KEY,
+    completed_at_ns INTEGER,
+    content_size_compressed INTEGER
+);
+CREATE TABLE IF NOT EXISTS index_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# (completed_at_ns, content_size_compressed) of a response when indexed.
+_Stamp = tuple[int | None, int | None]
+
+
+def default_text_index_path(db_path: Path) -> Path:
+    """Where the text index for the run DB at ``db_path`` lives."""
+    return db_path.with_name(f"{db_path.name}.text-index")
+
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace the way indexed page text is collapsed."""
+    return " ".join(text.split())
+
+
+@dataclass
+class TextIndexUpdate:
+    """Outcome of one :func:`update_text_index` pass.
+
+    Attributes:
+        indexed: Responses (re)indexed in this pass.
+        high_water: The high-water mark after the pass.
+    """
+
+    indexed: int
+    high_water: int
+
+
+class ResponseTextIndex:
+    """Connection to a text index file.
+
+    Methods are synchronous and thread-safe; async callers run them with
+    :func:`asyncio.to_thread`.
+    """
+
+    def __init__(self, path: Path, *, read_only: bool = False) -> None:
+        """Open (and with ``read_only=False``, create) the index at ``path``.
+
+        Args:
+            path: The index file.
+            read_only: Open an existing index without writing to it.
+        """
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            self._conn = sqlite3.connect(
+                f"file:{path}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_existing(cls, path: Path) -> ResponseTextIndex | None:
+        """Open the index at ``path`` read-only, or None if there is none."""
+        if not path.exists():
+            return None
+        return cls(path, read_only=True)
+
+    @staticmethod
+    def can_answer(text: str) -> bool:
+        """Whether ``text`` is long enough for a trigram query."""
+        return len(normalize_query(text)) >= MIN_QUERY_LENGTH
+
+    def high_water(self) -> int:
+        """Highest request id known finished and indexed (0 if none)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM index_state WHERE key = 'high_water'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def stamps(self, after_id: int) -> dict[int, _Stamp]:
+        """Stamps of indexed rows above ``after_id``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT request_id, completed_at_ns, content_size_compressed "
+                "FROM indexed WHERE request_id > ?",
+                (after_id,),
+            ).fetchall()
+        return {request_id: (ns, size) for request_id, ns, size in rows}
+
+    def match(self, text: str) -> list[int]:
+        """Ids of indexed responses whose page text contains ``text``.
+
+        Case-insensitive; ``text`` must satisfy :meth:`can_answer`.
+        """
+        phrase = '"' + normalize_query(text).replace('"', '""') + '"'
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid FROM response_text WHERE response_text "
+                "MATCH ? ORDER BY rowid",
+                (phrase,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def store(self, entries: Sequence[tuple[int, _Stamp, str]]) -> None:
+        """Index ``(request_id, stamp, page_text)`` entries, replacing any."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM response_text WHERE rowid = ?",
+                [(request_id,) for request_id, _, _ in entries],
+            )
+            self._conn.executemany(
+                "INSERT INTO response_text (rowid, body) VALUES (?, ?)",
+                [(request_id, body) for request_id, _, body in entries],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO indexed (request_id, "
+                "completed_at_ns, content_size_compressed) VALUES (?, ?, ?)",
+                [(request_id, *stamp) for request_id, stamp, _ in entries],
+            )
+
+    def set_high_water(self, high_water: int) -> None:
+        """Persist the high-water mark."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_state (key, value) "
+                "VALUES ('high_water', ?)",
+                (high_water,),
+            )
+
+    def clear(self) -> None:
+        """Drop every indexed row and reset the high-water mark."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM response_text")
+            self._conn.execute("DELETE FROM indexed")
+            self._conn.execute("DELETE FROM index_state")
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _extract_chunk(
+    rows: list[tuple[int, bytes | None, int | None]],
+    dictionaries: dict[int, bytes],
+) -> list[tuple[int, str]]:
+    """Decompress a chunk and extract page text; runs in a pool worker."""
+    return [
+        (request_id, response_page_text(content))
+        for request_id, content in decompress_rows(rows, dictionaries)
+    ]
+
+
+async def update_text_index(
+    session_factory: ScopedSessionFactory,
+    index: ResponseTextIndex,
+    *,
+    rebuild: bool = False,
+    processes: int | None = 0,
+) -> TextIndexUpdate:
+    """Index responses stored since the last pass.
+
+    Every response above the high-water mark whose stamp differs from
+    the one it was indexed at (or that was never indexed) is
+    decompressed, stripped to page text and indexed. The mark then
+    advances to just below the first request that was still unfinished
+    when the pass started, capped at the highest id that existed then.
+
+    Args:
+        session_factory: Session factory for the run database.
+        index: A writable index.
+        rebuild: Discard the index and start from scratch.
+        processes: Extraction pool size; ``0`` (default) extracts in a
+            thread, ``None`` uses one process per CPU.
+
+    Returns:
+        How many responses were indexed and the new high-water mark.
+    """
+    if rebuild:
+        await asyncio.to_thread(index.clear)
+    high_water = await asyncio.to_thread(index.high_water)
+
+    async with session_factory() as session:
+        result = await session.execute(
+            select(
+                sa.func.max(Request.id),
+                sa.select(sa.func.min(Request.id))
+                .where(
+                    Request.id > high_water,  # type: ignore[operator]
+                    Request.status.in_(_UNFINISHED),  # type: ignore[attr-defined]
+                )
+                .scalar_subquery(),
+            )
+        )
+        max_id, first_unfinished = result.one()
+        stamped = await session.execute(
+            select(
+                Request.id,
+                Request.completed_at_ns,
+                Request.content_size_compressed,
+            )
+            .where(
+                Request.id > high_water,  # type: ignore[operator]
+                Request.response_status_code.isnot(None),  # type: ignore[union-attr]
+            )
+            .order_by(Request.id)  # type: ignore[arg-type]
+        )
+        current = {
+            request_id: (ns, size) for request_id, ns, size in stamped.all()
+        }
+
+    known = await asyncio.to_thread(index.stamps, high_water)
+    stale = [
+        request_id
+        for request_id, stamp in current.items()
+        if known.get(request_id) != stamp
+    ]
+
+    indexed = 0
+    async with aclosing(
+        map_response_chunks(
+            session_factory,
+            _extract_chunk,
+            request_ids=stale,
+            processes=processes,
+        )
+    ) as chunks:
+        async for extracted in chunks:
+            await asyncio.to_thread(
+                index.store,
+                [
+                    (request_id, current[request_id], body)
+                    for request_id, body in extracted
+                ],
+            )
+            indexed += len(extracted)
+
+    if max_id is not None:
+        if first_unfinished is not None:
+            high_water = max(high_water, first_unfinished - 1)
+        else:
+            high_water = max(high_water, max_id)
+        await asyncio.to_thread(index.set_high_water, high_water)
+    return TextIndexUpdate(indexed=indexed, high_water=high_water)
+
+
+async def iter_indexed_matches(
+    session_factory: ScopedSessionFactory,
+    index: ResponseTextIndex,
+    text: str,
+    *,
+    continuation: str | None = None,
+    status_code: int | None = None,
+    min_size: int | None = None,
+    max_size: int | None = None,
+    limit: int | None = None,
+    processes: int | None = None,
+) -> AsyncGenerator[int, None]:
+    """Yield ids of responses whose page text contains ``text``.
+
+    Index hits are trusted at or below the high-water mark and, above
+    it, where the response still has the stamp it was indexed at. The
+    remaining responses above the mark are scanned with a page-text
+    :class:`SearchPattern`. Filters are applied in SQL to both, and hits
+    for requests no longer in the run are dropped. Ids are yielded in
+    ascending order.
+
+    Args:
+        session_factory: Session factory for the run database.
+        index: The text index.
+        text: Case-insensitive text; must satisfy
+            :meth:`ResponseTextIndex.can_answer`.
+        continuation: Only responses of this continuation.
+        status_code: Only responses with this HTTP status.
+        min_size: Only responses at least this many bytes.
+        max_size: Only responses at most this many bytes.
+        limit: Stop after this many matches.
+        processes: Pool size for scanning unindexed responses.
+    """
+    if limit is not None and limit <= 0:
+        return
+    where = response_filters(
+        continuation=continuation,
+        status_code=status_code,
+        min_size=min_size,
+        max_size=max_size,
+    )
+    high_water = await asyncio.to_thread(index.high_water)
+    hits = await asyncio.to_thread(index.match, text)
+    known = await asyncio.to_thread(index.stamps, high_water)
+
+    async with session_factory() as session:
+        result = await session.execute(
+            select(
+                Request.id,
+                Request.completed_at_ns,
+                Request.content_size_compressed,
+            ).where(
+                Request.id > high_water,  # type: ignore[operator]
+                Request.response_status_code.isnot(None),  # type: ignore[union-attr]
+                *where,
+            )
+        )
+        unindexed = [
+            request_id
+            for request_id, ns, size in result.all()
+            if known.get(request_id) != (ns, size)
+        ]
+        stale = set(unindexed)
+        hits = [request_id for request_id in hits if request_id not in stale]
+        # The index keeps entries for requests deleted since it was
+        # built, so hits are checked against the run even unfiltered.
+        kept: list[int] = []
+        for start in range(0, len(hits), _ID_BATCH):
+            batch = await session.execute(
+                select(Request.id).where(
+                    Request.id.in_(hits[start : start + _ID_BATCH]),  # type: ignore[union-attr]
+                    Request.response_status_code.isnot(None),  # type: ignore[union-attr]
+                    *where,
+                )
+            )
+            kept.extend(batch.scalars())
+        hits = sorted(kept)
+
+    scanned: list[int] = []
+    if unindexed:
+        async with aclosing(
+            iter_response_matches(
+                session_factory,
+                SearchPattern(text=text, page_text=True),
+                request_ids=unindexed,
+                processes=processes,
+            )
+        ) as matches:
+            scanned = [request_id async for request_id in matches]
+
+    for found, request_id in enumerate(sorted([*hits, *scanned]), 1):
+        yield request_id
+        if limit is not None and found >= limit:
+            return
@@ -22,6 +22,7 @@ from fastapi import FastAPI
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
 
+    from kent.driver.archive_store import ArchiveStore
     from kent.driver.persistent_driver.debugger import (
         LocalDevDriverDebugger,
     )
@@ -100,6 +101,20 @@ class RunManager:
         self.runs_dir = runs_dir
         self.runs: dict[str, RunInfo] = {}
         self._lock = asyncio.Lock()
+        self._archive_store: ArchiveStore | None = None
+
+    async def get_archive_store(self) -> ArchiveStore:
+        """Return the archive store shared by runs, opening it on first use."""
+        from kent.driver.archive_store import ArchiveStore
+        from kent.driver.persistent_driver.web.archive import (
+            get_archive_store_dir,
+        )
+
+        if self._archive_store is None:
+            self._archive_store = await asyncio.to_thread(
+                ArchiveStore, get_archive_store_dir(self.runs_dir)
+            )
+        return self._archive_store
 
     async def scan_runs(self) -> list[str]:
         """Scan runs directory for database files.
@@ -213,7 +228,9 @@ class RunManager:
                 **driver_kwargs,
             )
 
-            driver.archive_handler = UuidAsyncArchiveHandler(storage_dir)
+            driver.archive_handler = UuidAsyncArchiveHandler(
+                storage_dir, store=await self.get_archive_store()
+            )
 
             run_info = RunInfo(
                 run_id=run_id,
@@ -294,7 +311,9 @@ class RunManager:
                 **driver_kwargs,
             )
 
-            driver.archive_handler = UuidAsyncArchiveHandler(storage_dir)
+            driver.archive_handler = UuidAsyncArchiveHandler(
+                storage_dir, store=await self.get_archive_store()
+            )
 
             run_info.driver = driver
             run_info.status = "loaded"
@@ -314,6 +333,11 @@ class RunManager:
         Raises:
             ValueError: If run not loaded or already running.
         """
+        from kent.driver.persistent_driver.web.websocket import (
+            ProgressBus,
+            create_progress_callback,
+        )
+
         async with self._lock:
             if run_id not in self.runs:
                 raise ValueError(f"Run '{run_id}' not found")
@@ -324,9 +348,15 @@ class RunManager:
             if run_info.task is not None and not run_info.task.done():
                 raise ValueError(f"Run '{run_id}' is already running")
 
+            # Progress reaches WebSocket clients through a bus, so slow
+            # clients never hold up the workers.
+            progress = ProgressBus(create_progress_callback(run_id))
+            run_info.driver.on_progress = progress.publish
+
             # Create task to run the driver
             async def run_driver() -> None:
                 assert run_info.driver is not None
+                progress.start()
                 try:
                     # Don't set up signal handlers - FastAPI manages those
                     await run_info.driver.run(setup_signal_handlers=False)
@@ -335,6 +365,7 @@ class RunManager:
                 except Exception as e:
                     logger.exception(f"Run '{run_id}' failed: {e}")
                 finally:
+                    await progress.close()
                     async with self._lock:
                         run_info.status = "stopped"
 
@@ -747,6 +778,7 @@ async def get_debugger_for_run(
         sql_manager,
         sql_manager._session_factory,
         read_only=effective_read_only,
+        db_path=run_info.db_path if run_info is not None else None,
     )
 
 
@@ -806,6 +838,7 @@ def create_app(
         compression_router,
         debug_router,
         errors_router,
+        metrics_router,
         rate_limiter_router,
         requests_router,
         responses_router,
@@ -845,6 +878,7 @@ def create_app(
     app.include_router(debug_router)
     app.include_router(archived_files_router)
     app.include_router(rate_limiter_router)
+    app.include_router(metrics_router)
     app.include_router(websocket_router)
 
     # Include view routers (HTML pages) - must be last to avoid route conflicts
@@ -2,15 +2,22 @@
 
 Provides UuidAsyncArchiveHandler which saves downloaded files using
 SHA-256 content-hash filenames while preserving the original file extension.
+Runs started from the web interface share an
+:class:`~kent.driver.archive_store.ArchiveStore` under the runs directory,
+so a file archived by one run is linked into later runs instead of being
+downloaded again.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 from pathlib import Path
 from urllib.parse import urlparse
 
 from kent.data_types import ArchiveDecision
+from kent.driver.archive_handler import alink_from_store
+from kent.driver.archive_store import ArchiveStore
 
 
 def get_storage_dir_for_run(runs_dir: Path, run_id: str) -> Path:
@@ -18,15 +25,27 @@ def get_storage_dir_for_run(runs_dir: Path, run_id: str) -> Path:
     return runs_dir / run_id / "files"
 
 
+def get_archive_store_dir(runs_dir: Path) -> Path:
+    """Get the archive store shared by every run in ``runs_dir``.
+
+    Dot-prefixed so it cannot collide with a run's directory.
+    """
+    return runs_dir / ".archive_store"
+
+
 class UuidAsyncArchiveHandler:
     """Archive handler using SHA-256 content-hash filenames.
 
-    Used by the persistent driver web interface. Always downloads
-    (no skip logic), and names files by their content hash.
+    Used by the persistent driver web interface. Names files by their
+    content hash. Without a ``store`` it always downloads; with one, keys
+    the store already holds are linked into ``storage_dir`` instead.
     """
 
-    def __init__(self, storage_dir: Path) -> None:
+    def __init__(
+        self, storage_dir: Path, *, store: ArchiveStore | None = None
+    ) -> None:
         self.storage_dir = storage_dir
+        self.store = store
 
     async def should_download(
         self,
@@ -35,6 +54,10 @@ class UuidAsyncArchiveHandler:
         expected_type: str | None,
         hash_header_value: str | None,
     ) -> ArchiveDecision:
+        if self.store is not None and deduplication_key:
+            return await alink_from_store(
+                self.store, self.storage_dir, deduplication_key
+            )
         return ArchiveDecision(download=True)
 
     async def save(
@@ -78,4 +101,9 @@ class UuidAsyncArchiveHandler:
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         file_path.write_bytes(content)
 
+        if self.store is not None and deduplication_key:
+            await asyncio.to_thread(
+                self.store.add, deduplication_key, file_path, content_hash
+            )
+
         return str(file_path)
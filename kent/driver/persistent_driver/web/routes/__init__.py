@@ -11,6 +11,7 @@ This package contains all API route modules:
 - debug: Response diagnosis with XPath observation
 - archived_files: Archived file metadata and content
 - rate_limiter: Rate limiter state monitoring
+- metrics: Metrics scrape endpoint for loaded runs
 - websocket: Real-time progress events via WebSocket
 """
 
@@ -26,6 +27,9 @@ from kent.driver.persistent_driver.web.routes.debug import (
 from kent.driver.persistent_driver.web.routes.errors import (
     router as errors_router,
 )
+from kent.driver.persistent_driver.web.routes.metrics import (
+    router as metrics_router,
+)
 from kent.driver.persistent_driver.web.routes.rate_limiter import (
     router as rate_limiter_router,
 )
@@ -56,6 +60,7 @@ __all__ = [
     "compression_router",
     "debug_router",
     "errors_router",
+    "metrics_router",
     "rate_limiter_router",
     "requests_router",
     "responses_router",
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+from collections.abc import Awaitable
+from typing import TypeVar
+
 from fastapi import HTTPException, status
 
 from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.sql_manager import Page
 from kent.driver.persistent_driver.web.app import (
     RunManager,
     get_debugger_for_run,
 )
 
+T = TypeVar("T")
+
 
 def convert_run_error(e: ValueError) -> HTTPException:
     """Convert a run-manager ValueError into an appropriate HTTPException.
@@ -39,3 +45,18 @@ async def get_debugger(
         return await get_debugger_for_run(run_id, manager, read_only=read_only)
     except ValueError as e:
         raise convert_run_error(e) from e
+
+
+async def list_page(listing: Awaitable[Page[T]]) -> Page[T]:
+    """Await a listing call, turning an invalid cursor into a 400.
+
+    Raises:
+        HTTPException: 400 if the cursor does not belong to the listing.
+    """
+    try:
+        return await listing
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
@@ -10,7 +10,7 @@ This module provides endpoints for:
 
 from __future__ import annotations
 
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
@@ -19,7 +19,10 @@ from kent.driver.persistent_driver.web.app import (
     RunManager,
     get_run_manager,
 )
-from kent.driver.persistent_driver.web.routes._helpers import get_debugger
+from kent.driver.persistent_driver.web.routes._helpers import (
+    get_debugger,
+    list_page,
+)
 
 router = APIRouter(prefix="/api/runs/{run_id}/errors", tags=["errors"])
 
@@ -57,10 +60,11 @@ class ErrorListResponse(BaseModel):
     """Response model for listing errors."""
 
     items: list[ErrorResponse]
-    total: int
+    total: int | None
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 class ResolveRequest(BaseModel):
@@ -231,6 +235,12 @@ async def list_errors(
     ),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     limit: int = Query(50, ge=1, le=500, description="Pagination limit"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page"
+    ),
+    total: Literal["exact", "approximate", "none"] = Query(
+        "exact", description="Total to compute: exact, approximate, none"
+    ),
 ) -> ErrorListResponse:
     """List errors for a run with optional filters.
 
@@ -240,6 +250,9 @@ async def list_errors(
         unresolved_only: If True, only show unresolved errors.
         offset: Pagination offset.
         limit: Maximum number of results.
+        cursor: Opaque cursor from the previous page's ``next_cursor``.
+        total: How to compute ``total``; "approximate" reads the
+            maintained counters and may leave it null.
 
     Returns:
         Paginated list of errors.
@@ -247,11 +260,15 @@ async def list_errors(
     debugger = await get_debugger(run_id, manager, read_only=True)
 
     # Use LDDD's list_errors method
-    page = await debugger.list_errors(
-        error_type=error_type,
-        is_resolved=False if unresolved_only else None,
-        limit=limit,
-        offset=offset,
+    page = await list_page(
+        debugger.list_errors(
+            error_type=error_type,
+            is_resolved=False if unresolved_only else None,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            total=total,
+        )
     )
 
     # Convert dict items to ErrorResponse
@@ -263,6 +280,7 @@ async def list_errors(
         offset=page.offset,
         limit=page.limit,
         has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -0,0 +1,49 @@
+"""Metrics scrape endpoint.
+
+Serves the in-process metrics of every loaded run (see
+:mod:`kent.driver.persistent_driver.metrics`) in the Prometheus text
+exposition format, each sample labeled with its ``run``.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from kent.driver.persistent_driver.metrics import (
+    MetricsRegistry,
+    render_runs,
+)
+from kent.driver.persistent_driver.web.app import (
+    RunManager,
+    get_run_manager,
+)
+
+router = APIRouter(tags=["metrics"])
+
+EXPOSITION_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(
+    manager: Annotated[RunManager, Depends(get_run_manager)],
+) -> PlainTextResponse:
+    """Get the metrics of all loaded runs.
+
+    Runs that are not loaded have no live metrics; ``pdd metrics``
+    rebuilds what their database can tell.
+
+    Returns:
+        The metrics in the Prometheus text exposition format.
+    """
+    registries: dict[str, MetricsRegistry] = {}
+    for run_info in await manager.list_runs():
+        if run_info.driver is not None:
+            registries[
+                run_info.run_id
+            ] = await run_info.driver.collect_metrics()
+    return PlainTextResponse(
+        render_runs(registries), media_type=EXPOSITION_CONTENT_TYPE
+    )
@@ -142,13 +142,14 @@ async def get_throughput_stats(
     from sqlmodel import select
 
     from kent.driver.persistent_driver.models import Request as RequestModel
+    from kent.driver.persistent_driver.models import RequestCount
 
     async with debugger._session_factory() as session:
         # Get active workers (in_progress requests)
         result = await session.execute(
-            select(sa.func.count())
-            .select_from(RequestModel)
-            .where(RequestModel.status == "in_progress")
+            select(sa.func.coalesce(sa.func.sum(RequestCount.count), 0)).where(
+                RequestCount.status == "in_progress"
+            )
         )
         active_workers = result.scalar_one()
 
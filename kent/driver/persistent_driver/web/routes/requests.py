@@ -19,7 +19,10 @@ from kent.driver.persistent_driver.web.app import (
     RunManager,
     get_run_manager,
 )
-from kent.driver.persistent_driver.web.routes._helpers import get_debugger
+from kent.driver.persistent_driver.web.routes._helpers import (
+    get_debugger,
+    list_page,
+)
 
 router = APIRouter(prefix="/api/runs/{run_id}/requests", tags=["requests"])
 
@@ -47,10 +50,11 @@ class RequestListResponse(BaseModel):
     """Response model for listing requests."""
 
     items: list[RequestResponse]
-    total: int
+    total: int | None
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 class CancelResponse(BaseModel):
@@ -99,6 +103,12 @@ async def list_requests(
     ),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     limit: int = Query(50, ge=1, le=500, description="Pagination limit"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page"
+    ),
+    total: Literal["exact", "approximate", "none"] = Query(
+        "exact", description="Total to compute: exact, approximate, none"
+    ),
     sort: Literal["queue", "id_asc", "id_desc"] = Query(
         "queue", description="Sort order: queue (priority), id_asc, id_desc"
     ),
@@ -111,6 +121,9 @@ async def list_requests(
         continuation: Optional continuation name filter.
         offset: Pagination offset.
         limit: Maximum number of results.
+        cursor: Opaque cursor from the previous page's ``next_cursor``.
+        total: How to compute ``total``; "approximate" reads the
+            maintained counters and may leave it null.
 
     Returns:
         Paginated list of requests.
@@ -118,12 +131,16 @@ async def list_requests(
     debugger = await get_debugger(run_id, manager, read_only=True)
 
     # Use LDDD's list_requests method
-    page = await debugger.list_requests(
-        status=status_filter,
-        continuation=continuation,
-        offset=offset,
-        limit=limit,
-        sort=sort,
+    page = await list_page(
+        debugger.list_requests(
+            status=status_filter,
+            continuation=continuation,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            total=total,
+            sort=sort,
+        )
     )
 
     items = [
@@ -152,6 +169,7 @@ async def list_requests(
         offset=page.offset,
         limit=page.limit,
         has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
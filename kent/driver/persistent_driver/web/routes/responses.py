@@ -2,6 +2,7 @@
 
 This module provides endpoints for:
 - Listing responses with filters
+- Searching response content (text, regex, XPath)
 - Getting response details
 - Getting decompressed response content
 - Analyzing response output (continuation re-execution with XPath observation)
@@ -11,11 +12,13 @@ This module provides endpoints for:
 from __future__ import annotations
 
 import json
-from typing import Annotated, Any
+import re
+from typing import Annotated, Any, Literal
 
 import sqlalchemy as sa
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import RedirectResponse
+from lxml import etree
 from pydantic import BaseModel
 from sqlmodel import select
 
@@ -23,7 +26,10 @@ from kent.driver.persistent_driver.web.app import (
     RunManager,
     get_run_manager,
 )
-from kent.driver.persistent_driver.web.routes._helpers import get_debugger
+from kent.driver.persistent_driver.web.routes._helpers import (
+    get_debugger,
+    list_page,
+)
 
 router = APIRouter(prefix="/api/runs/{run_id}/responses", tags=["responses"])
 
@@ -49,10 +55,19 @@ class ResponseListResponse(BaseModel):
     """Response model for listing responses."""
 
     items: list[ResponseResponse]
-    total: int
+    total: int | None
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
+
+
+class ResponseSearchResponse(BaseModel):
+    """Response model for response content search."""
+
+    items: list[dict[str, int]]
+    limit: int
+    has_more: bool
 
 
 class SpeculationSummaryResponse(BaseModel):
@@ -169,6 +184,12 @@ async def list_responses(
     ),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     limit: int = Query(50, ge=1, le=500, description="Pagination limit"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page"
+    ),
+    total: Literal["exact", "approximate", "none"] = Query(
+        "exact", description="Total to compute: exact, approximate, none"
+    ),
 ) -> ResponseListResponse:
     """List responses for a run with optional filters.
 
@@ -179,18 +200,25 @@ async def list_responses(
         speculation_outcome: Optional speculation outcome filter.
         offset: Pagination offset.
         limit: Maximum number of results.
+        cursor: Opaque cursor from the previous page's ``next_cursor``.
+        total: How to compute ``total``; "approximate" reads the
+            maintained counters and may leave it null.
 
     Returns:
         Paginated list of responses.
     """
     debugger = await get_debugger(run_id, manager, read_only=True)
 
-    page = await debugger.sql.list_responses(
-        continuation=continuation,
-        request_id=request_id,
-        speculation_outcome=speculation_outcome,
-        offset=offset,
-        limit=limit,
+    page = await list_page(
+        debugger.sql.list_responses(
+            continuation=continuation,
+            request_id=request_id,
+            speculation_outcome=speculation_outcome,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            total=total,
+        )
     )
 
     items = [
@@ -215,6 +243,90 @@ async def list_responses(
         offset=page.offset,
         limit=page.limit,
         has_more=page.has_more,
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/search", response_model=ResponseSearchResponse)
+async def search_responses(
+    run_id: str,
+    manager: Annotated[RunManager, Depends(get_run_manager)],
+    text: str | None = Query(None, description="Case-insensitive text"),
+    regex: str | None = Query(None, description="Regular expression"),
+    xpath: str | None = Query(None, description="XPath expression"),
+    continuation: str | None = Query(
+        None, description="Filter by continuation"
+    ),
+    status_code: int | None = Query(
+        None, description="Filter by HTTP status code"
+    ),
+    min_size: int | None = Query(
+        None, ge=0, description="Minimum uncompressed size"
+    ),
+    max_size: int | None = Query(
+        None, ge=0, description="Maximum uncompressed size"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum matches"),
+    use_index: bool = Query(
+        False,
+        description="Answer the text search from the text index, "
+        "matching page text rather than the raw body",
+    ),
+) -> ResponseSearchResponse:
+    """Search response content for a text, regex or XPath match.
+
+    Exactly one of ``text``, ``regex`` or ``xpath`` is required. Uses
+    the same streaming engine as ``pdd responses search``: filters run
+    in SQL and the search stops once ``limit`` matches are found. With
+    ``use_index``, a text search is answered from the run's text index.
+
+    Args:
+        run_id: The run identifier.
+        text: Plain text to search for (case-insensitive).
+        regex: Regular expression pattern to search for.
+        xpath: XPath expression to evaluate.
+        continuation: Optional continuation name filter.
+        status_code: Optional HTTP status code filter.
+        min_size: Optional minimum uncompressed response size.
+        max_size: Optional maximum uncompressed response size.
+        limit: Maximum number of matches.
+        use_index: Answer a text search from the text index.
+
+    Returns:
+        Matching request ids in id order.
+
+    Raises:
+        HTTPException: 400 if the pattern is missing, ambiguous or
+            invalid.
+    """
+    debugger = await get_debugger(run_id, manager, read_only=True)
+
+    try:
+        # One extra match tells us whether more exist. Match in a thread:
+        # a process pool per HTTP request would fork one worker per CPU
+        # for every search.
+        matches = await debugger.search_responses(
+            text=text,
+            regex=regex,
+            xpath=xpath,
+            continuation=continuation,
+            status_code=status_code,
+            min_size=min_size,
+            max_size=max_size,
+            limit=limit + 1,
+            processes=0,
+            use_index=use_index,
+        )
+    except (ValueError, re.error, etree.XPathSyntaxError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid search: {e}",
+        ) from e
+
+    return ResponseSearchResponse(
+        items=matches[:limit],
+        limit=limit,
+        has_more=len(matches) > limit,
     )
 
 
@@ -10,20 +10,23 @@ This module provides endpoints for:
 from __future__ import annotations
 
 import json
-from collections.abc import AsyncGenerator
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
-import sqlalchemy as sa
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlmodel import select
 
+from kent.driver.persistent_driver.results_export import (
+    COMPRESSION_SUFFIXES,
+)
 from kent.driver.persistent_driver.web.app import (
     RunManager,
     get_run_manager,
 )
-from kent.driver.persistent_driver.web.routes._helpers import get_debugger
+from kent.driver.persistent_driver.web.routes._helpers import (
+    get_debugger,
+    list_page,
+)
 
 router = APIRouter(prefix="/api/runs/{run_id}/results", tags=["results"])
 
@@ -49,10 +52,11 @@ class ResultListResponse(BaseModel):
     """Response model for listing results."""
 
     items: list[ResultResponse]
-    total: int
+    total: int | None
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 class ResultTypeSummaryItem(BaseModel):
@@ -84,6 +88,12 @@ async def list_results(
     request_id: int | None = Query(None, description="Filter by request ID"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     limit: int = Query(50, ge=1, le=500, description="Pagination limit"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page"
+    ),
+    total: Literal["exact", "approximate", "none"] = Query(
+        "exact", description="Total to compute: exact, approximate, none"
+    ),
 ) -> ResultListResponse:
     """List results for a run with optional filters.
 
@@ -94,6 +104,9 @@ async def list_results(
         request_id: Optional request ID filter.
         offset: Pagination offset.
         limit: Maximum number of results.
+        cursor: Opaque cursor from the previous page's ``next_cursor``.
+        total: How to compute ``total``; "approximate" reads the
+            maintained counters and may leave it null.
 
     Returns:
         Paginated list of results.
@@ -103,19 +116,27 @@ async def list_results(
     # LDDD only supports result_type and is_valid filters, not request_id
     # Fall back to SQL for request_id filtering
     if request_id is not None:
-        page = await debugger.sql.list_results(
-            result_type=result_type,
-            is_valid=is_valid,
-            request_id=request_id,
-            offset=offset,
-            limit=limit,
+        page = await list_page(
+            debugger.sql.list_results(
+                result_type=result_type,
+                is_valid=is_valid,
+                request_id=request_id,
+                offset=offset,
+                limit=limit,
+                cursor=cursor,
+                total=total,
+            )
         )
     else:
-        page = await debugger.list_results(
-            result_type=result_type,
-            is_valid=is_valid,
-            offset=offset,
-            limit=limit,
+        page = await list_page(
+            debugger.list_results(
+                result_type=result_type,
+                is_valid=is_valid,
+                offset=offset,
+                limit=limit,
+                cursor=cursor,
+                total=total,
+            )
         )
 
     items = [
@@ -135,6 +156,7 @@ async def list_results(
         offset=page.offset,
         limit=page.limit,
         has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -155,19 +177,11 @@ async def get_result_type_summary(
     Returns:
         Dictionary mapping result types to their counts.
     """
-    from kent.driver.persistent_driver.models import Result
-
     debugger = await get_debugger(run_id, manager)
-
-    async with debugger._session_factory() as session:
-        result = await session.execute(
-            select(Result.result_type, sa.func.count())
-            .group_by(Result.result_type)
-            .order_by(sa.func.count().desc())
-        )
-        rows = result.all()
-
-    return {r[0]: r[1] for r in rows}
+    summary = await debugger.get_result_summary()
+    return {
+        result_type: counts["total"] for result_type, counts in summary.items()
+    }
 
 
 @router.get("/summary", response_model=ResultsSummaryResponse)
@@ -224,79 +238,27 @@ async def export_results_jsonl(
     is_valid: bool | None = Query(
         None, description="Filter by validation status"
     ),
+    compression: Literal["gzip", "zstd"] | None = Query(
+        None, description="Compress the download with gzip or zstd"
+    ),
 ) -> StreamingResponse:
     """Export results as JSONL (newline-delimited JSON) for bulk download.
 
     Each line is a valid JSON object containing result data. This format
     is efficient for large datasets and can be processed line-by-line.
+    Results stream from the database in chunks, optionally compressed.
 
     Args:
         run_id: The run identifier.
         result_type: Optional filter by result type.
         is_valid: Optional filter by validation status.
+        compression: Optional ``gzip`` or ``zstd`` compression.
 
     Returns:
         Streaming JSONL response with Content-Disposition for download.
     """
-    from kent.driver.persistent_driver.models import Result as ResultModel
-
     debugger = await get_debugger(run_id, manager)
 
-    # Build query
-    stmt = select(
-        ResultModel.id,
-        ResultModel.request_id,
-        ResultModel.result_type,
-        ResultModel.data_json,
-        ResultModel.is_valid,
-        ResultModel.validation_errors_json,
-        ResultModel.created_at,
-    ).order_by(ResultModel.created_at.asc())  # type: ignore[union-attr]
-
-    if result_type:
-        stmt = stmt.where(ResultModel.result_type == result_type)
-    if is_valid is not None:
-        stmt = stmt.where(ResultModel.is_valid == is_valid)
-
-    async def generate_jsonl() -> AsyncGenerator[bytes, None]:
-        """Stream results as JSONL."""
-        async with debugger._session_factory() as session:
-            result = await session.execute(stmt)
-            for row in result.all():
-                (
-                    result_id,
-                    request_id_val,
-                    rtype,
-                    data_json,
-                    valid,
-                    errors_json,
-                    created_at,
-                ) = row
-
-                # Parse JSON fields
-                try:
-                    data = json.loads(data_json) if data_json else {}
-                except json.JSONDecodeError:
-                    data = {}
-
-                validation_errors = None
-                if errors_json:
-                    try:
-                        validation_errors = json.loads(errors_json)
-                    except json.JSONDecodeError:
-                        pass
-
-                record = {
-                    "id": result_id,
-                    "request_id": request_id_val,
-                    "result_type": rtype,
-                    "is_valid": bool(valid),
-                    "data": data,
-                    "validation_errors": validation_errors,
-                    "created_at": created_at,
-                }
-                yield (json.dumps(record) + "\n").encode("utf-8")
-
     # Build filename with optional filters
     filename_parts = [run_id, "results"]
     if result_type:
@@ -304,10 +266,18 @@ async def export_results_jsonl(
     if is_valid is not None:
         filename_parts.append("valid" if is_valid else "invalid")
     filename = "-".join(filename_parts) + ".jsonl"
+    media_type = "application/x-ndjson"
+    if compression is not None:
+        filename += COMPRESSION_SUFFIXES[compression]
+        media_type = f"application/{compression}"
 
     return StreamingResponse(
-        generate_jsonl(),
-        media_type="application/x-ndjson",
+        debugger.iter_results_jsonl(
+            result_type=result_type,
+            is_valid=is_valid,
+            compression=compression,
+        ),
+        media_type=media_type,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
         },
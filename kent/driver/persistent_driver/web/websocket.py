@@ -4,6 +4,11 @@ This module provides WebSocket functionality for:
 - Real-time progress updates from running scrapers
 - Subscription management with selective event filtering
 - Connection lifecycle handling
+
+Delivery never holds up the driver. A run's events go through a
+:class:`ProgressBus`, which counts per-request events and sends them on
+as periodic ``progress_delta`` batches, and each connection has its own
+bounded send queue, so one slow browser tab only loses its own messages.
 """
 
 from __future__ import annotations
@@ -11,15 +16,17 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from collections import Counter
+from datetime import datetime, timezone
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from kent.driver.persistent_driver.persistent_driver import ProgressEvent
+
 if TYPE_CHECKING:
-    from kent.driver.persistent_driver.persistent_driver import (
-        ProgressEvent,
-    )
+    from collections.abc import Awaitable, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +47,212 @@ class ProgressEventType(str, Enum):
     STATS_UPDATED = "stats_updated"
 
 
+# Per-request events, which ProgressBus counts rather than forwards.
+COALESCED_EVENTS = frozenset(
+    {
+        "request_enqueued",
+        "request_started",
+        "request_completed",
+        "request_failed",
+        "request_skipped",
+        "request_retry_scheduled",
+        "request_cancelled",
+        "result_stored",
+        "error_stored",
+    }
+)
+
+# Events that end a request, after which its continuation is forgotten.
+_FINAL_EVENTS = frozenset(
+    {
+        "request_completed",
+        "request_failed",
+        "request_skipped",
+        "request_cancelled",
+    }
+)
+
+
+class ProgressBus:
+    """Bounded, coalescing hand-off from a driver to a progress sink.
+
+    :meth:`publish` is meant to be a driver's ``on_progress``. It never
+    awaits the sink, so a slow consumer cannot hold up the workers.
+    Per-request events (:data:`COALESCED_EVENTS`) are only counted, by
+    type and by continuation, and go out as one ``progress_delta`` event
+    every ``interval`` seconds. A fan-out of 1,000 children is one count
+    in one message. Other events (run lifecycle, worker scaling) are
+    queued as they are. When the queue is full they are dropped, and
+    the next delta reports how many were lost.
+
+    Args:
+        sink: Async callback that receives the events, e.g. from
+            :func:`create_progress_callback`.
+        interval: Seconds between deliveries.
+        maxsize: Events held between deliveries.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[ProgressEvent], Awaitable[None]],
+        *,
+        interval: float = 0.5,
+        maxsize: int = 256,
+    ) -> None:
+        self._sink = sink
+        self.interval = interval
+        self._queue: asyncio.Queue[ProgressEvent] = asyncio.Queue(maxsize)
+        self._counts: Counter[str] = Counter()
+        self._by_continuation: dict[str, Counter[str]] = {}
+        # request_id -> continuation, for events that only carry the id
+        self._in_flight: dict[Any, str] = {}
+        self._dropped = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def publish(self, event: ProgressEvent) -> None:
+        """Accept an event without waiting for its delivery."""
+        if event.event_type in COALESCED_EVENTS:
+            self._count(event)
+        else:
+            # Counts so far go out ahead of the event, keeping order.
+            self._seal()
+            self._put(event)
+
+    def start(self) -> None:
+        """Start delivering every ``interval`` seconds."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the periodic delivery and deliver what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Deliver the queued events and the pending counts now."""
+        await self._drain()
+        self._seal()
+        await self._drain()
+
+    def _count(self, event: ProgressEvent) -> None:
+        continuation = event.data.get("continuation")
+        request_id = event.data.get("request_id")
+        if continuation is not None:
+            continuation = str(continuation)
+            if event.event_type == "request_started":
+                self._in_flight[request_id] = continuation
+        elif request_id is not None:
+            if event.event_type in _FINAL_EVENTS:
+                continuation = self._in_flight.pop(request_id, None)
+            else:
+                continuation = self._in_flight.get(request_id)
+
+        self._counts[event.event_type] += 1
+        if continuation is not None:
+            self._by_continuation.setdefault(continuation, Counter())[
+                event.event_type
+            ] += 1
+
+    def _seal(self) -> None:
+        """Queue the pending counts as one ``progress_delta`` event."""
+        if not (self._counts or self._dropped) or self._queue.full():
+            # Nothing to report, or no room: keep counting until there is.
+            return
+        self._queue.put_nowait(
+            ProgressEvent(
+                event_type="progress_delta",
+                timestamp=datetime.now(timezone.utc),
+                data={
+                    "counts": dict(self._counts),
+                    "by_continuation": {
+                        name: dict(counts)
+                        for name, counts in self._by_continuation.items()
+                    },
+                    "dropped": self._dropped,
+                },
+            )
+        )
+        self._counts = Counter()
+        self._by_continuation = {}
+        self._dropped = 0
+
+    def _put(self, event: ProgressEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    async def _drain(self) -> None:
+        while not self._queue.empty():
+            event = self._queue.get_nowait()
+            try:
+                await self._sink(event)
+            except Exception as e:
+                logger.warning(f"Failed to deliver progress event: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+
+class _SendQueue:
+    """A connection's bounded outgoing queue and the task draining it.
+
+    When the client reads too slowly to keep up, new messages are
+    dropped. The client receives an ``events_dropped`` notice with the
+    count ahead of its next message.
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.writer = asyncio.create_task(self._write())
+
+    def offer(self, message: str) -> None:
+        """Queue ``message``, or count it as dropped if there is no room."""
+        if self.writer.done():
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _write(self) -> None:
+        while True:
+            message = await self.queue.get()
+            try:
+                if self.dropped:
+                    notice = json.dumps(
+                        {
+                            "event_type": "events_dropped",
+                            "timestamp": datetime.now(
+                                timezone.utc
+                            ).isoformat(),
+                            "data": {"count": self.dropped},
+                        }
+                    )
+                    self.dropped = 0
+                    await self.websocket.send_text(notice)
+                await self.websocket.send_text(message)
+            except Exception as e:
+                logger.warning(f"Failed to send to WebSocket: {e}")
+                # Stop writing; the disconnect handler cleans up.
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                return
+            finally:
+                self.queue.task_done()
+
+
 class WebSocketManager:
     """Manager for WebSocket connections and event broadcasting.
 
@@ -47,14 +260,20 @@ class WebSocketManager:
     - Connection lifecycle (connect, disconnect)
     - Event subscriptions per connection
     - Broadcasting events to appropriate subscribers
+
+    Broadcasting only queues messages. Each connection has a send queue
+    of ``queue_size`` messages drained by its own task.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, queue_size: int = 256) -> None:
         """Initialize the WebSocket manager."""
+        self.queue_size = queue_size
         # Map of run_id -> set of connections
         self._connections: dict[str, set[WebSocket]] = {}
         # Map of websocket -> set of event types subscribed to
         self._subscriptions: dict[WebSocket, set[ProgressEventType]] = {}
+        # Map of websocket -> its outgoing queue
+        self._send_queues: dict[WebSocket, _SendQueue] = {}
         self._lock = asyncio.Lock()
 
     async def connect(
@@ -82,6 +301,9 @@ class WebSocketManager:
             if event_types is None:
                 event_types = set(ProgressEventType)
             self._subscriptions[websocket] = event_types
+            self._send_queues[websocket] = _SendQueue(
+                websocket, self.queue_size
+            )
 
         logger.info(
             f"WebSocket connected for run '{run_id}' with {len(event_types)} event types"
@@ -100,6 +322,10 @@ class WebSocketManager:
                 if not self._connections[run_id]:
                     del self._connections[run_id]
             self._subscriptions.pop(websocket, None)
+            send_queue = self._send_queues.pop(websocket, None)
+
+        if send_queue is not None:
+            send_queue.writer.cancel()
 
         logger.info(f"WebSocket disconnected from run '{run_id}'")
 
@@ -119,7 +345,10 @@ class WebSocketManager:
                 self._subscriptions[websocket] = event_types
 
     async def broadcast(self, run_id: str, event: ProgressEvent) -> None:
-        """Broadcast a progress event to all subscribed connections.
+        """Queue a progress event for all subscribed connections.
+
+        Returns without waiting for any client. A ``progress_delta`` is
+        narrowed to the event types each connection subscribes to.
 
         Args:
             run_id: The run that generated the event.
@@ -140,16 +369,36 @@ class WebSocketManager:
         message = event.to_json()
 
         for websocket in connections:
+            send_queue = self._send_queues.get(websocket)
+            if send_queue is None:
+                continue
             # Check if this connection wants this event type
             subscribed_types = self._subscriptions.get(websocket, set())
+            if event.event_type == "progress_delta":
+                delta = _narrow_delta(event, subscribed_types)
+                if delta is not None:
+                    send_queue.offer(delta)
+                continue
             if event_type is not None and event_type not in subscribed_types:
                 continue
 
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket: {e}")
-                # Don't remove here - let the disconnect handler clean up
+            send_queue.offer(message)
+
+    async def drain(self, run_id: str) -> None:
+        """Wait until the messages queued for ``run_id`` have been sent.
+
+        Args:
+            run_id: The run whose connections to wait for.
+        """
+        async with self._lock:
+            send_queues = [
+                self._send_queues[websocket]
+                for websocket in self._connections.get(run_id, set())
+                if websocket in self._send_queues
+            ]
+        for send_queue in send_queues:
+            if not send_queue.writer.done():
+                await send_queue.queue.join()
 
     async def broadcast_to_all(self, event: ProgressEvent) -> None:
         """Broadcast an event to all connected clients.
@@ -183,6 +432,48 @@ class WebSocketManager:
         return sum(len(conns) for conns in self._connections.values())
 
 
+def _narrow_delta(
+    event: ProgressEvent, event_types: set[ProgressEventType]
+) -> str | None:
+    """Serialize a ``progress_delta`` with only the subscribed counts.
+
+    Returns:
+        The JSON message, or None if nothing subscribed is left.
+    """
+    # Types outside ProgressEventType go to everyone, as in broadcast().
+    filtered = {event_type.value for event_type in ProgressEventType}
+    filtered -= {event_type.value for event_type in event_types}
+    counts = {
+        name: count
+        for name, count in event.data["counts"].items()
+        if name not in filtered
+    }
+    if not counts and not event.data["dropped"]:
+        return None
+    by_continuation = {
+        continuation: narrowed
+        for continuation, type_counts in event.data["by_continuation"].items()
+        if (
+            narrowed := {
+                name: count
+                for name, count in type_counts.items()
+                if name in counts
+            }
+        )
+    }
+    return json.dumps(
+        {
+            "event_type": event.event_type,
+            "timestamp": event.timestamp.isoformat(),
+            "data": {
+                "counts": counts,
+                "by_continuation": by_continuation,
+                "dropped": event.data["dropped"],
+            },
+        }
+    )
+
+
 # Global WebSocket manager
 ws_manager = WebSocketManager()
 
@@ -203,7 +494,8 @@ def create_progress_callback(run_id: str) -> Any:
         run_id: The run identifier.
 
     Returns:
-        Async callback function for driver's on_progress.
+        Async callback that queues each event for the run's connections.
+        Wrap it in a :class:`ProgressBus` to coalesce a driver's events.
     """
 
     async def callback(event: ProgressEvent) -> None:
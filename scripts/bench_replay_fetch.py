@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""Benchmark LocalOnlyDriver response fetches at increasing concurrency.
+
+Generates a synthetic source DB of dictionary-compressed HTML pages and
+fetches every page with 1, 2, 4, ... concurrent tasks, the way replay
+workers do. Compares the previous fetch path, which serialized reads of
+a source DB behind one lock on a shared connection and rebuilt the zstd
+dictionary for every response, with :class:`SourceIndex` reading through
+per-thread connections on its own pool, with and without prefetching.
+
+Scaling is bounded by the cores available (``os.cpu_count()``).
+
+Usage:
+    uv run python scripts/bench_replay_fetch.py
+    uv run python scripts/bench_replay_fetch.py --pages 50000 --max-tasks 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import zstandard as zstd
+
+from kent.driver.local_only_driver.source_index import IndexEntry, SourceIndex
+from kent.driver.persistent_driver.compression import decompress
+
+_SCHEMA = """
+CREATE TABLE requests (
+    id INTEGER PRIMARY KEY,
+    deduplication_key TEXT,
+    response_status_code INTEGER,
+    response_headers_json TEXT,
+    response_url TEXT,
+    content_compressed BLOB,
+    compression_dict_id INTEGER,
+    request_type TEXT,
+    url TEXT,
+    body BLOB,
+    completed_at_ns INTEGER,
+    created_at_ns INTEGER
+);
+CREATE TABLE errors (
+    id INTEGER PRIMARY KEY,
+    request_id INTEGER,
+    error_type TEXT,
+    is_resolved BOOLEAN DEFAULT 0
+);
+CREATE TABLE compression_dicts (
+    id INTEGER PRIMARY KEY,
+    dictionary_data BLOB
+);
+"""
+
+_WORDS = [
+    "court",
+    "docket",
+    "opinion",
+    "appellant",
+    "appellee",
+    "filed",
+    "order",
+    "motion",
+    "judgment",
+    "district",
+    "circuit",
+    "hearing",
+    "brief",
+    "exhibit",
+    "counsel",
+    "plaintiff",
+    "defendant",
+]
+
+
+def _page(rng: random.Random, size: int) -> bytes:
+    rows = []
+    while sum(map(len, rows)) < size:
+        cells = "".join(
+            f"<td>{' '.join(rng.choices(_WORDS, k=6))} {rng.randrange(10**6)}"
+            "</td>"
+            for _ in range(4)
+        )
+        rows.append(f"<tr>{cells}</tr>\n")
+    return f"<html><body><table>{''.join(rows)}</table></body></html>".encode()
+
+
+def _make_source(path: Path, pages: int, page_size: int) -> None:
+    rng = random.Random(0)
+    samples = [_page(rng, page_size) for _ in range(200)]
+    dictionary = zstd.train_dictionary(112_640, samples)
+    compressor = zstd.ZstdCompressor(level=3, dict_data=dictionary)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    conn.execute(
+        "INSERT INTO compression_dicts (id, dictionary_data) VALUES (1, ?)",
+        (dictionary.as_bytes(),),
+    )
+    headers = json.dumps({"content-type": "text/html; charset=utf-8"})
+    conn.executemany(
+        "INSERT INTO requests (deduplication_key, response_status_code, "
+        "response_headers_json, content_compressed, compression_dict_id, "
+        "request_type, url, completed_at_ns, created_at_ns) "
+        "VALUES (?, 200, ?, ?, 1, 'navigating', ?, 0, 0)",
+        (
+            (
+                f"page-{i}",
+                headers,
+                compressor.compress(_page(rng, page_size)),
+                f"https://example.com/{i}",
+            )
+            for i in range(pages)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+class _LegacyFetcher:
+    """The lock-per-source-DB fetch this benchmark compares against."""
+
+    def __init__(self, path: Path) -> None:
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    def fetch(self, entry: IndexEntry) -> bytes:
+        with self._lock:
+            content, dict_id = self._conn.execute(
+                "SELECT content_compressed, compression_dict_id "
+                "FROM requests WHERE id = ?",
+                (entry.request_id,),
+            ).fetchone()
+            dictionary = self._conn.execute(
+                "SELECT dictionary_data FROM compression_dicts WHERE id = ?",
+                (dict_id,),
+            ).fetchone()[0]
+        return decompress(content, dictionary=dictionary)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+async def _drain(
+    entries: list[IndexEntry],
+    tasks: int,
+    fetch: Callable[[IndexEntry], Awaitable[object]],
+    on_dequeue: Callable[[int], None] | None = None,
+) -> None:
+    """Fetch every entry with ``tasks`` workers sharing one queue."""
+    position = 0
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(entries):
+            entry = entries[position]
+            position += 1
+            if on_dequeue is not None:
+                on_dequeue(position)
+            await fetch(entry)
+
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+
+
+async def _run(args: argparse.Namespace, path: Path) -> None:
+    idx = SourceIndex(source_db_paths=[path])
+    keys = [f"page-{i}" for i in range(args.pages)]
+    entries = [e for e in map(idx.lookup, keys) if e is not None]
+    idx.close()
+    legacy = _LegacyFetcher(path)
+    loop = asyncio.get_running_loop()
+
+    depth = args.prefetch_depth
+    print(f"{len(entries)} pages, {os.cpu_count()} CPUs")
+    print(f"{'tasks':>5} {'legacy':>10} {'per-thread':>11} {'prefetch':>10}")
+    tasks = 1
+    while tasks <= args.max_tasks:
+        timings = []
+
+        start = time.perf_counter()
+        await _drain(
+            entries, tasks, lambda e: asyncio.to_thread(legacy.fetch, e)
+        )
+        timings.append(time.perf_counter() - start)
+
+        idx = SourceIndex(source_db_paths=[path], read_workers=tasks)
+        start = time.perf_counter()
+        await _drain(
+            entries,
+            tasks,
+            lambda e, idx=idx: loop.run_in_executor(
+                idx.executor, idx.fetch_response, e
+            ),
+        )
+        timings.append(time.perf_counter() - start)
+        idx.close()
+
+        idx = SourceIndex(source_db_paths=[path], read_workers=tasks)
+
+        def refill(position: int, idx: SourceIndex = idx) -> None:
+            if position % (depth // 2) == 1:
+                idx.prefetch(entries[position : position + depth])
+
+        async def claim(e: IndexEntry, idx: SourceIndex = idx) -> object:
+            future = idx.take_prefetched(e)
+            if future is not None:
+                return await asyncio.wrap_future(future)
+            return await loop.run_in_executor(
+                idx.executor, idx.fetch_response, e
+            )
+
+        start = time.perf_counter()
+        await _drain(entries, tasks, claim, on_dequeue=refill)
+        timings.append(time.perf_counter() - start)
+        idx.close()
+
+        rates = [len(entries) / t for t in timings]
+        print(
+            f"{tasks:>5} {rates[0]:>8.0f}/s {rates[1]:>9.0f}/s "
+            f"{rates[2]:>8.0f}/s"
+        )
+        tasks *= 2
+    legacy.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument(
+        "--page-size", type=int, default=32_768, help="Bytes of HTML per page."
+    )
+    parser.add_argument("--max-tasks", type=int, default=8)
+    parser.add_argument("--prefetch-depth", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "source.db"
+        _make_source(path, args.pages, args.page_size)
+        asyncio.run(_run(args, path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""Benchmark response search against the previous one-row-at-a-time scan.
+
+Generates a run DB of dictionary-compressed HTML responses and searches
+it for text that appears on a fraction of the pages. Compares the
+previous search, which fetched, decompressed, decoded and lowercased one
+response per query, with :func:`iter_response_matches` in-process and
+on a process pool, and with ``--limit`` for early exit.
+
+Scaling with processes is bounded by ``os.cpu_count()``.
+
+Usage:
+    uv run python scripts/bench_response_search.py
+    uv run python scripts/bench_response_search.py --pages 50000 --processes 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import sqlalchemy as sa
+import zstandard as zstd
+
+from kent.driver.persistent_driver.database import init_database
+from kent.driver.persistent_driver.response_search import (
+    SearchPattern,
+    iter_response_matches,
+)
+from kent.driver.persistent_driver.sql_manager import SQLManager
+
+_WORDS = ["court", "docket", "opinion", "filed", "order", "motion", "brief"]
+
+
+def _page(rng: random.Random, size: int, needle: bool) -> bytes:
+    rows = []
+    while sum(map(len, rows)) < size:
+        rows.append(
+            f"<tr><td>{' '.join(rng.choices(_WORDS, k=8))}</td></tr>\n"
+        )
+    if needle:
+        rows.insert(rng.randrange(len(rows)), "<tr><td>Habeas</td></tr>")
+    return f"<html><table>{''.join(rows)}</table></html>".encode()
+
+
+async def _make_run(path: Path, pages: int, page_size: int) -> None:
+    rng = random.Random(0)
+    samples = [_page(rng, page_size, False) for _ in range(200)]
+    dictionary = zstd.train_dictionary(65_536, samples).as_bytes()
+    compressor = zstd.ZstdCompressor(
+        level=3, dict_data=zstd.ZstdCompressionDict(dictionary)
+    )
+    engine, session_factory = await init_database(path)
+    async with session_factory() as session:
+        await session.execute(
+            sa.text(
+                "INSERT INTO compression_dicts (id, continuation, version, "
+                "dictionary_data, sample_count) "
+                "VALUES (1, 'parse', 1, :data, 200)"
+            ),
+            {"data": dictionary},
+        )
+        await session.execute(
+            sa.text(
+                "INSERT INTO requests (status, queue_counter, method, url, "
+                "continuation, response_status_code, content_compressed, "
+                "content_size_original, compression_dict_id) "
+                "VALUES ('completed', :i, 'GET', :url, 'parse', 200, "
+                ":content, :size, 1)"
+            ),
+            [
+                {
+                    "i": i,
+                    "url": f"https://example.com/{i}",
+                    "content": compressor.compress(page),
+                    "size": len(page),
+                }
+                for i, page in (
+                    (i, _page(rng, page_size, i % 50 == 0))
+                    for i in range(pages)
+                )
+            ],
+        )
+        await session.commit()
+    await engine.dispose()
+
+
+async def _legacy(sql: SQLManager, ids: list[int], text: str) -> int:
+    """The previous scan: one fetch and full lowercase per response."""
+    found = 0
+    for request_id in ids:
+        content = await sql.get_response_content(request_id)
+        if content is not None and text.lower() in content.decode().lower():
+            found += 1
+    return found
+
+
+async def _run(args: argparse.Namespace, path: Path) -> None:
+    engine, session_factory = await init_database(path)
+    sql = SQLManager(engine, session_factory)
+    async with session_factory() as session:
+        ids = list(
+            (
+                await session.execute(sa.text("SELECT id FROM requests"))
+            ).scalars()
+        )
+    pattern = SearchPattern(text="habeas")
+
+    async def engine_search(**kwargs: int | None) -> int:
+        return len(
+            [
+                request_id
+                async for request_id in iter_response_matches(
+                    session_factory, pattern, **kwargs
+                )
+            ]
+        )
+
+    print(f"{len(ids)} responses, {os.cpu_count()} CPUs")
+    cases = [
+        ("legacy", lambda: _legacy(sql, ids, "habeas")),
+        ("in-process", lambda: engine_search(processes=0)),
+        (
+            f"{args.processes} processes",
+            lambda: engine_search(processes=args.processes),
+        ),
+        (
+            "--limit 10",
+            lambda: engine_search(processes=args.processes, limit=10),
+        ),
+    ]
+    for name, search in cases:
+        start = time.perf_counter()
+        found = await search()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>14}: {found:>6} matches in {elapsed:7.2f}s")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument(
+        "--page-size", type=int, default=32_768, help="Bytes of HTML per page."
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "run.db"
+        asyncio.run(_make_run(path, args.pages, args.page_size))
+        asyncio.run(_run(args, path))
+
+
+if __name__ == "__main__":
+    main()
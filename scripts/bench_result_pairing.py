@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Benchmark result pairing against the previous all-pairs pairing.
+
+Builds pages of long records where the re-evaluated output edits every
+record slightly and shuffles the order, then pairs them with the
+previous implementation, which computed the full Levenshtein distance
+of every original x new pair before pairing greedily, and with
+:func:`_pair_results_by_levenshtein` in greedy and optimal mode.
+Reports wall time and how many pairs matched the right record.
+
+The previous implementation is quadratic in both the number and the
+length of records, so it only runs on ``--legacy-results`` records
+(ten 2 KB records already take minutes).
+
+Usage:
+    uv run python scripts/bench_result_pairing.py
+    uv run python scripts/bench_result_pairing.py --results 300 --words 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+
+from kent.driver.persistent_driver.comparison import (
+    _pair_results_by_levenshtein,
+)
+from kent.driver.persistent_driver.dry_run_driver import CapturedData
+
+_WORDS = [
+    "the",
+    "court",
+    "held",
+    "that",
+    "appeal",
+    "motion",
+    "denied",
+    "granted",
+    "record",
+    "plaintiff",
+    "defendant",
+    "judgment",
+    "reversed",
+    "remanded",
+    "affirmed",
+]
+
+
+def _legacy_distance(s1: str, s2: str) -> int:
+    if len(s1) < len(s2):
+        return _legacy_distance(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(
+                min(
+                    previous_row[j + 1] + 1,
+                    current_row[j] + 1,
+                    previous_row[j] + (c1 != c2),
+                )
+            )
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def _legacy(
+    original: list[CapturedData], new: list[CapturedData]
+) -> list[tuple[CapturedData, CapturedData]]:
+    """The previous pairing: exact matches, then the full distance matrix."""
+    original_strs = [json.dumps(o.data, sort_keys=True) for o in original]
+    new_strs = [json.dumps(n.data, sort_keys=True) for n in new]
+    available_orig = set(range(len(original)))
+    available_new = set(range(len(new)))
+    paired = []
+    for i in list(available_orig):
+        for j, ns in enumerate(new_strs):
+            if j in available_new and ns == original_strs[i]:
+                paired.append((original[i], new[j]))
+                available_orig.discard(i)
+                available_new.discard(j)
+                break
+    distances = sorted(
+        (
+            (_legacy_distance(original_strs[i], new_strs[j]), i, j)
+            for i in sorted(available_orig)
+            for j in sorted(available_new)
+        ),
+        key=lambda x: x[0],
+    )
+    for _dist, i, j in distances:
+        if i in available_orig and j in available_new:
+            paired.append((original[i], new[j]))
+            available_orig.discard(i)
+            available_new.discard(j)
+    return paired
+
+
+def _page(
+    results: int, words: int, seed: int
+) -> tuple[list[CapturedData], list[CapturedData]]:
+    rng = random.Random(seed)
+    original = [
+        CapturedData(
+            data={
+                "docket": f"24-cv-{i:05d}",
+                "court": "ca1",
+                "text": " ".join(rng.choice(_WORDS) for _ in range(words)),
+            }
+        )
+        for i in range(results)
+    ]
+    new = [
+        CapturedData(
+            data={
+                **o.data,
+                "docket": o.data["docket"].upper(),
+                "text": o.data["text"].replace("court", "Court", 2),
+            }
+        )
+        for o in original
+    ]
+    rng.shuffle(new)
+    return original, new
+
+
+def _measure(
+    name: str,
+    pair: Callable[
+        [list[CapturedData], list[CapturedData]],
+        list[tuple[CapturedData, CapturedData]],
+    ],
+    original: list[CapturedData],
+    new: list[CapturedData],
+) -> None:
+    start = time.perf_counter()
+    paired = pair(original, new)
+    elapsed = time.perf_counter() - start
+    right = sum(
+        o.data["docket"].upper() == n.data["docket"] for o, n in paired
+    )
+    print(
+        f"{name:>8}: {len(original)} results in {elapsed:7.2f}s, "
+        f"{right}/{len(paired)} pairs right"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=300)
+    parser.add_argument("--legacy-results", type=int, default=5)
+    parser.add_argument("--words", type=int, default=300)
+    args = parser.parse_args()
+
+    original, new = _page(args.legacy_results, args.words, seed=1)
+    _measure("legacy", _legacy, original, new)
+    _measure(
+        "greedy",
+        lambda o, n: _pair_results_by_levenshtein(o, n)[0],
+        original,
+        new,
+    )
+
+    original, new = _page(args.results, args.words, seed=2)
+    for mode in ("greedy", "optimal"):
+
+        def pair(o, n, mode=mode):  # type: ignore[no-untyped-def]
+            return _pair_results_by_levenshtein(o, n, mode)[0]
+
+        _measure(mode, pair, original, new)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""Benchmark results export against the previous load-everything export.
+
+Generates a run DB of results and exports them with the previous
+implementation, which fetched every row with ``result.all()`` and
+decoded and re-encoded each row's JSON, and with the streaming
+:meth:`export_results_jsonl`, plain and compressed. Reports wall time
+and peak Python heap (``tracemalloc``) for each.
+
+Usage:
+    uv run python scripts/bench_results_export.py
+    uv run python scripts/bench_results_export.py --results 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlmodel import select
+
+from kent.driver.persistent_driver.database import init_database
+from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.models import Result
+
+
+async def _make_run(path: Path, results: int) -> None:
+    engine, session_factory = await init_database(path)
+    async with session_factory() as session:
+        for start in range(0, results, 10_000):
+            await session.execute(
+                sa.text(
+                    "INSERT INTO results (result_type, data_json, is_valid) "
+                    "VALUES ('CourtOpinion', :data, 1)"
+                ),
+                [
+                    {
+                        "data": json.dumps(
+                            {
+                                "docket": f"{i:08d}",
+                                "title": f"Case {i} v. State",
+                                "judges": ["A. Judge", "B. Judge"],
+                                "text": "opinion " * 40,
+                            }
+                        )
+                    }
+                    for i in range(start, min(start + 10_000, results))
+                ],
+            )
+        await session.commit()
+    await engine.dispose()
+
+
+async def _legacy(debugger: LocalDevDriverDebugger, output: Path) -> int:
+    """The previous export: all rows in memory, JSON decoded and re-encoded."""
+    async with debugger._session_factory() as session:
+        result = await session.execute(
+            select(
+                Result.id,
+                Result.request_id,
+                Result.result_type,
+                Result.data_json,
+                Result.is_valid,
+                Result.validation_errors_json,
+                Result.created_at,
+            ).order_by(Result.created_at.asc())  # type: ignore[union-attr]
+        )
+        rows = result.all()
+    with output.open("w") as f:
+        for rid, req, rtype, data_json, valid, errors_json, created in rows:
+            record = {
+                "id": rid,
+                "request_id": req,
+                "result_type": rtype,
+                "data": json.loads(data_json) if data_json else {},
+                "is_valid": bool(valid),
+                "validation_errors": (
+                    json.loads(errors_json) if errors_json else None
+                ),
+                "created_at": created,
+            }
+            f.write(json.dumps(record) + "\n")
+    return len(rows)
+
+
+async def _measure(
+    name: str, export: Callable[[], Awaitable[int]], output: Path
+) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = await export()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = output.stat().st_size / 1e6
+    print(
+        f"{name:>10}: {count} results in {elapsed:6.2f}s, "
+        f"peak heap {peak / 1e6:7.1f} MB, file {size:7.1f} MB"
+    )
+
+
+async def _run(path: Path, tmp: Path) -> None:
+    async with LocalDevDriverDebugger.open(path) as debugger:
+        legacy = tmp / "legacy.jsonl"
+        await _measure("legacy", lambda: _legacy(debugger, legacy), legacy)
+        for name in ("out.jsonl", "out.jsonl.gz", "out.jsonl.zst"):
+            output = tmp / name
+            await _measure(
+                name.removeprefix("out."),
+                lambda output=output: debugger.export_results_jsonl(output),
+                output,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "run.db"
+        asyncio.run(_make_run(path, args.results))
+        asyncio.run(_run(path, Path(tmp)))
+
+
+if __name__ == "__main__":
+    main()
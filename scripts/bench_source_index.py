@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""Benchmark building the LocalOnlyDriver source index.
+
+Generates synthetic source DBs and times ``SourceIndex`` against the
+previous build, which scanned each source row in Python and issued a
+lookup plus an INSERT or UPDATE per row. Then times reopening the
+persisted index unchanged, and after appending rows to one source.
+
+Usage:
+    uv run python scripts/bench_source_index.py
+    uv run python scripts/bench_source_index.py --dbs 5 --rows 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from kent.driver.local_only_driver.source_index import (
+    IndexBuildProgress,
+    SourceIndex,
+    fallback_replay_key,
+)
+
+_SCHEMA = """
+CREATE TABLE requests (
+    id INTEGER PRIMARY KEY,
+    deduplication_key TEXT,
+    response_status_code INTEGER,
+    content_compressed BLOB,
+    request_type TEXT,
+    url TEXT,
+    body BLOB,
+    completed_at_ns INTEGER,
+    created_at_ns INTEGER
+);
+CREATE TABLE errors (
+    id INTEGER PRIMARY KEY,
+    request_id INTEGER,
+    error_type TEXT,
+    is_resolved BOOLEAN DEFAULT 0
+);
+"""
+
+
+def _make_source(path: Path, db_idx: int, rows: int, overlap: float) -> None:
+    """Write ``rows`` fulfilled requests; ``overlap`` share other DBs' keys.
+
+    One row in twenty has a NULL dedup_key so the fallback key is
+    exercised, and one in a hundred has an unresolved parser error.
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    shared = int(rows * overlap)
+
+    def gen() -> Iterator[tuple[object, ...]]:
+        for i in range(rows):
+            key = f"shared-{i}" if i < shared else f"db{db_idx}-{i}"
+            yield (
+                None if i % 20 == 0 else key,
+                b"x",
+                f"https://example.com/{key}",
+                (i * 7 + db_idx) % 1000,
+                i,
+            )
+
+    conn.executemany(
+        "INSERT INTO requests (deduplication_key, response_status_code, "
+        "content_compressed, request_type, url, completed_at_ns, "
+        "created_at_ns) VALUES (?, 200, ?, 'navigating', ?, ?, ?)",
+        gen(),
+    )
+    conn.executemany(
+        "INSERT INTO errors (request_id, error_type) "
+        "VALUES (?, 'HTMLStructuralAssumptionException')",
+        ((i,) for i in range(1, rows + 1, 100)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _legacy_build(paths: list[Path]) -> sqlite3.Connection:
+    """The row-at-a-time build this benchmark compares against."""
+    index = sqlite3.connect(":memory:")
+    index.execute(
+        "CREATE TABLE source_index (dedup_key TEXT PRIMARY KEY, "
+        "source_db_idx INTEGER, request_id INTEGER, completed_at_ns INTEGER, "
+        "created_at_ns INTEGER, retry_eligible INTEGER)"
+    )
+    for db_idx, path in enumerate(paths):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        retry_ids = {
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT request_id FROM errors WHERE is_resolved = 0"
+            )
+        }
+        for request_id, key, completed, created, url, body in conn.execute(
+            "SELECT id, deduplication_key, completed_at_ns, created_at_ns, "
+            "url, body FROM requests WHERE response_status_code IS NOT NULL "
+            "AND (content_compressed IS NOT NULL OR request_type = 'archive')"
+        ):
+            if key is None:
+                key = fallback_replay_key(url, body)
+            retry = 1 if request_id in retry_ids else 0
+            existing = index.execute(
+                "SELECT source_db_idx, completed_at_ns, created_at_ns "
+                "FROM source_index WHERE dedup_key = ?",
+                (key,),
+            ).fetchone()
+            if existing is None:
+                index.execute(
+                    "INSERT INTO source_index VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, db_idx, request_id, completed, created, retry),
+                )
+            elif (completed, created, -db_idx) > (
+                existing[1],
+                existing[2],
+                -existing[0],
+            ):
+                index.execute(
+                    "UPDATE source_index SET source_db_idx = ?, "
+                    "request_id = ?, completed_at_ns = ?, created_at_ns = ?, "
+                    "retry_eligible = ? WHERE dedup_key = ?",
+                    (db_idx, request_id, completed, created, retry, key),
+                )
+        conn.close()
+    index.commit()
+    return index
+
+
+def _time(label: str, run: Callable[[], Callable[[], None]]) -> float:
+    start = time.perf_counter()
+    close = run()
+    elapsed = time.perf_counter() - start
+    close()
+    print(f"{label:<24} {elapsed:8.2f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dbs", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=0.5,
+        help="Share of each DB's keys that also appear in the other DBs.",
+    )
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Only time SourceIndex."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"source-{i}.db" for i in range(args.dbs)]
+        for i, path in enumerate(paths):
+            _make_source(path, i, args.rows, args.overlap)
+        print(f"{args.dbs} source DBs x {args.rows} rows")
+
+        def on_progress(progress: IndexBuildProgress) -> None:
+            print(
+                f"  db {progress.source_db_idx + 1}/"
+                f"{progress.source_db_count}: {progress.rows} entries won, "
+                f"{progress.keys} keys at {progress.elapsed_s:.2f}s"
+            )
+
+        index_db = Path(tmp) / "out.db.source-index"
+
+        def open_index() -> Callable[[], None]:
+            return SourceIndex(
+                source_db_paths=paths,
+                index_db_path=index_db,
+                on_progress=on_progress,
+            ).close
+
+        bulk = _time("SourceIndex (SQL)", open_index)
+        if not args.skip_legacy:
+            legacy = _time(
+                "row-at-a-time (previous)",
+                lambda: _legacy_build(paths).close,
+            )
+            print(f"speedup: {legacy / bulk:.1f}x")
+
+        _time("reuse, unchanged", open_index)
+        appended = max(args.rows // 100, 1)
+        conn = sqlite3.connect(paths[-1])
+        conn.executemany(
+            "INSERT INTO requests (deduplication_key, response_status_code, "
+            "content_compressed, request_type, url, completed_at_ns, "
+            "created_at_ns) VALUES (?, 200, x'00', 'navigating', ?, 0, 0)",
+            (
+                (f"late-{i}", f"https://example.com/late-{i}")
+                for i in range(appended)
+            ),
+        )
+        conn.commit()
+        conn.close()
+        _time(f"incremental, +{appended} rows", open_index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Benchmark the local streaming archive handlers.
+
+Streams a synthetic payload through ``LocalAsyncStreamingArchiveHandler``
+and ``LocalSyncStreamingArchiveHandler`` and compares them with the
+previous implementations, which hashed and wrote every chunk inline (sync)
+or with one ``asyncio.to_thread`` dispatch per chunk (async).
+
+Usage:
+    uv run python scripts/bench_streaming_archive.py
+    uv run python scripts/bench_streaming_archive.py --size-mb 2048 --chunk-kb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+
+from kent.driver.archive_handler import (
+    LocalAsyncStreamingArchiveHandler,
+    LocalSyncStreamingArchiveHandler,
+    _hash_and_write,
+    _streaming_target_path,
+)
+
+
+def _chunks(size: int, chunk_size: int) -> Iterator[bytes]:
+    block = os.urandom(chunk_size)
+    for _ in range(size // chunk_size):
+        yield block
+
+
+async def _achunks(size: int, chunk_size: int) -> AsyncIterator[bytes]:
+    for i, chunk in enumerate(_chunks(size, chunk_size)):
+        if i % 16 == 0:
+            # Yield to the loop as a network read would.
+            await asyncio.sleep(0)
+        yield chunk
+
+
+def _legacy_sync(storage_dir: Path, chunks: Iterator[bytes]) -> str:
+    sha = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(
+        dir=storage_dir, delete=False, prefix=".stream-", suffix=".tmp"
+    ) as f:
+        for chunk in chunks:
+            sha.update(chunk)
+            f.write(chunk)
+    final_path = _streaming_target_path(
+        storage_dir, None, sha.hexdigest(), None
+    )
+    os.replace(f.name, final_path)
+    return str(final_path)
+
+
+async def _legacy_async(
+    storage_dir: Path, chunks: AsyncIterator[bytes]
+) -> str:
+    sha = hashlib.sha256()
+    tmp = await asyncio.to_thread(
+        tempfile.NamedTemporaryFile,
+        dir=storage_dir,
+        delete=False,
+        prefix=".stream-",
+        suffix=".tmp",
+    )
+    async for chunk in chunks:
+        await asyncio.to_thread(_hash_and_write, sha, tmp, chunk)
+    await asyncio.to_thread(tmp.close)
+    final_path = _streaming_target_path(
+        storage_dir, None, sha.hexdigest(), None
+    )
+    os.replace(tmp.name, final_path)
+    return str(final_path)
+
+
+def _report(label: str, size: int, run: Callable[[], str]) -> None:
+    start = time.perf_counter()
+    path = run()
+    elapsed = time.perf_counter() - start
+    os.unlink(path)
+    print(f"{label:<28} {elapsed:8.3f}s  {size / elapsed / 2**20:9.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    args = parser.parse_args()
+    size = args.size_mb * 2**20
+    chunk_size = args.chunk_kb * 2**10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_dir = Path(tmp)
+        sync_handler = LocalSyncStreamingArchiveHandler(storage_dir)
+        async_handler = LocalAsyncStreamingArchiveHandler(storage_dir)
+
+        print(f"{args.size_mb} MB in {args.chunk_kb} KB chunks")
+        _report(
+            "sync, inline (previous)",
+            size,
+            lambda: _legacy_sync(storage_dir, _chunks(size, chunk_size)),
+        )
+        _report(
+            "sync, writer thread",
+            size,
+            lambda: sync_handler.save_stream(
+                "bench", None, None, None, _chunks(size, chunk_size)
+            ),
+        )
+        _report(
+            "async, to_thread per chunk",
+            size,
+            lambda: asyncio.run(
+                _legacy_async(storage_dir, _achunks(size, chunk_size))
+            ),
+        )
+        _report(
+            "async, writer thread",
+            size,
+            lambda: asyncio.run(
+                async_handler.save_stream(
+                    "bench", None, None, None, _achunks(size, chunk_size)
+                )
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
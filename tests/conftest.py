@@ -1,6 +1,7 @@
 """Shared fixtures for design documentation tests."""
 
 import asyncio
+import random
 import socket
 import threading
 from collections.abc import Generator
@@ -143,3 +144,74 @@ def server_url(bug_court_server: AioHttpTestServer) -> str:
         The base URL string (e.g., "http://127.0.0.1:8080").
     """
     return bug_court_server.url
+
+
+# =============================================================================
+# Range-capable file server for ranged archive downloads
+# =============================================================================
+
+RANGE_PAYLOAD = random.Random(0).randbytes(256 * 1024)
+
+
+class RangeServer:
+    """Serves ``RANGE_PAYLOAD`` at ``/files/{name}`` with Range support.
+
+    ``norange`` omits ``Accept-Ranges``; ``ignores-range`` advertises it
+    but always answers 200; ``flaky`` drops ranged responses halfway while
+    ``drops_left`` is positive. Every request is recorded in ``seen``.
+    """
+
+    def __init__(self) -> None:
+        self.seen: list[tuple[str, str, str | None]] = []
+        self.etag = '"v1"'
+        # Ranged GETs of /flaky that should drop halfway through.
+        self.drops_left = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/files/{name}", self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        name = request.match_info["name"]
+        range_header = request.headers.get("Range")
+        self.seen.append((request.method, name, range_header))
+        headers = {"ETag": self.etag}
+        if name != "norange":
+            headers["Accept-Ranges"] = "bytes"
+        if (
+            request.method == "HEAD"
+            or range_header is None
+            or name in ("norange", "ignores-range")
+        ):
+            return web.Response(body=RANGE_PAYLOAD, headers=headers)
+
+        start_s, end_s = range_header.removeprefix("bytes=").split("-")
+        start, end = int(start_s), int(end_s) + 1
+        body = RANGE_PAYLOAD[start:end]
+        headers["Content-Range"] = (
+            f"bytes {start}-{end - 1}/{len(RANGE_PAYLOAD)}"
+        )
+        if name == "flaky" and self.drops_left > 0:
+            self.drops_left -= 1
+            response = web.StreamResponse(status=206, headers=headers)
+            response.content_length = len(body)
+            await response.prepare(request)
+            await response.write(body[: len(body) // 2])
+            assert request.transport is not None
+            request.transport.close()
+            return response
+        return web.Response(status=206, body=body, headers=headers)
+
+    def ranged_gets(self, name: str) -> list[str]:
+        return [r for m, n, r in self.seen if m == "GET" and n == name and r]
+
+
+@pytest.fixture
+def range_server() -> Generator[tuple[RangeServer, str], None, None]:
+    """Start a Range-capable file server; yields its state and base URL."""
+    state = RangeServer()
+    server = AioHttpTestServer(state.app(), find_free_port())
+    server.start()
+    yield state, server.url
+    server.stop()
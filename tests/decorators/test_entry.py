@@ -456,6 +456,13 @@ class TestSchema:
         props = entry["parameters"]["properties"]
         assert props["filing_date"] == {"type": "string", "format": "date"}
 
+    def test_return_model_schema_in_defs(self):
+        schema = SimpleScraper.schema()
+        assert schema["entries"]["search_by_name"]["returns"] == "FakeData"
+        assert schema["$defs"]["FakeData"]["properties"] == {
+            "name": {"title": "Name", "type": "string"}
+        }
+
     def test_schema_is_json_serializable(self):
         import json
 
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from pathlib import Path
 from typing import Any
 
 import sqlalchemy as sa
+import zstandard as zstd
 
 from kent.driver.persistent_driver.persistent_driver import PersistentDriver
 from kent.driver.persistent_driver.sql_manager import SQLManager
@@ -84,3 +86,139 @@ async def read_pending_dedup_keys(db_path: Path) -> set[str]:
             )
         ).all()
     return {r[0] for r in rows}
+
+
+def create_minimal_source_db(path: Path) -> sqlite3.Connection:
+    """Open a fresh SQLite DB with just the columns SourceIndex reads."""
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        """
+        CREATE TABLE requests (
+            id INTEGER PRIMARY KEY,
+            deduplication_key TEXT,
+            response_status_code INTEGER,
+            content_compressed BLOB,
+            compression_dict_id INTEGER,
+            response_headers_json TEXT,
+            response_url TEXT,
+            url TEXT,
+            method TEXT,
+            headers_json TEXT,
+            cookies_json TEXT,
+            body BLOB,
+            continuation TEXT,
+            current_location TEXT,
+            accumulated_data_json TEXT,
+            permanent_json TEXT,
+            expected_type TEXT,
+            verify TEXT,
+            bypass_rate_limit INTEGER DEFAULT 0,
+            request_type TEXT,
+            parent_request_id INTEGER,
+            completed_at_ns INTEGER,
+            created_at_ns INTEGER,
+            priority INTEGER DEFAULT 9,
+            hateoas BOOLEAN
+        );
+        CREATE TABLE errors (
+            id INTEGER PRIMARY KEY,
+            request_id INTEGER,
+            error_type TEXT,
+            error_class TEXT,
+            message TEXT,
+            request_url TEXT,
+            is_resolved BOOLEAN DEFAULT 0,
+            created_at TEXT
+        );
+        CREATE TABLE archived_files (
+            id INTEGER PRIMARY KEY,
+            request_id INTEGER,
+            file_path TEXT,
+            original_url TEXT,
+            content_hash TEXT,
+            created_at TEXT
+        );
+        CREATE TABLE compression_dicts (
+            id INTEGER PRIMARY KEY,
+            continuation TEXT,
+            version INTEGER,
+            dictionary_data BLOB,
+            sample_count INTEGER
+        );
+        CREATE TABLE run_metadata (
+            id INTEGER PRIMARY KEY,
+            scraper_name TEXT,
+            status TEXT
+        );
+        """
+    )
+    return conn
+
+
+def insert_completed_request(
+    conn: sqlite3.Connection,
+    *,
+    dedup_key: str,
+    completed_at_ns: int,
+    created_at_ns: int,
+    content: bytes = b"<html></html>",
+    request_type: str = "navigating",
+) -> int:
+    """Insert a fully-completed request row and return its rowid."""
+    compressed = zstd.ZstdCompressor().compress(content)
+    cur = conn.execute(
+        """
+        INSERT INTO requests (
+            deduplication_key, response_status_code, content_compressed,
+            response_headers_json, response_url, url, method, continuation,
+            completed_at_ns, created_at_ns, request_type
+        ) VALUES (?, 200, ?, '{}', 'http://x/', 'http://x/', 'GET',
+                  'parse', ?, ?, ?)
+        """,
+        (
+            dedup_key,
+            compressed,
+            completed_at_ns,
+            created_at_ns,
+            request_type,
+        ),
+    )
+    conn.commit()
+    return cur.lastrowid  # type: ignore[return-value]
+
+
+async def corrupt_one_detail_response(db_path: Path) -> str:
+    """Replace one ``/cases/<docket>`` row's stored HTML with garbage.
+
+    BugCourtScraper.parse_detail uses :class:`CheckedHtmlElement` to
+    require exactly one ``//div[@class='case-details']`` element. A
+    body of ``<html><body>empty</body></html>`` will fail that check
+    with ``HTMLStructuralAssumptionException``, which is what we want
+    to exercise.
+
+    Returns the URL of the corrupted row so tests can target it.
+    """
+    conn = sqlite3.connect(str(db_path))
+    row = conn.execute(
+        "SELECT id, url, compression_dict_id FROM requests "
+        "WHERE url LIKE '%/cases/%' AND response_status_code IS NOT NULL "
+        "ORDER BY id ASC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        conn.close()
+        raise AssertionError("source DB has no /cases/<docket> row to corrupt")
+    rid, url, _dict_id = row
+    # Compress against no dictionary so the source-side decompress just
+    # works — even if the source originally trained a dict, NULL-dict
+    # decompression on a NULL-dict compressed blob is the simplest path.
+    garbage = b"<html><body>broken</body></html>"
+    compressed = zstd.ZstdCompressor().compress(garbage)
+    conn.execute(
+        "UPDATE requests SET content_compressed = ?, "
+        "content_size_original = ?, content_size_compressed = ?, "
+        "compression_dict_id = NULL WHERE id = ?",
+        (compressed, len(garbage), len(compressed), rid),
+    )
+    conn.commit()
+    conn.close()
+    return url
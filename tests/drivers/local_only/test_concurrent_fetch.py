@@ -1,12 +1,12 @@
 """Concurrent ``fetch_response`` calls against a shared source DB.
 
 sqlite3 connections with ``check_same_thread=False`` can be used from
-multiple threads but not *simultaneously*. The worker pool will fan out
-``asyncio.to_thread(self.source_index.fetch_response, entry)`` across N
-threads — without per-connection serialization, that interleaves
-statement handles on the same connection and raises
+multiple threads but not *simultaneously*. The worker pool fans
+``fetch_response`` out across N threads — sharing one connection
+between them interleaves statement handles and raises
 ``sqlite3.InterfaceError: bad parameter or other API misuse`` (or, more
-insidiously, returns the wrong row's ``compression_dict_id``).
+insidiously, returns the wrong row's ``compression_dict_id``). Each
+reader thread therefore opens its own read-only connection.
 """
 
 from __future__ import annotations
@@ -55,7 +55,7 @@ async def test_concurrent_fetch_response_does_not_corrupt(
         assert len(rows) > 1, "fixture should have multiple rows"
         entries = [idx.lookup(r[0]) for r in rows]
 
-        # Fire all fetches concurrently. Without the per-connection lock,
+        # Fire all fetches concurrently. With a shared connection,
         # this is the path that raised "bad parameter or other API misuse"
         # in production with --workers 8.
         async def fetch(entry):  # type: ignore[no-untyped-def]
@@ -82,7 +82,7 @@ async def test_concurrent_fetch_response_does_not_corrupt(
 async def test_replay_with_two_source_dbs_and_workers(
     bug_court_server: AioHttpTestServer, tmp_path: Path
 ) -> None:
-    """End-to-end multi-DB replay with workers>1 doesn't crash on the conn lock."""
+    """End-to-end multi-DB replay with workers>1 doesn't corrupt reads."""
     from kent.driver.local_only_driver import LocalOnlyDriver
 
     src_a = tmp_path / "a.db"
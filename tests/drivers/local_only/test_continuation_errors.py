@@ -14,59 +14,21 @@ still broken.
 
 from __future__ import annotations
 
-import sqlite3
 from pathlib import Path
 
 import pytest
 import sqlalchemy as sa
-import zstandard as zstd
 
 from kent.driver.local_only_driver import LocalOnlyDriver
 from kent.driver.persistent_driver.sql_manager import SQLManager
 from tests.conftest import AioHttpTestServer
 from tests.drivers.local_only.conftest import (
+    corrupt_one_detail_response,
     make_bug_court_scraper,
     run_with_persistent_driver,
 )
 
 
-async def _corrupt_one_detail_response(db_path: Path) -> str:
-    """Replace one ``/cases/<docket>`` row's stored HTML with garbage.
-
-    BugCourtScraper.parse_detail uses :class:`CheckedHtmlElement` to
-    require exactly one ``//div[@class='case-details']`` element. A
-    body of ``<html><body>empty</body></html>`` will fail that check
-    with ``HTMLStructuralAssumptionException``, which is what we want
-    to exercise.
-
-    Returns the URL of the corrupted row so tests can target it.
-    """
-    conn = sqlite3.connect(str(db_path))
-    row = conn.execute(
-        "SELECT id, url, compression_dict_id FROM requests "
-        "WHERE url LIKE '%/cases/%' AND response_status_code IS NOT NULL "
-        "ORDER BY id ASC LIMIT 1"
-    ).fetchone()
-    if row is None:
-        conn.close()
-        raise AssertionError("source DB has no /cases/<docket> row to corrupt")
-    rid, url, _dict_id = row
-    # Compress against no dictionary so the source-side decompress just
-    # works — even if the source originally trained a dict, NULL-dict
-    # decompression on a NULL-dict compressed blob is the simplest path.
-    garbage = b"<html><body>broken</body></html>"
-    compressed = zstd.ZstdCompressor().compress(garbage)
-    conn.execute(
-        "UPDATE requests SET content_compressed = ?, "
-        "content_size_original = ?, content_size_compressed = ?, "
-        "compression_dict_id = NULL WHERE id = ?",
-        (compressed, len(garbage), len(compressed), rid),
-    )
-    conn.commit()
-    conn.close()
-    return url
-
-
 async def _row_status(db_path: Path, url_substring: str) -> str | None:
     async with (
         SQLManager.open(db_path) as sql,
@@ -104,7 +66,7 @@ async def test_strict_continuation_error_becomes_pending(
     await run_with_persistent_driver(
         make_bug_court_scraper(bug_court_server.url), source_db
     )
-    corrupted_url = await _corrupt_one_detail_response(source_db)
+    corrupted_url = await corrupt_one_detail_response(source_db)
 
     async with LocalOnlyDriver.open(
         scraper=make_bug_court_scraper(bug_court_server.url),
@@ -136,7 +98,7 @@ async def test_lenient_continuation_error_becomes_pending(
     await run_with_persistent_driver(
         make_bug_court_scraper(bug_court_server.url), source_db
     )
-    corrupted_url = await _corrupt_one_detail_response(source_db)
+    corrupted_url = await corrupt_one_detail_response(source_db)
 
     async with LocalOnlyDriver.open(
         scraper=make_bug_court_scraper(bug_court_server.url),
@@ -167,7 +129,7 @@ async def test_lenient_continuation_error_raises_with_miss_raise(
     await run_with_persistent_driver(
         make_bug_court_scraper(bug_court_server.url), source_db
     )
-    await _corrupt_one_detail_response(source_db)
+    await corrupt_one_detail_response(source_db)
 
     with pytest.raises(RequestFailedHalt):
         async with LocalOnlyDriver.open(
@@ -13,106 +13,14 @@ from pathlib import Path
 
 import zstandard as zstd
 
-from kent.driver.local_only_driver.source_index import SourceIndex
-
-
-def _create_minimal_db(path: Path) -> sqlite3.Connection:
-    """Open a fresh SQLite DB with just the columns SourceIndex reads."""
-    conn = sqlite3.connect(str(path))
-    conn.executescript(
-        """
-        CREATE TABLE requests (
-            id INTEGER PRIMARY KEY,
-            deduplication_key TEXT,
-            response_status_code INTEGER,
-            content_compressed BLOB,
-            compression_dict_id INTEGER,
-            response_headers_json TEXT,
-            response_url TEXT,
-            url TEXT,
-            method TEXT,
-            headers_json TEXT,
-            cookies_json TEXT,
-            body BLOB,
-            continuation TEXT,
-            current_location TEXT,
-            accumulated_data_json TEXT,
-            permanent_json TEXT,
-            expected_type TEXT,
-            verify TEXT,
-            bypass_rate_limit INTEGER DEFAULT 0,
-            request_type TEXT,
-            parent_request_id INTEGER,
-            completed_at_ns INTEGER,
-            created_at_ns INTEGER,
-            priority INTEGER DEFAULT 9,
-            hateoas BOOLEAN
-        );
-        CREATE TABLE errors (
-            id INTEGER PRIMARY KEY,
-            request_id INTEGER,
-            error_type TEXT,
-            error_class TEXT,
-            message TEXT,
-            request_url TEXT,
-            is_resolved BOOLEAN DEFAULT 0,
-            created_at TEXT
-        );
-        CREATE TABLE archived_files (
-            id INTEGER PRIMARY KEY,
-            request_id INTEGER,
-            file_path TEXT,
-            original_url TEXT,
-            content_hash TEXT,
-            created_at TEXT
-        );
-        CREATE TABLE compression_dicts (
-            id INTEGER PRIMARY KEY,
-            continuation TEXT,
-            version INTEGER,
-            dictionary_data BLOB,
-            sample_count INTEGER
-        );
-        CREATE TABLE run_metadata (
-            id INTEGER PRIMARY KEY,
-            scraper_name TEXT,
-            status TEXT
-        );
-        """
-    )
-    return conn
-
-
-def _insert_completed_request(
-    conn: sqlite3.Connection,
-    *,
-    dedup_key: str,
-    completed_at_ns: int,
-    created_at_ns: int,
-    content: bytes = b"<html></html>",
-    request_type: str = "navigating",
-) -> int:
-    """Insert a fully-completed request row and return its rowid."""
-    compressed = zstd.ZstdCompressor().compress(content)
-    cur = conn.execute(
-        """
-        INSERT INTO requests (
-            deduplication_key, response_status_code, content_compressed,
-            response_headers_json, response_url, url, method, continuation,
-            completed_at_ns, created_at_ns, request_type
-        ) VALUES (?, 200, ?, '{}', 'http://x/', 'http://x/', 'GET',
-                  'parse', ?, ?, ?)
-        """,
-        (
-            dedup_key,
-            compressed,
-            completed_at_ns,
-            created_at_ns,
-            request_type,
-        ),
-    )
-    conn.commit()
-    return cur.lastrowid  # type: ignore[return-value]
+from kent.driver.local_only_driver.source_index import (
+    IndexBuildProgress,
+    SourceIndex,
+)
+from tests.drivers.local_only.conftest import (
+    create_minimal_source_db,
+    insert_completed_request,
+)
 
 
 def test_multi_db_resolution_picks_most_recent_completion(
@@ -120,12 +28,12 @@ def test_multi_db_resolution_picks_most_recent_completion(
 ) -> None:
     db_a = tmp_path / "a.db"
     db_b = tmp_path / "b.db"
-    conn_a = _create_minimal_db(db_a)
-    conn_b = _create_minimal_db(db_b)
-    _insert_completed_request(
+    conn_a = create_minimal_source_db(db_a)
+    conn_b = create_minimal_source_db(db_b)
+    insert_completed_request(
         conn_a, dedup_key="K", completed_at_ns=100, created_at_ns=50
     )
-    _insert_completed_request(
+    insert_completed_request(
         conn_b, dedup_key="K", completed_at_ns=200, created_at_ns=70
     )
     conn_a.close()
@@ -143,12 +51,12 @@ def test_multi_db_resolution_picks_most_recent_completion(
 def test_tiebreaker_higher_created_at_wins(tmp_path: Path) -> None:
     db_a = tmp_path / "a.db"
     db_b = tmp_path / "b.db"
-    conn_a = _create_minimal_db(db_a)
-    conn_b = _create_minimal_db(db_b)
-    _insert_completed_request(
+    conn_a = create_minimal_source_db(db_a)
+    conn_b = create_minimal_source_db(db_b)
+    insert_completed_request(
         conn_a, dedup_key="K", completed_at_ns=100, created_at_ns=80
     )
-    _insert_completed_request(
+    insert_completed_request(
         conn_b, dedup_key="K", completed_at_ns=100, created_at_ns=50
     )
     conn_a.close()
@@ -166,12 +74,12 @@ def test_tiebreaker_higher_created_at_wins(tmp_path: Path) -> None:
 def test_tiebreaker_earlier_db_wins_on_full_tie(tmp_path: Path) -> None:
     db_a = tmp_path / "a.db"
     db_b = tmp_path / "b.db"
-    conn_a = _create_minimal_db(db_a)
-    conn_b = _create_minimal_db(db_b)
-    _insert_completed_request(
+    conn_a = create_minimal_source_db(db_a)
+    conn_b = create_minimal_source_db(db_b)
+    insert_completed_request(
         conn_a, dedup_key="K", completed_at_ns=100, created_at_ns=50
     )
-    _insert_completed_request(
+    insert_completed_request(
         conn_b, dedup_key="K", completed_at_ns=100, created_at_ns=50
     )
     conn_a.close()
@@ -189,7 +97,7 @@ def test_tiebreaker_earlier_db_wins_on_full_tie(tmp_path: Path) -> None:
 def test_content_gate_excludes_rows_missing_response(tmp_path: Path) -> None:
     """Rows with response_status_code set but no content are not indexed."""
     db = tmp_path / "incomplete.db"
-    conn = _create_minimal_db(db)
+    conn = create_minimal_source_db(db)
     conn.execute(
         """
         INSERT INTO requests (
@@ -213,8 +121,8 @@ def test_retry_eligible_flag_set_for_unresolved_structural_error(
     tmp_path: Path,
 ) -> None:
     db = tmp_path / "errored.db"
-    conn = _create_minimal_db(db)
-    rid = _insert_completed_request(
+    conn = create_minimal_source_db(db)
+    rid = insert_completed_request(
         conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
     )
     conn.execute(
@@ -242,8 +150,8 @@ def test_retry_eligible_flag_set_for_unresolved_structural_error(
 def test_resolved_errors_do_not_set_retry_eligible(tmp_path: Path) -> None:
     """A resolved error in the source DB doesn't keep the row out of the index."""
     db = tmp_path / "resolved.db"
-    conn = _create_minimal_db(db)
-    rid = _insert_completed_request(
+    conn = create_minimal_source_db(db)
+    rid = insert_completed_request(
         conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
     )
     conn.execute(
@@ -271,8 +179,8 @@ def test_resolved_errors_do_not_set_retry_eligible(tmp_path: Path) -> None:
 def test_exclude_retry_eligible_drops_them_from_index(tmp_path: Path) -> None:
     """prev-error-free mode rebuilds with exclude_retry_eligible=True."""
     db = tmp_path / "errored.db"
-    conn = _create_minimal_db(db)
-    rid = _insert_completed_request(
+    conn = create_minimal_source_db(db)
+    rid = insert_completed_request(
         conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
     )
     conn.execute(
@@ -301,8 +209,8 @@ def test_exclude_retry_eligible_drops_them_from_index(tmp_path: Path) -> None:
 def test_lookup_skipdedup_returns_none(tmp_path: Path) -> None:
     """A None dedup_key is the SkipDeduplicationCheck signal: always miss."""
     db = tmp_path / "a.db"
-    conn = _create_minimal_db(db)
-    _insert_completed_request(
+    conn = create_minimal_source_db(db)
+    insert_completed_request(
         conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
     )
     conn.close()
@@ -373,3 +281,99 @@ def test_pre_migration_db_without_hateoas_column_reads_as_none(
         assert chain == [(1, None)]
     finally:
         idx.close()
+
+
+def test_duplicate_keys_within_one_db_keep_latest(tmp_path: Path) -> None:
+    """The policy also applies between rows of the same source DB."""
+    db = tmp_path / "a.db"
+    conn = create_minimal_source_db(db)
+    insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=100, created_at_ns=1
+    )
+    newer = insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=300, created_at_ns=1
+    )
+    insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=200, created_at_ns=1
+    )
+    conn.close()
+
+    idx = SourceIndex(source_db_paths=[db])
+    try:
+        entry = idx.lookup("K")
+        assert entry is not None
+        assert entry.request_id == newer
+    finally:
+        idx.close()
+
+
+def test_excluded_request_ids_fall_back_to_other_db(tmp_path: Path) -> None:
+    """An excluded winner leaves the key to the next-best source row."""
+    db_a = tmp_path / "a.db"
+    db_b = tmp_path / "b.db"
+    conn_a = create_minimal_source_db(db_a)
+    conn_b = create_minimal_source_db(db_b)
+    insert_completed_request(
+        conn_a, dedup_key="K", completed_at_ns=100, created_at_ns=1
+    )
+    excluded = insert_completed_request(
+        conn_b, dedup_key="K", completed_at_ns=200, created_at_ns=1
+    )
+    conn_a.close()
+    conn_b.close()
+
+    idx = SourceIndex(
+        source_db_paths=[db_a, db_b],
+        excluded_request_ids={1: {excluded}},
+    )
+    try:
+        entry = idx.lookup("K")
+        assert entry is not None
+        assert entry.source_db_idx == 0
+    finally:
+        idx.close()
+
+
+def test_build_reports_progress_per_source(tmp_path: Path) -> None:
+    paths = []
+    for name, count in (("a?.db", 2), ("b#.db", 3)):
+        path = tmp_path / name
+        conn = create_minimal_source_db(path)
+        for i in range(count):
+            insert_completed_request(
+                conn, dedup_key=f"K{i}", completed_at_ns=i, created_at_ns=i
+            )
+        conn.close()
+        paths.append(path)
+    events: list[IndexBuildProgress] = []
+
+    idx = SourceIndex(source_db_paths=paths, on_progress=events.append)
+    idx.close()
+
+    assert [(e.source_db_idx, e.rows, e.keys) for e in events] == [
+        (0, 2, 2),
+        (1, 1, 3),  # ties on K0 and K1 go to the earlier DB
+    ]
+    assert all(e.source_db_count == 2 for e in events)
+
+
+def test_existing_index_db_file_is_rebuilt(tmp_path: Path) -> None:
+    """Building twice at the same on-disk path replaces the old index."""
+    db = tmp_path / "a.db"
+    conn = create_minimal_source_db(db)
+    insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
+    )
+    conn.close()
+    index_db = tmp_path / "index.db"
+
+    SourceIndex(source_db_paths=[db], index_db_path=index_db).close()
+    idx = SourceIndex(
+        source_db_paths=[db],
+        index_db_path=index_db,
+        exclude_retry_eligible=True,
+    )
+    try:
+        assert idx.lookup("K") is not None
+    finally:
+        idx.close()
@@ -0,0 +1,217 @@
+"""Tests for the persisted, incrementally updated :class:`SourceIndex`.
+
+An index built at ``index_db_path`` records each source DB's path, size,
+mtime and max request id. A later build over the same sources reuses it
+when nothing changed and otherwise merges in only rows above the
+source's high-water id.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+from kent.driver.local_only_driver.source_index import (
+    IndexBuildProgress,
+    SourceIndex,
+)
+from tests.drivers.local_only.conftest import (
+    create_minimal_source_db,
+    insert_completed_request,
+)
+
+
+def _build(
+    paths: list[Path], index_db: Path, **kwargs: object
+) -> tuple[SourceIndex, list[IndexBuildProgress]]:
+    events: list[IndexBuildProgress] = []
+    idx = SourceIndex(
+        source_db_paths=paths,
+        index_db_path=index_db,
+        on_progress=events.append,
+        **kwargs,  # type: ignore[arg-type]
+    )
+    return idx, events
+
+
+def _bump_mtime(path: Path) -> None:
+    """Make a change visible even on filesystems with coarse mtimes."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _add_structural_error(path: Path, request_id: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO errors (request_id, error_type, is_resolved) "
+        "VALUES (?, 'HTMLStructuralAssumptionException', 0)",
+        (request_id,),
+    )
+    conn.commit()
+    conn.close()
+    _bump_mtime(path)
+
+
+def test_unchanged_sources_reuse_cached_index(tmp_path: Path) -> None:
+    db = tmp_path / "a.db"
+    conn = create_minimal_source_db(db)
+    insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
+    )
+    conn.close()
+    index_db = tmp_path / "out.db.source-index"
+    _build([db], index_db)[0].close()
+
+    idx, events = _build([db], index_db)
+    try:
+        assert [(e.cached, e.rows, e.keys) for e in events] == [(True, 0, 1)]
+        assert idx.lookup("K") is not None
+    finally:
+        idx.close()
+
+
+def test_only_new_rows_are_merged(tmp_path: Path) -> None:
+    """Rows added since the last build are merged under the usual policy."""
+    db = tmp_path / "a.db"
+    conn = create_minimal_source_db(db)
+    insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
+    )
+    insert_completed_request(
+        conn, dedup_key="OLD", completed_at_ns=1, created_at_ns=1
+    )
+    index_db = tmp_path / "index.db"
+    _build([db], index_db)[0].close()
+    newer = insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=5, created_at_ns=1
+    )
+    insert_completed_request(
+        conn, dedup_key="NEW", completed_at_ns=1, created_at_ns=1
+    )
+    conn.close()
+
+    idx, events = _build([db], index_db)
+    try:
+        assert [(e.cached, e.rows, e.keys) for e in events] == [(False, 2, 3)]
+        entry = idx.lookup("K")
+        assert entry is not None
+        assert entry.request_id == newer
+        assert idx.lookup("OLD") is not None
+        assert idx.lookup("NEW") is not None
+    finally:
+        idx.close()
+
+
+def test_rows_completed_after_build_are_picked_up(tmp_path: Path) -> None:
+    """A row still pending at build time is re-read once it completes."""
+    db = tmp_path / "a.db"
+    conn = create_minimal_source_db(db)
+    conn.execute(
+        "ALTER TABLE requests ADD COLUMN status TEXT DEFAULT 'completed'"
+    )
+    insert_completed_request(
+        conn, dedup_key="DONE", completed_at_ns=1, created_at_ns=1
+    )
+    pending = conn.execute(
+        "INSERT INTO requests (deduplication_key, url, status) "
+        "VALUES ('LATE', 'http://x/', 'pending')"
+    ).lastrowid
+    insert_completed_request(
+        conn, dedup_key="AFTER", completed_at_ns=1, created_at_ns=1
+    )
+    conn.commit()
+    index_db = tmp_path / "index.db"
+    idx, _ = _build([db], index_db)
+    assert idx.lookup("LATE") is None
+    idx.close()
+
+    conn.execute(
+        "UPDATE requests SET status = 'completed', "
+        "response_status_code = 200, content_compressed = x'00', "
+        "completed_at_ns = 2, created_at_ns = 2 WHERE id = ?",
+        (pending,),
+    )
+    conn.commit()
+    conn.close()
+    _bump_mtime(db)
+
+    idx, events = _build([db], index_db)
+    try:
+        assert events[0].cached is False
+        assert idx.lookup("LATE") is not None
+        assert idx.lookup("DONE") is not None
+    finally:
+        idx.close()
+
+
+def test_new_errors_refresh_retry_flags(tmp_path: Path) -> None:
+    db = tmp_path / "a.db"
+    conn = create_minimal_source_db(db)
+    rid = insert_completed_request(
+        conn, dedup_key="K", completed_at_ns=1, created_at_ns=1
+    )
+    conn.close()
+    index_db = tmp_path / "index.db"
+    _build([db], index_db)[0].close()
+    _add_structural_error(db, rid)
+
+    idx, _ = _build([db], index_db)
+    try:
+        entry = idx.lookup("K")
+        assert entry is not None
+        assert entry.retry_eligible is True
+    finally:
+        idx.close()
+
+
+def test_new_exclusions_force_full_rebuild(tmp_path: Path) -> None:
+    """prev-error-free: a newly errored winner yields to the next-best row."""
+    db_a = tmp_path / "a.db"
+    db_b = tmp_path / "b.db"
+    conn_a = create_minimal_source_db(db_a)
+    conn_b = create_minimal_source_db(db_b)
+    insert_completed_request(
+        conn_a, dedup_key="K", completed_at_ns=1, created_at_ns=1
+    )
+    winner = insert_completed_request(
+        conn_b, dedup_key="K", completed_at_ns=2, created_at_ns=1
+    )
+    conn_a.close()
+    conn_b.close()
+    index_db = tmp_path / "index.db"
+    _build([db_a, db_b], index_db, exclude_retry_eligible=True)[0].close()
+    _add_structural_error(db_b, winner)
+
+    idx, events = _build([db_a, db_b], index_db, exclude_retry_eligible=True)
+    try:
+        assert not any(e.cached for e in events)
+        entry = idx.lookup("K")
+        assert entry is not None
+        assert entry.source_db_idx == 0
+    finally:
+        idx.close()
+
+
+def test_different_settings_rebuild(tmp_path: Path) -> None:
+    """Changing sources, exclusions or ``rebuild`` discards the cache."""
+    db_a = tmp_path / "a.db"
+    db_b = tmp_path / "b.db"
+    for path, completed in ((db_a, 1), (db_b, 2)):
+        conn = create_minimal_source_db(path)
+        insert_completed_request(
+            conn, dedup_key="K", completed_at_ns=completed, created_at_ns=1
+        )
+        conn.close()
+    index_db = tmp_path / "index.db"
+    _build([db_a], index_db)[0].close()
+
+    idx, events = _build([db_a, db_b], index_db)
+    entry = idx.lookup("K")
+    idx.close()
+    assert [e.cached for e in events] == [False, False]
+    assert entry is not None and entry.source_db_idx == 1
+
+    idx, events = _build([db_a, db_b], index_db, rebuild=True)
+    idx.close()
+    assert [e.cached for e in events] == [False, False]
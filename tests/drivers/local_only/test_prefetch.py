@@ -0,0 +1,185 @@
+"""Tests for :class:`SourceIndex` reader threads and response prefetch.
+
+Responses are read on the index's executor, each thread through its own
+read-only connection, and can be prefetched in batches ahead of the
+workers. ``LocalOnlyDriver`` prefetches the next pending requests as it
+dequeues.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from kent.driver.local_only_driver import LocalOnlyDriver
+from kent.driver.local_only_driver.source_index import (
+    FetchedResponse,
+    IndexEntry,
+    SourceIndex,
+)
+from tests.conftest import AioHttpTestServer
+from tests.drivers.local_only.conftest import (
+    create_minimal_source_db,
+    insert_completed_request,
+    make_bug_court_scraper,
+    read_result_data_json,
+    run_with_persistent_driver,
+)
+
+
+def _source_with_pages(path: Path, count: int) -> list[str]:
+    conn = create_minimal_source_db(path)
+    keys = [f"K{i}" for i in range(count)]
+    for i, key in enumerate(keys):
+        insert_completed_request(
+            conn,
+            dedup_key=key,
+            completed_at_ns=1,
+            created_at_ns=1,
+            content=f"<html>page {i}</html>".encode(),
+        )
+    conn.close()
+    return keys
+
+
+def _canonical(result: dict[str, object]) -> str:
+    return json.dumps(result, sort_keys=True)
+
+
+def _entries(idx: SourceIndex, keys: list[str]) -> list[IndexEntry]:
+    entries = [idx.lookup(key) for key in keys]
+    assert all(entry is not None for entry in entries)
+    return entries  # type: ignore[return-value]
+
+
+def test_prefetched_response_matches_direct_fetch(tmp_path: Path) -> None:
+    db = tmp_path / "a.db"
+    keys = _source_with_pages(db, 40)
+    idx = SourceIndex(source_db_paths=[db])
+    try:
+        entries = _entries(idx, keys)
+        # 40 rows span two batched reads.
+        assert idx.prefetch(entries) == 40
+        assert idx.prefetch(entries) == 0
+        for entry in entries:
+            future = idx.take_prefetched(entry)
+            assert future is not None
+            assert future.result(timeout=10) == idx.fetch_response(entry)
+        assert idx.take_prefetched(entries[0]) is None
+        assert idx.prefetched_count() == 0
+    finally:
+        idx.close()
+
+
+def test_prefetch_limit_drops_oldest(tmp_path: Path) -> None:
+    db = tmp_path / "a.db"
+    keys = _source_with_pages(db, 6)
+    idx = SourceIndex(source_db_paths=[db], prefetch_limit=4)
+    try:
+        entries = _entries(idx, keys)
+        idx.prefetch(entries)
+        assert idx.prefetched_count() == 4
+        assert idx.take_prefetched(entries[0]) is None
+        assert idx.take_prefetched(entries[1]) is None
+        future = idx.take_prefetched(entries[5])
+        assert future is not None
+        assert future.result(timeout=10).content == b"<html>page 5</html>"
+    finally:
+        idx.close()
+
+
+def test_prefetch_of_missing_row_raises_on_claim(tmp_path: Path) -> None:
+    db = tmp_path / "a.db"
+    keys = _source_with_pages(db, 2)
+    idx = SourceIndex(source_db_paths=[db])
+    try:
+        gone = IndexEntry(
+            dedup_key="gone",
+            source_db_idx=0,
+            request_id=999,
+            retry_eligible=False,
+        )
+        idx.prefetch([*_entries(idx, keys), gone])
+        future = idx.take_prefetched(gone)
+        assert future is not None
+        with pytest.raises(RuntimeError, match="row is gone"):
+            future.result(timeout=10)
+        with pytest.raises(RuntimeError, match="row is gone"):
+            idx.fetch_response(gone)
+    finally:
+        idx.close()
+
+
+def test_each_thread_reads_through_its_own_connection(tmp_path: Path) -> None:
+    db = tmp_path / "a.db"
+    keys = _source_with_pages(db, 4)
+    idx = SourceIndex(source_db_paths=[db])
+    try:
+        entries = _entries(idx, keys)
+        barrier = threading.Barrier(3)
+        results: list[FetchedResponse] = []
+
+        def read(entry: IndexEntry) -> None:
+            barrier.wait()
+            results.append(idx.fetch_response(entry))
+
+        threads = [
+            threading.Thread(target=read, args=(entry,))
+            for entry in entries[:3]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 3
+        assert len(idx._reader_conns) == 3
+        assert not set(map(id, idx._reader_conns)) & set(
+            map(id, idx._source_conns)
+        )
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            idx._reader_conns[0].execute("DELETE FROM requests")
+    finally:
+        idx.close()
+
+
+@pytest.mark.asyncio
+async def test_driver_serves_prefetched_responses(
+    bug_court_server: AioHttpTestServer, tmp_path: Path
+) -> None:
+    """Replay claims prefetched responses and stores the same results."""
+    source = tmp_path / "source.db"
+    out = tmp_path / "out.db"
+    await run_with_persistent_driver(
+        make_bug_court_scraper(bug_court_server.url), source
+    )
+
+    claimed: list[bool] = []
+    async with LocalOnlyDriver.open(
+        scraper=make_bug_court_scraper(bug_court_server.url),
+        db_path=out,
+        source_db_paths=[source],
+        miss_policy="raise",
+        num_workers=4,
+        enable_monitor=False,
+    ) as driver:
+        take = driver.source_index.take_prefetched
+
+        def counting_take(entry: IndexEntry):  # type: ignore[no-untyped-def]
+            future = take(entry)
+            claimed.append(future is not None)
+            return future
+
+        driver.source_index.take_prefetched = counting_take  # type: ignore[method-assign]
+        await driver.run(setup_signal_handlers=False)
+
+    assert any(claimed)
+    source_results = await read_result_data_json(source)
+    replay_results = await read_result_data_json(out)
+    assert sorted(map(_canonical, replay_results)) == sorted(
+        map(_canonical, source_results)
+    )
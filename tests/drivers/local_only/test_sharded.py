@@ -0,0 +1,306 @@
+"""Tests for multi-process sharded replay (:func:`run_sharded_replay`).
+
+A sharded replay expands the crawl in-process, replays slices of the
+frontier in separate processes against copies of the output DB, and
+merges the copies back. Its output must match a single-process replay.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from kent.driver.local_only_driver import (
+    LocalOnlyDriver,
+    run_sharded_replay,
+)
+from kent.driver.local_only_driver.sharded import (
+    _create_shard,
+    _merge_shard,
+    _plan_shards,
+)
+from kent.driver.persistent_driver.database import init_database
+from kent.driver.persistent_driver.sql_manager import SQLManager
+from kent.driver.persistent_driver.stats import check_run_counters
+from tests.conftest import AioHttpTestServer
+from tests.drivers.local_only.conftest import (
+    corrupt_one_detail_response,
+    make_bug_court_scraper,
+    run_with_persistent_driver,
+)
+
+
+def _snapshot(db_path: Path) -> dict[str, Any]:
+    """Everything replay decides, independent of row ids and order."""
+    conn = sqlite3.connect(db_path)
+    try:
+        requests = sorted(
+            conn.execute(
+                "SELECT r.url, r.status, p.url FROM requests r "
+                "LEFT JOIN requests p ON p.id = r.parent_request_id"
+            ),
+            key=repr,
+        )
+        results = sorted(
+            json.dumps(json.loads(row[0]), sort_keys=True)
+            for row in conn.execute("SELECT data_json FROM results")
+        )
+        dangling = conn.execute(
+            "SELECT COUNT(*) FROM requests r WHERE r.parent_request_id "
+            "IS NOT NULL AND r.parent_request_id NOT IN "
+            "(SELECT id FROM requests)"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return {"requests": requests, "results": results, "dangling": dangling}
+
+
+async def _single_process(
+    server_url: str, source: Path, out: Path, **kwargs: Any
+) -> None:
+    async with LocalOnlyDriver.open(
+        scraper=make_bug_court_scraper(server_url),
+        db_path=out,
+        source_db_paths=[source],
+        enable_monitor=False,
+        **kwargs,
+    ) as driver:
+        await driver.run(setup_signal_handlers=False)
+
+
+@pytest.mark.asyncio
+async def test_sharded_replay_matches_single_process(
+    bug_court_server: AioHttpTestServer, tmp_path: Path
+) -> None:
+    source = tmp_path / "source.db"
+    await run_with_persistent_driver(
+        make_bug_court_scraper(bug_court_server.url), source
+    )
+    single = tmp_path / "single.db"
+    sharded = tmp_path / "sharded.db"
+    await _single_process(bug_court_server.url, source, single)
+
+    result = await run_sharded_replay(
+        make_bug_court_scraper(bug_court_server.url),
+        sharded,
+        source_db_paths=[source],
+        shards=2,
+        frontier_per_shard=2,
+        enable_monitor=False,
+    )
+
+    assert result.shards == 2
+    assert result.frontier >= 4
+    assert _snapshot(sharded) == _snapshot(single)
+    assert _snapshot(sharded)["dangling"] == 0
+    assert not list(tmp_path.glob("sharded.db.shard-*"))
+
+
+def _output_counter_drift(db_path: Path) -> list[tuple[Any, ...]]:
+    """Requests whose child_count or result_count disagree with a recount."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT r.id, r.child_count, r.result_count, "
+            "(SELECT COUNT(*) FROM requests c "
+            " WHERE c.parent_request_id = r.id) AS children, "
+            "(SELECT COUNT(*) FROM results s "
+            " WHERE s.request_id = r.id) AS results "
+            "FROM requests r "
+            "WHERE r.child_count != children OR r.result_count != results"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_replay_keeps_counters_exact(
+    bug_court_server: AioHttpTestServer, tmp_path: Path
+) -> None:
+    """Merging replaced frontier rows leaves no counter behind."""
+    source = tmp_path / "source.db"
+    await run_with_persistent_driver(
+        make_bug_court_scraper(bug_court_server.url), source
+    )
+    sharded = tmp_path / "sharded.db"
+
+    await run_sharded_replay(
+        make_bug_court_scraper(bug_court_server.url),
+        sharded,
+        source_db_paths=[source],
+        shards=2,
+        frontier_per_shard=2,
+        enable_monitor=False,
+    )
+
+    assert _output_counter_drift(sharded) == []
+    engine, session_factory = await init_database(sharded)
+    try:
+        drift = await check_run_counters(session_factory)
+        status = await SQLManager(engine, session_factory).get_run_status()
+    finally:
+        await engine.dispose()
+    assert drift["has_drift"] is False, drift
+    assert status == "done"
+
+
+@pytest.mark.asyncio
+async def test_sharded_replay_keeps_miss_policy_and_retry_semantics(
+    bug_court_server: AioHttpTestServer, tmp_path: Path
+) -> None:
+    """curr-error-free + stub: a broken continuation ends pending."""
+    source = tmp_path / "source.db"
+    await run_with_persistent_driver(
+        make_bug_court_scraper(bug_court_server.url), source
+    )
+    broken_url = await corrupt_one_detail_response(source)
+    single = tmp_path / "single.db"
+    sharded = tmp_path / "sharded.db"
+    await _single_process(
+        bug_court_server.url, source, single, mode="curr-error-free"
+    )
+
+    result = await run_sharded_replay(
+        make_bug_court_scraper(bug_court_server.url),
+        sharded,
+        source_db_paths=[source],
+        shards=2,
+        mode="curr-error-free",
+        miss_policy="stub",
+        frontier_per_shard=2,
+        enable_monitor=False,
+    )
+
+    assert result.shards == 2
+    snapshot = _snapshot(sharded)
+    assert snapshot == _snapshot(single)
+    statuses = {url: status for url, status, _ in snapshot["requests"]}
+    assert statuses[broken_url] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_crawl_smaller_than_frontier_runs_in_process(
+    bug_court_server: AioHttpTestServer, tmp_path: Path
+) -> None:
+    source = tmp_path / "source.db"
+    await run_with_persistent_driver(
+        make_bug_court_scraper(bug_court_server.url), source
+    )
+    single = tmp_path / "single.db"
+    sharded = tmp_path / "sharded.db"
+    await _single_process(bug_court_server.url, source, single)
+
+    result = await run_sharded_replay(
+        make_bug_court_scraper(bug_court_server.url),
+        sharded,
+        source_db_paths=[source],
+        shards=2,
+        frontier_per_shard=10_000,
+        enable_monitor=False,
+    )
+
+    assert result.shards == 0
+    assert _snapshot(sharded) == _snapshot(single)
+
+
+def _add_request(
+    conn: sqlite3.Connection,
+    url: str,
+    *,
+    parent: int | None,
+    status: str = "completed",
+    dedup_key: str | None = None,
+) -> int:
+    (queue_counter,) = conn.execute(
+        "SELECT COALESCE(MAX(queue_counter), 0) + 1 FROM requests"
+    ).fetchone()
+    cur = conn.execute(
+        "INSERT INTO requests (status, queue_counter, method, url, "
+        "continuation, parent_request_id, deduplication_key) "
+        "VALUES (?, ?, 'GET', ?, 'parse', ?, ?)",
+        (status, queue_counter, url, parent, dedup_key or url),
+    )
+    return cur.lastrowid  # type: ignore[return-value]
+
+
+def _add_result(conn: sqlite3.Connection, request_id: int, name: str) -> None:
+    conn.execute(
+        "INSERT INTO results (request_id, result_type, data_json) "
+        "VALUES (?, 'Case', ?)",
+        (request_id, json.dumps({"name": name})),
+    )
+
+
+@pytest.mark.asyncio
+async def test_merge_shifts_ids_and_drops_duplicate_subtrees(
+    tmp_path: Path,
+) -> None:
+    """Two shards reaching the same dedup_key keep only the first."""
+    out = tmp_path / "out.db"
+    async with SQLManager.open(out):
+        pass
+    conn = sqlite3.connect(out)
+    root = _add_request(conn, "root", parent=None)
+    frontier = [
+        _add_request(conn, url, parent=root, status="pending")
+        for url in ("a", "b")
+    ]
+    conn.commit()
+    conn.close()
+
+    plan = _plan_shards(out, 2)
+    assert plan is not None
+    assert sorted(map(sorted, plan.owned)) == [[frontier[0]], [frontier[1]]]
+    shard_paths = [tmp_path / f"shard-{i}.db" for i in range(2)]
+    for shard_path, owned in zip(shard_paths, plan.owned, strict=True):
+        _create_shard(out, shard_path, owned)
+        conn = sqlite3.connect(shard_path)
+        (held,) = conn.execute(
+            "SELECT COUNT(*) FROM requests WHERE status = 'held'"
+        ).fetchone()
+        assert held == 1
+        (mine,) = owned
+        conn.execute(
+            "UPDATE requests SET status = 'completed' WHERE id = ?", (mine,)
+        )
+        shared = _add_request(conn, "shared", parent=mine)
+        _add_result(conn, shared, f"shared-from-{mine}")
+        leaf = _add_request(conn, f"leaf-{mine}", parent=shared)
+        _add_result(conn, leaf, f"leaf-{mine}")
+        conn.commit()
+        conn.close()
+
+    first = _merge_shard(out, shard_paths[0], plan, plan.owned[0])
+    second = _merge_shard(out, shard_paths[1], plan, plan.owned[1])
+
+    assert first.dropped == set()
+    assert len(second.dropped) == 2
+    conn = sqlite3.connect(out)
+    try:
+        rows = conn.execute(
+            "SELECT r.url, r.status, p.url FROM requests r "
+            "LEFT JOIN requests p ON p.id = r.parent_request_id ORDER BY r.id"
+        ).fetchall()
+        results = sorted(
+            json.loads(row[0])["name"]
+            for row in conn.execute("SELECT data_json FROM results")
+        )
+    finally:
+        conn.close()
+    first_owner = "a" if plan.owned[0] == [frontier[0]] else "b"
+    first_id = plan.owned[0][0]
+    assert sorted(rows, key=repr) == sorted(
+        [
+            ("root", "completed", None),
+            ("a", "completed", "root"),
+            ("b", "completed", "root"),
+            ("shared", "completed", first_owner),
+            (f"leaf-{first_id}", "completed", "shared"),
+        ],
+        key=repr,
+    )
+    assert results == [f"leaf-{first_id}", f"shared-from-{first_id}"]
@@ -0,0 +1,244 @@
+"""Tests for SyncDriver concurrent mode.
+
+This module tests the optional concurrent execution of SyncDriver:
+- num_workers fetches requests on a thread pool
+- continuation_processes runs continuations on a process pool
+- The heap remains the single source of ordering
+- on_data and the other callbacks fire in the driver thread
+"""
+
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from lxml import html
+
+from kent.common.checked_html import CheckedHtmlElement
+from kent.common.exceptions import (
+    HTMLStructuralAssumptionException,
+    ScraperAssumptionException,
+    TransientException,
+)
+from kent.data_types import (
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+)
+from kent.driver.sync_driver import SyncDriver
+from tests.scraper.example.bug_court import BugCourtScraper
+from tests.utils import collect_results
+
+
+class StructuralErrorScraper(BaseScraper[dict]):
+    """Yields data, then trips a structural assumption on the error page.
+
+    Defined at module level so it can be pickled into a process pool.
+    """
+
+    BASE_URL = "http://127.0.0.1"
+
+    def get_entry(self) -> Generator[Request, None, None]:
+        yield Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"{self.BASE_URL}/cases/BCC-2024-001?error=true",
+            ),
+            continuation="parse_detail",
+        )
+
+    def parse_detail(self, response: Response):
+        yield ParsedData(data={"partial": True})
+        tree = CheckedHtmlElement(html.fromstring(response.text), response.url)
+        tree.checked_xpath("//div[@class='case-details']", "case details")
+
+
+class PriorityScraper(BaseScraper[dict]):
+    """Yields entry requests out of priority order."""
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__()
+        self.base_url = base_url
+
+    def get_entry(self) -> Generator[Request, None, None]:
+        for priority in (9, 1, 5):
+            yield Request(
+                request=HTTPRequestParams(
+                    method=HttpMethod.GET,
+                    url=f"{self.base_url}/cases?p={priority}",
+                ),
+                continuation="parse",
+                priority=priority,
+            )
+
+    def parse(self, response: Response):
+        yield ParsedData(data={"priority": response.request.priority})
+
+
+def _run_bug_court(
+    server_url: str, tmp_path: Path, **driver_kwargs
+) -> list[dict]:
+    scraper = BugCourtScraper()
+    scraper.BASE_URL = server_url
+    callback, results = collect_results()
+    driver = SyncDriver(
+        scraper=scraper,
+        storage_dir=tmp_path,
+        on_data=callback,
+        **driver_kwargs,
+    )
+    driver.run()
+    return results
+
+
+class TestConcurrentFetch:
+    """Tests for the fetch thread pool."""
+
+    def test_thread_pool_matches_serial_results(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        """The driver shall produce the same data with num_workers > 1."""
+        serial = _run_bug_court(server_url, tmp_path)
+        concurrent = _run_bug_court(server_url, tmp_path, num_workers=4)
+
+        assert len(concurrent) == len(serial) > 0
+        key = lambda d: d["docket"]  # noqa: E731
+        assert sorted(concurrent, key=key) == sorted(serial, key=key)
+
+    def test_on_data_fires_in_driver_thread(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        """The on_data callback shall run in the thread that called run()."""
+        scraper = BugCourtScraper()
+        scraper.BASE_URL = server_url
+        threads: set[int] = set()
+
+        driver = SyncDriver(
+            scraper=scraper,
+            storage_dir=tmp_path,
+            on_data=lambda _data: threads.add(threading.get_ident()),
+            num_workers=4,
+        )
+        driver.run()
+
+        assert threads == {threading.get_ident()}
+
+    def test_dispatch_follows_heap_priority(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        """With one fetch worker, requests shall be dispatched by priority."""
+
+        callback, results = collect_results()
+        driver = SyncDriver(
+            scraper=PriorityScraper(server_url),
+            storage_dir=tmp_path,
+            on_data=callback,
+            num_workers=1,
+            continuation_processes=1,
+        )
+        driver.run()
+
+        assert [r["priority"] for r in results] == [1, 5, 9]
+
+    def test_transient_exception_routes_to_callback(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        """Transient errors raised in a fetch thread shall reach the callback."""
+
+        class ServerErrorScraper(BaseScraper[dict]):
+            TRANSIENT_HTTP_ERROR_CODES = frozenset({500})
+
+            def get_entry(self) -> Generator[Request, None, None]:
+                yield Request(
+                    request=HTTPRequestParams(
+                        method=HttpMethod.GET,
+                        url=f"{server_url}/cases/BCC-2024-001?server_error=true",
+                    ),
+                    continuation="parse",
+                )
+                yield Request(
+                    request=HTTPRequestParams(
+                        method=HttpMethod.GET,
+                        url=f"{server_url}/cases",
+                    ),
+                    continuation="parse",
+                )
+
+            def parse(self, response: Response):
+                yield ParsedData(data={"url": response.url})
+
+        errors: list[TransientException] = []
+
+        def on_transient(exc: TransientException) -> bool:
+            errors.append(exc)
+            return True
+
+        callback, results = collect_results()
+        driver = SyncDriver(
+            scraper=ServerErrorScraper(),
+            storage_dir=tmp_path,
+            on_data=callback,
+            on_transient_exception=on_transient,
+            num_workers=2,
+        )
+        driver.run()
+
+        assert len(errors) == 1
+        assert results == [{"url": f"{server_url}/cases"}]
+
+    def test_rejects_invalid_worker_counts(self, tmp_path: Path) -> None:
+        """The driver shall reject non-positive worker counts."""
+        with pytest.raises(ValueError):
+            SyncDriver(BugCourtScraper(), storage_dir=tmp_path, num_workers=0)
+        with pytest.raises(ValueError):
+            SyncDriver(
+                BugCourtScraper(),
+                storage_dir=tmp_path,
+                continuation_processes=-1,
+            )
+
+
+class TestProcessPoolContinuations:
+    """Tests for running continuations in a process pool."""
+
+    def test_process_pool_matches_serial_results(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        """The driver shall produce the same data with continuation_processes."""
+        serial = _run_bug_court(server_url, tmp_path)
+        pooled = _run_bug_court(
+            server_url, tmp_path, num_workers=4, continuation_processes=2
+        )
+
+        key = lambda d: d["docket"]  # noqa: E731
+        assert sorted(pooled, key=key) == sorted(serial, key=key)
+
+    def test_structural_error_keeps_step_atomic(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        """A step failing in a pool process shall emit none of its yields."""
+        scraper = StructuralErrorScraper()
+        scraper.BASE_URL = server_url
+        errors: list[ScraperAssumptionException] = []
+
+        def on_structural(exc: ScraperAssumptionException) -> bool:
+            errors.append(exc)
+            return True
+
+        callback, results = collect_results()
+        driver = SyncDriver(
+            scraper=scraper,
+            storage_dir=tmp_path,
+            on_data=callback,
+            on_structural_error=on_structural,
+            continuation_processes=1,
+        )
+        driver.run()
+
+        assert results == []
+        assert len(errors) == 1
+        assert isinstance(errors[0], HTMLStructuralAssumptionException)
+        assert errors[0].selector == "//div[@class='case-details']"
@@ -0,0 +1,203 @@
+"""Tests for the cross-run content-addressed archive store.
+
+``ArchiveStore`` keeps one copy of each archived file under
+``{root}/objects`` and an append-only index that is read into memory when
+the store is opened. Local archive handlers given a ``store`` add every
+keyed file to it and answer ``should_download`` from the index, linking
+stored files into the current run's storage directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from kent.driver import archive_handler
+from kent.driver.archive_handler import (
+    LocalAsyncArchiveHandler,
+    LocalAsyncStreamingArchiveHandler,
+    LocalSyncArchiveHandler,
+)
+from kent.driver.archive_store import ArchiveStore
+from kent.driver.persistent_driver.web.archive import UuidAsyncArchiveHandler
+
+PAYLOAD = b"%PDF-1.7 opinion text" * 100
+SHA = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+async def _aiter(data: bytes) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), 64):
+        yield data[i : i + 64]
+
+
+async def _archive_in_run(
+    store: ArchiveStore, storage_dir: Path, key: str
+) -> str:
+    handler = LocalAsyncStreamingArchiveHandler(storage_dir, store=store)
+    return await handler.save_stream(
+        "https://example.com/op.pdf", key, "pdf", None, _aiter(PAYLOAD)
+    )
+
+
+class TestArchiveStoreIndex:
+    async def test_index_survives_reopen(self, tmp_path: Path) -> None:
+        """Entries shall be found again after reopening the store."""
+        store = ArchiveStore(tmp_path / "store")
+        path = await _archive_in_run(store, tmp_path / "run1", "case-1")
+
+        reopened = ArchiveStore(tmp_path / "store")
+        entry = reopened.lookup("case-1")
+
+        assert entry is not None
+        assert (entry.sha256, entry.size) == (SHA, len(PAYLOAD))
+        assert entry.name == f"{SHA}.pdf"
+        assert reopened.blob_path(SHA).samefile(path)
+
+    async def test_identical_files_share_one_blob(
+        self, tmp_path: Path
+    ) -> None:
+        """Two keys with the same bytes shall be stored once."""
+        store = ArchiveStore(tmp_path / "store")
+        first = await _archive_in_run(store, tmp_path / "run1", "case-1")
+        second = await _archive_in_run(store, tmp_path / "run1", "case-2")
+
+        stats = store.stats()
+        assert (stats.keys, stats.blobs) == (2, 1)
+        assert stats.dedup_saved_bytes == len(PAYLOAD)
+        assert Path(first).samefile(second)
+
+    async def test_refresh_counts_own_hits_once(self, tmp_path: Path) -> None:
+        """A hit this store recorded is not counted again on refresh."""
+        first = ArchiveStore(tmp_path / "store")
+        await _archive_in_run(first, tmp_path / "run1", "case-1")
+        second = ArchiveStore(tmp_path / "store")
+        entry = second.lookup("case-1")
+        assert entry is not None
+
+        # The second store appends first, so the first falls behind.
+        assert second.link_into("case-1", entry, tmp_path / "a" / "f")
+        assert first.link_into("case-1", entry, tmp_path / "b" / "f")
+        first.refresh()
+        second.refresh()
+
+        assert first.stats().hits == second.stats().hits == 2
+        assert ArchiveStore(tmp_path / "store").stats().hits == 2
+
+    async def test_newline_key_is_not_recorded(self, tmp_path: Path) -> None:
+        """A key that would split an index record is never linked."""
+        store = ArchiveStore(tmp_path / "store")
+        await _archive_in_run(store, tmp_path / "run1", "case-1")
+        entry = store.lookup("case-1")
+        assert entry is not None
+
+        assert store.link_into("bad\nkey", entry, tmp_path / "f") is None
+        assert store.stats().hits == 0
+        assert ArchiveStore(tmp_path / "store").stats().hits == 0
+
+    def test_bad_index_records_are_skipped(self, tmp_path: Path) -> None:
+        """A corrupt index line shall not prevent the store from opening."""
+        root = tmp_path / "store"
+        root.mkdir()
+        (root / "index.tsv").write_text(
+            f"P\t{SHA}\tnot-a-size\tx.pdf\tcase-1\n"
+            f"P\t{SHA}\t7\tx.pdf\tcase-2\n"
+        )
+
+        store = ArchiveStore(root)
+
+        assert store.lookup("case-1") is None
+        assert store.lookup("case-2") is not None
+
+
+class TestHandlersWithStore:
+    async def test_second_run_links_instead_of_downloading(
+        self, tmp_path: Path
+    ) -> None:
+        """A later run shall link the stored file and record the reuse."""
+        store = ArchiveStore(tmp_path / "store")
+        first = await _archive_in_run(store, tmp_path / "run1", "case-1")
+        handler = LocalAsyncStreamingArchiveHandler(
+            tmp_path / "run2", store=store
+        )
+
+        decision = await handler.should_download(
+            "https://example.com/op.pdf", "case-1", "pdf", None
+        )
+
+        assert decision.download is False
+        linked = Path(decision.file_url)
+        assert linked.is_relative_to(tmp_path / "run2")
+        assert linked.samefile(first)
+        stats = ArchiveStore(tmp_path / "store").stats()
+        assert (stats.hits, stats.hit_bytes) == (1, len(PAYLOAD))
+
+    async def test_miss_does_not_list_directories(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """An unknown key shall be answered from memory alone."""
+
+        def fail(*args: object) -> None:
+            raise AssertionError("directory listed")
+
+        monkeypatch.setattr(archive_handler, "_existing_dedup_file", fail)
+        handler = LocalAsyncArchiveHandler(
+            tmp_path / "run", store=ArchiveStore(tmp_path / "store")
+        )
+
+        decision = await handler.should_download(
+            "https://example.com/op.pdf", "case-9", "pdf", None
+        )
+
+        assert decision.download is True
+
+    async def test_missing_blob_falls_back_to_download(
+        self, tmp_path: Path
+    ) -> None:
+        """A blob deleted behind the store's back shall trigger a download."""
+        store = ArchiveStore(tmp_path / "store")
+        await _archive_in_run(store, tmp_path / "run1", "case-1")
+        store.blob_path(SHA).unlink()
+        handler = LocalAsyncStreamingArchiveHandler(
+            tmp_path / "run2", store=store
+        )
+
+        decision = await handler.should_download(
+            "https://example.com/op.pdf", "case-1", "pdf", None
+        )
+
+        assert decision.download is True
+        assert store.lookup("case-1") is None
+
+    def test_sync_handler_shares_across_runs(self, tmp_path: Path) -> None:
+        store = ArchiveStore(tmp_path / "store")
+        LocalSyncArchiveHandler(tmp_path / "run1", store=store).save(
+            "https://example.com/op.pdf", "case-1", "pdf", None, PAYLOAD
+        )
+
+        decision = LocalSyncArchiveHandler(
+            tmp_path / "run2", store=store
+        ).should_download("https://example.com/op.pdf", "case-1", "pdf", None)
+
+        assert decision.download is False
+        assert Path(decision.file_url).name == "op.pdf"
+        assert Path(decision.file_url).read_bytes() == PAYLOAD
+
+    async def test_web_handler_links_into_flat_run_dir(
+        self, tmp_path: Path
+    ) -> None:
+        """The web handler shall reuse files archived by earlier runs."""
+        store = ArchiveStore(tmp_path / "store")
+        first = await UuidAsyncArchiveHandler(
+            tmp_path / "run1", store=store
+        ).save("https://example.com/op.pdf", "case-1", "pdf", None, PAYLOAD)
+
+        decision = await UuidAsyncArchiveHandler(
+            tmp_path / "run2", store=store
+        ).should_download("https://example.com/op.pdf", "case-1", "pdf", None)
+
+        assert decision.download is False
+        assert Path(decision.file_url) == tmp_path / "run2" / f"{SHA}.pdf"
+        assert Path(decision.file_url).samefile(first)
@@ -0,0 +1,206 @@
+"""Tests for the bounded, spill-to-disk request frontier.
+
+``SpillingFrontier`` caps the in-memory heap used by the sync and async
+drivers and spills the lowest-priority overflow to sorted segment files.
+These tests lock in that pops keep exact ``(priority, counter)`` order
+across spills, that segment files are cleaned up, and that both drivers
+run unchanged with a tiny cap.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from kent.data_types import (
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+)
+from kent.driver.async_driver import AsyncDriver
+from kent.driver.frontier import SpillingFrontier, SpillingPriorityQueue
+from kent.driver.sync_driver import SyncDriver
+from tests.utils import collect_results, collect_results_async
+
+
+class TestSpillingFrontier:
+    def test_unbounded_frontier_never_spills(self, tmp_path: Path) -> None:
+        frontier = SpillingFrontier(spill_dir=tmp_path)
+        for i in range(100):
+            frontier.push((i % 3, i, f"r{i}"))
+
+        assert frontier.segment_count == 0
+        assert list(tmp_path.iterdir()) == []
+        assert len(frontier) == 100
+
+    def test_spills_overflow_to_segments(self, tmp_path: Path) -> None:
+        frontier = SpillingFrontier(max_in_memory=10, spill_dir=tmp_path)
+        for i in range(50):
+            frontier.push((9, i, f"r{i}"))
+
+        assert frontier.in_memory <= 10
+        assert frontier.segment_count > 0
+        assert len(frontier) == 50
+        assert sorted(e[1] for e in frontier) == list(range(50))
+
+    def test_pop_order_matches_heapq_with_interleaving(
+        self, tmp_path: Path
+    ) -> None:
+        rng = random.Random(1234)
+        frontier = SpillingFrontier(
+            max_in_memory=8, spill_dir=tmp_path, max_segments=4
+        )
+        reference: list[tuple[int, int, str]] = []
+        counter = 0
+
+        for _ in range(2000):
+            if reference and rng.random() < 0.4:
+                assert frontier.pop() == heapq.heappop(reference)
+            else:
+                entry = (rng.randint(0, 9), counter, f"r{counter}")
+                counter += 1
+                frontier.push(entry)
+                heapq.heappush(reference, entry)
+            assert len(frontier) == len(reference)
+
+        while reference:
+            assert frontier.pop() == heapq.heappop(reference)
+        assert not frontier
+
+    def test_drained_segments_are_deleted(self, tmp_path: Path) -> None:
+        frontier = SpillingFrontier(max_in_memory=4, spill_dir=tmp_path)
+        for i in range(20):
+            frontier.push((1, i, i))
+        assert list(tmp_path.iterdir())
+
+        while frontier:
+            frontier.pop()
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_close_removes_segment_files(self, tmp_path: Path) -> None:
+        frontier = SpillingFrontier(max_in_memory=4, spill_dir=tmp_path)
+        for i in range(20):
+            frontier.push((1, i, i))
+
+        frontier.close()
+
+        assert len(frontier) == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_merges_segments_past_limit(self, tmp_path: Path) -> None:
+        frontier = SpillingFrontier(
+            max_in_memory=2, spill_dir=tmp_path, max_segments=3
+        )
+        for i in range(40):
+            frontier.push((5, i, i))
+
+        assert frontier.segment_count <= 3
+        assert [frontier.pop()[1] for _ in range(40)] == list(range(40))
+
+    def test_rejects_non_positive_cap(self) -> None:
+        with pytest.raises(ValueError):
+            SpillingFrontier(max_in_memory=0)
+
+
+class TestSpillingPriorityQueue:
+    async def test_get_returns_priority_order(self, tmp_path: Path) -> None:
+        queue = SpillingPriorityQueue(max_in_memory=3, spill_dir=tmp_path)
+        entries = [(p, i, f"r{i}") for i, p in enumerate([5, 1, 9, 1, 3, 7])]
+        for entry in entries:
+            await queue.put(entry)
+
+        assert queue.qsize() == len(entries)
+        assert queue.frontier.segment_count > 0
+
+        popped = [await queue.get() for _ in entries]
+        assert popped == sorted(entries)
+        assert queue.empty()
+
+
+class _FanOutScraper(BaseScraper[dict]):
+    """Entry page fans out to many detail requests of mixed priority."""
+
+    def __init__(self, base_url: str, fan_out: int) -> None:
+        super().__init__()
+        self.base_url = base_url
+        self.fan_out = fan_out
+
+    def get_entry(self) -> Generator[Request, None, None]:
+        yield Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET, url=f"{self.base_url}/cases"
+            ),
+            continuation="parse_list",
+        )
+
+    def parse_list(self, response: Response):
+        for i in range(self.fan_out):
+            yield Request(
+                request=HTTPRequestParams(
+                    method=HttpMethod.GET, url=f"/cases?n={i}"
+                ),
+                continuation="parse_item",
+                priority=9 - (i % 3),
+                accumulated_data={"n": i},
+            )
+
+    def parse_item(self, response: Response):
+        yield ParsedData(
+            data={
+                "n": response.request.accumulated_data["n"],
+                "priority": response.request.priority,
+            }
+        )
+
+
+class TestDriversWithBoundedFrontier:
+    def test_sync_driver_preserves_order_with_spilling(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        spill_dir = tmp_path / "spill"
+        spill_dir.mkdir()
+        callback, results = collect_results()
+
+        driver = SyncDriver(
+            scraper=_FanOutScraper(server_url, fan_out=30),
+            storage_dir=tmp_path,
+            on_data=callback,
+            max_queue_in_memory=4,
+            spill_dir=spill_dir,
+        )
+        driver.run()
+
+        expected = sorted(
+            ({"n": i, "priority": 9 - (i % 3)} for i in range(30)),
+            key=lambda d: (d["priority"], d["n"]),
+        )
+        assert results == expected
+        assert list(spill_dir.iterdir()) == []
+
+    async def test_async_driver_completes_with_spilling(
+        self, server_url: str, tmp_path: Path
+    ) -> None:
+        spill_dir = tmp_path / "spill"
+        spill_dir.mkdir()
+        callback, results = collect_results_async()
+
+        driver = AsyncDriver(
+            scraper=_FanOutScraper(server_url, fan_out=30),
+            storage_dir=tmp_path,
+            on_data=callback,
+            num_workers=3,
+            max_queue_in_memory=4,
+            spill_dir=spill_dir,
+        )
+        await driver.run()
+
+        assert sorted(r["n"] for r in results) == list(range(30))
+        assert list(spill_dir.iterdir()) == []
@@ -0,0 +1,80 @@
+"""Tests for the shared process pool helpers.
+
+``OrderedPool`` keeps calls in submission order, bounds how many are in
+flight, starts its process pool only when a call needs it, and shuts it
+down without blocking the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import operator
+import threading
+import time
+
+from kent.driver._process_pool import OrderedPool
+
+
+async def test_results_come_back_in_submission_order() -> None:
+    pool: OrderedPool[str] = OrderedPool(2)
+    try:
+        pool.submit("slow", time.sleep, 0.2)
+        pool.add_result("known", 7)
+        pool.submit("sum", operator.add, 2, 3)
+        assert pool.max_in_flight == 4
+        assert len(pool) == 3 and not pool.full
+
+        collected = []
+        while pool:
+            tag, future = pool.popleft()
+            collected.append((tag, await future))
+    finally:
+        await pool.aclose()
+    assert collected == [("slow", None), ("known", 7), ("sum", 5)]
+
+
+async def test_pool_starts_only_when_a_call_needs_it() -> None:
+    pool: OrderedPool[int] = OrderedPool(1)
+    pool.add_result(0, "cached")
+    pool.submit(1, threading.get_ident, in_thread=True)
+    assert not pool.started
+    (_, first), (_, second) = pool.popleft(), pool.popleft()
+    assert await first == "cached"
+    assert await second != threading.get_ident()
+
+    pool.submit(2, operator.neg, 1)
+    assert pool.started
+    await pool.aclose()
+    assert not pool.started and len(pool) == 0
+
+
+async def test_thread_only_pool_never_starts() -> None:
+    pool: OrderedPool[None] = OrderedPool(0)
+    assert pool.max_in_flight == 2
+    pool.submit(None, operator.neg, 1)
+    pool.submit(None, operator.neg, 2)
+    assert pool.full and not pool.started
+    assert [await pool.popleft()[1] for _ in range(2)] == [-1, -2]
+    await pool.aclose()
+
+
+async def test_aclose_cancels_pending_and_keeps_the_loop_running() -> None:
+    pool: OrderedPool[int] = OrderedPool(1)
+    for tag in range(pool.max_in_flight):
+        pool.submit(tag, time.sleep, 0.3)
+    futures = [future for _, future in pool._in_flight]
+
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    await pool.aclose()
+    ticker.cancel()
+    # The running call was waited for off the loop, so the loop ticked.
+    assert ticks > 5
+    assert all(future.cancelled() for future in futures)
@@ -4,20 +4,24 @@ The sync and async ``LocalStreamingArchiveHandler`` variants write files
 to ``{storage_dir}/{xx}/{yy}/{deduplication_key}/{sha256}.{expected_type}``
 by default, where ``xx`` and ``yy`` are the first two pairs of hex digits
 of the SHA-256 of the deduplication key. These tests lock in that layout
-and confirm the hashing + atomic-rename plumbing.
+and confirm the hashing + atomic-rename plumbing, and the writer-thread
+sink that coalesces chunks into large writes.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 
 import pytest
 
+from kent.driver import archive_handler
 from kent.driver.archive_handler import (
     LocalAsyncStreamingArchiveHandler,
     LocalSyncStreamingArchiveHandler,
+    _StreamingSink,
 )
 
 
@@ -180,3 +184,114 @@ class TestAsyncStreamingLayout:
         dedup_dir = _dedup_path(tmp_path, "k")
         # Neither a final file nor a stray .tmp file should remain.
         assert not dedup_dir.exists() or list(dedup_dir.iterdir()) == []
+
+
+class TestStreamingSink:
+    def test_coalesces_chunks_into_large_writes(self, tmp_path: Path) -> None:
+        """The sink shall write batches of coalesce_bytes, not every chunk."""
+        payload = bytes(range(256)) * 2
+        sink = _StreamingSink(tmp_path, coalesce_bytes=64, max_pending=2)
+        for chunk in _iter_chunks(payload):
+            sink.write(chunk)
+        sha = sink.close()
+
+        assert sink.writes == len(payload) // 64
+        assert sha == hashlib.sha256(payload).hexdigest()
+        assert Path(sink.name).read_bytes() == payload
+
+    def test_sync_handler_matches_across_settings(
+        self, tmp_path: Path
+    ) -> None:
+        """Coalescing and queue depth shall not change the stored bytes."""
+        payload = bytes(range(256)) * 40
+        paths = []
+        for coalesce_bytes, max_pending in [(1, 1), (100, 2), (1 << 20, 8)]:
+            handler = LocalSyncStreamingArchiveHandler(
+                tmp_path / str(coalesce_bytes),
+                coalesce_bytes=coalesce_bytes,
+                max_pending=max_pending,
+            )
+            paths.append(
+                Path(
+                    handler.save_stream(
+                        url="u",
+                        deduplication_key=None,
+                        expected_type=None,
+                        hash_header_value=None,
+                        chunks=iter(_iter_chunks(payload, 7)),
+                    )
+                )
+            )
+
+        assert {p.name for p in paths} == {hashlib.sha256(payload).hexdigest()}
+        assert all(p.read_bytes() == payload for p in paths)
+
+    def test_writer_error_surfaces_and_cleans_up(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A failing write shall raise in the caller and leave no .tmp."""
+
+        def _disk_full(sha: object, tmp: object, chunk: bytes) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(archive_handler, "_hash_and_write", _disk_full)
+        handler = LocalSyncStreamingArchiveHandler(
+            tmp_path, coalesce_bytes=4, max_pending=1
+        )
+
+        with pytest.raises(OSError, match="disk full"):
+            handler.save_stream(
+                url="u",
+                deduplication_key="k",
+                expected_type="pdf",
+                hash_header_value=None,
+                chunks=iter(_iter_chunks(b"x" * 64)),
+            )
+
+        assert list(_dedup_path(tmp_path, "k").iterdir()) == []
+
+    async def test_async_backpressure_preserves_bytes(
+        self, tmp_path: Path
+    ) -> None:
+        """A full queue shall block the async producer, not drop batches."""
+        payload = bytes(range(256)) * 64
+        handler = LocalAsyncStreamingArchiveHandler(
+            tmp_path, coalesce_bytes=16, max_pending=1
+        )
+
+        path = await handler.save_stream(
+            url="u",
+            deduplication_key=None,
+            expected_type="bin",
+            hash_header_value=None,
+            chunks=_aiter(_iter_chunks(payload)),
+        )
+
+        assert Path(path).read_bytes() == payload
+
+    async def test_cancelled_download_cleans_up(self, tmp_path: Path) -> None:
+        """Cancelling save_stream shall stop the writer and remove the .tmp."""
+        handler = LocalAsyncStreamingArchiveHandler(tmp_path)
+        started = asyncio.Event()
+
+        async def _stalled() -> AsyncIterator[bytes]:
+            yield b"first"
+            started.set()
+            await asyncio.Event().wait()
+            yield b"never"
+
+        task = asyncio.create_task(
+            handler.save_stream(
+                url="u",
+                deduplication_key="k",
+                expected_type="pdf",
+                hash_header_value=None,
+                chunks=_stalled(),
+            )
+        )
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert list(_dedup_path(tmp_path, "k").iterdir()) == []
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
 from kent.driver.persistent_driver.cli import cli
@@ -85,3 +86,27 @@ class TestExportCommands:
 
         assert result.exit_code == 0
         assert "Exported 1" in result.output
+
+    def test_export_parquet_per_result_type(
+        self, runner: CliRunner, populated_db: Path, tmp_path: Path
+    ) -> None:
+        """--format parquet writes one file per result type."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output_dir = tmp_path / "parquet"
+        result = runner.invoke(
+            cli,
+            [
+                "results",
+                "export",
+                "--db",
+                str(populated_db),
+                str(output_dir),
+                "--format",
+                "parquet",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Exported 2 results" in result.output
+        table = pq.read_table(output_dir / "TestResult.parquet")
+        assert table.column("_is_valid").to_pylist() == [True, False]
@@ -363,3 +363,25 @@ class TestHealthCommands:
         )
 
         assert result.exit_code == 0
+
+    def test_doctor_counters_match(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Test doctor counters reports no drift on a trigger-kept run."""
+        result = runner.invoke(
+            cli,
+            [
+                "doctor",
+                "counters",
+                "--db",
+                str(populated_db),
+                "--format",
+                "json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["has_drift"] is False
+        assert data["requests"] == []
+        assert data["results"] == []
@@ -46,6 +46,48 @@ class TestInfoCommand:
         assert result.exit_code != 0
 
 
+class TestMetricsCommand:
+    """Tests for the metrics command."""
+
+    def test_metrics_default_format(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Test metrics command summarizes each metric."""
+        result = runner.invoke(cli, ["metrics", "--db", str(populated_db)])
+
+        assert result.exit_code == 0
+        assert "=== kent_queue_depth ===" in result.output
+        assert "status=pending: 1" in result.output
+        assert "continuation=step1: count=" in result.output
+        # Live-only metrics have no samples in a database snapshot
+        assert "kent_step_duration_seconds" not in result.output
+
+    def test_metrics_json_format(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Test metrics command outputs the snapshot as JSON."""
+        result = runner.invoke(
+            cli, ["metrics", "--db", str(populated_db), "--format", "json"]
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["kent_queue_depth"]["type"] == "gauge"
+        assert data["kent_compression_ratio"]["type"] == "histogram"
+
+    def test_metrics_exposition(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Test metrics command prints the exposition format."""
+        result = runner.invoke(
+            cli, ["metrics", "--db", str(populated_db), "--exposition"]
+        )
+
+        assert result.exit_code == 0
+        assert "# TYPE kent_queue_depth gauge" in result.output
+        assert 'kent_queue_depth{status="pending"} 1' in result.output
+
+
 class TestOutputFormats:
     """Tests for different output formats across commands."""
 
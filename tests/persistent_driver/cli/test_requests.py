@@ -109,6 +109,33 @@ class TestRequestsCommands:
         assert "Showing: 2" in result.output
         assert "Limit: 2" in result.output
 
+    def test_requests_list_cursor(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Test following --cursor through every page of requests list."""
+        args = ["requests", "list", "--db", str(populated_db)]
+        ids: list[int] = []
+        cursor = None
+        while True:
+            page_args = [*args, "--limit", "2", "--format", "json"]
+            if cursor:
+                page_args += ["--cursor", cursor]
+            result = runner.invoke(cli, page_args)
+            assert result.exit_code == 0
+            data = json.loads(result.output)
+            ids += [item["id"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(ids) == [1, 2, 3, 4, 5]
+
+        result = runner.invoke(cli, [*args, "--limit", "2"])
+        assert "Next page: --cursor " in result.output
+
+        result = runner.invoke(cli, [*args, "--cursor", "bogus"])
+        assert result.exit_code != 0
+        assert "Invalid cursor" in result.output
+
     def test_requests_show(
         self, runner: CliRunner, populated_db: Path
     ) -> None:
@@ -198,3 +225,60 @@ class TestRequestsCommands:
         assert result.exit_code == 0
         assert output_file.exists()
         assert b"Response 1" in output_file.read_bytes()
+
+    def test_requests_search_streams_jsonl_with_limit(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Search prints one JSON line per match and stops at --limit."""
+        args = ["requests", "search", "--db", str(populated_db)]
+        result = runner.invoke(
+            cli, [*args, "--text", "response", "--format", "jsonl"]
+        )
+        assert result.exit_code == 0
+        assert [json.loads(line) for line in result.output.splitlines()] == [
+            {"request_id": 2},
+            {"request_id": 5},
+        ]
+
+        result = runner.invoke(
+            cli,
+            [*args, "--text", "response", "--limit", "1", "--format", "jsonl"],
+        )
+        assert result.exit_code == 0
+        assert result.output.splitlines() == ['{"request_id": 2}']
+
+        result = runner.invoke(
+            cli, [*args, "--text", "response", "--status-code", "404"]
+        )
+        assert result.exit_code == 0
+        assert "No matching responses found" in result.output
+
+    def test_responses_index_then_indexed_search(
+        self, runner: CliRunner, populated_db: Path
+    ) -> None:
+        """Search --index fails without an index and uses it once built."""
+        args = ["requests", "search", "--db", str(populated_db)]
+        search = [*args, "--text", "response 2", "--format", "jsonl"]
+        result = runner.invoke(cli, [*search, "--index"])
+        assert result.exit_code != 0
+
+        result = runner.invoke(
+            cli,
+            [
+                "responses",
+                "index",
+                "--db",
+                str(populated_db),
+                "--processes",
+                "0",
+                "--format",
+                "json",
+            ],
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.output)["indexed"] == 2
+        assert Path(f"{populated_db}.text-index").exists()
+
+        result = runner.invoke(cli, [*search, "--index"])
+        assert result.exit_code == 0
+        assert result.output.splitlines() == ['{"request_id": 5}']
@@ -0,0 +1,65 @@
+"""Tests for the store command group."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from kent.driver.archive_handler import LocalSyncArchiveHandler
+from kent.driver.archive_store import ArchiveStore
+from kent.driver.persistent_driver.cli import cli
+
+PAYLOAD = b"x" * 1000
+
+
+class TestStoreStats:
+    def test_reports_reuse_savings(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that stats count downloads avoided and disk saved."""
+        root = tmp_path / "store"
+        store = ArchiveStore(root)
+        LocalSyncArchiveHandler(tmp_path / "run1", store=store).save(
+            "https://example.com/a.pdf", "case-1", "pdf", None, PAYLOAD
+        )
+        LocalSyncArchiveHandler(tmp_path / "run1", store=store).save(
+            "https://example.com/b.pdf", "case-2", "pdf", None, PAYLOAD
+        )
+        LocalSyncArchiveHandler(
+            tmp_path / "run2", store=store
+        ).should_download("https://example.com/a.pdf", "case-1", "pdf", None)
+
+        result = runner.invoke(
+            cli, ["store", "stats", "--store", str(root), "--format", "json"]
+        )
+
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert (data["keys"], data["blobs"]) == (2, 1)
+        assert (data["hits"], data["hit_bytes"]) == (1, 1000)
+        assert data["disk_saved_bytes"] == 2000
+
+    def test_summary_format(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Test the human-readable summary."""
+        root = tmp_path / "store"
+        ArchiveStore(root)
+        (root / "index.tsv").touch()
+
+        result = runner.invoke(cli, ["store", "stats", "--store", str(root)])
+
+        assert result.exit_code == 0, result.output
+        assert "Reuse Savings" in result.output
+        assert "Downloads Avoided: 0" in result.output
+
+    def test_rejects_non_store_dir(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that a directory without an index is rejected."""
+        result = runner.invoke(
+            cli, ["store", "stats", "--store", str(tmp_path)]
+        )
+
+        assert result.exit_code != 0
+        assert "not an archive store" in result.output
@@ -0,0 +1,185 @@
+"""Tests for the in-process metrics registry.
+
+The registry renders the Prometheus text exposition format, the driver
+lock records how long callers wait for it, and ``get_run_metrics``
+rebuilds what it can from a run database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+
+from kent.driver.persistent_driver.metrics import (
+    HistogramValue,
+    MetricsRegistry,
+    TimedLock,
+    render_runs,
+)
+from kent.driver.persistent_driver.sql_manager import SQLManager
+from kent.driver.persistent_driver.stats import get_run_metrics
+
+
+def test_render_exposition_format() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "kent_latency_seconds",
+        "Latency.",
+        buckets=(0.1, 1.0),
+        labelnames=("host",),
+    )
+    latency.labels("a.example").observe(0.05)
+    latency.labels("a.example").observe(0.5)
+    latency.labels("a.example").observe(5.0)
+    registry.counter("kent_retries_total", "Retries.").inc(2)
+
+    assert registry.render() == (
+        "# HELP kent_latency_seconds Latency.\n"
+        "# TYPE kent_latency_seconds histogram\n"
+        'kent_latency_seconds_bucket{host="a.example",le="0.1"} 1\n'
+        'kent_latency_seconds_bucket{host="a.example",le="1"} 2\n'
+        'kent_latency_seconds_bucket{host="a.example",le="+Inf"} 3\n'
+        'kent_latency_seconds_sum{host="a.example"} 5.55\n'
+        'kent_latency_seconds_count{host="a.example"} 3\n'
+        "# HELP kent_retries_total Retries.\n"
+        "# TYPE kent_retries_total counter\n"
+        "kent_retries_total 2\n"
+    )
+
+
+def test_render_runs_labels_each_registry() -> None:
+    first, second = MetricsRegistry(), MetricsRegistry()
+    first.gauge("kent_active_workers", "Workers.").set(2)
+    second.gauge("kent_active_workers", "Workers.").set(3)
+
+    text = render_runs({"one": first, "two": second})
+
+    # One HELP/TYPE header per family, whichever run registered it.
+    assert text.count("# TYPE kent_active_workers gauge") == 1
+    assert 'kent_active_workers{run="one"} 2' in text
+    assert 'kent_active_workers{run="two"} 3' in text
+
+
+def test_registry_rejects_type_conflict() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("kent_things", "Things.")
+    assert registry.counter("kent_things", "Things.") is counter
+    with pytest.raises(ValueError):
+        registry.gauge("kent_things", "Things.")
+
+
+def test_histogram_quantiles_interpolate() -> None:
+    value = HistogramValue((1.0, 2.0, 4.0))
+    assert value.quantile(0.5) is None
+    for observation in (0.5, 1.5, 1.5, 3.0):
+        value.observe(observation)
+
+    assert value.quantile(0.5) == 1.5
+    assert value.quantile(0.99) == pytest.approx(3.92)
+    value.observe(100.0)
+    assert value.quantile(1.0) == 4.0
+
+
+async def test_timed_lock_records_waits() -> None:
+    registry = MetricsRegistry()
+    waits = registry.histogram("kent_lock_wait_seconds", "Waits.")
+    lock = TimedLock()
+    lock.wait_histogram = waits
+
+    async def hold() -> None:
+        async with lock:
+            await asyncio.sleep(0.05)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    async with lock:
+        pass
+    await holder
+
+    (_, value), *_ = waits.items()
+    assert value.count == 2
+    assert value.sum >= 0.04
+
+
+async def test_get_run_metrics_from_database(initialized_db) -> None:
+    engine, session_factory = initialized_db
+    sql_manager = SQLManager(engine, session_factory)
+    rows = [
+        ("https://a.example/1", "completed", 0, 1.0),
+        ("https://a.example/2", "completed", 2, 3.0),
+        ("https://b.example:8443/1", "failed", 1, 0.2),
+        ("https://b.example:8443/2", "pending", 0, None),
+    ]
+    for url, status, retries, seconds in rows:
+        request_id = await sql_manager.insert_request(
+            priority=1,
+            request_type="navigating",
+            method="GET",
+            url=url,
+            headers_json="{}",
+            cookies_json="{}",
+            body=None,
+            continuation="parse",
+            current_location="",
+            accumulated_data_json="{}",
+            permanent_json="{}",
+            expected_type=None,
+            dedup_key=None,
+            parent_id=None,
+        )
+        if seconds is None:
+            continue
+        async with session_factory() as session:
+            await session.execute(
+                sa.text(
+                    "UPDATE requests SET status = :status,"
+                    " retry_count = :retries, started_at_ns = 0,"
+                    " completed_at_ns = :ns WHERE id = :id"
+                ),
+                {
+                    "status": status,
+                    "retries": retries,
+                    "ns": int(seconds * 1e9),
+                    "id": request_id,
+                },
+            )
+            await session.commit()
+    await sql_manager.store_response(
+        request_id=1,
+        status_code=200,
+        headers_json="{}",
+        url="https://a.example/1",
+        compressed_content=b"x" * 25,
+        content_size_original=100,
+        content_size_compressed=25,
+        dict_id=None,
+        continuation="parse",
+        speculation_outcome=None,
+    )
+
+    snapshot = (await get_run_metrics(session_factory)).snapshot()
+    await engine.dispose()
+
+    duration = {
+        s["labels"]["host"]: s
+        for s in snapshot["kent_request_duration_seconds"]["samples"]
+    }
+    assert duration["a.example"]["count"] == 2
+    assert duration["a.example"]["sum"] == pytest.approx(4.0)
+    assert duration["b.example"]["count"] == 1
+    retries = {
+        s["labels"]["host"]: s["value"]
+        for s in snapshot["kent_retries_total"]["samples"]
+    }
+    assert retries == {"a.example": 2.0, "b.example": 1.0}
+    (ratio,) = snapshot["kent_compression_ratio"]["samples"]
+    assert ratio["labels"] == {"continuation": "parse"}
+    assert ratio["sum"] == pytest.approx(4.0)
+    depth = {
+        s["labels"]["status"]: s["value"]
+        for s in snapshot["kent_queue_depth"]["samples"]
+    }
+    assert depth["pending"] == 1.0
+    assert depth["completed"] == 2.0
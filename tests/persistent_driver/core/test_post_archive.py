@@ -0,0 +1,197 @@
+"""Tests for the post-archive processing stage of PersistentDriver.
+
+Archived files are hashed and passed to registered processors by a worker
+pool separate from the download workers. Outputs and timings land in
+``archive_processing``; ``archived_files.processed_at`` marks finished
+files so leftovers are processed when the next run starts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Generator
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from kent.data_types import (
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    Request,
+    Response,
+    ScraperYield,
+)
+from kent.driver.persistent_driver._post_archive import PostArchiveJob
+from kent.driver.persistent_driver.persistent_driver import (
+    PersistentDriver,
+    ProgressEvent,
+)
+from tests.conftest import RANGE_PAYLOAD as PAYLOAD
+from tests.conftest import RangeServer
+
+
+class FileScraper(BaseScraper[dict]):
+    def __init__(self, url: str | None) -> None:
+        super().__init__()
+        self.url = url
+
+    def get_entry(self) -> Generator[Request, None, None]:
+        if self.url is None:
+            return
+        yield Request(
+            archive=True,
+            request=HTTPRequestParams(method=HttpMethod.GET, url=self.url),
+            continuation="handle_file",
+            expected_type="bin",
+        )
+
+    def handle_file(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        yield from ()
+
+
+def _size(job: PostArchiveJob) -> dict[str, object]:
+    return {
+        "bytes": Path(job.file_path).stat().st_size,
+        "type": job.expected_type,
+    }
+
+
+def _broken(job: PostArchiveJob) -> None:
+    raise ValueError("cannot parse")
+
+
+async def _archived_file(driver: PersistentDriver) -> tuple:
+    async with driver.db._session_factory() as session:
+        return (
+            await session.execute(
+                sa.text(
+                    "SELECT id, file_size, content_hash, processed_at "
+                    "FROM archived_files"
+                )
+            )
+        ).one()
+
+
+class TestPostArchiveStage:
+    async def test_records_outputs_timings_and_hash(
+        self,
+        range_server: tuple[RangeServer, str],
+        db_path: Path,
+        tmp_path: Path,
+    ) -> None:
+        """The stage shall hash the file and record every processor run."""
+        _, url = range_server
+        async with PersistentDriver.open(
+            FileScraper(f"{url}/files/big"),
+            db_path,
+            enable_monitor=False,
+            storage_dir=tmp_path / "files",
+        ) as driver:
+            driver.register_archive_processor("size", _size)
+            driver.register_archive_processor("broken", _broken)
+            await driver.run(setup_signal_handlers=False)
+
+            file_id, size, content_hash, processed_at = await _archived_file(
+                driver
+            )
+            runs = await driver.db.list_archive_processing(file_id)
+
+        assert (size, content_hash) == (
+            len(PAYLOAD),
+            hashlib.sha256(PAYLOAD).hexdigest(),
+        )
+        assert processed_at is not None
+        assert [(r["processor"], r["status"]) for r in runs] == [
+            ("size", "success"),
+            ("broken", "error"),
+        ]
+        assert json.loads(runs[0]["output_json"]) == {
+            "bytes": len(PAYLOAD),
+            "type": "bin",
+        }
+        assert runs[1]["error"] == "ValueError: cannot parse"
+        assert all(r["duration_ms"] >= 0 for r in runs)
+
+    async def test_download_worker_does_not_wait_for_processors(
+        self,
+        range_server: tuple[RangeServer, str],
+        db_path: Path,
+        tmp_path: Path,
+    ) -> None:
+        """The request shall complete while its processor is still running."""
+        _, url = range_server
+        completed = asyncio.Event()
+
+        async def wait_for_request(job: PostArchiveJob) -> bool:
+            await asyncio.wait_for(completed.wait(), timeout=10)
+            return True
+
+        async def on_progress(event: ProgressEvent) -> None:
+            if event.event_type == "request_completed":
+                completed.set()
+
+        async with PersistentDriver.open(
+            FileScraper(f"{url}/files/big"),
+            db_path,
+            enable_monitor=False,
+            storage_dir=tmp_path / "files",
+        ) as driver:
+            driver.on_progress = on_progress
+            driver.register_archive_processor("waits", wait_for_request)
+            await driver.run(setup_signal_handlers=False)
+            runs = await driver.db.list_archive_processing()
+
+        assert [(r["processor"], r["status"]) for r in runs] == [
+            ("waits", "success")
+        ]
+
+    async def test_unfinished_files_processed_on_next_run(
+        self, db_path: Path, tmp_path: Path
+    ) -> None:
+        """Files left unprocessed by an earlier run shall be picked up."""
+        path = tmp_path / "left-over.bin"
+        path.write_bytes(PAYLOAD)
+
+        async with PersistentDriver.open(
+            FileScraper(None), db_path, enable_monitor=False
+        ) as driver:
+            request_id = await driver.db.insert_entry_request(
+                priority=0,
+                method="GET",
+                url="https://example.com/left-over.bin",
+                headers_json=None,
+                cookies_json=None,
+                body=None,
+                continuation="handle_file",
+                current_location="",
+                accumulated_data_json=None,
+                permanent_json=None,
+                dedup_key=None,
+            )
+            await driver.db.mark_request_completed(request_id)
+            await driver.db.store_archived_file(
+                request_id=request_id,
+                file_path=str(path),
+                original_url="https://example.com/left-over.bin",
+                expected_type="bin",
+                file_size=None,
+                content_hash=None,
+            )
+            assert len(await driver.db.list_unprocessed_archived_files()) == 1
+
+            driver.register_archive_processor("size", _size)
+            await driver.run(setup_signal_handlers=False)
+
+            _, size, content_hash, _ = await _archived_file(driver)
+            runs = await driver.db.list_archive_processing()
+            unprocessed = await driver.db.list_unprocessed_archived_files()
+
+        assert size == len(PAYLOAD)
+        assert content_hash == hashlib.sha256(PAYLOAD).hexdigest()
+        assert [r["processor"] for r in runs] == ["size"]
+        assert unprocessed == []
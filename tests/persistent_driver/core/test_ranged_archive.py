@@ -0,0 +1,113 @@
+"""Tests for resumable ranged archive downloads in PersistentDriver.
+
+With ``LocalAsyncStreamingArchiveHandler(range_segments=N)``, a ranged
+download that drops part-way raises a transient
+``IncompleteDownloadException``. Segment offsets are recorded in
+``archive_partials``, so the retry scheduled by ``_handle_retry`` fetches
+only the missing bytes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Generator
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from kent.data_types import (
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+    ScraperYield,
+)
+from kent.driver.archive_handler import LocalAsyncStreamingArchiveHandler
+from kent.driver.persistent_driver.persistent_driver import PersistentDriver
+from tests.conftest import RANGE_PAYLOAD as PAYLOAD
+from tests.conftest import RangeServer
+
+SEGMENT_BYTES = 64 * 1024
+
+# The flaky file is split into 4 segments, each dropping halfway once.
+HALF_SEGMENT_STARTS = {
+    start + SEGMENT_BYTES // 2
+    for start in range(0, len(PAYLOAD), SEGMENT_BYTES)
+}
+
+
+class FileScraper(BaseScraper[dict]):
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        self.url = url
+
+    def get_entry(self) -> Generator[Request, None, None]:
+        yield Request(
+            archive=True,
+            request=HTTPRequestParams(method=HttpMethod.GET, url=self.url),
+            continuation="handle_file",
+            expected_type="bin",
+        )
+
+    def handle_file(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        yield ParsedData({"file_url": response.file_url})  # type: ignore[attr-defined]
+
+
+class TestRangedArchiveResume:
+    async def test_retry_resumes_from_recorded_offsets(
+        self,
+        range_server: tuple[RangeServer, str],
+        db_path: Path,
+        tmp_path: Path,
+    ) -> None:
+        """The retry shall fetch only bytes missing after the drop."""
+        state, url = range_server
+        state.drops_left = 4
+        storage_dir = tmp_path / "files"
+        handler = LocalAsyncStreamingArchiveHandler(
+            storage_dir,
+            range_segments=4,
+            range_min_segment_bytes=SEGMENT_BYTES,
+        )
+
+        async with PersistentDriver.open(
+            FileScraper(f"{url}/files/flaky"),
+            db_path,
+            enable_monitor=False,
+            storage_dir=storage_dir,
+        ) as driver:
+            driver.archive_handler = handler
+            await driver.run(setup_signal_handlers=False)
+
+            async with driver.db._session_factory() as session:
+                status, retries = (
+                    await session.execute(
+                        sa.text("SELECT status, retry_count FROM requests")
+                    )
+                ).one()
+                (file_path,) = (
+                    await session.execute(
+                        sa.text("SELECT file_path FROM archived_files")
+                    )
+                ).one()
+                partials = (
+                    await session.execute(
+                        sa.text("SELECT COUNT(*) FROM archive_partials")
+                    )
+                ).scalar_one()
+
+        assert (status, retries) == ("completed", 1)
+        assert Path(file_path).read_bytes() == PAYLOAD
+        assert Path(file_path).name == (
+            f"{hashlib.sha256(PAYLOAD).hexdigest()}.bin"
+        )
+        assert partials == 0
+
+        ranged = state.ranged_gets("flaky")
+        starts = [int(r.split("=")[1].split("-")[0]) for r in ranged]
+        assert len(starts) == 8
+        assert set(starts[4:]) == HALF_SEGMENT_STARTS
@@ -0,0 +1,165 @@
+"""Tests for bulk loading of request subtrees.
+
+``load_request_nodes`` reads whole subtrees with one recursive query and
+``iter_step_inputs`` loads their bodies, results and errors in batches,
+so comparing a tree costs a fixed number of queries however deep it is.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from kent.driver.persistent_driver.compression import compress
+from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.request_subtree import (
+    iter_step_inputs,
+    load_request_nodes,
+)
+from kent.driver.persistent_driver.sql_manager import SQLManager
+from tests.persistent_driver.core.test_step_eval import TitleSite
+
+
+async def _node(
+    sql_manager: SQLManager,
+    parent_id: int | None,
+    content: bytes | None,
+    title: str = "",
+) -> int:
+    request_id = await sql_manager.insert_request(
+        priority=1,
+        request_type="navigating",
+        method="GET",
+        url=f"https://example.com/{title}",
+        headers_json="{}",
+        cookies_json="{}",
+        body=None,
+        continuation="parse",
+        current_location="",
+        accumulated_data_json='{"page": 1}',
+        permanent_json="{}",
+        expected_type=None,
+        dedup_key=None,
+        parent_id=parent_id,
+    )
+    if content is not None:
+        compressed = compress(content)
+        await sql_manager.store_response(
+            request_id=request_id,
+            status_code=200,
+            headers_json="{}",
+            url="https://example.com",
+            compressed_content=compressed,
+            content_size_original=len(content),
+            content_size_compressed=len(compressed),
+            dict_id=None,
+            continuation="parse",
+            speculation_outcome=None,
+        )
+        await sql_manager.store_result(
+            request_id=request_id,
+            result_type="Title",
+            data_json=f'{{"title": "{title}"}}',
+            is_valid=True,
+            validation_errors_json=None,
+        )
+    async with sql_manager._session_factory() as session:
+        await session.execute(
+            sa.text("UPDATE requests SET status = 'completed' WHERE id = :id"),
+            {"id": request_id},
+        )
+        await session.commit()
+    return request_id
+
+
+async def _tree(sql_manager: SQLManager) -> dict[str, int]:
+    """root -> (a -> c, b -> d); b has no stored response."""
+    ids = {"root": await _node(sql_manager, None, b" root ", "root")}
+    ids["a"] = await _node(sql_manager, ids["root"], b" a ", "a")
+    ids["b"] = await _node(sql_manager, ids["root"], None)
+    ids["c"] = await _node(sql_manager, ids["a"], b" c ", "stale")
+    ids["d"] = await _node(sql_manager, ids["b"], b" d ", "d")
+    async with sql_manager._session_factory() as session:
+        await session.execute(
+            sa.text(
+                "INSERT INTO errors (request_id, error_type, error_class,"
+                " message, request_url, is_resolved)"
+                " VALUES (:id, 'xpath', 'XPathError', 'old', '', 0)"
+            ),
+            {"id": ids["root"]},
+        )
+        await session.commit()
+    return ids
+
+
+async def test_subtree_loads_with_fixed_query_count(initialized_db) -> None:
+    engine, session_factory = initialized_db
+    ids = await _tree(SQLManager(engine, session_factory))
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args) -> None:  # type: ignore[no-untyped-def]
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append(statement)
+
+    sa.event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        trees = await load_request_nodes(session_factory, [ids["root"]])
+        order = trees.walk([ids["root"]])
+        inputs = [
+            i async for i in iter_step_inputs(session_factory, trees, order)
+        ]
+    finally:
+        sa.event.remove(engine.sync_engine, "before_cursor_execute", count)
+    await engine.dispose()
+
+    # One recursive query for the tree; bodies, results and errors.
+    assert len(statements) == 4
+    assert set(trees.nodes) == set(ids.values())
+    assert order == [ids[k] for k in ("root", "a", "b", "c", "d")]
+    assert trees.walk([ids["root"]], through_missing=False) == [
+        ids[k] for k in ("root", "a", "b", "c")
+    ]
+
+    by_id = {i.request_id: i for i in inputs}
+    assert by_id[ids["b"]].failure == (
+        f"No response found for request {ids['b']}"
+    )
+    root = by_id[ids["root"]]
+    assert root.response_data is not None
+    assert root.response_data["content"] == b" root "
+    assert root.original is not None
+    assert [r.url for r in root.original.requests] == [
+        trees.nodes[ids[k]].url for k in ("a", "b", "c", "d")
+    ]
+    assert root.original.requests[0].accumulated_data == {"page": 1}
+    assert [d.data for d in root.original.data] == [{"title": "root"}]
+    assert root.original.error is not None
+    assert root.original.error.error_message == "old"
+
+
+async def test_compare_request_tree_matches_per_request(
+    db_path: Path, initialized_db
+) -> None:
+    engine, session_factory = initialized_db
+    ids = await _tree(SQLManager(engine, session_factory))
+    await engine.dispose()
+
+    async with LocalDevDriverDebugger.open(db_path) as debugger:
+        tree = await debugger.compare_request_tree(ids["root"], TitleSite)
+        # b has no response, so neither it nor d is compared.
+        assert [r.request_id for r in tree] == [
+            ids[k] for k in ("root", "a", "c")
+        ]
+        for result in tree:
+            single = await debugger.compare_continuation(
+                result.request_id, TitleSite
+            )
+            assert single == result
+        assert not tree[1].data_diff.has_changes
+        assert tree[1].request_diff.has_changes  # c is not re-yielded
+        assert tree[2].data_diff.changed_pairs
+        assert await debugger.collect_request_trees(
+            [ids["a"], ids["root"], 10_000]
+        ) == [ids[k] for k in ("a", "c", "root", "b", "d")] + [10_000]
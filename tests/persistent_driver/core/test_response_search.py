@@ -0,0 +1,184 @@
+"""Tests for the streaming response search engine.
+
+``iter_response_matches`` prefilters in SQL, matches chunks of rows on a
+process pool and yields request ids in order, stopping at ``limit``.
+"""
+
+from __future__ import annotations
+
+import pickle
+from contextlib import aclosing
+
+import pytest
+import sqlalchemy as sa
+
+from kent.driver.persistent_driver.compression import compress
+from kent.driver.persistent_driver.response_search import (
+    SearchPattern,
+    iter_response_matches,
+)
+from kent.driver.persistent_driver.sql_manager import SQLManager
+
+_DICTIONARY = b"<html><body><div class='case'>docket opinion</div>" * 20
+
+
+async def _store(
+    sql_manager: SQLManager,
+    content: bytes,
+    *,
+    continuation: str = "step1",
+    status_code: int = 200,
+    dict_id: int | None = None,
+    dictionary: bytes | None = None,
+) -> int:
+    request_id = await sql_manager.insert_request(
+        priority=1,
+        request_type="navigating",
+        method="GET",
+        url=f"https://example.com/{content[:20]!r}",
+        headers_json="{}",
+        cookies_json="{}",
+        body=None,
+        continuation=continuation,
+        current_location="",
+        accumulated_data_json="{}",
+        permanent_json="{}",
+        expected_type=None,
+        dedup_key=None,
+        parent_id=None,
+    )
+    compressed = compress(content, dictionary=dictionary)
+    await sql_manager.store_response(
+        request_id=request_id,
+        status_code=status_code,
+        headers_json="{}",
+        url="https://example.com",
+        compressed_content=compressed,
+        content_size_original=len(content),
+        content_size_compressed=len(compressed),
+        dict_id=dict_id,
+        continuation=continuation,
+        speculation_outcome=None,
+    )
+    return request_id
+
+
+async def _matches(sql_manager: SQLManager, **kwargs) -> list[int]:  # type: ignore[no-untyped-def]
+    pattern = SearchPattern(
+        **{k: kwargs.pop(k) for k in ("text", "regex", "xpath") if k in kwargs}
+    )
+    return [
+        request_id
+        async for request_id in iter_response_matches(
+            sql_manager._session_factory, pattern, **kwargs
+        )
+    ]
+
+
+def test_pattern_requires_exactly_one_and_pickles() -> None:
+    with pytest.raises(ValueError, match="Exactly one"):
+        SearchPattern()
+    with pytest.raises(ValueError, match="Exactly one"):
+        SearchPattern(text="a", xpath="//a")
+
+    pattern = pickle.loads(pickle.dumps(SearchPattern(xpath="//b")))
+    assert pattern.matches(b"<html><b>x</b></html>")
+    assert not pattern.matches(b"<html><i>x</i></html>")
+
+
+@pytest.mark.parametrize(
+    ("needle", "content", "expected"),
+    [
+        ("Docket", b"<p>DOCKET 12</p>", True),
+        ("docket", b"<p>caf\xc3\xa9 docket</p>", True),
+        ("docket", b"<p>caf\xc3\xa9</p>", False),
+        # U+212A KELVIN SIGN lowercases to ASCII "k".
+        ("k", "K".encode(), True),
+        ("café", "CAFÉ".encode(), True),
+        ("café", b"CAF\xc9", True),
+    ],
+)
+def test_text_match_agrees_with_lowercased_decode(
+    needle: str, content: bytes, expected: bool
+) -> None:
+    assert SearchPattern(text=needle).matches(content) is expected
+
+
+async def test_prefilters_and_limit(sql_manager: SQLManager) -> None:
+    small = await _store(sql_manager, b"<p>docket</p>")
+    large = await _store(sql_manager, b"<p>docket</p>" + b" " * 1000)
+    missing = await _store(sql_manager, b"<p>docket</p>", status_code=404)
+    other = await _store(sql_manager, b"<p>docket</p>", continuation="step2")
+    await _store(sql_manager, b"<p>nothing</p>")
+
+    assert await _matches(sql_manager, text="docket", processes=0) == [
+        small,
+        large,
+        missing,
+        other,
+    ]
+    assert await _matches(
+        sql_manager, text="docket", status_code=404, processes=0
+    ) == [missing]
+    assert await _matches(
+        sql_manager, text="docket", continuation="step2", processes=0
+    ) == [other]
+    assert await _matches(
+        sql_manager, text="docket", min_size=100, processes=0
+    ) == [large]
+    assert await _matches(
+        sql_manager, text="docket", max_size=100, processes=0
+    ) == [small, missing, other]
+    assert await _matches(
+        sql_manager, text="docket", limit=2, processes=0
+    ) == [small, large]
+
+
+async def test_pool_matches_chunks_in_order(
+    sql_manager: SQLManager, initialized_db
+) -> None:
+    """Several chunks on a process pool, including dictionary rows."""
+    _, session_factory = initialized_db
+    async with session_factory() as session:
+        await session.execute(
+            sa.text(
+                "INSERT INTO compression_dicts "
+                "(continuation, version, dictionary_data, sample_count) "
+                "VALUES ('step1', 1, :data, 1)"
+            ),
+            {"data": _DICTIONARY},
+        )
+        await session.commit()
+
+    expected = []
+    for i in range(9):
+        hit = i % 3 != 1
+        content = f"<html><p>{'docket' if hit else 'other'} {i}</p></html>"
+        request_id = await _store(
+            sql_manager,
+            content.encode(),
+            dict_id=1 if i % 2 else None,
+            dictionary=_DICTIONARY if i % 2 else None,
+        )
+        if hit:
+            expected.append(request_id)
+
+    found = await _matches(
+        sql_manager, regex=r"docket \d", processes=2, chunk_size=2
+    )
+    assert found == expected
+
+    found = []
+    async with aclosing(
+        iter_response_matches(
+            session_factory,
+            SearchPattern(xpath="//p[contains(., 'docket')]"),
+            processes=2,
+            chunk_size=2,
+        )
+    ) as matches:
+        async for request_id in matches:
+            found.append(request_id)
+            if len(found) == 2:
+                break
+    assert found == expected[:2]
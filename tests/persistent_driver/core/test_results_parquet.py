@@ -0,0 +1,181 @@
+"""Tests for the per-result-type Parquet export.
+
+Columns are typed from the scraper's result models via
+``BaseScraper.schema()``; rows are written in row groups.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Generator
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from pydantic import BaseModel
+
+from kent.common.decorators import entry
+from kent.data_types import (
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    Request,
+)
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from kent.driver.persistent_driver.results_parquet import (  # noqa: E402
+    export_results_parquet,
+)
+
+
+class Party(BaseModel):
+    name: str
+    role: str | None = None
+
+
+class Docket(BaseModel):
+    number: str
+    filed: date
+    updated: datetime | None = None
+    pages: int
+    parties: list[Party]
+    extra: dict[str, str] | int | None = None
+
+
+class DocketScraper(BaseScraper[Docket]):
+    @entry(Docket)
+    def by_number(self, number: str) -> Generator[Request, None, None]:
+        yield Request(
+            request=HTTPRequestParams(method=HttpMethod.GET, url=number),
+            continuation="parse",
+        )
+
+
+async def _insert(session_factory, rows: list[tuple]) -> None:  # type: ignore[no-untyped-def]
+    async with session_factory() as session:
+        await session.execute(
+            sa.text(
+                "INSERT INTO results (request_id, result_type, data_json, "
+                "is_valid, validation_errors_json) "
+                "VALUES (:request_id, :rtype, :data, :valid, :errors)"
+            ),
+            [
+                {
+                    "request_id": request_id,
+                    "rtype": rtype,
+                    "data": json.dumps(data),
+                    "valid": valid,
+                    "errors": errors,
+                }
+                for request_id, rtype, data, valid, errors in rows
+            ],
+        )
+        await session.commit()
+
+
+async def test_columns_typed_from_result_models(
+    initialized_db, tmp_path: Path
+) -> None:
+    _, session_factory = initialized_db
+    docket = {
+        "number": "1:24-cv-1",
+        "filed": "2024-01-02",
+        "updated": "2024-01-03T04:05:06Z",
+        "pages": 12,
+        "parties": [{"name": "Smith", "role": "plaintiff"}],
+        "extra": {"k": "v"},
+    }
+    await _insert(
+        session_factory,
+        [
+            (None, "Docket", docket, True, None),
+            (
+                None,
+                "Docket",
+                {**docket, "updated": None, "extra": 3},
+                True,
+                None,
+            ),
+            (
+                None,
+                "Docket",
+                {**docket, "pages": "twelve", "filed": "soon"},
+                False,
+                '[{"loc": ["pages"]}]',
+            ),
+        ],
+    )
+
+    counts = await export_results_parquet(
+        session_factory,
+        tmp_path,
+        DocketScraper.schema(),
+        row_group_size=2,
+    )
+    assert counts == {"Docket": 3}
+
+    parquet = pq.ParquetFile(tmp_path / "Docket.parquet")
+    assert parquet.metadata.num_row_groups == 2
+    schema = parquet.schema_arrow
+    assert str(schema.field("filed").type) == "date32[day]"
+    assert str(schema.field("updated").type) == "timestamp[us, tz=UTC]"
+    assert str(schema.field("pages").type) == "int64"
+    assert schema.field("parties").type.value_type.names == ["name", "role"]
+    assert str(schema.field("extra").type) == "string"
+
+    rows = parquet.read().to_pylist()
+    assert rows[0]["filed"] == date(2024, 1, 2)
+    assert rows[0]["updated"] == datetime(
+        2024, 1, 3, 4, 5, 6, tzinfo=timezone.utc
+    )
+    assert rows[0]["parties"] == [{"name": "Smith", "role": "plaintiff"}]
+    assert [row["extra"] for row in rows] == ['{"k": "v"}', "3", '{"k": "v"}']
+    # Values that do not fit their column become null.
+    assert (rows[2]["pages"], rows[2]["filed"]) == (None, None)
+    assert [row["_is_valid"] for row in rows] == [True, True, False]
+    assert rows[2]["_validation_errors"] == '[{"loc": ["pages"]}]'
+
+
+async def test_unknown_types_as_json_and_filters(
+    initialized_db, tmp_path: Path
+) -> None:
+    _, session_factory = initialized_db
+    await _insert(
+        session_factory,
+        [
+            (None, "Note", {"text": "a"}, True, None),
+            (None, "Note", {"text": "b"}, False, None),
+            (None, "Other", [1, 2], True, None),
+        ],
+    )
+
+    counts = await export_results_parquet(
+        session_factory, tmp_path / "all", None
+    )
+    assert counts == {"Note": 2, "Other": 1}
+    notes = pq.read_table(tmp_path / "all" / "Note.parquet")
+    assert notes.column_names == [
+        "_id",
+        "_request_id",
+        "_is_valid",
+        "_validation_errors",
+        "_created_at",
+        "data",
+    ]
+    assert notes.column("data").to_pylist() == [
+        '{"text": "a"}',
+        '{"text": "b"}',
+    ]
+
+    counts = await export_results_parquet(
+        session_factory, tmp_path / "valid", None, is_valid=False
+    )
+    assert counts == {"Note": 1}
+    assert not (tmp_path / "valid" / "Other.parquet").exists()
+
+    counts = await export_results_parquet(
+        session_factory, tmp_path / "other", None, result_type="Other"
+    )
+    assert counts == {"Other": 1}
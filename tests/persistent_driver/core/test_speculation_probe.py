@@ -0,0 +1,135 @@
+"""Tests for speculative existence probes in PersistentDriver.
+
+A template with ``probe = "head"`` queues a probe row per speculative ID.
+The probe's ``requests.probe`` column survives the round trip through the
+queue, its outcome is stored in ``speculation_outcome``, and only IDs that
+exist get a second, full row whose continuation runs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+
+from kent.common.decorators import entry, step
+from kent.data_types import (
+    BaseRequest,
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+    ScraperYield,
+)
+from kent.driver.persistent_driver.persistent_driver import PersistentDriver
+from kent.driver.persistent_driver.testing import (
+    MockRequestManager,
+    MockResponse,
+    create_html_response,
+)
+
+LAST_CASE = 4
+
+
+class ProbedCaseId(BaseModel):
+    """Speculative parameter that probes with HEAD before fetching."""
+
+    case_id: int
+    should_advance: bool = True
+    gap: int = 2
+    probe: str = "head"
+
+    def seed_range(self) -> range:
+        return range(self.case_id, self.case_id)
+
+    def from_int(self, n: int) -> ProbedCaseId:
+        return self.model_copy(update={"case_id": n})
+
+    def max_gap(self) -> int:
+        return self.gap
+
+
+class ProbedScraper(BaseScraper[dict]):
+    @entry(dict)
+    def fetch_case(self, cid: ProbedCaseId) -> Request:
+        return Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"https://example.com/case/{cid.case_id}",
+            ),
+            continuation="parse_case",
+        )
+
+    @step
+    def parse_case(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        yield ParsedData({"id": int(response.url.split("/")[-1])})
+
+
+def _make_request_manager() -> MockRequestManager:
+    def respond(request: BaseRequest) -> MockResponse:
+        case_id = int(request.request.url.split("/")[-1])
+        if case_id > LAST_CASE:
+            return create_html_response("", 404)
+        if request.probe is not None:
+            return MockResponse(status_code=200)
+        return create_html_response(f"<html>Case {case_id}</html>")
+
+    manager = MockRequestManager()
+    manager.add_response_generator("https://example.com/case/", respond)
+    return manager
+
+
+class TestSpeculationProbes:
+    async def test_only_existing_ids_are_fetched_in_full(
+        self, db_path: Path
+    ) -> None:
+        """The driver shall probe each ID and fetch existing ones in full."""
+        manager = _make_request_manager()
+        async with PersistentDriver.open(
+            ProbedScraper(),
+            db_path,
+            enable_monitor=False,
+            request_manager=manager,
+            seed_params=[{"fetch_case": {"cid": {"case_id": 1}}}],
+        ) as driver:
+            await driver.run(setup_signal_handlers=False)
+
+            async with driver.db._session_factory() as session:
+                rows = (
+                    await session.execute(
+                        sa.text(
+                            "SELECT url, probe, is_speculative, "
+                            "speculation_outcome, status FROM requests"
+                        )
+                    )
+                ).all()
+                result_count = (
+                    await session.execute(
+                        sa.text("SELECT COUNT(*) FROM results")
+                    )
+                ).scalar_one()
+
+        def case_id(url: str) -> int:
+            return int(url.rsplit("/", 1)[1])
+
+        probes = {case_id(r[0]): r for r in rows if r[1] is not None}
+        full = {case_id(r[0]): r for r in rows if r[1] is None}
+
+        assert set(full) == set(range(1, LAST_CASE + 1))
+        assert set(probes) >= set(range(1, LAST_CASE + 3))
+        assert all(r[1] == "head" and r[2] for r in probes.values())
+        assert all(not r[2] for r in full.values())
+        assert all(r[4] == "completed" for r in rows)
+        for n, row in probes.items():
+            expected = "success" if n <= LAST_CASE else "failure"
+            assert row[3] == expected
+        assert result_count == LAST_CASE
+
+        sent_probes = [r for r in manager.requests if r.probe == "head"]
+        assert len(sent_probes) == len(probes)
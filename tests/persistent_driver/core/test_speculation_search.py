@@ -0,0 +1,112 @@
+"""Tests for galloping frontier search in PersistentDriver.
+
+A template with ``search_strategy = "gallop"`` keeps probing past a run of
+``max_gap()`` failures. The probe counts are persisted on
+``speculation_tracking`` and reported by ``get_speculation_summary``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from kent.common.decorators import entry, step
+from kent.data_types import (
+    BaseRequest,
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+    ScraperYield,
+)
+from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.persistent_driver import PersistentDriver
+from kent.driver.persistent_driver.testing import (
+    MockRequestManager,
+    MockResponse,
+    create_html_response,
+)
+
+EXISTING = set(range(1, 4)) | set(range(200, 260))
+
+
+class DocketId(BaseModel):
+    """Speculative parameter that gallops past gaps."""
+
+    number: int
+    should_advance: bool = True
+    gap: int = 3
+    search_strategy: str = "gallop"
+
+    def seed_range(self) -> range:
+        return range(self.number, self.number)
+
+    def from_int(self, n: int) -> DocketId:
+        return self.model_copy(update={"number": n})
+
+    def max_gap(self) -> int:
+        return self.gap
+
+
+class DocketScraper(BaseScraper[dict]):
+    @entry(dict)
+    def fetch_docket(self, docket: DocketId) -> Request:
+        return Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"https://example.com/docket/{docket.number}",
+            ),
+            continuation="parse_docket",
+        )
+
+    @step
+    def parse_docket(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        yield ParsedData({"id": int(response.url.split("/")[-1])})
+
+
+def _make_request_manager() -> MockRequestManager:
+    def respond(request: BaseRequest) -> MockResponse:
+        n = int(request.request.url.split("/")[-1])
+        if n in EXISTING:
+            return create_html_response(f"<html>Docket {n}</html>")
+        return create_html_response("<html>Not found</html>", 404)
+
+    manager = MockRequestManager()
+    manager.add_response_generator("https://example.com/docket/", respond)
+    return manager
+
+
+class TestFrontierSearchPersistence:
+    async def test_search_finds_block_and_records_stats(
+        self, db_path: Path
+    ) -> None:
+        """The driver shall reach the far block and persist probe stats."""
+        manager = _make_request_manager()
+        async with PersistentDriver.open(
+            DocketScraper(),
+            db_path,
+            enable_monitor=False,
+            request_manager=manager,
+            seed_params=[{"fetch_docket": {"docket": {"number": 1}}}],
+        ) as driver:
+            await driver.run(setup_signal_handlers=False)
+
+        requested = {
+            int(url.rsplit("/", 1)[1]) for url in manager.request_counts
+        }
+        assert requested >= EXISTING
+        assert len(requested) < len(EXISTING) + 60
+
+        async with LocalDevDriverDebugger.open(db_path) as debugger:
+            summary = await debugger.get_speculation_summary()
+
+        tracking = summary["tracking"]["fetch_docket:0"]
+        assert tracking["highest_successful_id"] == 259
+        assert summary["search"]["probes"] == tracking["search_probes"] > 0
+        assert summary["search"]["probes_saved"] > 100
@@ -0,0 +1,173 @@
+"""Tests for windowed speculative seeding in PersistentDriver.
+
+With ``speculation_window`` set, the driver inserts speculative rows as
+outcomes arrive instead of one row per ``seed_range()`` ID up front. The
+seeded ceiling is persisted via ``save_speculation_state`` so a resumed run
+continues from the first unseeded ID.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+
+from kent.common.decorators import entry, step
+from kent.data_types import (
+    BaseRequest,
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+    ScraperYield,
+)
+from kent.driver.persistent_driver.persistent_driver import PersistentDriver
+from kent.driver.persistent_driver.testing import (
+    MockRequestManager,
+    MockResponse,
+    create_html_response,
+)
+
+LAST_CASE = 30
+
+
+class CaseId(BaseModel):
+    """Speculative parameter for testing."""
+
+    case_id: int
+    soft_max: int = 0
+    should_advance: bool = True
+    gap: int = 2
+
+    def seed_range(self) -> range:
+        return range(self.case_id, self.soft_max)
+
+    def from_int(self, n: int) -> CaseId:
+        return CaseId(
+            case_id=n,
+            soft_max=self.soft_max,
+            should_advance=self.should_advance,
+            gap=self.gap,
+        )
+
+    def max_gap(self) -> int:
+        return self.gap
+
+
+class CaseScraper(BaseScraper[dict]):
+    @entry(dict)
+    def fetch_case(self, cid: CaseId) -> Request:
+        return Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"https://example.com/case/{cid.case_id}",
+            ),
+            continuation="parse_case",
+        )
+
+    @step
+    def parse_case(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        yield ParsedData({"id": int(response.url.split("/")[-1])})
+
+
+SEED_PARAMS = [{"fetch_case": {"cid": {"case_id": 1, "soft_max": 20}}}]
+
+
+def _make_request_manager() -> MockRequestManager:
+    def respond(request: BaseRequest) -> MockResponse:
+        case_id = int(request.request.url.split("/")[-1])
+        if case_id <= LAST_CASE:
+            return create_html_response(f"<html>Case {case_id}</html>")
+        return create_html_response("<html>Not found</html>", 404)
+
+    manager = MockRequestManager()
+    manager.add_response_generator("https://example.com/case/", respond)
+    return manager
+
+
+def _seeded_scraper() -> CaseScraper:
+    scraper = CaseScraper()
+    list(scraper.initial_seed(SEED_PARAMS))
+    return scraper
+
+
+async def _count_requests(driver: PersistentDriver[Any]) -> int:
+    async with driver.db._session_factory() as session:
+        result = await session.execute(
+            sa.text("SELECT COUNT(*) FROM requests")
+        )
+        return int(result.scalar_one())
+
+
+class TestSpeculationWindow:
+    async def test_seeding_inserts_only_window(self, db_path: Path) -> None:
+        """Seeding shall insert `window` rows and persist the ceiling."""
+        async with PersistentDriver.open(
+            _seeded_scraper(),
+            db_path,
+            enable_monitor=False,
+            request_manager=_make_request_manager(),
+            speculation_window=3,
+        ) as driver:
+            driver._speculation_state = driver._discover_speculate_functions()
+            await driver._seed_speculative_queue()
+
+            assert await _count_requests(driver) == 3
+            saved = await driver.db.load_speculation_state("fetch_case:0")
+            assert saved is not None
+            assert saved["current_ceiling"] == 3
+
+    async def test_windowed_run_fetches_every_id_once(
+        self, db_path: Path
+    ) -> None:
+        """A windowed run shall cover the range and advance window once."""
+        manager = _make_request_manager()
+        async with PersistentDriver.open(
+            CaseScraper(),
+            db_path,
+            enable_monitor=False,
+            request_manager=manager,
+            seed_params=SEED_PARAMS,
+            speculation_window=2,
+        ) as driver:
+            await driver.run(setup_signal_handlers=False)
+
+        counts = manager.request_counts
+        for n in range(1, LAST_CASE + 1):
+            assert counts[f"https://example.com/case/{n}"] == 1
+        assert all(c == 1 for c in counts.values())
+
+    async def test_resume_continues_from_saved_ceiling(
+        self, db_path: Path
+    ) -> None:
+        """A resumed run shall seed from the persisted ceiling onward."""
+        async with PersistentDriver.open(
+            _seeded_scraper(),
+            db_path,
+            enable_monitor=False,
+            request_manager=_make_request_manager(),
+            speculation_window=2,
+        ) as driver:
+            driver._speculation_state = driver._discover_speculate_functions()
+            await driver._seed_speculative_queue()
+
+        manager = _make_request_manager()
+        async with PersistentDriver.open(
+            _seeded_scraper(),
+            db_path,
+            enable_monitor=False,
+            request_manager=manager,
+            speculation_window=2,
+        ) as driver:
+            await driver.run(setup_signal_handlers=False)
+
+        counts = manager.request_counts
+        for n in range(1, LAST_CASE + 1):
+            assert counts[f"https://example.com/case/{n}"] == 1
@@ -0,0 +1,196 @@
+"""Tests for parallel, cached step replay.
+
+``compare_requests`` and ``observe_selectors`` replay stored responses
+on a process pool and cache the output under a fingerprint of the step's
+code; the scrapers here are module-level so workers can import them.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from kent.common.data_models import ScrapedData
+from kent.data_types import BaseScraper, ParsedData, Response
+from kent.driver.persistent_driver.compression import compress
+from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.sql_manager import SQLManager
+from kent.driver.persistent_driver.step_eval import (
+    StepEvalProgress,
+    step_fingerprint,
+)
+
+
+class Title(ScrapedData):
+    title: str
+
+
+class TitleSite(BaseScraper[Title]):
+    def parse(self, response: Response):
+        yield ParsedData(Title(title=self.clean(response.text)))
+
+    def clean(self, text: str) -> str:
+        return text.strip()
+
+    def unrelated(self) -> int:
+        return 1
+
+
+def _parse(self, response):  # type: ignore[no-untyped-def]
+    yield ParsedData(Title(title=self.clean(response.text)))
+
+
+def _strip(self, text):  # type: ignore[no-untyped-def]
+    return text.strip()
+
+
+def _upper(self, text):  # type: ignore[no-untyped-def]
+    return text.upper()
+
+
+def _one(self):  # type: ignore[no-untyped-def]
+    return 1
+
+
+def _two(self):  # type: ignore[no-untyped-def]
+    return 2
+
+
+def _site(clean, unrelated) -> type:  # type: ignore[no-untyped-def]
+    return type(
+        "Site",
+        (BaseScraper,),
+        {"parse": _parse, "clean": clean, "unrelated": unrelated},
+    )
+
+
+def test_fingerprint_follows_referenced_methods() -> None:
+    base = step_fingerprint(_site(_strip, _one), "parse")
+    assert step_fingerprint(_site(_strip, _one), "parse") == base
+    # Methods the step does not reach do not change it...
+    assert step_fingerprint(_site(_strip, _two), "parse") == base
+    # ...helpers it calls do.
+    assert step_fingerprint(_site(_upper, _one), "parse") != base
+
+
+async def _store(
+    sql_manager: SQLManager, content: bytes | None, stored_title: str
+) -> int:
+    request_id = await sql_manager.insert_request(
+        priority=1,
+        request_type="navigating",
+        method="GET",
+        url="https://example.com",
+        headers_json="{}",
+        cookies_json="{}",
+        body=None,
+        continuation="parse",
+        current_location="",
+        accumulated_data_json="{}",
+        permanent_json="{}",
+        expected_type=None,
+        dedup_key=None,
+        parent_id=None,
+    )
+    if content is not None:
+        compressed = compress(content)
+        await sql_manager.store_response(
+            request_id=request_id,
+            status_code=200,
+            headers_json="{}",
+            url="https://example.com",
+            compressed_content=compressed,
+            content_size_original=len(content),
+            content_size_compressed=len(compressed),
+            dict_id=None,
+            continuation="parse",
+            speculation_outcome=None,
+        )
+        await sql_manager.store_result(
+            request_id=request_id,
+            result_type="Title",
+            data_json=f'{{"title": "{stored_title}"}}',
+            is_valid=True,
+            validation_errors_json=None,
+        )
+    async with sql_manager._session_factory() as session:
+        await session.execute(
+            sa.text("UPDATE requests SET status = 'completed' WHERE id = :id"),
+            {"id": request_id},
+        )
+        await session.commit()
+    return request_id
+
+
+async def test_compare_requests_pooled_and_cached(
+    db_path: Path, initialized_db
+) -> None:
+    engine, session_factory = initialized_db
+    sql_manager = SQLManager(engine, session_factory)
+    same = await _store(sql_manager, b" a ", "a")
+    changed = await _store(sql_manager, b" b ", "old")
+    missing = await _store(sql_manager, None, "")
+    await engine.dispose()
+
+    async with LocalDevDriverDebugger.open(db_path) as debugger:
+        ids = [same, missing, changed]
+
+        async def run(**kwargs):  # type: ignore[no-untyped-def]
+            progress: list[StepEvalProgress] = []
+            outcomes = [
+                outcome
+                async for outcome in debugger.compare_requests(
+                    ids, TitleSite, on_progress=progress.append, **kwargs
+                )
+            ]
+            return outcomes, progress[-1]
+
+        outcomes, progress = await run(processes=1)
+        assert [request_id for request_id, _, _ in outcomes] == ids
+        assert outcomes[0][1].is_identical
+        assert outcomes[1][1] is None
+        assert "No response" in outcomes[1][2]
+        assert outcomes[2][1].data_diff.changed_pairs
+        assert (progress.done, progress.cached) == (2, 0)
+        assert debugger.step_cache_path.exists()
+
+        # Unchanged responses and step code are answered from the cache.
+        cached, progress = await run(processes=1)
+        assert (progress.done, progress.cached) == (2, 2)
+        assert [
+            (request_id, result.is_identical if result else None)
+            for request_id, result, _ in cached
+        ] == [(same, True), (missing, None), (changed, False)]
+
+        _, progress = await run(processes=0, use_cache=False)
+        assert progress.cached == 0
+
+        serial = await debugger.compare_continuation(changed, TitleSite)
+        assert serial.is_identical == outcomes[2][1].is_identical
+
+
+async def test_observe_selectors_local_scraper(
+    db_path: Path, initialized_db
+) -> None:
+    class LocalSite(BaseScraper[Title]):
+        def parse(self, response: Response):
+            raise RuntimeError("boom")
+
+    engine, session_factory = initialized_db
+    request_id = await _store(
+        SQLManager(engine, session_factory), b"<p/>", "x"
+    )
+    await engine.dispose()
+
+    async with LocalDevDriverDebugger.open(db_path) as debugger:
+        # A scraper workers cannot import is replayed in-process.
+        outcomes = [
+            outcome
+            async for outcome in debugger.observe_selectors(
+                [request_id], LocalSite, processes=2
+            )
+        ]
+    assert outcomes == [
+        (request_id, {"queries": [], "error": "RuntimeError: boom"}, None)
+    ]
@@ -0,0 +1,264 @@
+"""Tests for the incremental full-text side index over response text.
+
+``update_text_index`` indexes responses above a high-water mark that
+stops below the first unfinished request; ``iter_indexed_matches``
+answers page-text searches from the index and scans what it lacks.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from kent.driver.persistent_driver.compression import compress
+from kent.driver.persistent_driver.response_search import (
+    SearchPattern,
+    iter_response_matches,
+)
+from kent.driver.persistent_driver.sql_manager import SQLManager
+from kent.driver.persistent_driver.text_index import (
+    ResponseTextIndex,
+    default_text_index_path,
+    iter_indexed_matches,
+    update_text_index,
+)
+
+
+async def _store(
+    sql_manager: SQLManager,
+    content: bytes | None,
+    *,
+    status: str = "completed",
+    status_code: int = 200,
+    completed_at_ns: int = 1,
+) -> int:
+    request_id = await sql_manager.insert_request(
+        priority=1,
+        request_type="navigating",
+        method="GET",
+        url="https://example.com",
+        headers_json="{}",
+        cookies_json="{}",
+        body=None,
+        continuation="step1",
+        current_location="",
+        accumulated_data_json="{}",
+        permanent_json="{}",
+        expected_type=None,
+        dedup_key=None,
+        parent_id=None,
+    )
+    if content is not None:
+        await _respond(
+            sql_manager, request_id, content, status_code, completed_at_ns
+        )
+    await _set_status(sql_manager, request_id, status)
+    return request_id
+
+
+async def _respond(
+    sql_manager: SQLManager,
+    request_id: int,
+    content: bytes,
+    status_code: int = 200,
+    completed_at_ns: int = 1,
+) -> None:
+    compressed = compress(content)
+    await sql_manager.store_response(
+        request_id=request_id,
+        status_code=status_code,
+        headers_json="{}",
+        url="https://example.com",
+        compressed_content=compressed,
+        content_size_original=len(content),
+        content_size_compressed=len(compressed),
+        dict_id=None,
+        continuation="step1",
+        speculation_outcome=None,
+    )
+    async with sql_manager._session_factory() as session:
+        await session.execute(
+            sa.text(
+                "UPDATE requests SET completed_at_ns = :ns WHERE id = :id"
+            ),
+            {"ns": completed_at_ns, "id": request_id},
+        )
+        await session.commit()
+
+
+async def _set_status(
+    sql_manager: SQLManager, request_id: int, status: str
+) -> None:
+    async with sql_manager._session_factory() as session:
+        await session.execute(
+            sa.text("UPDATE requests SET status = :status WHERE id = :id"),
+            {"status": status, "id": request_id},
+        )
+        await session.commit()
+
+
+async def _indexed(
+    sql_manager: SQLManager, index: ResponseTextIndex, text: str, **kwargs
+) -> list[int]:  # type: ignore[no-untyped-def]
+    return [
+        request_id
+        async for request_id in iter_indexed_matches(
+            sql_manager._session_factory, index, text, processes=0, **kwargs
+        )
+    ]
+
+
+async def test_high_water_stops_below_unfinished(
+    sql_manager: SQLManager, tmp_path: Path
+) -> None:
+    first = await _store(sql_manager, b"<p>Habeas one</p>")
+    pending = await _store(sql_manager, None, status="pending")
+    after = await _store(sql_manager, b"<p>Habeas two</p>")
+    index = ResponseTextIndex(tmp_path / "run.db.text-index")
+
+    update = await update_text_index(sql_manager._session_factory, index)
+    assert (update.indexed, update.high_water) == (2, first)
+    # Rows above the mark keep their stamps and are not re-extracted.
+    update = await update_text_index(sql_manager._session_factory, index)
+    assert (update.indexed, update.high_water) == (0, first)
+
+    await _respond(sql_manager, pending, b"<p>habeas three</p>")
+    await _set_status(sql_manager, pending, "completed")
+    update = await update_text_index(sql_manager._session_factory, index)
+    assert (update.indexed, update.high_water) == (1, after)
+    assert index.match("HABEAS") == [first, pending, after]
+
+    update = await update_text_index(
+        sql_manager._session_factory, index, rebuild=True
+    )
+    assert (update.indexed, update.high_water) == (3, after)
+    index.close()
+
+
+async def test_indexed_search_agrees_with_page_text_scan(
+    sql_manager: SQLManager, tmp_path: Path
+) -> None:
+    contents = [
+        b"<html><p>Petition for  writ\n of habeas</p></html>",
+        b"<html><script>var habeas = 1;</script><p>other</p></html>",
+        b"<html><p>HABEAS corpus</p></html>",
+        b"<html><p>habeas</p></html>",
+        b"<html><p>nothing</p></html>",
+    ]
+    ids = [
+        await _store(sql_manager, content, status_code=404 if i == 3 else 200)
+        for i, content in enumerate(contents)
+    ]
+    index = ResponseTextIndex(tmp_path / "run.db.text-index")
+    await update_text_index(sql_manager._session_factory, index)
+
+    for text, kwargs in [
+        ("habeas", {}),
+        ("writ of habeas", {}),
+        ("habeas", {"status_code": 404}),
+        ("habeas", {"limit": 2}),
+        ("var habeas", {}),
+    ]:
+        scanned = [
+            request_id
+            async for request_id in iter_response_matches(
+                sql_manager._session_factory,
+                SearchPattern(text=text, page_text=True),
+                processes=0,
+                **kwargs,
+            )
+        ]
+        assert await _indexed(sql_manager, index, text, **kwargs) == scanned
+    assert await _indexed(sql_manager, index, "habeas") == [
+        ids[0],
+        ids[2],
+        ids[3],
+    ]
+    index.close()
+
+
+async def test_unindexed_and_rerun_rows_above_mark_are_scanned(
+    sql_manager: SQLManager, tmp_path: Path
+) -> None:
+    done = await _store(sql_manager, b"<p>habeas</p>")
+    pending = await _store(sql_manager, None, status="pending")
+    rerun = await _store(sql_manager, b"<p>habeas</p>", completed_at_ns=5)
+    index = ResponseTextIndex(tmp_path / "run.db.text-index")
+    await update_text_index(sql_manager._session_factory, index)
+
+    # Stored after the pass, and re-run with new content after the pass.
+    await _respond(sql_manager, pending, b"<p>habeas late</p>")
+    await _respond(sql_manager, rerun, b"<p>other</p>", completed_at_ns=6)
+
+    assert index.match("habeas") == [done, rerun]
+    assert await _indexed(sql_manager, index, "habeas") == [done, pending]
+    index.close()
+
+
+async def test_hits_for_deleted_requests_are_dropped(
+    sql_manager: SQLManager, tmp_path: Path
+) -> None:
+    kept = await _store(sql_manager, b"<p>habeas</p>")
+    deleted = await _store(sql_manager, b"<p>habeas</p>")
+    index = ResponseTextIndex(tmp_path / "run.db.text-index")
+    await update_text_index(sql_manager._session_factory, index)
+    async with sql_manager._session_factory() as session:
+        await session.execute(
+            sa.text("DELETE FROM requests WHERE id = :id"), {"id": deleted}
+        )
+        await session.commit()
+
+    # Unfiltered, so only the existence check can drop the stale hit.
+    assert index.match("habeas") == [kept, deleted]
+    assert await _indexed(sql_manager, index, "habeas") == [kept]
+    index.close()
+
+
+async def test_driver_indexes_when_run_finishes(db_path: Path) -> None:
+    from kent.data_types import (
+        BaseScraper,
+        HttpMethod,
+        HTTPRequestParams,
+        Request,
+        Response,
+    )
+    from kent.driver.persistent_driver.persistent_driver import (
+        PersistentDriver,
+    )
+    from kent.driver.persistent_driver.testing import (
+        MockRequestManager,
+        MockResponse,
+    )
+
+    class PageScraper(BaseScraper[dict]):
+        def get_entry(self):  # type: ignore[no-untyped-def]
+            yield Request(
+                request=HTTPRequestParams(
+                    method=HttpMethod.GET, url="https://example.com/page"
+                ),
+                continuation="parse",
+                current_location="",
+            )
+
+        def parse(self, response: Response):  # type: ignore[no-untyped-def]
+            return []
+
+    request_manager = MockRequestManager()
+    request_manager.add_response(
+        "https://example.com/page",
+        MockResponse(content=b"<html><p>Writ of habeas</p></html>"),
+    )
+    async with PersistentDriver.open(
+        PageScraper(),
+        db_path,
+        enable_monitor=False,
+        request_manager=request_manager,
+        text_index=True,
+    ) as driver:
+        await driver.run()
+
+    index = ResponseTextIndex(default_text_index_path(db_path))
+    assert index.match("of habeas") == [1]
+    assert index.high_water() == 1
+    index.close()
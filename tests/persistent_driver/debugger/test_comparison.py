@@ -2,7 +2,7 @@
 
 Tests cover:
 - Levenshtein distance calculation
-- Result pairing via Levenshtein distance
+- Result pairing via Levenshtein distance (greedy, optimal, blocked)
 - Dict comparison with field-level diffs
 - Request tree comparison (added/removed/modified)
 - Data comparison with Levenshtein pairing
@@ -10,6 +10,11 @@ Tests cover:
 - Summary statistics aggregation
 """
 
+import itertools
+import json
+import random
+import time
+
 from kent.driver.persistent_driver.comparison import (
     ComparisonResult,
     ComparisonSummary,
@@ -28,6 +33,10 @@ from kent.driver.persistent_driver.dry_run_driver import (
     CapturedRequest,
     DryRunResult,
 )
+from kent.driver.persistent_driver.result_pairing import (
+    bounded_levenshtein,
+    pair_indices,
+)
 
 
 class TestLevenshteinDistance:
@@ -166,6 +175,125 @@ class TestPairResultsByLevenshtein:
         assert len(unpaired_new) == 1
 
 
+def _full_matrix_greedy(
+    original: list[str], new: list[str]
+) -> list[tuple[int, int]]:
+    """The all-pairs greedy pairing that pair_indices must reproduce."""
+    available_orig = set(range(len(original)))
+    available_new = set(range(len(new)))
+    paired = []
+    for i in list(available_orig):
+        for j in range(len(new)):
+            if j in available_new and original[i] == new[j]:
+                paired.append((i, j))
+                available_orig.discard(i)
+                available_new.discard(j)
+                break
+    distances = sorted(
+        (
+            (_levenshtein_distance(original[i], new[j]), i, j)
+            for i in sorted(available_orig)
+            for j in sorted(available_new)
+        ),
+        key=lambda x: x[0],
+    )
+    for _dist, i, j in distances:
+        if i in available_orig and j in available_new:
+            paired.append((i, j))
+            available_orig.discard(i)
+            available_new.discard(j)
+    return paired
+
+
+class TestScalablePairing:
+    """Test the bounded distance and the pairing engine."""
+
+    def test_bounded_distance_agrees_with_full(self):
+        """Banded distance is exact within the bound, None beyond it."""
+        rng = random.Random(7)
+        for _ in range(300):
+            s1 = "".join(rng.choices("abc", k=rng.randint(0, 12)))
+            s2 = "".join(rng.choices("abc", k=rng.randint(0, 12)))
+            full = _levenshtein_distance(s1, s2)
+            for bound in range(0, 13):
+                expected = full if full <= bound else None
+                assert bounded_levenshtein(s1, s2, bound) == expected
+
+    def test_greedy_matches_full_matrix_on_small_inputs(self):
+        """Pairs and their order equal the all-pairs greedy pairing."""
+        rng = random.Random(11)
+        for _ in range(200):
+            records = [
+                json.dumps(
+                    {
+                        "id": rng.randint(0, 5),
+                        "name": "".join(
+                            rng.choices("xyz", k=rng.randint(0, 30))
+                        ),
+                    }
+                )
+                for _ in range(rng.randint(1, 14))
+            ]
+            original = rng.sample(records, rng.randint(1, len(records)))
+            new = rng.sample(records, rng.randint(1, len(records)))
+            assert pair_indices(original, new) == _full_matrix_greedy(
+                original, new
+            )
+
+    def test_optimal_minimizes_total_distance(self):
+        """Optimal pairing reaches the brute-force minimum total."""
+        # Greedy takes the closest pair (abce, abcd) and is left with a
+        # distant one; crossing the pairs costs less in total.
+        original = ["abce", "xycd"]
+        new = ["abcd", "abff"]
+        greedy = pair_indices(original, new)
+        optimal = pair_indices(original, new, mode="optimal")
+
+        def total(pairs):
+            return sum(
+                _levenshtein_distance(original[i], new[j]) for i, j in pairs
+            )
+
+        best = min(
+            sum(_levenshtein_distance(original[i], new[j]) for i, j in perm)
+            for perm in (
+                list(zip(range(2), p))
+                for p in itertools.permutations(range(2))
+            )
+        )
+        assert total(optimal) == best == 4
+        assert total(greedy) == 5
+
+    def test_large_inputs_pair_by_blocking(self):
+        """Hundreds of long records pair with their edited counterparts."""
+        rng = random.Random(3)
+        original = [
+            CapturedData(
+                data={
+                    "docket": f"24-{i:05d}",
+                    "title": f"Party {i} v. State",
+                    "text": " ".join(
+                        rng.choice(["opinion", "court", "held", "appeal"])
+                        for _ in range(300)
+                    ),
+                }
+            )
+            for i in range(300)
+        ]
+        new = [
+            CapturedData(data={**o.data, "text": o.data["text"] + " amended"})
+            for o in reversed(original)
+        ]
+
+        start = time.perf_counter()
+        paired, unpaired_orig, unpaired_new = _pair_results_by_levenshtein(
+            original, new
+        )
+        assert time.perf_counter() - start < 30
+        assert unpaired_orig == unpaired_new == []
+        assert all(o.data["docket"] == n.data["docket"] for o, n in paired)
+
+
 class TestCompareDicts:
     """Test dict comparison with field-level diffs."""
 
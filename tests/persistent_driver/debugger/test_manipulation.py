@@ -11,6 +11,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+import sqlalchemy as sa
 from pydantic import BaseModel
 
 from kent.driver.persistent_driver.debugger import (
@@ -210,6 +211,79 @@ class TestExportMethods:
             assert count == 1
             assert output_path.exists()
 
+    async def test_export_results_jsonl_compressed_matches_decoded(
+        self, db_path: Path, populated_db, tmp_path: Path
+    ) -> None:
+        """Spliced lines equal re-encoded records; suffixes pick compression."""
+        import gzip
+
+        import zstandard as zstd
+
+        engine, _ = populated_db
+        await engine.dispose()
+
+        async with LocalDevDriverDebugger.open(db_path) as debugger:
+            plain = tmp_path / "results.jsonl"
+            assert await debugger.export_results_jsonl(plain) == 2
+            for line in plain.read_text().splitlines():
+                assert json.dumps(json.loads(line)) == line
+
+            gz = tmp_path / "results.jsonl.gz"
+            zst = tmp_path / "results.jsonl.zst"
+            assert await debugger.export_results_jsonl(gz) == 2
+            assert await debugger.export_results_jsonl(zst) == 2
+            assert gzip.decompress(gz.read_bytes()) == plain.read_bytes()
+            with zstd.ZstdDecompressor().stream_reader(
+                zst.read_bytes()
+            ) as reader:
+                assert reader.read() == plain.read_bytes()
+
+            streamed = b"".join(
+                [
+                    chunk
+                    async for chunk in debugger.iter_results_jsonl(
+                        is_valid=False, compression="gzip"
+                    )
+                ]
+            )
+            assert len(gzip.decompress(streamed).splitlines()) == 1
+
+            with pytest.raises(ValueError, match="Unknown compression"):
+                await debugger.export_results_jsonl(plain, compression="xz")
+
+    async def test_export_results_jsonl_tolerates_malformed_json(
+        self, db_path: Path, populated_db, tmp_path: Path
+    ) -> None:
+        """Malformed stored JSON is exported as {}/null, not spliced."""
+        engine, _ = populated_db
+        async with engine.begin() as conn:
+            first, second = (
+                await conn.execute(
+                    sa.text("SELECT id FROM results ORDER BY id")
+                )
+            ).scalars()
+            # Truncated data, and errors that would inject a second key.
+            await conn.execute(
+                sa.text(
+                    "UPDATE results SET data_json = :data,"
+                    " validation_errors_json = :errors WHERE id = :id"
+                ),
+                {"data": '{"case": ', "errors": '[], "id": 0', "id": first},
+            )
+        await engine.dispose()
+
+        output_path = tmp_path / "results.jsonl"
+        async with LocalDevDriverDebugger.open(db_path) as debugger:
+            assert await debugger.export_results_jsonl(output_path) == 2
+
+        records = {
+            record["id"]: record
+            for record in map(json.loads, output_path.read_text().splitlines())
+        }
+        assert records[first]["data"] == {}
+        assert records[first]["validation_errors"] is None
+        assert records[second]["data"] != {}
+
 
 class TestDiagnoseMethods:
     """Tests for diagnosis methods."""
@@ -381,6 +455,26 @@ class TestResponseSearch:
             # Request IDs are 2 and 5 for the two completed requests
             assert matches[0]["request_id"] == 2
 
+    async def test_search_uses_text_index_only_when_asked(
+        self, db_path: Path, populated_db
+    ) -> None:
+        """An existing text index does not change what a search matches."""
+        engine, _ = populated_db
+        await engine.dispose()
+
+        async with LocalDevDriverDebugger.open(db_path) as debugger:
+            await debugger.update_text_index(processes=0)
+
+            # Markup is in the raw body but not in the indexed page text.
+            matches = await debugger.search_responses(
+                text="<html>", processes=0
+            )
+            assert [m["request_id"] for m in matches] == [2, 5]
+            matches = await debugger.search_responses(
+                text="<html>", processes=0, use_index=True
+            )
+            assert matches == []
+
 
 class TestSeedSpeculativeRequests:
     """Tests for seed_speculative_requests method."""
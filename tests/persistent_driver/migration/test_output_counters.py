@@ -0,0 +1,97 @@
+"""Tests for the v26 requests.child_count / result_count counters."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.migrations import migrate_to
+
+_COUNTS = sa.text(
+    "SELECT id, child_count, result_count FROM requests ORDER BY id"
+)
+
+
+async def _insert_request(conn, parent_id: int | None) -> None:  # type: ignore[no-untyped-def]
+    await conn.execute(
+        sa.text(
+            "INSERT INTO requests (status, queue_counter, method, url,"
+            " continuation, parent_request_id, response_status_code)"
+            " VALUES ('completed', 1, 'GET', 'https://example.com',"
+            " 'parse', :parent, 200)"
+        ),
+        {"parent": parent_id},
+    )
+
+
+async def _insert_result(conn, request_id: int) -> None:  # type: ignore[no-untyped-def]
+    await conn.execute(
+        sa.text(
+            "INSERT INTO results (request_id, result_type, data_json,"
+            " is_valid) VALUES (:id, 'Case', '{}', 1)"
+        ),
+        {"id": request_id},
+    )
+
+
+async def test_migration_backfills_then_triggers_maintain(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "test.db"
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    await migrate_to(engine, target=25)
+
+    # A v25 run: 1 -> (2 -> 4, 3); results on 2 and 4.
+    async with engine.begin() as conn:
+        for parent in (None, 1, 1, 2):
+            await _insert_request(conn, parent)
+        for request_id in (2, 4, 4):
+            await _insert_result(conn, request_id)
+        assert (await conn.execute(_COUNTS)).all() == [
+            (1, 0, 0),
+            (2, 0, 0),
+            (3, 0, 0),
+            (4, 0, 0),
+        ]
+
+    assert await migrate_to(engine, target=26) == [26]
+    async with engine.begin() as conn:
+        assert (await conn.execute(_COUNTS)).all() == [
+            (1, 2, 0),
+            (2, 1, 1),
+            (3, 0, 0),
+            (4, 0, 2),
+        ]
+
+    # From here on the counters follow inserts, deletes and re-parents.
+    async with engine.begin() as conn:
+        await _insert_request(conn, 3)
+        await _insert_result(conn, 3)
+        await conn.execute(
+            sa.text("UPDATE requests SET parent_request_id = 1 WHERE id = 4")
+        )
+        await conn.execute(sa.text("DELETE FROM results WHERE request_id = 4"))
+        assert (await conn.execute(_COUNTS)).all() == [
+            (1, 3, 0),
+            (2, 0, 1),
+            (3, 1, 1),
+            (4, 0, 0),
+            (5, 0, 0),
+        ]
+    await engine.dispose()
+
+    async with LocalDevDriverDebugger.open(db_path) as debugger:
+        ghosts = await debugger.get_ghost_requests()
+    assert [g["id"] for g in ghosts["ghosts"]] == [4, 5]
+    assert ghosts["by_continuation"] == {"parse": 2}
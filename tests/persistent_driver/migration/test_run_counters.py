@@ -0,0 +1,142 @@
+"""Tests for the v27 request_counts / result_counts tables."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from kent.driver.persistent_driver.debugger import LocalDevDriverDebugger
+from kent.driver.persistent_driver.migrations import migrate_to
+
+_REQUEST_COUNTS = sa.text(
+    "SELECT continuation, status, count FROM request_counts"
+    " WHERE count != 0 ORDER BY continuation, status"
+)
+_RESULT_COUNTS = sa.text(
+    "SELECT result_type, is_valid, count FROM result_counts"
+    " WHERE count != 0 ORDER BY result_type, is_valid"
+)
+
+
+async def _insert_request(conn, continuation: str, status: str) -> None:  # type: ignore[no-untyped-def]
+    await conn.execute(
+        sa.text(
+            "INSERT INTO requests (status, queue_counter, method, url,"
+            " continuation) VALUES (:status, 1, 'GET',"
+            " 'https://example.com', :continuation)"
+        ),
+        {"status": status, "continuation": continuation},
+    )
+
+
+async def _insert_result(conn, result_type: str, is_valid: bool) -> None:  # type: ignore[no-untyped-def]
+    await conn.execute(
+        sa.text(
+            "INSERT INTO results (request_id, result_type, data_json,"
+            " is_valid) VALUES (1, :type, '{}', :valid)"
+        ),
+        {"type": result_type, "valid": is_valid},
+    )
+
+
+async def test_migration_backfills_then_triggers_maintain(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "test.db"
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    await migrate_to(engine, target=26)
+
+    async with engine.begin() as conn:
+        await conn.execute(sa.text("DELETE FROM request_counts"))
+        await conn.execute(sa.text("DELETE FROM result_counts"))
+        for status in ("pending", "pending", "completed"):
+            await _insert_request(conn, "parse", status)
+        await _insert_request(conn, "detail", "pending")
+        for valid in (True, True, False):
+            await _insert_result(conn, "Case", valid)
+
+    assert await migrate_to(engine) == [27]
+    async with engine.begin() as conn:
+        assert (await conn.execute(_REQUEST_COUNTS)).all() == [
+            ("detail", "pending", 1),
+            ("parse", "completed", 1),
+            ("parse", "pending", 2),
+        ]
+        assert (await conn.execute(_RESULT_COUNTS)).all() == [
+            ("Case", 0, 1),
+            ("Case", 1, 2),
+        ]
+
+    # From here on the counters follow inserts, updates and deletes.
+    async with engine.begin() as conn:
+        await conn.execute(
+            sa.text(
+                "UPDATE requests SET status = 'in_progress'"
+                " WHERE continuation = 'parse' AND status = 'pending'"
+            )
+        )
+        await conn.execute(
+            sa.text("UPDATE requests SET continuation = 'parse' WHERE id = 4")
+        )
+        await conn.execute(sa.text("DELETE FROM requests WHERE id = 3"))
+        await conn.execute(
+            sa.text("UPDATE results SET is_valid = 1 WHERE is_valid = 0")
+        )
+        await _insert_result(conn, "Docket", False)
+        assert (await conn.execute(_REQUEST_COUNTS)).all() == [
+            ("parse", "in_progress", 2),
+            ("parse", "pending", 1),
+        ]
+        assert (await conn.execute(_RESULT_COUNTS)).all() == [
+            ("Case", 1, 3),
+            ("Docket", 0, 1),
+        ]
+    await engine.dispose()
+
+    async with LocalDevDriverDebugger.open(db_path) as debugger:
+        stats = await debugger.get_stats()
+        assert stats["queue"]["in_progress"] == 2
+        assert stats["queue"]["by_continuation"]["parse"]["pending"] == 1
+        assert (await debugger.check_counters())["has_drift"] is False
+
+
+async def test_check_counters_reports_and_fixes_drift(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "test.db"
+    async with LocalDevDriverDebugger.open(db_path, read_only=False) as d:
+        async with d._session_factory() as session:
+            conn = await session.connection()
+            await _insert_request(conn, "parse", "pending")
+            await _insert_result(conn, "Case", True)
+            await conn.execute(sa.text("UPDATE request_counts SET count = 5"))
+            await conn.execute(sa.text("DELETE FROM result_counts"))
+            await session.commit()
+
+        report = await d.check_counters()
+        assert report["has_drift"] is True
+        assert report["fixed"] is False
+        assert report["requests"] == [
+            {
+                "continuation": "parse",
+                "status": "pending",
+                "stored": 5,
+                "actual": 1,
+            }
+        ]
+        assert report["results"] == [
+            {"result_type": "Case", "is_valid": True, "stored": 0, "actual": 1}
+        ]
+
+        assert (await d.check_counters(fix=True))["fixed"] is True
+        assert (await d.check_counters())["has_drift"] is False
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import json
 
+import pytest
+
 from kent.driver.persistent_driver.compression import compress
 from kent.driver.persistent_driver.sql_manager import SQLManager
 
@@ -268,6 +270,95 @@ class TestListingOperations:
         invalid_results = await sql_manager.list_results(is_valid=False)
         assert invalid_results.total == 1
 
+    async def test_list_requests_cursor_pages(
+        self, sql_manager: SQLManager
+    ) -> None:
+        """Test walking list_requests by cursor in each sort order."""
+        for i in range(7):
+            await sql_manager.insert_request(
+                priority=i % 3,
+                request_type="navigating",
+                method="GET",
+                url=f"https://example.com/{i}",
+                headers_json=None,
+                cookies_json=None,
+                body=None,
+                continuation="parse",
+                current_location="",
+                accumulated_data_json=None,
+                permanent_json=None,
+                expected_type=None,
+                dedup_key=str(i),
+                parent_id=None,
+            )
+
+        for sort in ("queue", "id_asc", "id_desc"):
+            expected = await sql_manager.list_requests(sort=sort, limit=50)
+            seen: list[int] = []
+            cursor = None
+            while True:
+                page = await sql_manager.list_requests(
+                    sort=sort, limit=3, cursor=cursor, total="none"
+                )
+                assert page.total is None
+                seen.extend(r.id for r in page.items)
+                cursor = page.next_cursor
+                assert page.has_more == (cursor is not None)
+                if cursor is None:
+                    break
+            assert seen == [r.id for r in expected.items]
+
+        # Cursors are opaque and tied to their sort order.
+        first = await sql_manager.list_requests(sort="id_asc", limit=3)
+        assert first.next_cursor is not None
+        with pytest.raises(ValueError, match="sort order"):
+            await sql_manager.list_requests(
+                sort="id_desc", cursor=first.next_cursor
+            )
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await sql_manager.list_requests(cursor="not a cursor")
+
+    async def test_list_approximate_totals(
+        self, sql_manager: SQLManager
+    ) -> None:
+        """Test approximate totals come from the run counters."""
+        req_id = await sql_manager.insert_request(
+            priority=5,
+            request_type="navigating",
+            method="GET",
+            url="https://example.com/test",
+            headers_json=None,
+            cookies_json=None,
+            body=None,
+            continuation="parse",
+            current_location="",
+            accumulated_data_json=None,
+            permanent_json=None,
+            expected_type=None,
+            dedup_key=None,
+            parent_id=None,
+        )
+        for i, valid in enumerate((True, True, False)):
+            await sql_manager.store_result(
+                request_id=req_id,
+                result_type="CaseData",
+                data_json=json.dumps({"id": i}),
+                is_valid=valid,
+            )
+
+        pending = await sql_manager.list_requests(
+            status="pending", continuation="parse", total="approximate"
+        )
+        assert pending.total == 1
+        valid = await sql_manager.list_results(
+            result_type="CaseData", is_valid=True, total="approximate"
+        )
+        assert valid.total == 2
+        # No counter covers responses, so only "exact" counts them.
+        responses = await sql_manager.list_responses(total="approximate")
+        assert responses.total is None
+        assert not responses.has_more
+
 
 class TestGetterMethods:
     """Tests for get_request, get_response, get_result."""
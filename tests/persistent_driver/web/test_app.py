@@ -212,6 +212,53 @@ class TestRunManager:
         # Cleanup
         await run.driver.close()
 
+    async def test_metrics_of_loaded_runs(
+        self, runs_dir: Path, mock_scraper: Any
+    ) -> None:
+        """Test /metrics renders each loaded driver's registry by run."""
+        from kent.driver.persistent_driver.database import (
+            init_database,
+        )
+        from kent.driver.persistent_driver.web.app import (
+            RunManager,
+        )
+        from kent.driver.persistent_driver.web.routes.metrics import (
+            get_metrics,
+        )
+
+        engine, session_factory = await init_database(runs_dir / "live.db")
+        async with session_factory() as session:
+            await session.execute(
+                sa.text("""
+                INSERT INTO run_metadata (id, scraper_name, status, base_delay, jitter, num_workers, max_backoff_time)
+                VALUES (1, 'MockScraper', 'completed', 1.0, 0.5, 1, 60.0)
+                """)
+            )
+            await session.commit()
+        await engine.dispose()
+        (runs_dir / "idle.db").touch()
+
+        manager = RunManager(runs_dir)
+        await manager.scan_runs()
+        run = await manager.load_run("live", mock_scraper)
+        assert run.driver is not None
+        run.driver.metrics.http_latency.labels("example.com").observe(0.2)
+
+        try:
+            response = await get_metrics(manager)
+        finally:
+            await run.driver.close()
+
+        text = bytes(response.body).decode()
+        assert response.media_type.startswith("text/plain; version=0.0.4")
+        assert (
+            'kent_http_request_duration_seconds_count{run="live",'
+            'host="example.com"} 1'
+        ) in text
+        assert 'kent_queue_depth{run="live",status="pending"}' in text
+        assert 'kent_active_workers{run="live"} 0' in text
+        assert 'run="idle"' not in text
+
     async def test_load_run_not_found(
         self, runs_dir: Path, mock_scraper: Any
     ) -> None:
@@ -586,6 +633,74 @@ class TestRunsAPI:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
+    def test_metrics_endpoint_without_loaded_runs(self, client) -> None:
+        """Test /metrics answers with an empty exposition."""
+        with client:
+            response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == ""
+
+    def test_list_results_pages_by_cursor(
+        self, runs_dir: Path, client
+    ) -> None:
+        """Test results listing hands out cursors that walk every page."""
+        import asyncio
+
+        from kent.driver.persistent_driver.database import init_database
+
+        async def seed() -> None:
+            engine, session_factory = await init_database(
+                runs_dir / "paged.db"
+            )
+            async with session_factory() as session:
+                await session.execute(
+                    sa.text(
+                        "INSERT INTO requests (status, queue_counter, method,"
+                        " url, continuation) VALUES"
+                        " ('completed', 1, 'GET', 'https://example.com',"
+                        " 'parse')"
+                    )
+                )
+                for _ in range(5):
+                    await session.execute(
+                        sa.text(
+                            "INSERT INTO results (request_id, result_type,"
+                            " data_json, is_valid) VALUES (1, 'Case', '{}', 1)"
+                        )
+                    )
+                await session.commit()
+            await engine.dispose()
+
+        asyncio.run(seed())
+
+        with client:
+            url = "/api/runs/paged/results"
+            first = client.get(
+                url, params={"limit": 2, "total": "approximate"}
+            )
+            assert first.status_code == 200
+            data = first.json()
+            assert data["total"] == 5
+            ids = [item["id"] for item in data["items"]]
+            while data["next_cursor"]:
+                response = client.get(
+                    url,
+                    params={
+                        "limit": 2,
+                        "total": "none",
+                        "cursor": data["next_cursor"],
+                    },
+                )
+                data = response.json()
+                assert data["total"] is None
+                ids += [item["id"] for item in data["items"]]
+            assert ids == [5, 4, 3, 2, 1]
+            assert data["has_more"] is False
+
+            response = client.get(url, params={"cursor": "bogus"})
+            assert response.status_code == 400
+
 
 class TestWebSocketManager:
     """Tests for WebSocket manager."""
@@ -654,6 +769,7 @@ class TestWebSocketManager:
 
         # Broadcast
         await manager.broadcast("test_run", event)
+        await manager.drain("test_run")
 
         # Both should receive
         ws1.send_text.assert_called_once()
@@ -692,6 +808,7 @@ class TestWebSocketManager:
         )
 
         await manager.broadcast("test_run", event_match)
+        await manager.drain("test_run")
         assert ws.send_text.call_count == 1
 
         # Event that doesn't match subscription
@@ -702,6 +819,7 @@ class TestWebSocketManager:
         )
 
         await manager.broadcast("test_run", event_no_match)
+        await manager.drain("test_run")
         # Should still be 1, not called for this event
         assert ws.send_text.call_count == 1
 
@@ -778,9 +896,178 @@ class TestWebSocketManager:
         )
 
         await callback(event)
+        await ws_manager.drain("callback_test")
 
         # Should have broadcasted to ws
         ws.send_text.assert_called_once()
 
         # Cleanup
         await ws_manager.disconnect(ws, "callback_test")
+
+    async def test_slow_connection_drops_and_notifies(self) -> None:
+        """A full send queue drops messages without blocking broadcast."""
+        import asyncio
+        import json
+        from datetime import datetime, timezone
+        from unittest.mock import AsyncMock, MagicMock
+
+        from kent.driver.persistent_driver.persistent_driver import (
+            ProgressEvent,
+        )
+        from kent.driver.persistent_driver.web.websocket import (
+            WebSocketManager,
+        )
+
+        manager = WebSocketManager(queue_size=2)
+        release = asyncio.Event()
+        sent: list[dict[str, Any]] = []
+
+        async def slow_send(message: str) -> None:
+            await release.wait()
+            sent.append(json.loads(message))
+
+        slow, fast = MagicMock(), MagicMock()
+        slow.accept = fast.accept = AsyncMock()
+        slow.send_text = slow_send
+        fast.send_text = AsyncMock()
+        await manager.connect(slow, "test_run")
+        await manager.connect(fast, "test_run")
+
+        for request_id in range(6):
+            await manager.broadcast(
+                "test_run",
+                ProgressEvent(
+                    event_type="run_started",
+                    timestamp=datetime.now(timezone.utc),
+                    data={"n": request_id},
+                ),
+            )
+            # The writers get to run; the slow one is stuck on its first
+            await asyncio.sleep(0)
+
+        # The fast client is unaffected by the stuck one
+        assert fast.send_text.call_count == 6
+
+        release.set()
+        await manager.drain("test_run")
+        # In flight, then the two that fit, then the loss is reported
+        assert [m["data"] for m in sent] == [
+            {"n": 0},
+            {"count": 3},
+            {"n": 1},
+            {"n": 2},
+        ]
+        assert sent[1]["event_type"] == "events_dropped"
+
+
+class TestProgressBus:
+    """Tests for coalesced progress delivery."""
+
+    @staticmethod
+    def _event(event_type: str, **data: Any) -> Any:
+        from datetime import datetime, timezone
+
+        from kent.driver.persistent_driver.persistent_driver import (
+            ProgressEvent,
+        )
+
+        return ProgressEvent(
+            event_type=event_type,
+            timestamp=datetime.now(timezone.utc),
+            data=data,
+        )
+
+    async def test_per_request_events_become_one_delta(self) -> None:
+        """A fan-out of children is counted, not forwarded one by one."""
+        from kent.driver.persistent_driver.web.websocket import ProgressBus
+
+        delivered: list[Any] = []
+
+        async def sink(event: Any) -> None:
+            delivered.append(event)
+
+        bus = ProgressBus(sink)
+        await bus.publish(self._event("run_started"))
+        await bus.publish(
+            self._event("request_started", request_id=1, continuation="list")
+        )
+        for _ in range(1000):
+            await bus.publish(
+                self._event("request_enqueued", continuation="detail")
+            )
+        await bus.publish(self._event("request_completed", request_id=1))
+        await bus.publish(self._event("run_completed", status="completed"))
+        # Nothing is delivered until the bus flushes
+        assert delivered == []
+
+        await bus.close()
+        assert [e.event_type for e in delivered] == [
+            "run_started",
+            "progress_delta",
+            "run_completed",
+        ]
+        assert delivered[1].data == {
+            "counts": {
+                "request_started": 1,
+                "request_enqueued": 1000,
+                "request_completed": 1,
+            },
+            "by_continuation": {
+                "list": {"request_started": 1, "request_completed": 1},
+                "detail": {"request_enqueued": 1000},
+            },
+            "dropped": 0,
+        }
+
+    async def test_full_bus_drops_and_reports(self) -> None:
+        """Events beyond maxsize are dropped and counted in a delta."""
+        from kent.driver.persistent_driver.web.websocket import ProgressBus
+
+        delivered: list[Any] = []
+
+        async def sink(event: Any) -> None:
+            delivered.append(event)
+
+        bus = ProgressBus(sink, maxsize=2)
+        for n in range(5):
+            await bus.publish(self._event("worker_scaled", worker_id=n))
+        await bus.flush()
+
+        assert [e.data.get("worker_id") for e in delivered] == [0, 1, None]
+        assert delivered[2].data["dropped"] == 3
+
+    async def test_delta_narrowed_to_subscription(self) -> None:
+        """Connections only see counts for the types they subscribe to."""
+        import json
+        from unittest.mock import AsyncMock, MagicMock
+
+        from kent.driver.persistent_driver.web.websocket import (
+            ProgressBus,
+            ProgressEventType,
+            WebSocketManager,
+        )
+
+        manager = WebSocketManager()
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock()
+        await manager.connect(
+            ws, "test_run", event_types={ProgressEventType.REQUEST_FAILED}
+        )
+
+        async def sink(event: Any) -> None:
+            await manager.broadcast("test_run", event)
+
+        bus = ProgressBus(sink)
+        await bus.publish(self._event("request_started", request_id=1))
+        await bus.flush()
+        await manager.drain("test_run")
+        ws.send_text.assert_not_called()
+
+        await bus.publish(self._event("request_started", request_id=2))
+        await bus.publish(self._event("request_failed", request_id=2))
+        await bus.flush()
+        await manager.drain("test_run")
+        message = json.loads(ws.send_text.call_args.args[0])
+        assert message["event_type"] == "progress_delta"
+        assert message["data"]["counts"] == {"request_failed": 1}
@@ -0,0 +1,231 @@
+"""Tests for existence probes on speculative templates.
+
+A template with ``probe = "head"`` (or ``"range"``) makes the driver
+request each speculative ID cheaply first. The outcome is tracked from the
+probe response, and only IDs whose probe succeeds are fetched in full.
+
+These tests cover:
+- ``build_speculative_request`` marking probes, and rejecting unknown modes.
+- The request managers rewriting a probe into HEAD / ``Range: bytes=0-0``.
+- End-to-end: the SyncDriver fetches in full only the IDs that exist.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from pydantic import BaseModel
+
+from kent.common.decorators import entry, step
+from kent.common.exceptions import ScraperConfigError
+from kent.common.request_manager import (
+    AsyncRequestManager,
+    SyncRequestManager,
+)
+from kent.data_types import (
+    BaseScraper,
+    HttpMethod,
+    HTTPRequestParams,
+    ParsedData,
+    Request,
+    Response,
+    ScraperYield,
+)
+from kent.driver._speculation_support import build_speculative_request
+from kent.driver.sync_driver import SyncDriver
+
+
+class ProbeCaseId(BaseModel):
+    """Speculative parameter that probes before fetching."""
+
+    case_id: int
+    soft_max: int = 0
+    should_advance: bool = True
+    gap: int = 2
+    probe: str | None = "head"
+
+    def seed_range(self) -> range:
+        return range(self.case_id, self.soft_max)
+
+    def from_int(self, n: int) -> ProbeCaseId:
+        return self.model_copy(update={"case_id": n})
+
+    def max_gap(self) -> int:
+        return self.gap
+
+
+class ProbeScraper(BaseScraper[dict]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.parsed: list[int] = []
+
+    @entry(dict)
+    def fetch_case(self, cid: ProbeCaseId) -> Request:
+        return Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"https://example.com/case/{cid.case_id}",
+            ),
+            continuation="parse_case",
+        )
+
+    @step
+    def parse_case(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        case_id = int(response.url.split("/")[-1])
+        self.parsed.append(case_id)
+        yield ParsedData({"case_id": case_id})
+
+
+def _seeded_driver(probe: str | None = "head") -> SyncDriver:
+    scraper = ProbeScraper()
+    list(
+        scraper.initial_seed(
+            [{"fetch_case": {"cid": {"case_id": 1, "probe": probe}}}]
+        )
+    )
+    driver = SyncDriver(scraper)
+    driver._speculation_state = driver._discover_speculate_functions()
+    return driver
+
+
+def _probe_request(mode: str, method: HttpMethod) -> Request:
+    return (
+        Request(
+            request=HTTPRequestParams(
+                method=method,
+                url="https://example.com/case/1",
+                data={"q": "1"} if method == HttpMethod.POST else None,
+            ),
+            continuation="parse_case",
+        )
+        .speculative("fetch_case:0", 0, 1)
+        .as_probe(mode)
+    )
+
+
+class TestBuildProbeRequest:
+    def test_probe_template_builds_probe_request(self) -> None:
+        driver = _seeded_driver()
+        state = driver._speculation_state["fetch_case:0"]
+
+        request = build_speculative_request(
+            driver.scraper, state, "fetch_case:0", 4
+        )
+
+        assert request.probe == "head"
+        assert request.is_speculative is True
+        assert request.request.method == HttpMethod.GET
+
+        target = request.probe_target()  # type: ignore[attr-defined]
+        assert target.probe is None
+        assert target.is_speculative is False
+        assert target.speculation_id == ("fetch_case:0", 0, 4)
+
+    def test_template_without_probe_fetches_in_full(self) -> None:
+        driver = _seeded_driver(probe=None)
+        state = driver._speculation_state["fetch_case:0"]
+
+        request = build_speculative_request(
+            driver.scraper, state, "fetch_case:0", 4
+        )
+
+        assert request.probe is None
+
+    def test_unknown_probe_mode_rejected(self) -> None:
+        driver = _seeded_driver(probe="options")
+        state = driver._speculation_state["fetch_case:0"]
+
+        with pytest.raises(ScraperConfigError):
+            build_speculative_request(driver.scraper, state, "fetch_case:0", 4)
+
+
+def _mock_httpx_response(status_code: int = 200) -> Mock:
+    m = Mock()
+    m.status_code = status_code
+    m.headers = {}
+    m.content = b""
+    m.text = ""
+    return m
+
+
+class TestRequestManagerProbes:
+    def test_head_probe_sent_as_head_without_body(self) -> None:
+        rm = SyncRequestManager(scraper=BaseScraper)
+        rm._client.request = Mock(return_value=_mock_httpx_response())
+
+        rm.resolve_request(_probe_request("head", HttpMethod.POST))
+
+        kwargs = rm._client.request.call_args.kwargs
+        assert kwargs["method"] == "HEAD"
+        assert kwargs["data"] is None
+        assert kwargs["content"] is None
+
+    def test_range_probe_keeps_method_and_asks_for_one_byte(self) -> None:
+        rm = SyncRequestManager(scraper=BaseScraper)
+        rm._client.request = Mock(return_value=_mock_httpx_response(206))
+
+        response = rm.resolve_request(_probe_request("range", HttpMethod.GET))
+
+        kwargs = rm._client.request.call_args.kwargs
+        assert kwargs["method"] == "GET"
+        assert kwargs["headers"]["Range"] == "bytes=0-0"
+        assert response.status_code == 206
+
+    async def test_async_head_probe_against_server(
+        self, server_url: str
+    ) -> None:
+        """AsyncRequestManager shall send HEAD and return no body."""
+        request = Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"{server_url}/cases/BCC-2024-001",
+            ),
+            continuation="parse_case",
+        )
+        async with AsyncRequestManager(scraper=BaseScraper) as rm:
+            full = await rm.resolve_request(request)
+            probe = await rm.resolve_request(
+                request.speculative("fetch_case:0", 0, 1).as_probe("head")
+            )
+
+        assert full.status_code == probe.status_code == 200
+        assert full.content
+        assert probe.content == b""
+
+
+class TestSyncDriverProbes:
+    def test_fetches_only_existing_ids_in_full(self) -> None:
+        """The driver shall probe every ID but fetch only existing ones."""
+        scraper = ProbeScraper()
+        probes: list[int] = []
+        fetches: list[int] = []
+
+        def resolve(request: Request) -> Response:
+            n = int(request.request.url.split("/")[-1])
+            (probes if request.probe else fetches).append(n)
+            return Response(
+                status_code=200 if n <= 5 else 404,
+                headers={},
+                content=b"" if request.probe else b"<html></html>",
+                text="",
+                url=request.request.url,
+                request=request,
+            )
+
+        mock_manager = MagicMock()
+        mock_manager.resolve_request.side_effect = resolve
+        driver = SyncDriver(scraper, request_manager=mock_manager)
+        driver.seed_params = [{"fetch_case": {"cid": {"case_id": 1}}}]
+        driver.run()
+
+        # 6-8 are the 404 tail that stops speculation.
+        assert sorted(probes) == list(range(1, 9))
+        assert sorted(fetches) == list(range(1, 6))
+        assert sorted(scraper.parsed) == list(range(1, 6))
+        state = driver._speculation_state["fetch_case:0"]
+        assert state.highest_successful_id == 5
+        assert state.stopped is True
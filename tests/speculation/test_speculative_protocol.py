@@ -6,6 +6,8 @@ This test module verifies:
 - check_success() split between speculative and non-speculative requests
 - max_gap() == 0 for frozen ranges
 - Multiple templates for the same entry (param_index)
+- Windowed seeding: top-up as outcomes arrive, resumable from the ceiling
+- Galloping frontier search past gaps for search_strategy="gallop"
 - fails_successfully() soft-404 detection
 - End-to-end speculation with mock request manager
 """
@@ -13,6 +15,7 @@ This test module verifies:
 from collections.abc import Generator
 from unittest.mock import MagicMock
 
+import pytest
 from pydantic import BaseModel
 
 from kent.common.decorators import (
@@ -30,6 +33,10 @@ from kent.data_types import (
     Response,
     ScraperYield,
 )
+from kent.driver._speculation_support import (
+    GALLOP_MAX_DOUBLINGS,
+    FrontierSearch,
+)
 from kent.driver.sync_driver import SyncDriver
 
 # ── Test Speculative models ────────────────────────────────────────
@@ -83,6 +90,25 @@ class DocketId(BaseModel):
         return self.gap
 
 
+class GallopCaseId(BaseModel):
+    """Speculative parameter that searches past gaps instead of stopping."""
+
+    case_id: int
+    soft_max: int = 0
+    should_advance: bool = True
+    gap: int = 2
+    search_strategy: str = "gallop"
+
+    def seed_range(self) -> range:
+        return range(self.case_id, self.soft_max)
+
+    def from_int(self, n: int) -> "GallopCaseId":
+        return self.model_copy(update={"case_id": n})
+
+    def max_gap(self) -> int:
+        return self.gap
+
+
 # ── Test scrapers ──────────────────────────────────────────────────
 
 
@@ -576,6 +602,258 @@ class TestExtendSpeculation:
         assert len(driver.request_queue) == 0
 
 
+# ── Windowed (lazy) seeding ────────────────────────────────────────
+
+
+class TestSpeculationWindow:
+    def _make_driver(self, window, case_id=1, soft_max=0, gap=2):
+        scraper = SpeculationTestScraper()
+        list(
+            scraper.initial_seed(
+                [
+                    {
+                        "fetch_case": {
+                            "cid": {
+                                "case_id": case_id,
+                                "soft_max": soft_max,
+                                "gap": gap,
+                            }
+                        }
+                    }
+                ]
+            )
+        )
+        driver = SyncDriver(scraper, speculation_window=window)
+        driver._speculation_state = driver._discover_speculate_functions()
+        return driver
+
+    def _outcome(self, driver, n, status=200):
+        request = Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET, url=f"https://example.com/case/{n}"
+            ),
+            continuation="parse_case",
+            is_speculative=True,
+            speculation_id=("fetch_case:0", 0, n),
+        )
+        response = Response(
+            status_code=status,
+            headers={},
+            content=b"",
+            text="",
+            url=request.request.url,
+            request=request,
+        )
+        driver._track_speculation_outcome(request, response)
+
+    def _queued_ids(self, driver):
+        return sorted(
+            req.speculation_id[2] for _p, _c, req in driver.request_queue
+        )
+
+    def test_seeding_stops_at_window(self):
+        """Only `window` IDs of a large seed_range are enqueued up front."""
+        driver = self._make_driver(window=3, soft_max=200_000)
+        driver._seed_speculative_queue()
+
+        state = driver._speculation_state["fetch_case:0"]
+        assert self._queued_ids(driver) == [1, 2, 3]
+        assert state.current_ceiling == 3
+        assert state.target_ceiling == 200_001
+        assert state.pending == 3
+
+    def test_outcome_refills_window(self):
+        """Each tracked outcome frees a slot for the next ID."""
+        driver = self._make_driver(window=3, soft_max=100)
+        driver._seed_speculative_queue()
+        driver.request_queue.clear()
+
+        self._outcome(driver, 1, status=404)
+
+        state = driver._speculation_state["fetch_case:0"]
+        assert self._queued_ids(driver) == [4]
+        assert state.current_ceiling == 4
+        assert state.pending == 3
+
+    def test_refill_recovers_leaked_slots(self):
+        """A drained queue resets pending so untracked outcomes can't stall."""
+        driver = self._make_driver(window=2, soft_max=10)
+        driver._seed_speculative_queue()
+        driver.request_queue.clear()
+
+        assert driver._refill_speculation() is True
+        assert self._queued_ids(driver) == [3, 4]
+
+    def test_resume_continues_after_seeded_ceiling(self):
+        """A persisted ceiling resumes seeding at the next unseeded ID."""
+        driver = self._make_driver(window=2, soft_max=10)
+        state = driver._speculation_state["fetch_case:0"]
+        state.current_ceiling = 6
+
+        driver._seed_speculative_queue()
+
+        assert self._queued_ids(driver) == [7, 8]
+
+    def test_stopped_state_still_finishes_seed_range(self):
+        """Stopping only blocks extension; the seed_range is still seeded."""
+        driver = self._make_driver(window=2, soft_max=6, gap=2)
+        driver._seed_speculative_queue()
+        driver.request_queue.clear()
+
+        self._outcome(driver, 1, status=404)
+        self._outcome(driver, 2, status=404)
+
+        state = driver._speculation_state["fetch_case:0"]
+        assert state.stopped is True
+        assert self._queued_ids(driver) == [3, 4]
+
+    def test_windowed_run_fetches_same_ids_as_eager(self):
+        """A windowed run processes exactly the IDs an eager run does."""
+
+        def run(window):
+            scraper = EndToEndScraper()
+            mock_manager = MagicMock()
+            mock_manager.resolve_request.side_effect = lambda r: Response(
+                status_code=(
+                    200 if int(r.request.url.split("/")[-1]) <= 12 else 404
+                ),
+                headers={},
+                content=b"ok",
+                text="ok",
+                url=r.request.url,
+                request=r,
+            )
+            driver = SyncDriver(
+                scraper,
+                request_manager=mock_manager,
+                speculation_window=window,
+            )
+            driver.seed_params = [
+                {"fetch_case": {"cid": {"case_id": 1, "soft_max": 8}}}
+            ]
+            driver.run()
+            return sorted(scraper.results)
+
+        # 13-15 are the 404 tail that stops speculation.
+        assert run(window=2) == run(window=None) == list(range(1, 16))
+
+    def test_rejects_non_positive_window(self):
+        with pytest.raises(ValueError):
+            SyncDriver(SpeculationTestScraper(), speculation_window=0)
+
+
+# ── Frontier search (galloping) ────────────────────────────────────
+
+
+class GallopScraper(BaseScraper[dict]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.results: list[int] = []
+
+    @entry(dict)
+    def fetch_case(self, cid: GallopCaseId) -> Request:
+        return Request(
+            request=HTTPRequestParams(
+                method=HttpMethod.GET,
+                url=f"https://example.com/case/{cid.case_id}",
+            ),
+            continuation="parse_case",
+        )
+
+    @step
+    def parse_case(
+        self, response: Response
+    ) -> Generator[ScraperYield, None, None]:
+        if response.status_code == 200:
+            self.results.append(int(response.url.split("/")[-1]))
+        yield from ()
+
+
+class TestFrontierSearch:
+    def test_gallops_then_bisects_to_block_start(self):
+        """Probes double past the floor, then bisect down to the block."""
+        search = FrontierSearch(floor=10, gap=2)
+        probes = []
+        while (n := search.next_probe()) is not None:
+            probes.append(n)
+            search.record(n, n >= 50)
+
+        assert probes[:6] == [12, 14, 18, 26, 42, 74]
+        assert search.found
+        assert (search.lo, search.hi) == (48, 50)
+
+    def test_exhausts_after_max_doublings(self):
+        search = FrontierSearch(floor=0, gap=1)
+        while (n := search.next_probe()) is not None:
+            search.record(n, False)
+
+        assert search.exhausted
+        assert search.probes == GALLOP_MAX_DOUBLINGS
+
+    def _run(self, existing, gap=3):
+        scraper = GallopScraper()
+        requested: list[int] = []
+
+        def resolve(request):
+            n = int(request.request.url.split("/")[-1])
+            requested.append(n)
+            status = 200 if n in existing else 404
+            return Response(
+                status_code=status,
+                headers={},
+                content=b"",
+                text="",
+                url=request.request.url,
+                request=request,
+            )
+
+        mock_manager = MagicMock()
+        mock_manager.resolve_request.side_effect = resolve
+        driver = SyncDriver(scraper, request_manager=mock_manager)
+        driver.seed_params = [
+            {"fetch_case": {"cid": {"case_id": 1, "gap": gap}}}
+        ]
+        driver.run()
+        return scraper, requested, driver._speculation_state["fetch_case:0"]
+
+    def test_finds_block_at_unknown_offset(self):
+        """The driver shall find a live block past a gap with few requests."""
+        existing = set(range(1, 6)) | set(range(300, 601))
+        scraper, requested, state = self._run(existing)
+
+        assert set(scraper.results) == existing
+        assert len(requested) == len(set(requested))
+        # Dense IDs plus the gap tails and a few dozen probes.
+        assert len(requested) < len(existing) + 60
+        assert state.stopped is True
+        assert state.highest_successful_id == 600
+        assert state.search_probes > 0
+        assert state.probes_saved > 200
+
+    def test_linear_template_does_not_search(self):
+        """Templates without search_strategy keep stopping at the gap."""
+        scraper = EndToEndScraper()
+        mock_manager = MagicMock()
+        mock_manager.resolve_request.side_effect = lambda r: Response(
+            status_code=(
+                200 if int(r.request.url.split("/")[-1]) <= 5 else 404
+            ),
+            headers={},
+            content=b"",
+            text="",
+            url=r.request.url,
+            request=r,
+        )
+        driver = SyncDriver(scraper, request_manager=mock_manager)
+        driver.seed_params = [{"fetch_case": {"cid": {"case_id": 1}}}]
+        driver.run()
+
+        state = driver._speculation_state["fetch_case:0"]
+        assert state.search is None
+        assert state.search_probes == 0
+        assert max(scraper.results) <= 8
+
+
 # ── Soft 404 / fails_successfully ──────────────────────────────────
 
 